@@ -36,9 +36,21 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-from app.models import Base
+from app.models import Base, DATABASE_ONLY_OBJECTS, MONTHLY_PARTITION_NAME
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Ne pas proposer de supprimer les objets gérés uniquement par les migrations"""
+    if reflected and compare_to is None:
+        # Partitions mensuelles de orders / order_items, et clés étrangères internes
+        # que Postgres crée vers chaque partition de orders
+        if type_ == "table" and MONTHLY_PARTITION_NAME.match(name):
+            return False
+        if type_ == "foreign_key_constraint" and MONTHLY_PARTITION_NAME.match(object.referred_table.name):
+            return False
+    return not (reflected and compare_to is None and name in DATABASE_ONLY_OBJECTS)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,6 +73,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -84,7 +97,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,70 @@
+"""add_foreign_key_indexes
+
+Revision ID: 0b5e9a47c3d8
+Revises: f2a8d35c61e7
+Create Date: 2026-10-18 18:04:52.117340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b5e9a47c3d8'
+down_revision: Union[str, Sequence[str], None] = 'f2a8d35c61e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, table, colonnes). products.category_id est déjà couvert par ix_products_category_id_status
+# et orders.marketplace_id par ix_orders_marketplace_id_order_date
+INDEXES = [
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+    ('ix_orders_customer_id_order_date', 'orders', ['customer_id', 'order_date']),
+    ('ix_products_subcategory_id', 'products', ['subcategory_id']),
+    ('ix_operational_costs_month_category', 'operational_costs', ['month', 'category']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Doublons (role_id, section): fusionnés sur la plus ancienne ligne. La matrice de
+    # permissions combinait déjà les doublons par OU, les droits effectifs ne changent pas
+    op.execute("""
+        UPDATE section_permissions AS keep
+        SET can_view = merged.can_view, can_edit = merged.can_edit
+        FROM (
+            SELECT min(id) AS id, bool_or(coalesce(can_view, false)) AS can_view, bool_or(coalesce(can_edit, false)) AS can_edit
+            FROM section_permissions
+            GROUP BY role_id, section
+            HAVING count(*) > 1
+        ) AS merged
+        WHERE keep.id = merged.id
+    """)
+    op.execute("""
+        DELETE FROM section_permissions AS duplicate
+        USING section_permissions AS keep
+        WHERE duplicate.role_id = keep.role_id
+          AND duplicate.section = keep.section
+          AND duplicate.id > keep.id
+    """)
+
+    # CREATE INDEX CONCURRENTLY: pas de verrou bloquant les écritures, mais hors transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        op.create_index('uq_section_permissions_role_section', 'section_permissions', ['role_id', 'section'], unique=True, postgresql_concurrently=True)
+    op.execute(
+        "ALTER TABLE section_permissions ADD CONSTRAINT uq_section_permissions_role_section"
+        " UNIQUE USING INDEX uq_section_permissions_role_section"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_section_permissions_role_section', 'section_permissions', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
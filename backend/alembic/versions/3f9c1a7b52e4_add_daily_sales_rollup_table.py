@@ -0,0 +1,83 @@
+"""add_daily_sales_rollup_table
+
+Revision ID: 3f9c1a7b52e4
+Revises: d88dfcad96f5
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7b52e4'
+down_revision: Union[str, Sequence[str], None] = 'd88dfcad96f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_sales_rollup',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('marketplace_id', sa.Integer(), nullable=False),
+    sa.Column('country_code', sa.String(length=10), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('items_count', sa.Integer(), nullable=False),
+    sa.Column('subtotal_ht', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('discount_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_ht', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_ttc', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('refunded_count', sa.Integer(), nullable=False),
+    sa.Column('refunded_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('returns_count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['marketplace_id'], ['marketplaces.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'marketplace_id', 'country_code', name='uq_daily_sales_rollup_bucket')
+    )
+
+    # Remplissage initial à partir des commandes existantes
+    op.execute("""
+        INSERT INTO daily_sales_rollup (
+            day, marketplace_id, country_code, orders_count, items_count,
+            subtotal_ht, discount_amount, tax_amount, total_ht, total_ttc,
+            cancelled_count, cancelled_amount, refunded_count, refunded_amount,
+            returns_count, refreshed_at
+        )
+        SELECT
+            CAST(o.order_date AS DATE),
+            o.marketplace_id,
+            COALESCE(o.country_code, ''),
+            COUNT(o.id),
+            COALESCE(SUM(i.units), 0),
+            COALESCE(SUM(o.subtotal_ht), 0),
+            COALESCE(SUM(o.discount_amount), 0),
+            COALESCE(SUM(o.tax_amount), 0),
+            COALESCE(SUM(o.total_ht), 0),
+            COALESCE(SUM(o.total_ttc), 0),
+            COUNT(*) FILTER (WHERE o.is_cancelled),
+            COALESCE(SUM(o.total_ttc) FILTER (WHERE o.is_cancelled), 0),
+            COUNT(*) FILTER (WHERE o.is_refunded),
+            COALESCE(SUM(o.total_ttc) FILTER (WHERE o.is_refunded), 0),
+            COUNT(*) FILTER (WHERE o.has_returns),
+            now()
+        FROM orders o
+        LEFT JOIN (
+            SELECT order_id, SUM(quantity) AS units
+            FROM order_items
+            GROUP BY order_id
+        ) i ON i.order_id = o.id
+        GROUP BY CAST(o.order_date AS DATE), o.marketplace_id, COALESCE(o.country_code, '')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_sales_rollup')
@@ -0,0 +1,182 @@
+"""partition_orders_by_month
+
+Revision ID: 5d1c7f3a9e20
+Revises: 0b5e9a47c3d8
+Create Date: 2026-10-18 19:26:03.845512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c7f3a9e20'
+down_revision: Union[str, Sequence[str], None] = '0b5e9a47c3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mois créés à l'avance au-delà du mois courant (ensuite: PartitionService / ETL)
+MONTHS_AHEAD = 3
+
+# Crée les partitions mensuelles manquantes d'une table partitionnée par RANGE:
+# <table>_AAAA_MM, du mois de from_month au mois de to_month inclus
+ENSURE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent regclass, from_month date, to_month date)
+RETURNS integer AS $$
+DECLARE
+    month date := date_trunc('month', from_month)::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    -- Deux imports concurrents ne créent pas la même partition
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_monthly_partitions:' || parent::text));
+    WHILE month <= to_month LOOP
+        partition_name := parent::text || '_' || to_char(month, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month, (month + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Index recréés sur les nouvelles tables: (nom, table, définition)
+ORDER_INDEXES = [
+    ('ix_orders_updated_at', 'orders', '(updated_at)'),
+    ('ix_orders_platform_order_id', 'orders', '(platform_order_id)'),
+    ('ix_orders_order_date_marketplace_id', 'orders', '(order_date, marketplace_id)'),
+    ('ix_orders_marketplace_id_order_date', 'orders', '(marketplace_id, order_date)'),
+    ('ix_orders_status_order_date', 'orders', '(status, order_date)'),
+    ('ix_orders_country_code_order_date', 'orders', '(country_code, order_date)'),
+    ('ix_orders_customer_id_order_date', 'orders', '(customer_id, order_date)'),
+    ('ix_orders_search_vector', 'orders', 'USING gin (search_vector)'),
+]
+ORDER_ITEM_INDEXES = [
+    ('ix_order_items_created_at', 'order_items', '(created_at)'),
+    ('ix_order_items_order_id', 'order_items', '(order_id)'),
+    ('ix_order_items_product_id', 'order_items', '(product_id)'),
+]
+ORDER_FOREIGN_KEYS = """
+    ALTER TABLE orders
+        ADD CONSTRAINT orders_customer_id_fkey FOREIGN KEY (customer_id) REFERENCES customers(id),
+        ADD CONSTRAINT orders_marketplace_id_fkey FOREIGN KEY (marketplace_id) REFERENCES marketplaces(id),
+        ADD CONSTRAINT orders_promo_code_id_fkey FOREIGN KEY (promo_code_id) REFERENCES promo_codes(id),
+        ADD CONSTRAINT orders_import_batch_id_fkey FOREIGN KEY (import_batch_id) REFERENCES import_batches(id)
+"""
+ORDER_COLUMNS = """
+    id, platform_order_id, order_number, customer_id, marketplace_id, country_code, order_date,
+    subtotal_ht, discount_amount, tax_amount, total_ht, total_ttc, status, has_returns, is_refunded,
+    is_cancelled, promo_code_id, import_batch_id, import_hash, created_at, updated_at
+"""
+ORDER_ITEM_COLUMNS = """
+    id, order_id, product_id, product_name, quantity, unit_price_ht, unit_price_ttc, total_price_ht,
+    total_price_ttc, cost_price, gross_margin, net_margin, packaging_cost, washing_cost,
+    marketplace_commission, other_costs, calculated_net_margin, created_at
+"""
+
+
+def _create_indexes(indexes) -> None:
+    for name, table, definition in indexes:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
+
+
+def _create_trigram_index() -> None:
+    """Index trigrammes de add_search_vectors, si pg_trgm est installé"""
+    installed = op.get_bind().execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar()
+    if installed:
+        op.execute("CREATE INDEX ix_orders_order_number_trgm ON orders USING gin (order_number gin_trgm_ops)")
+
+
+def _swap_tables(partitioned: bool) -> None:
+    """Recrée orders et order_items (partitionnées ou non) et y recopie les données"""
+    partition_by = " PARTITION BY RANGE (order_date)" if partitioned else ""
+
+    # Compromis: order_promo_codes.order_id n'a plus de clé étrangère vers orders, dont la clé
+    # primaire devient (id, order_date); la table n'est écrite ni par l'API ni par l'ETL
+    op.execute("ALTER TABLE order_promo_codes DROP CONSTRAINT IF EXISTS order_promo_codes_order_id_fkey")
+    op.execute("ALTER TABLE orders RENAME TO orders_old")
+    op.execute("ALTER TABLE order_items RENAME TO order_items_old")
+    # Les séquences des id survivent aux anciennes tables
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY NONE")
+
+    op.execute(f"CREATE TABLE orders (LIKE orders_old INCLUDING DEFAULTS INCLUDING GENERATED){partition_by}")
+    if partitioned:
+        op.execute("CREATE TABLE order_items (LIKE order_items_old INCLUDING DEFAULTS, order_date timestamp NOT NULL) PARTITION BY RANGE (order_date)")
+        op.execute(f"""
+            SELECT ensure_monthly_partitions(parent, first_month, last_month)
+            FROM (VALUES ('orders'::regclass), ('order_items'::regclass)) AS tables (parent),
+                 (
+                     SELECT coalesce(min(order_date), now())::date AS first_month,
+                            (greatest(max(order_date), now()) + interval '{MONTHS_AHEAD} months')::date AS last_month
+                     FROM orders_old
+                 ) AS bounds
+        """)
+        item_source = f"SELECT i.{', i.'.join(column.strip() for column in ORDER_ITEM_COLUMNS.split(','))}, o.order_date FROM order_items_old i JOIN orders_old o ON o.id = i.order_id"
+        item_columns = ORDER_ITEM_COLUMNS + ", order_date"
+    else:
+        op.execute("CREATE TABLE order_items (LIKE order_items_old INCLUDING DEFAULTS)")
+        op.execute("ALTER TABLE order_items DROP COLUMN order_date")
+        item_source = f"SELECT {ORDER_ITEM_COLUMNS} FROM order_items_old"
+        item_columns = ORDER_ITEM_COLUMNS
+
+    op.execute(f"INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_old")
+    op.execute(f"INSERT INTO order_items ({item_columns}) {item_source}")
+    op.execute("DROP TABLE order_items_old")
+    op.execute("DROP TABLE orders_old")
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(ENSURE_MONTHLY_PARTITIONS)
+    _swap_tables(partitioned=True)
+
+    # La clé de partition fait partie de toute contrainte d'unicité. Compromis: order_number
+    # et platform_order_id ne sont plus uniques que par order_date, l'ETL vérifie leur unicité
+    # globale avant chaque chargement (Loader._check_order_keys)
+    op.execute("ALTER TABLE orders ADD CONSTRAINT orders_pkey PRIMARY KEY (id, order_date)")
+    op.execute("ALTER TABLE orders ADD CONSTRAINT uq_orders_order_number_order_date UNIQUE (order_number, order_date)")
+    op.execute("ALTER TABLE orders ADD CONSTRAINT uq_orders_platform_order_id_order_date UNIQUE (platform_order_id, order_date)")
+    op.execute(ORDER_FOREIGN_KEYS)
+    op.execute("ALTER TABLE order_items ADD CONSTRAINT order_items_pkey PRIMARY KEY (id, order_date)")
+    # Une commande qui change de date entraîne ses lignes dans la nouvelle partition
+    op.execute("""
+        ALTER TABLE order_items
+            ADD CONSTRAINT fk_order_items_order FOREIGN KEY (order_id, order_date)
+                REFERENCES orders(id, order_date) ON UPDATE CASCADE,
+            ADD CONSTRAINT order_items_product_id_fkey FOREIGN KEY (product_id) REFERENCES products(id)
+    """)
+    _create_indexes(ORDER_INDEXES + ORDER_ITEM_INDEXES)
+    _create_trigram_index()
+    op.execute("ANALYZE orders")
+    op.execute("ANALYZE order_items")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap_tables(partitioned=False)
+
+    op.execute("ALTER TABLE orders ADD CONSTRAINT orders_pkey PRIMARY KEY (id)")
+    op.execute("ALTER TABLE orders ADD CONSTRAINT orders_order_number_key UNIQUE (order_number)")
+    op.execute("ALTER TABLE orders ADD CONSTRAINT orders_platform_order_id_key UNIQUE (platform_order_id)")
+    op.execute(ORDER_FOREIGN_KEYS)
+    op.execute("ALTER TABLE order_items ADD CONSTRAINT order_items_pkey PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE order_items
+            ADD CONSTRAINT order_items_order_id_fkey FOREIGN KEY (order_id) REFERENCES orders(id),
+            ADD CONSTRAINT order_items_product_id_fkey FOREIGN KEY (product_id) REFERENCES products(id)
+    """)
+    op.execute("ALTER TABLE order_promo_codes ADD CONSTRAINT order_promo_codes_order_id_fkey FOREIGN KEY (order_id) REFERENCES orders(id)")
+    _create_indexes([index for index in ORDER_INDEXES if index[0] != 'ix_orders_platform_order_id'] + ORDER_ITEM_INDEXES)
+    _create_trigram_index()
+    op.execute("DROP FUNCTION ensure_monthly_partitions(regclass, date, date)")
@@ -0,0 +1,58 @@
+"""add_rollup_watermarks
+
+Revision ID: a51d0e6c9b17
+Revises: 3f9c1a7b52e4
+Create Date: 2026-10-18 11:03:54.218640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a51d0e6c9b17'
+down_revision: Union[str, Sequence[str], None] = '3f9c1a7b52e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colonnes servant de watermark : (table, colonne)
+WATERMARK_COLUMNS = [
+    ('orders', 'updated_at'),
+    ('products', 'updated_at'),
+    ('customers', 'updated_at'),
+    ('order_items', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rollup_watermarks',
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+    # Les écritures hors ORM (ETL en SQL brut) doivent aussi renseigner les timestamps
+    for table in ('orders', 'products', 'customers', 'order_items'):
+        op.alter_column(table, 'created_at', server_default=sa.text('now()'))
+        op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+    for table in ('orders', 'products', 'customers'):
+        op.alter_column(table, 'updated_at', server_default=sa.text('now()'))
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+
+    for table, column in WATERMARK_COLUMNS:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in WATERMARK_COLUMNS:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    for table in ('orders', 'products', 'customers'):
+        op.alter_column(table, 'updated_at', server_default=None)
+    for table in ('orders', 'products', 'customers', 'order_items'):
+        op.alter_column(table, 'created_at', server_default=None)
+    op.drop_table('rollup_watermarks')
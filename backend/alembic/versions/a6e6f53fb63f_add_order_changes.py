@@ -0,0 +1,107 @@
+"""add_order_changes
+
+Revision ID: a6e6f53fb63f
+Revises: f66a3209171e
+Create Date: 2026-10-18 04:35:38.408164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e6f53fb63f'
+down_revision: Union[str, Sequence[str], None] = 'f66a3209171e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Journalise l'ancien (jour, marketplace, client) des commandes supprimées ou dont l'un des trois
+# change: les watermarks updated_at/created_at ne voient que les nouvelles valeurs.
+# Triggers par instruction avec tables de transition: un seul INSERT par UPDATE de l'ETL.
+LOG_ORDER_CHANGES = """
+CREATE OR REPLACE FUNCTION log_order_changes()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO order_changes (order_id, order_date, marketplace_id, customer_id)
+        SELECT id, order_date, marketplace_id, customer_id FROM old_rows;
+    ELSE
+        INSERT INTO order_changes (order_id, order_date, marketplace_id, customer_id)
+        SELECT o.id, o.order_date, o.marketplace_id, o.customer_id
+        FROM old_rows o JOIN new_rows n ON n.id = o.id
+        WHERE (o.order_date, o.marketplace_id, o.customer_id)
+              IS DISTINCT FROM (n.order_date, n.marketplace_id, n.customer_id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Lignes supprimées ou modifiées sur place (order_items n'a pas d'updated_at): la commande est journalisée.
+# Les lignes déplacées par la cascade d'un changement de date ne trouvent plus leur commande
+# à l'ancienne date: elles sont déjà couvertes par log_order_changes.
+LOG_ORDER_ITEM_CHANGES = """
+CREATE OR REPLACE FUNCTION log_order_item_changes()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO order_changes (order_id, order_date, marketplace_id, customer_id)
+        SELECT DISTINCT o.id, o.order_date, o.marketplace_id, o.customer_id
+        FROM old_rows i JOIN orders o ON o.id = i.order_id AND o.order_date = i.order_date;
+    ELSE
+        INSERT INTO order_changes (order_id, order_date, marketplace_id, customer_id)
+        SELECT DISTINCT o.id, o.order_date, o.marketplace_id, o.customer_id
+        FROM old_rows i
+        JOIN new_rows n ON n.id = i.id
+        JOIN orders o ON o.id = i.order_id AND o.order_date = i.order_date
+        WHERE (i.product_id, i.quantity, i.total_price_ht, i.total_price_ttc)
+              IS DISTINCT FROM (n.product_id, n.quantity, n.total_price_ht, n.total_price_ttc);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    ('trg_orders_log_update', 'orders', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows', 'log_order_changes'),
+    ('trg_orders_log_delete', 'orders', 'DELETE', 'OLD TABLE AS old_rows', 'log_order_changes'),
+    ('trg_order_items_log_update', 'order_items', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows', 'log_order_item_changes'),
+    ('trg_order_items_log_delete', 'order_items', 'DELETE', 'OLD TABLE AS old_rows', 'log_order_item_changes'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('order_changes',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=False),
+    sa.Column('marketplace_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_changes_changed_at'), 'order_changes', ['changed_at'], unique=False)
+    # ### end Alembic commands ###
+    op.execute(LOG_ORDER_CHANGES)
+    op.execute(LOG_ORDER_ITEM_CHANGES)
+    for name, table, event, transition_tables, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON {table} REFERENCING {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON {table}")
+    op.execute("DROP FUNCTION log_order_item_changes()")
+    op.execute("DROP FUNCTION log_order_changes()")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_order_changes_changed_at'), table_name='order_changes')
+    op.drop_table('order_changes')
+    # ### end Alembic commands ###
@@ -0,0 +1,32 @@
+"""add_import_hash_columns
+
+Revision ID: c7e2d4f81a93
+Revises: a51d0e6c9b17
+Create Date: 2026-10-18 14:26:07.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2d4f81a93'
+down_revision: Union[str, Sequence[str], None] = 'a51d0e6c9b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('customers', sa.Column('import_hash', sa.BigInteger(), nullable=True))
+    op.add_column('products', sa.Column('import_hash', sa.BigInteger(), nullable=True))
+    op.add_column('orders', sa.Column('import_hash', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('orders', 'import_hash')
+    op.drop_column('products', 'import_hash')
+    op.drop_column('customers', 'import_hash')
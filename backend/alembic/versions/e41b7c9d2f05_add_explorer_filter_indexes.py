@@ -0,0 +1,38 @@
+"""add_explorer_filter_indexes
+
+Revision ID: e41b7c9d2f05
+Revises: c7e2d4f81a93
+Create Date: 2026-10-18 16:02:44.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7c9d2f05'
+down_revision: Union[str, Sequence[str], None] = 'c7e2d4f81a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_order_date_marketplace_id', 'orders', ['order_date', 'marketplace_id'], unique=False)
+    op.create_index('ix_orders_marketplace_id_order_date', 'orders', ['marketplace_id', 'order_date'], unique=False)
+    op.create_index('ix_orders_status_order_date', 'orders', ['status', 'order_date'], unique=False)
+    op.create_index('ix_orders_country_code_order_date', 'orders', ['country_code', 'order_date'], unique=False)
+    op.create_index('ix_products_category_id_status', 'products', ['category_id', 'status'], unique=False)
+    op.create_index('ix_products_sku_pattern', 'products', ['sku'], unique=False, postgresql_ops={'sku': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_sku_pattern', table_name='products')
+    op.drop_index('ix_products_category_id_status', table_name='products')
+    op.drop_index('ix_orders_country_code_order_date', table_name='orders')
+    op.drop_index('ix_orders_status_order_date', table_name='orders')
+    op.drop_index('ix_orders_marketplace_id_order_date', table_name='orders')
+    op.drop_index('ix_orders_order_date_marketplace_id', table_name='orders')
@@ -0,0 +1,79 @@
+"""add_search_vectors
+
+Revision ID: f2a8d35c61e7
+Revises: e41b7c9d2f05
+Create Date: 2026-10-18 17:11:29.604518
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d35c61e7'
+down_revision: Union[str, Sequence[str], None] = 'e41b7c9d2f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Même logger que les messages "Running upgrade" (niveau configuré dans alembic.ini)
+log = logging.getLogger("alembic.runtime.migration")
+
+# Colonnes tsvector générées (configuration 'simple': pas de racinisation, SKU / emails intacts)
+PRODUCT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(sku, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+# Même poids 'A' pour les identifiants de toutes les entités: les rangs restent comparables entre elles
+CUSTOMER_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A')"
+)
+ORDER_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(order_number, '') || ' ' || coalesce(platform_order_id, '')), 'A')"
+)
+
+# Index trigrammes (recherche floue / infixe), créés seulement si pg_trgm est disponible
+TRIGRAM_INDEXES = [
+    ('ix_products_name_trgm', 'products', 'name'),
+    ('ix_products_sku_trgm', 'products', 'sku'),
+    ('ix_customers_email_trgm', 'customers', 'email'),
+    ('ix_customers_full_name_trgm', 'customers', "(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"),
+    ('ix_orders_order_number_trgm', 'orders', 'order_number'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(PRODUCT_SEARCH_VECTOR, persisted=True), nullable=True))
+    op.add_column('customers', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(CUSTOMER_SEARCH_VECTOR, persisted=True), nullable=True))
+    op.add_column('orders', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(ORDER_SEARCH_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_customers_search_vector', 'customers', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_orders_search_vector', 'orders', ['search_vector'], unique=False, postgresql_using='gin')
+
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        log.warning("pg_trgm indisponible: index trigrammes non créés (recherche plein texte uniquement, "
+                    "voir SearchResponse.fuzzy)")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, expression in TRIGRAM_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin ({expression} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in reversed(TRIGRAM_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.drop_index('ix_orders_search_vector', table_name='orders', postgresql_using='gin')
+    op.drop_index('ix_customers_search_vector', table_name='customers', postgresql_using='gin')
+    op.drop_index('ix_products_search_vector', table_name='products', postgresql_using='gin')
+    op.drop_column('orders', 'search_vector')
+    op.drop_column('customers', 'search_vector')
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,100 @@
+"""add_category_closure
+
+Revision ID: f66a3209171e
+Revises: 929c1b39b67a
+Create Date: 2026-10-18 04:26:19.004446
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f66a3209171e'
+down_revision: Union[str, Sequence[str], None] = '929c1b39b67a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Maintient category_closure quand une catégorie est créée ou change de parent
+# (la suppression est propagée par ON DELETE CASCADE)
+MAINTAIN_CATEGORY_CLOSURE = """
+CREATE OR REPLACE FUNCTION maintain_category_closure()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        SELECT NEW.id, NEW.id, 0
+        UNION ALL
+        SELECT ancestor_id, NEW.id, depth + 1 FROM category_closure WHERE descendant_id = NEW.parent_id;
+        RETURN NEW;
+    END IF;
+
+    IF NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id THEN
+        RETURN NEW;
+    END IF;
+    IF EXISTS (SELECT 1 FROM category_closure WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id) THEN
+        RAISE EXCEPTION 'category % cannot be moved under its descendant %', NEW.id, NEW.parent_id;
+    END IF;
+    -- Sous-arbre détaché de ses anciens ancêtres puis rattaché à ceux du nouveau parent
+    DELETE FROM category_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id)
+      AND ancestor_id NOT IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = NEW.id);
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+    FROM category_closure above, category_closure below
+    WHERE above.descendant_id = NEW.parent_id AND below.ancestor_id = NEW.id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Fermeture de l'arbre existant
+BACKFILL_CATEGORY_CLOSURE = """
+WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM categories
+    UNION ALL
+    SELECT c.parent_id, p.descendant_id, p.depth + 1
+    FROM paths p JOIN categories c ON c.id = p.ancestor_id
+    WHERE c.parent_id IS NOT NULL
+)
+INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, depth FROM paths
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_category_closure_descendant_id'), 'category_closure', ['descendant_id'], unique=False)
+    # ### end Alembic commands ###
+    op.execute(MAINTAIN_CATEGORY_CLOSURE)
+    op.execute("""
+        CREATE TRIGGER trg_categories_closure_insert AFTER INSERT ON categories
+        FOR EACH ROW EXECUTE FUNCTION maintain_category_closure()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_categories_closure_move AFTER UPDATE OF parent_id ON categories
+        FOR EACH ROW EXECUTE FUNCTION maintain_category_closure()
+    """)
+    op.execute(BACKFILL_CATEGORY_CLOSURE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_categories_closure_move ON categories")
+    op.execute("DROP TRIGGER IF EXISTS trg_categories_closure_insert ON categories")
+    op.execute("DROP FUNCTION IF EXISTS maintain_category_closure()")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_category_closure_descendant_id'), table_name='category_closure')
+    op.drop_table('category_closure')
+    # ### end Alembic commands ###
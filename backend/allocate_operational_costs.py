@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Script pour répartir les coûts opérationnels mensuels sur les lignes de commande
+
+Les créations / modifications / suppressions faites via l'API répartissent
+déjà leur mois; ce script rattrape les mois touchés par les imports.
+
+Usage:
+    python allocate_operational_costs.py                  # incrémental (watermarks updated_at)
+    python allocate_operational_costs.py --month 2025-11
+    python allocate_operational_costs.py --all
+"""
+import sys
+import argparse
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.services.cost_allocation_service import CostAllocationService
+from app.services.rollup_refresh_service import RollupRefreshService
+from app.core.exceptions import BaseAppException
+
+
+def parse_month(value: str):
+    """Parse un mois au format YYYY-MM pour argparse"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Mois invalide: {value} (format attendu: YYYY-MM)")
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Répartir les coûts opérationnels sur les lignes de commande"
+    )
+    parser.add_argument("--month", type=parse_month, action="append", help="Mois à répartir (YYYY-MM), répétable")
+    parser.add_argument("--all", action="store_true", help="Répartir tous les mois")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            updated = CostAllocationService(db).allocate_all()
+        elif args.month:
+            updated = CostAllocationService(db).allocate_months(args.month)
+        else:
+            stats = RollupRefreshService(db).refresh(["operational_cost_allocation"])["operational_cost_allocation"]
+            print(f"✓ {stats['buckets']} mois modifié(s) depuis le dernier passage")
+            updated = stats["rows"]
+        print(f"✓ Coûts opérationnels répartis ({updated} ligne(s) modifiée(s))")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
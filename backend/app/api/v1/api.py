@@ -2,7 +2,7 @@
 API v1 router - Aggregates all v1 routes
 """
 from fastapi import APIRouter
-from app.api.v1.routes import user_routes, auth_routes, section_permission_routes, operational_cost_routes, role_routes, dashboard_routes
+from app.api.v1.routes import user_routes, auth_routes, section_permission_routes, operational_cost_routes, role_routes, dashboard_routes, order_routes, product_routes, search_routes
 
 api_router = APIRouter()
 
@@ -12,4 +12,7 @@ api_router.include_router(user_routes.router)
 api_router.include_router(role_routes.router)
 api_router.include_router(section_permission_routes.router)
 api_router.include_router(operational_cost_routes.router)
-api_router.include_router(dashboard_routes.router)
\ No newline at end of file
+api_router.include_router(dashboard_routes.router)
+api_router.include_router(order_routes.router)
+api_router.include_router(product_routes.router)
+api_router.include_router(search_routes.router)
\ No newline at end of file
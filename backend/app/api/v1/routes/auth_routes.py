@@ -8,7 +8,7 @@ from app.controllers.auth_controller import AuthController
 from app.dto.auth_dto import LoginRequest, RegisterRequest, LoginResponse
 from app.dto.user_dto import UserResponse
 from app.middlewares.auth_middleware import get_current_user_required
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
 
 router = APIRouter(
     prefix="/auth",
@@ -25,7 +25,7 @@ controller = AuthController()
     summary="User login",
     description="Authenticate a user and receive a JWT access token"
 )
-async def login(
+def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
@@ -47,7 +47,7 @@ async def login(
     summary="User registration",
     description="Register a new user and receive a JWT access token"
 )
-async def register(
+def register(
     register_data: RegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -70,8 +70,8 @@ async def register(
     summary="Get current authenticated user",
     description="Get the information of the currently authenticated user"
 )
-async def get_current_user(
-    current_user: User = Depends(get_current_user_required),
+def get_current_user(
+    current_user: AuthenticatedUser = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """
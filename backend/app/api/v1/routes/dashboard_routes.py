@@ -1,61 +1,234 @@
 """
 Dashboard routes - HTTP endpoints for dashboard KPIs and statistics
 """
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.core.database import get_db
-from app.models import Order
+from app.controllers.dashboard_controller import DashboardController
+from app.dto.dashboard_dto import (
+    OrdersCountResponse, KPIResponse, TimeSeriesResponse, CohortsResponse,
+    CustomerSegmentsResponse, RankedCustomersResponse, ProductRankingResponse, CategoryTreeResponse
+)
 from app.middlewares.auth_middleware import get_current_user_required
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
 
 router = APIRouter(
     prefix="/dashboard",
     tags=["dashboard"]
 )
 
+controller = DashboardController()
+
 
 @router.get(
     "/orders/count",
+    response_model=OrdersCountResponse,
     status_code=status.HTTP_200_OK,
     summary="Get orders count",
     description="Get the count of orders within a date range"
 )
-async def get_orders_count(
+def get_orders_count(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    marketplace_id: Optional[int] = Query(None, description="Marketplace ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_required)
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
 ):
     """
     Get the count of orders within a date range.
     If no dates are provided, returns count of all orders.
+
+    Answered from the daily sales rollup, so the figures are as fresh as
+    the last rollup refresh (see refresh_sales_rollup.py).
+    """
+    return controller.get_orders_count(start_date, end_date, marketplace_id, db)
+
+
+@router.get(
+    "/kpis",
+    response_model=KPIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get several KPIs at once",
+    description="Compute all requested dashboard KPIs for a shared date range and marketplace in a single query"
+)
+def get_kpis(
+    metrics: Optional[List[str]] = Query(None, description="Metric names (repeat the parameter), all metrics if omitted"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    marketplace_id: Optional[int] = Query(None, description="Marketplace ID"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get several KPIs in one round trip
+
+    - **metrics**: e.g. `?metrics=orders_count&metrics=revenue_ttc&metrics=average_basket_ttc`
+    - **start_date** / **end_date**: Optional inclusive date range
+    - **marketplace_id**: Optional marketplace filter
+
+    Returns a `metrics` object keyed by metric name.
+    """
+    return controller.get_kpis(metrics, start_date, end_date, marketplace_id, db)
+
+
+@router.get(
+    "/timeseries",
+    response_model=TimeSeriesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get a KPI time series",
+    description="Get metrics bucketed by day, week or month over a date range, empty buckets included"
+)
+def get_time_series(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    metric: Optional[List[str]] = Query(None, description="Metric names (repeat the parameter), all metrics if omitted"),
+    granularity: str = Query("day", description="Bucket size: day, week or month"),
+    marketplace_id: Optional[int] = Query(None, description="Marketplace ID"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get a time series for one or more metrics
+
+    - **metric**: e.g. `?metric=revenue_ttc&metric=orders_count`
+    - **granularity**: `day`, `week` (ISO weeks) or `month`
+    - **start_date** / **end_date**: Inclusive date range (required)
+
+    Returns `buckets` (first day of each bucket) and `series`, one list per
+    metric aligned on `buckets`.
+    """
+    return controller.get_time_series(metric, granularity, start_date, end_date, marketplace_id, db)
+
+
+@router.get(
+    "/cohorts",
+    response_model=CohortsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get customer cohorts",
+    description="Get the retention and repeat-purchase matrices of monthly acquisition cohorts"
+)
+def get_cohorts(
+    start_date: Optional[str] = Query(None, description="Any day of the first cohort month (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Any day of the last cohort month (YYYY-MM-DD)"),
+    months: int = Query(12, ge=1, le=36, description="Months followed after the acquisition month"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get customer cohorts by month of first (non-cancelled) order
+
+    - **start_date** / **end_date**: Cohort months, the last 12 months by default
+    - **months**: Number of values per cohort (index 0 = acquisition month)
+
+    Every cohort has `customers` (its size) and lists aligned on the months
+    since acquisition: `active_customers`, `retention_rate` (% of the cohort
+    ordering that month), `repeat_rate` (cumulative % having ordered again),
+    `orders_count` and `revenue_ttc`.
+
+    Answered from the materialized cohort tables, as fresh as the last
+    refresh (see refresh_cohorts.py).
+    """
+    return controller.get_cohorts(start_date, end_date, months, db)
+
+
+@router.get(
+    "/customer-segments",
+    response_model=CustomerSegmentsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get customer segments",
+    description="Get the size and lifetime value of every RFM segment"
+)
+def get_customer_segments(
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get the RFM segments (recency / frequency / monetary quintiles, 5 = best)
+
+    Segments: champions (R ≥ 4, F ≥ 4), loyal (R ≥ 3, F ≥ 3), recent (R ≥ 4),
+    needs_attention (R = 3), at_risk (R ≤ 2, F ≥ 3), hibernating.
+
+    Answered from the customer_scores table, as fresh as the last refresh
+    (see refresh_customer_scores.py).
+    """
+    return controller.get_customer_segments(db)
+
+
+@router.get(
+    "/customer-segments/customers",
+    response_model=RankedCustomersResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get ranked customers",
+    description="Get the customers with the highest or lowest lifetime value, optionally within a segment"
+)
+def get_ranked_customers(
+    segment: Optional[str] = Query(None, description="RFM segment (champions, loyal, recent, needs_attention, at_risk, hibernating)"),
+    order: str = Query("top", description="top (highest lifetime value first) or bottom"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of customers"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get customers ranked by lifetime value (cumulative total TTC of their non-cancelled orders)
+
+    - **segment**: Only customers of this segment
+    - **order**: top or bottom
+    - **limit**: 20 by default, 200 at most
     """
-    query = db.query(func.count(Order.id))
-    
-    if start_date:
-        try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            query = query.filter(Order.order_date >= start_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
-    
-    if end_date:
-        try:
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            # Include the entire end date
-            end_dt = end_dt.replace(hour=23, minute=59, second=59)
-            query = query.filter(Order.order_date <= end_dt)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
-    
-    count = query.scalar() or 0
-    
-    return {
-        "count": count,
-        "start_date": start_date,
-        "end_date": end_date
-    }
+    return controller.get_ranked_customers(segment, order, limit, db)
 
+
+@router.get(
+    "/products/top",
+    response_model=ProductRankingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get top products",
+    description="Get the top products or categories by revenue, units or net margin over a date range"
+)
+def get_top_products(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD), inclusive"),
+    metric: str = Query("revenue_ttc", description="revenue_ttc, revenue_ht, units or net_margin"),
+    group_by: str = Query("product", description="product or category"),
+    category_id: Optional[int] = Query(None, description="Products: category sub-tree filter. Categories: parent to drill down into"),
+    limit: int = Query(10, ge=1, le=100, description="Number of entries"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get the leaderboard of products or categories
+
+    - **metric**: revenue_ttc, revenue_ht, units or net_margin (calculated_net_margin)
+    - **group_by**: product, or category (top-level categories, whatever the depth of the tree)
+    - **category_id**: With group_by=product, keeps the products of this category
+      and every category below it. With group_by=category, ranks the direct
+      children of this category instead (products attached to the category
+      itself count for it)
+
+    Cancelled orders are excluded. Answered from the product_daily_sales
+    aggregate, as fresh as the last refresh (see refresh_product_sales.py).
+    """
+    return controller.get_top_products(start_date, end_date, metric, group_by, category_id, limit, db)
+
+
+@router.get(
+    "/categories",
+    response_model=CategoryTreeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the category tree",
+    description="Get the category tree used to drill down into the product leaderboard"
+)
+def get_category_tree(
+    category_id: Optional[int] = Query(None, description="Only the sub-tree below this category"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Get the categories as a nested tree, sorted by name
+
+    Served from an in-memory copy of the categories, reloaded every
+    CATEGORY_TREE_TTL_SECONDS: categories created by the ETL may take that
+    long to appear.
+    """
+    return controller.get_category_tree(category_id, db)
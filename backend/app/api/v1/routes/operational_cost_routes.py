@@ -4,17 +4,20 @@ OperationalCost routes - HTTP endpoints for OperationalCost operations
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Optional
 from app.core.database import get_db
 from app.controllers.operational_cost_controller import OperationalCostController
 from app.dto.operational_cost_dto import (
     OperationalCostCreate,
     OperationalCostUpdate,
     OperationalCostResponse,
-    OperationalCostListResponse
+    OperationalCostListResponse,
+    OperationalCostSummaryResponse
 )
 from app.middlewares.auth_middleware import get_current_admin_user
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
 from app.core.constants import OperationalCostCategory
+from app.core.pagination import PageRequest, get_page_request
 
 router = APIRouter(
     prefix="/costs",
@@ -49,9 +52,9 @@ async def get_categories():
     summary="Create a new operational cost",
     description="Create a new operational cost. Admin only."
 )
-async def create_cost(
+def create_cost(
     cost_data: OperationalCostCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -74,21 +77,50 @@ async def create_cost(
     summary="Get all operational costs",
     description="Get all operational costs with pagination. Admin only."
 )
-async def get_all_costs(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records"),
-    current_user: User = Depends(get_current_admin_user),
+def get_all_costs(
+    page_request: PageRequest = Depends(get_page_request),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all operational costs with pagination
     
-    - **skip**: Number of records to skip (default: 0)
     - **limit**: Maximum number of records (default: 100, max: 1000)
+    - **cursor**: next_cursor of the previous page (keyset pagination)
+    - **sort** / **descending**: id or created_at, ascending by default
+    - **total**: exact (cached COUNT), estimate or none
+    - **skip**: Offset, only used without cursor (deprecated)
     
-    Returns paginated list of costs.
+    Returns paginated list of costs with the real total and the next cursor.
     """
-    return controller.get_all_costs(skip, limit, db)
+    return controller.get_all_costs(page_request, db)
+
+
+@router.get(
+    "/summary",
+    response_model=OperationalCostSummaryResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get cost totals per month and category",
+    description="Get operational cost totals grouped by month and category, computed in SQL. Admin only."
+)
+def get_cost_summary(
+    start_date: Optional[date] = Query(None, description="Start date (inclusive)"),
+    end_date: Optional[date] = Query(None, description="End date (inclusive)"),
+    category: Optional[str] = Query(None, description="Restrict to one category"),
+    pivot: bool = Query(False, description="Also return a category x month table (months as columns)"),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get cost totals per month and category
+    
+    - **start_date** / **end_date**: Optional month range (YYYY-MM-DD)
+    - **category**: Optional category filter
+    - **pivot**: Also return one row per category with one value per month (max 36 months)
+    
+    Returns the totals only, never the individual costs.
+    """
+    return controller.get_cost_summary(start_date, end_date, category, pivot, db)
 
 
 @router.get(
@@ -98,9 +130,9 @@ async def get_all_costs(
     summary="Get a cost by ID",
     description="Get a specific operational cost by its ID. Admin only."
 )
-async def get_cost(
+def get_cost(
     cost_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -120,10 +152,10 @@ async def get_cost(
     summary="Update a cost",
     description="Update an operational cost by ID. Admin only."
 )
-async def update_cost(
+def update_cost(
     cost_id: int,
     cost_data: OperationalCostUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -143,9 +175,9 @@ async def update_cost(
     summary="Delete a cost",
     description="Delete an operational cost by ID. Admin only."
 )
-async def delete_cost(
+def delete_cost(
     cost_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -165,9 +197,9 @@ async def delete_cost(
     summary="Get costs by month",
     description="Get all operational costs for a specific month. Admin only."
 )
-async def get_costs_by_month(
+def get_costs_by_month(
     month: date,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -187,9 +219,9 @@ async def get_costs_by_month(
     summary="Get costs by category",
     description="Get all operational costs for a specific category. Admin only."
 )
-async def get_costs_by_category(
+def get_costs_by_category(
     category: str,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -0,0 +1,57 @@
+"""
+Order routes - HTTP endpoints for the orders explorer
+"""
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+from app.core.database import get_db
+from app.controllers.order_controller import OrderController
+from app.dto.order_dto import OrderListResponse
+from app.middlewares.auth_middleware import get_current_user_required
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import OrderSortKey, PageRequest, page_request_dependency
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["orders"]
+)
+
+controller = OrderController()
+
+# Plus récentes d'abord par défaut
+get_order_page_request = page_request_dependency(OrderSortKey, OrderSortKey.ORDER_DATE, default_descending=True)
+
+
+@router.get(
+    "/",
+    response_model=OrderListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Browse orders",
+    description="Get orders matching the filters with keyset pagination, newest first by default"
+)
+def get_orders(
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD, inclusive)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD, inclusive)"),
+    marketplace_id: Optional[int] = Query(None, description="Marketplace ID"),
+    order_status: Optional[str] = Query(None, alias="status", description="pending, completed, cancelled, refunded or returned"),
+    country_code: Optional[str] = Query(None, description="Country code (FR, US...)"),
+    category_id: Optional[int] = Query(None, description="Orders containing a product of this category"),
+    sku: Optional[str] = Query(None, description="Orders containing this product SKU"),
+    page_request: PageRequest = Depends(get_order_page_request),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Browse orders
+    
+    - **start_date** / **end_date**: Optional order date range
+    - **marketplace_id**, **status**, **country_code**: Optional filters on the order
+    - **category_id**, **sku**: Optional filters on the ordered products
+    - **limit** / **cursor**: Keyset pagination, pass next_cursor to get the next page
+    - **sort** / **descending**: order_date (default, newest first), total_ttc or id
+    - **total**: exact, estimate or none (use none on wide ranges to skip the COUNT)
+    """
+    return controller.get_orders(
+        page_request, start_date, end_date, marketplace_id, order_status, country_code, category_id, sku, db
+    )
@@ -0,0 +1,49 @@
+"""
+Product routes - HTTP endpoints for the products explorer
+"""
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.controllers.product_controller import ProductController
+from app.dto.product_dto import ProductListResponse
+from app.middlewares.auth_middleware import get_current_user_required
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import PageRequest, ProductSortKey, page_request_dependency
+
+router = APIRouter(
+    prefix="/products",
+    tags=["products"]
+)
+
+controller = ProductController()
+
+get_product_page_request = page_request_dependency(ProductSortKey)
+
+
+@router.get(
+    "/",
+    response_model=ProductListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Browse products",
+    description="Get products matching the filters with keyset pagination"
+)
+def get_products(
+    category_id: Optional[int] = Query(None, description="Category ID"),
+    subcategory_id: Optional[int] = Query(None, description="Subcategory ID"),
+    product_status: Optional[str] = Query(None, alias="status", description="published, draft, sold or archived"),
+    sku: Optional[str] = Query(None, min_length=1, description="SKU prefix"),
+    page_request: PageRequest = Depends(get_product_page_request),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Browse products
+    
+    - **category_id**, **subcategory_id**, **status**: Optional filters
+    - **sku**: Optional SKU prefix (e.g. "TSH-" for all t-shirts)
+    - **limit** / **cursor**: Keyset pagination, pass next_cursor to get the next page
+    - **sort** / **descending**: id (default), sku or created_at
+    - **total**: exact, estimate or none
+    """
+    return controller.get_products(page_request, category_id, subcategory_id, product_status, sku, db)
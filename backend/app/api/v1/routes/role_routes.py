@@ -7,7 +7,8 @@ from app.core.database import get_db
 from app.controllers.role_controller import RoleController
 from app.dto.role_dto import RoleCreate, RoleUpdate, RoleResponse, RoleListResponse
 from app.middlewares.auth_middleware import get_current_admin_user
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import PageRequest, get_page_request
 
 router = APIRouter(
     prefix="/roles",
@@ -24,10 +25,10 @@ controller = RoleController()
     summary="Create a new role (Admin only)",
     description="Create a new role. Requires admin authentication."
 )
-async def create_role(
+def create_role(
     role_data: RoleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Create a new role (Admin only)
@@ -46,20 +47,22 @@ async def create_role(
     summary="Get all roles (Admin only)",
     description="Get all roles with pagination. Requires admin authentication."
 )
-async def get_all_roles(
-    skip: int = 0,
-    limit: int = 100,
+def get_all_roles(
+    page_request: PageRequest = Depends(get_page_request),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Get all roles with pagination (Admin only)
     
-    - **skip**: Number of roles to skip (default: 0)
-    - **limit**: Maximum number of roles to return (default: 100)
+    - **limit**: Maximum number of roles to return (default: 100, max: 1000)
+    - **cursor**: next_cursor of the previous page (keyset pagination)
+    - **sort** / **descending**: id or created_at, ascending by default
+    - **total**: exact (cached COUNT), estimate or none
+    - **skip**: Offset, only used without cursor (deprecated)
     - Returns paginated list of roles
     """
-    return controller.get_all_roles(skip, limit, db)
+    return controller.get_all_roles(page_request, db)
 
 
 @router.get(
@@ -69,10 +72,10 @@ async def get_all_roles(
     summary="Get a role by ID (Admin only)",
     description="Get a specific role by its ID. Requires admin authentication."
 )
-async def get_role(
+def get_role(
     role_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Get a role by ID (Admin only)
@@ -90,11 +93,11 @@ async def get_role(
     summary="Update a role (Admin only)",
     description="Update a role by ID. Requires admin authentication."
 )
-async def update_role(
+def update_role(
     role_id: int,
     role_data: RoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Update a role by ID (Admin only)
@@ -112,10 +115,10 @@ async def update_role(
     summary="Delete a role (Admin only)",
     description="Delete a role by ID. Requires admin authentication. Cannot delete if role is assigned to users."
 )
-async def delete_role(
+def delete_role(
     role_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Delete a role by ID (Admin only)
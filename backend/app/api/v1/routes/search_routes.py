@@ -0,0 +1,45 @@
+"""
+Search routes - HTTP endpoint for the global search bar
+"""
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.controllers.search_controller import SearchController
+from app.dto.search_dto import SearchResponse
+from app.middlewares.auth_middleware import get_current_user_required
+from app.core.auth_cache import AuthenticatedUser
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+controller = SearchController()
+
+
+@router.get(
+    "/",
+    response_model=SearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Search products, customers and orders",
+    description="Ranked full-text search (prefix matching, fuzzy matching when pg_trgm is installed)"
+)
+def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Search input"),
+    types: Optional[List[str]] = Query(None, description="product, customer and/or order (repeat the parameter), all if omitted"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+):
+    """
+    Search products (name, SKU, description), customers (email, name) and orders (number)
+    
+    - **q**: Search input, every word is matched as a prefix ("rob ble" finds "Robe bleue")
+    - **types**: Optional entity filter
+    - **limit**: Maximum number of results (default: 20, max: 100)
+    
+    Returns the best matches first, each with its type, id, label and detail.
+    **fuzzy** is false when pg_trgm is not installed: only prefix matching is done.
+    """
+    return controller.search(q, types, limit, db)
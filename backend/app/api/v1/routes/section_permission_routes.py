@@ -1,7 +1,8 @@
 """
 SectionPermission routes - HTTP endpoints for SectionPermission operations
 """
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.controllers.section_permission_controller import SectionPermissionController
@@ -11,7 +12,8 @@ from app.dto.section_permission_dto import (
     SetPermissionRequest
 )
 from app.middlewares.auth_middleware import get_current_admin_user
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import PageRequest, get_page_request
 
 router = APIRouter(
     prefix="/permissions",
@@ -21,6 +23,30 @@ router = APIRouter(
 controller = SectionPermissionController()
 
 
+@router.get(
+    "/",
+    response_model=SectionPermissionListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get all permissions",
+    description="Get all section permissions with keyset pagination. Admin only."
+)
+def get_all_permissions(
+    role_id: Optional[int] = Query(None, description="Restrict to one role"),
+    section: Optional[str] = Query(None, description="Restrict to one section"),
+    page_request: PageRequest = Depends(get_page_request),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all permissions
+    
+    - **role_id** / **section**: Optional filters
+    - **limit**, **cursor**, **sort**, **descending**, **total**: Pagination (see GET /costs/)
+    - Returns a page of section permissions with the real total and the next cursor
+    """
+    return controller.get_all_permissions(page_request, role_id, section, db)
+
+
 @router.get(
     "/role/{role_id}",
     response_model=SectionPermissionListResponse,
@@ -28,9 +54,9 @@ controller = SectionPermissionController()
     summary="Get all permissions for a role",
     description="Get all section permissions for a specific role. Admin only."
 )
-async def get_permissions_for_role(
+def get_permissions_for_role(
     role_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -49,11 +75,11 @@ async def get_permissions_for_role(
     summary="Set permission for a role on a section",
     description="Create or update a permission for a role on a specific section. Admin only."
 )
-async def set_permission(
+def set_permission(
     role_id: int,
     section: str,
     permission_data: SetPermissionRequest,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -74,9 +100,9 @@ async def set_permission(
     summary="Get a permission by ID",
     description="Get a specific permission by its ID. Admin only."
 )
-async def get_permission(
+def get_permission(
     permission_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -95,10 +121,10 @@ async def get_permission(
     summary="Update a permission",
     description="Update a permission by ID. Admin only."
 )
-async def update_permission(
+def update_permission(
     permission_id: int,
     permission_data: SetPermissionRequest,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -117,9 +143,9 @@ async def update_permission(
     summary="Delete a permission",
     description="Delete a permission by ID. Admin only."
 )
-async def delete_permission(
+def delete_permission(
     permission_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
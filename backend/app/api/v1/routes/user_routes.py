@@ -7,7 +7,8 @@ from app.core.database import get_db
 from app.controllers.user_controller import UserController
 from app.dto.user_dto import UserCreate, UserUpdate, UserResponse, UserListResponse, DeleteResponse
 from app.middlewares.auth_middleware import get_current_admin_user, get_current_user_required
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import PageRequest, get_page_request
 
 router = APIRouter(
     prefix="/users",
@@ -24,8 +25,8 @@ controller = UserController()
     summary="Get current user profile",
     description="Get the profile of the currently authenticated user"
 )
-async def get_current_user_profile(
-    current_user: User = Depends(get_current_user_required),
+def get_current_user_profile(
+    current_user: AuthenticatedUser = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """
@@ -44,10 +45,10 @@ async def get_current_user_profile(
     summary="Create a new user (Admin only)",
     description="Create a new user. Requires admin authentication. Does not generate JWT token."
 )
-async def create_user(
+def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Create a new user (Admin only)
@@ -64,10 +65,10 @@ async def create_user(
     summary="Get a user by ID (Admin only)",
     description="Get a user by ID. Requires admin authentication."
 )
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Get a user by ID (Admin only)"""
     return controller.get_user(user_id, db)
@@ -79,14 +80,13 @@ async def get_user(
     summary="Get all users (Admin only)",
     description="Get all users with pagination. Requires admin authentication."
 )
-async def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+def get_all_users(
+    page_request: PageRequest = Depends(get_page_request),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
-    """Get all users with pagination (Admin only)"""
-    return controller.get_all_users(skip, limit, db)
+    """Get a page of users, use next_cursor to fetch the following one (Admin only)"""
+    return controller.get_all_users(page_request, db)
 
 
 @router.put(
@@ -95,11 +95,11 @@ async def get_all_users(
     summary="Update a user (Admin only)",
     description="Update a user. Requires admin authentication."
 )
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Update a user (Admin only)"""
     return controller.update_user(user_id, user_data, db)
@@ -112,10 +112,10 @@ async def update_user(
     summary="Delete a user (Admin only)",
     description="Delete a user. Requires admin authentication."
 )
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """Delete a user (Admin only)"""
     return controller.delete_user(user_id, db)
@@ -127,10 +127,10 @@ async def delete_user(
     summary="Get user roles (Admin only)",
     description="Get all roles assigned to a user. Requires admin authentication."
 )
-async def get_user_roles(
+def get_user_roles(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Get all roles assigned to a user (Admin only)
@@ -148,11 +148,11 @@ async def get_user_roles(
     summary="Assign role to user (Admin only)",
     description="Assign a role to a user. Requires admin authentication."
 )
-async def assign_role_to_user(
+def assign_role_to_user(
     user_id: int,
     role_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Assign a role to a user (Admin only)
@@ -171,11 +171,11 @@ async def assign_role_to_user(
     summary="Remove role from user (Admin only)",
     description="Remove a role from a user. Requires admin authentication."
 )
-async def remove_role_from_user(
+def remove_role_from_user(
     user_id: int,
     role_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     """
     Remove a role from a user (Admin only)
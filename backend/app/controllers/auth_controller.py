@@ -7,7 +7,7 @@ from app.services.auth_service import AuthService
 from app.dto.auth_dto import LoginRequest, RegisterRequest, LoginResponse
 from app.dto.user_dto import UserResponse
 from app.core.exceptions import BaseAppException, UnauthorizedError
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
 
 
 class AuthController:
@@ -74,7 +74,7 @@ class AuthController:
             )
     
     @staticmethod
-    def get_current_user(current_user: User) -> UserResponse:
+    def get_current_user(current_user: AuthenticatedUser) -> UserResponse:
         """
         Get the current authenticated user
         
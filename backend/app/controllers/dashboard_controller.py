@@ -0,0 +1,324 @@
+"""
+Dashboard controller - Handles HTTP requests and responses for dashboard KPIs
+"""
+from typing import List, Optional
+from datetime import date, datetime
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.services.dashboard_service import DashboardService
+from app.services.cohort_service import CohortService
+from app.services.customer_score_service import CustomerScoreService
+from app.services.product_performance_service import ProductPerformanceService
+from app.dto.dashboard_dto import (
+    OrdersCountResponse, KPIResponse, TimeSeriesResponse, CohortsResponse,
+    CustomerSegmentsResponse, RankedCustomersResponse, ProductRankingResponse, CategoryTreeResponse
+)
+from app.core.exceptions import BaseAppException
+
+
+class DashboardController:
+    """
+    Controller for dashboard endpoints
+    Handles HTTP requests, validates input, and formats responses
+    """
+
+    @staticmethod
+    def _parse_date(value: Optional[str], field: str) -> Optional[date]:
+        """
+        Parse a YYYY-MM-DD query parameter
+
+        Raises:
+            HTTPException: 400 if the date format is invalid
+        """
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid {field} format. Use YYYY-MM-DD"
+            )
+
+    @staticmethod
+    def get_orders_count(
+        start_date: Optional[str],
+        end_date: Optional[str],
+        marketplace_id: Optional[int],
+        db: Session
+    ) -> OrdersCountResponse:
+        """
+        Get the count of orders within a date range
+
+        Args:
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD, inclusive), optional
+            marketplace_id: Marketplace filter, optional
+            db: Database session
+
+        Returns:
+            OrdersCountResponse with the count and the applied filters
+        """
+        start_day = DashboardController._parse_date(start_date, "start_date")
+        end_day = DashboardController._parse_date(end_date, "end_date")
+        try:
+            service = DashboardService(db)
+            count = service.get_orders_count(start_day, end_day, marketplace_id)
+            return OrdersCountResponse(
+                count=count,
+                start_date=start_date,
+                end_date=end_date,
+                marketplace_id=marketplace_id
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_kpis(
+        metrics: Optional[List[str]],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        marketplace_id: Optional[int],
+        db: Session
+    ) -> KPIResponse:
+        """
+        Compute several KPIs sharing the same filters
+
+        Args:
+            metrics: Metric names, all metrics if empty
+            start_date: Start date (YYYY-MM-DD), optional
+            end_date: End date (YYYY-MM-DD, inclusive), optional
+            marketplace_id: Marketplace filter, optional
+            db: Database session
+
+        Returns:
+            KPIResponse with one value per metric
+        """
+        start_day = DashboardController._parse_date(start_date, "start_date")
+        end_day = DashboardController._parse_date(end_date, "end_date")
+        try:
+            service = DashboardService(db)
+            values = service.get_kpis(metrics, start_day, end_day, marketplace_id)
+            return KPIResponse(
+                metrics=values,
+                start_date=start_date,
+                end_date=end_date,
+                marketplace_id=marketplace_id
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_time_series(
+        metrics: Optional[List[str]],
+        granularity: str,
+        start_date: str,
+        end_date: str,
+        marketplace_id: Optional[int],
+        db: Session
+    ) -> TimeSeriesResponse:
+        """
+        Compute metrics bucketed by day, week or month
+
+        Args:
+            metrics: Metric names, all metrics if empty
+            granularity: "day", "week" or "month"
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD, inclusive)
+            marketplace_id: Marketplace filter, optional
+            db: Database session
+
+        Returns:
+            TimeSeriesResponse with bucket dates and one value list per metric
+        """
+        start_day = DashboardController._parse_date(start_date, "start_date")
+        end_day = DashboardController._parse_date(end_date, "end_date")
+        try:
+            service = DashboardService(db)
+            buckets, series = service.get_time_series(
+                metrics, granularity, start_day, end_day, marketplace_id
+            )
+            return TimeSeriesResponse(
+                granularity=granularity,
+                start_date=start_date,
+                end_date=end_date,
+                marketplace_id=marketplace_id,
+                buckets=buckets,
+                series=series
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_cohorts(
+        start_date: Optional[str],
+        end_date: Optional[str],
+        months: int,
+        db: Session
+    ) -> CohortsResponse:
+        """
+        Get the retention matrix of monthly acquisition cohorts
+
+        Args:
+            start_date: Day of the first cohort month (YYYY-MM-DD), optional
+            end_date: Day of the last cohort month (YYYY-MM-DD), optional
+            months: Number of months followed after acquisition
+            db: Database session
+
+        Returns:
+            CohortsResponse with one entry per cohort
+        """
+        start_day = DashboardController._parse_date(start_date, "start_date")
+        end_day = DashboardController._parse_date(end_date, "end_date")
+        try:
+            service = CohortService(db)
+            cohorts = service.get_cohorts(start_day, end_day, months)
+            return CohortsResponse(
+                start_date=start_date,
+                end_date=end_date,
+                months=months,
+                cohorts=cohorts
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_customer_segments(db: Session) -> CustomerSegmentsResponse:
+        """
+        Get the size and value of every RFM segment
+
+        Args:
+            db: Database session
+
+        Returns:
+            CustomerSegmentsResponse, most valuable segment first
+        """
+        try:
+            service = CustomerScoreService(db)
+            return CustomerSegmentsResponse(segments=service.get_segments())
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_ranked_customers(
+        segment: Optional[str],
+        order: str,
+        limit: int,
+        db: Session
+    ) -> RankedCustomersResponse:
+        """
+        Get the customers with the highest or lowest lifetime value
+
+        Args:
+            segment: Segment filter, optional
+            order: "top" or "bottom"
+            limit: Maximum number of customers
+            db: Database session
+
+        Returns:
+            RankedCustomersResponse
+        """
+        try:
+            service = CustomerScoreService(db)
+            customers = service.get_ranked_customers(segment, order, limit)
+            return RankedCustomersResponse(segment=segment, order=order, customers=customers)
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_top_products(
+        start_date: str,
+        end_date: str,
+        metric: str,
+        group_by: str,
+        category_id: Optional[int],
+        limit: int,
+        db: Session
+    ) -> ProductRankingResponse:
+        """
+        Get the top products or categories by a metric over a date range
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD, inclusive)
+            metric: Ranking metric
+            group_by: "product" or "category"
+            category_id: Category filter (products) or parent to drill down into (categories)
+            limit: Number of entries
+            db: Database session
+
+        Returns:
+            ProductRankingResponse, best entry first
+        """
+        start_day = DashboardController._parse_date(start_date, "start_date")
+        end_day = DashboardController._parse_date(end_date, "end_date")
+        try:
+            service = ProductPerformanceService(db)
+            entries = service.get_top(start_day, end_day, metric, group_by, category_id, limit)
+            return ProductRankingResponse(
+                start_date=start_date,
+                end_date=end_date,
+                metric=metric,
+                group_by=group_by,
+                category_id=category_id,
+                entries=entries
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+
+    @staticmethod
+    def get_category_tree(category_id: Optional[int], db: Session) -> CategoryTreeResponse:
+        """
+        Get the category tree, or the sub-tree below a category
+
+        Args:
+            category_id: Root of the sub-tree, optional
+            db: Database session
+
+        Returns:
+            CategoryTreeResponse
+        """
+        try:
+            return CategoryTreeResponse(**ProductPerformanceService(db).get_category_tree(category_id))
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
@@ -1,7 +1,7 @@
 """
 OperationalCost controller - Handles HTTP requests and responses for OperationalCost operations
 """
-from typing import List
+from typing import List, Optional
 from datetime import date
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
@@ -10,10 +10,12 @@ from app.dto.operational_cost_dto import (
     OperationalCostCreate,
     OperationalCostUpdate,
     OperationalCostResponse,
-    OperationalCostListResponse
+    OperationalCostListResponse,
+    OperationalCostSummaryResponse
 )
 from app.core.exceptions import BaseAppException
-from app.models import User
+from app.core.auth_cache import AuthenticatedUser
+from app.core.pagination import PageRequest
 
 
 class OperationalCostController:
@@ -25,7 +27,7 @@ class OperationalCostController:
     @staticmethod
     def create_cost(
         cost_data: OperationalCostCreate,
-        current_user: User,
+        current_user: AuthenticatedUser,
         db: Session
     ) -> OperationalCostResponse:
         """
@@ -76,31 +78,30 @@ class OperationalCostController:
             )
     
     @staticmethod
-    def get_all_costs(
-        skip: int = 0,
-        limit: int = 100,
-        db: Session = None
-    ) -> OperationalCostListResponse:
+    def get_all_costs(page_request: PageRequest, db: Session) -> OperationalCostListResponse:
         """
-        Get all costs with pagination
+        Get a page of costs
         
         Args:
-            skip: Number of records to skip
-            limit: Maximum number of records to return
+            page_request: Pagination parameters (keyset cursor, total mode...)
             db: Database session
         
         Returns:
-            OperationalCostListResponse with list of costs
+            OperationalCostListResponse with the page, the real total and the next cursor
         """
         try:
             service = OperationalCostService(db)
-            costs = service.get_all_costs(skip=skip, limit=limit)
+            page = service.get_costs_page(page_request)
             return OperationalCostListResponse(
-                items=[OperationalCostResponse.model_validate(cost) for cost in costs],
-                total=len(costs),
-                skip=skip,
-                limit=limit
+                items=[OperationalCostResponse.model_validate(cost) for cost in page.items],
+                total=page.total,
+                skip=page_request.skip,
+                limit=page_request.limit,
+                next_cursor=page.next_cursor,
+                total_is_estimate=page.total_is_estimate
             )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -214,3 +215,36 @@ class OperationalCostController:
                 detail=f"Internal server error: {str(e)}"
             )
 
+    
+    @staticmethod
+    def get_cost_summary(
+        start_date: Optional[date],
+        end_date: Optional[date],
+        category: Optional[str],
+        pivot: bool,
+        db: Session
+    ) -> OperationalCostSummaryResponse:
+        """
+        Get cost totals per month and category
+        
+        Args:
+            start_date: Start date (inclusive), unbounded if None
+            end_date: End date (inclusive), unbounded if None
+            category: Restrict to one category if provided
+            pivot: Also return a category x month table
+            db: Database session
+        
+        Returns:
+            OperationalCostSummaryResponse with the aggregated totals
+        """
+        try:
+            service = OperationalCostService(db)
+            summary = service.get_cost_summary(start_date, end_date, category, pivot)
+            return OperationalCostSummaryResponse(**summary)
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
@@ -0,0 +1,68 @@
+"""
+Order controller - Handles HTTP requests and responses for the orders explorer
+"""
+from typing import Optional
+from datetime import date
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.services.order_service import OrderService
+from app.dto.order_dto import OrderResponse, OrderListResponse
+from app.core.exceptions import BaseAppException
+from app.core.pagination import PageRequest
+
+
+class OrderController:
+    """
+    Controller for Order endpoints
+    Handles HTTP requests, validates input, and formats responses
+    """
+    
+    @staticmethod
+    def get_orders(
+        page_request: PageRequest,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        marketplace_id: Optional[int],
+        order_status: Optional[str],
+        country_code: Optional[str],
+        category_id: Optional[int],
+        sku: Optional[str],
+        db: Session
+    ) -> OrderListResponse:
+        """
+        Get a page of orders matching the filters
+        
+        Args:
+            page_request: Pagination parameters (keyset cursor, total mode...)
+            start_date: Start date (inclusive), unbounded if None
+            end_date: End date (inclusive), unbounded if None
+            marketplace_id: Marketplace filter
+            order_status: Status filter
+            country_code: Country filter
+            category_id: Product category filter
+            sku: Product SKU filter
+            db: Database session
+        
+        Returns:
+            OrderListResponse with the page, the total and the next cursor
+        """
+        try:
+            service = OrderService(db)
+            page = service.get_orders_page(
+                page_request, start_date, end_date, marketplace_id, order_status, country_code, category_id, sku
+            )
+            return OrderListResponse(
+                items=[OrderResponse.model_validate(order) for order in page.items],
+                total=page.total,
+                skip=page_request.skip,
+                limit=page_request.limit,
+                next_cursor=page.next_cursor,
+                total_is_estimate=page.total_is_estimate
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
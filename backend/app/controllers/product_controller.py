@@ -0,0 +1,59 @@
+"""
+Product controller - Handles HTTP requests and responses for the products explorer
+"""
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.services.product_service import ProductService
+from app.dto.product_dto import ProductResponse, ProductListResponse
+from app.core.exceptions import BaseAppException
+from app.core.pagination import PageRequest
+
+
+class ProductController:
+    """
+    Controller for Product endpoints
+    Handles HTTP requests, validates input, and formats responses
+    """
+    
+    @staticmethod
+    def get_products(
+        page_request: PageRequest,
+        category_id: Optional[int],
+        subcategory_id: Optional[int],
+        product_status: Optional[str],
+        sku: Optional[str],
+        db: Session
+    ) -> ProductListResponse:
+        """
+        Get a page of products matching the filters
+        
+        Args:
+            page_request: Pagination parameters (keyset cursor, total mode...)
+            category_id: Category filter
+            subcategory_id: Subcategory filter
+            product_status: Status filter
+            sku: SKU prefix filter
+            db: Database session
+        
+        Returns:
+            ProductListResponse with the page, the total and the next cursor
+        """
+        try:
+            service = ProductService(db)
+            page = service.get_products_page(page_request, category_id, subcategory_id, product_status, sku)
+            return ProductListResponse(
+                items=[ProductResponse.model_validate(product) for product in page.items],
+                total=page.total,
+                skip=page_request.skip,
+                limit=page_request.limit,
+                next_cursor=page.next_cursor,
+                total_is_estimate=page.total_is_estimate
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
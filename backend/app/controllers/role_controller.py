@@ -11,6 +11,7 @@ from app.dto.role_dto import (
     RoleListResponse
 )
 from app.models import Role
+from app.core.pagination import PageRequest
 
 
 class RoleController:
@@ -34,20 +35,18 @@ class RoleController:
         role = service.get_role_by_id(role_id)
         return RoleResponse.model_validate(role)
     
-    def get_all_roles(self, skip: int, limit: int, db: Session) -> RoleListResponse:
-        """Get all roles with pagination"""
+    def get_all_roles(self, page_request: PageRequest, db: Session) -> RoleListResponse:
+        """Get a page of roles (keyset pagination with real total)"""
         service = RoleService(db)
-        roles = service.get_all_roles(skip=skip, limit=limit)
-        
-        # Get total count
-        from app.models import Role
-        total = db.query(Role).count()
+        page = service.get_roles_page(page_request)
         
         return RoleListResponse(
-            items=[RoleResponse.model_validate(role) for role in roles],
-            total=total,
-            skip=skip,
-            limit=limit
+            items=[RoleResponse.model_validate(role) for role in page.items],
+            total=page.total,
+            skip=page_request.skip,
+            limit=page_request.limit,
+            next_cursor=page.next_cursor,
+            total_is_estimate=page.total_is_estimate
         )
     
     def update_role(self, role_id: int, role_data: RoleUpdate, db: Session) -> RoleResponse:
@@ -0,0 +1,46 @@
+"""
+Search controller - Handles HTTP requests and responses for the global search
+"""
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.services.search_service import SearchService
+from app.dto.search_dto import SearchResponse, SearchResult
+from app.core.exceptions import BaseAppException
+
+
+class SearchController:
+    """
+    Controller for Search endpoints
+    Handles HTTP requests, validates input, and formats responses
+    """
+    
+    @staticmethod
+    def search(q: str, types: Optional[List[str]], limit: int, db: Session) -> SearchResponse:
+        """
+        Search products, customers and orders
+        
+        Args:
+            q: Search input
+            types: Entities to search, all if None
+            limit: Maximum number of results
+            db: Database session
+        
+        Returns:
+            SearchResponse with the ranked results, and whether fuzzy matching was available
+        """
+        try:
+            service = SearchService(db)
+            results = service.search(q, types, limit)
+            return SearchResponse(
+                query=q,
+                fuzzy=service.fuzzy_available(),
+                results=[SearchResult(**result) for result in results]
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
@@ -1,7 +1,7 @@
 """
 SectionPermission controller - Handles HTTP requests and responses for SectionPermission operations
 """
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.services.section_permission_service import SectionPermissionService
@@ -11,6 +11,7 @@ from app.dto.section_permission_dto import (
     SetPermissionRequest
 )
 from app.core.exceptions import BaseAppException
+from app.core.pagination import PageRequest
 
 
 class SectionPermissionController:
@@ -19,6 +20,44 @@ class SectionPermissionController:
     Handles HTTP requests, validates input, and formats responses
     """
     
+    @staticmethod
+    def get_all_permissions(
+        page_request: PageRequest,
+        role_id: Optional[int],
+        section: Optional[str],
+        db: Session
+    ) -> SectionPermissionListResponse:
+        """
+        Get a page of permissions
+        
+        Args:
+            page_request: Pagination parameters (keyset cursor, total mode...)
+            role_id: Restrict to one role if provided
+            section: Restrict to one section if provided
+            db: Database session
+        
+        Returns:
+            SectionPermissionListResponse with the page, the real total and the next cursor
+        """
+        try:
+            service = SectionPermissionService(db)
+            page = service.get_permissions_page(page_request, role_id, section)
+            return SectionPermissionListResponse(
+                items=[SectionPermissionResponse.model_validate(perm) for perm in page.items],
+                total=page.total,
+                skip=page_request.skip,
+                limit=page_request.limit,
+                next_cursor=page.next_cursor,
+                total_is_estimate=page.total_is_estimate
+            )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
+            )
+    
     @staticmethod
     def get_permissions_for_role(role_id: int, db: Session) -> SectionPermissionListResponse:
         """
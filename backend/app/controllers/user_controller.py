@@ -8,6 +8,7 @@ from app.core.database import get_db
 from app.services.user_service import UserService
 from app.dto.user_dto import UserCreate, UserUpdate, UserResponse, UserListResponse
 from app.core.exceptions import BaseAppException
+from app.core.pagination import PageRequest
 
 
 class UserController:
@@ -59,20 +60,23 @@ class UserController:
     
     @staticmethod
     def get_all_users(
-        skip: int = 0,
-        limit: int = 100,
+        page_request: PageRequest,
         db: Session = Depends(get_db)
     ) -> UserListResponse:
-        """Get all users with pagination"""
+        """Get a page of users (keyset pagination with real total)"""
         try:
             service = UserService(db)
-            users = service.get_all_users(skip=skip, limit=limit)
+            page = service.get_users_page(page_request)
             return UserListResponse(
-                items=[UserResponse.model_validate(user) for user in users],
-                total=len(users),
-                skip=skip,
-                limit=limit
+                items=[UserResponse.model_validate(user) for user in page.items],
+                total=page.total,
+                skip=page_request.skip,
+                limit=page_request.limit,
+                next_cursor=page.next_cursor,
+                total_is_estimate=page.total_is_estimate
             )
+        except BaseAppException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
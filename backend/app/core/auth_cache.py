@@ -0,0 +1,109 @@
+"""
+In-process cache of authenticated principals
+
+Resolving a JWT to a user with its roles costs a joined query; the result is
+cached per (user id, token) for a short TTL and invalidated by the services
+that modify users or roles. Section permissions are not cached here but read
+from the permission matrix (see app.core.permission_matrix).
+Each uvicorn worker has its own cache: writes handled by another worker
+become visible here after at most AUTH_CACHE_TTL_SECONDS.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.core.permission_matrix import permission_matrix
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    Detached snapshot of the authenticated user
+
+    Exposes the same attributes as User for the response DTOs (id, name, email,
+    is_active, is_verified, created_at) plus the resolved roles,
+    so it can be cached and shared between requests without a database session.
+    """
+    id: int
+    name: str
+    email: str
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    role_ids: Tuple[int, ...] = ()
+    role_names: Tuple[str, ...] = ()
+    # Bits de permissions issus d'un jeton enrichi (None: calculés depuis role_ids)
+    permission_mask: Optional[int] = None
+
+    @property
+    def is_admin(self) -> bool:
+        """True if one of the user's roles is named "admin" (case insensitive)"""
+        return any(name.lower() == "admin" for name in self.role_names)
+
+    def can(self, section: str, action: str) -> bool:
+        """Check a "view" or "edit" permission on a section"""
+        if self.permission_mask is not None:
+            return permission_matrix.mask_allows(self.permission_mask, section, action)
+        return permission_matrix.allows(self.role_ids, section, action)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live
+
+    Keys are tuples whose first element is the user id, so every entry of a
+    user can be dropped at once with invalidate_user().
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every entry belonging to a user"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after a role is renamed)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+principal_cache = TTLCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+)
@@ -1,11 +1,13 @@
 """
 Base repository class with common CRUD operations
 """
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Generic, TypeVar, Type, Optional, List, Tuple
+from sqlalchemy import and_, func, or_, text, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.core.database import Base
-from app.core.exceptions import NotFoundError, ConflictError
+from app.core.exceptions import NotFoundError, ConflictError, ValidationError
+from app.core.pagination import Page, SortKey, TotalMode, count_cache, decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -16,6 +18,9 @@ class BaseRepository(Generic[ModelType]):
     All repositories should inherit from this class
     """
     
+    # Colonnes acceptées comme clé de tri par get_page (id départage toujours)
+    sort_keys: Tuple[str, ...] = (SortKey.ID.value, SortKey.CREATED_AT.value)
+    
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
@@ -28,20 +33,138 @@ class BaseRepository(Generic[ModelType]):
         """Get all records with pagination"""
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
-    def create(self, **kwargs) -> ModelType:
-        """Create a new record"""
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = SortKey.ID.value,
+        descending: bool = False,
+        total_mode: str = TotalMode.EXACT.value,
+        skip: int = 0,
+        filters: Optional[list] = None
+    ) -> Page[ModelType]:
+        """
+        Get a page of records with keyset pagination
+        
+        The page starts right after the row encoded in the cursor
+        (WHERE (sort_key, id) > cursor ORDER BY sort_key, id LIMIT n), so deep
+        pages cost the same as the first one. NULL sort keys come after every
+        value (before them when descending), like PostgreSQL's default order.
+        Without cursor, skip is applied as a plain OFFSET for backward compatibility.
+        
+        Args:
+            limit: Maximum number of records to return
+            cursor: next_cursor of the previous page
+            sort: Sort key (one of sort_keys), id breaks ties
+            descending: Sort newest / highest first
+            total_mode: How the total is computed (see TotalMode)
+            skip: Number of records to skip when no cursor is given
+            filters: Extra SQLAlchemy filter clauses
+        
+        Returns:
+            Page with the records, the next cursor (None on the last page) and the total
+        
+        Raises:
+            ValidationError: If the sort key, total mode or cursor is invalid
+        """
+        if sort not in self.sort_keys or not hasattr(self.model, sort):
+            raise ValidationError(f"Invalid sort key for {self.model.__name__}: {sort}")
+        if total_mode not in TotalMode.get_all_values():
+            raise ValidationError(
+                f"Invalid total mode. Must be one of: {', '.join(TotalMode.get_all_values())}"
+            )
+        
+        columns = [getattr(self.model, sort)] if sort != SortKey.ID.value else []
+        columns.append(self.model.id)
+        
+        query = self.db.query(self.model)
+        if filters:
+            query = query.filter(*filters)
+        if cursor:
+            values = decode_cursor(
+                cursor,
+                [column.type.python_type for column in columns],
+                [column.nullable for column in columns]
+            )
+            query = query.filter(self._after_cursor(columns, values, descending))
+        query = query.order_by(*[
+            column.desc().nulls_first() if descending else column.asc().nulls_last() for column in columns
+        ])
+        if skip and not cursor:
+            query = query.offset(skip)
+        
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        rows = query.limit(limit + 1).all()
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(tuple(getattr(items[-1], column.key) for column in columns))
+        
+        total, estimated = self._count(total_mode, filters)
+        return Page(items=items, next_cursor=next_cursor, total=total, total_is_estimate=estimated)
+    
+    @staticmethod
+    def _after_cursor(columns: list, values: tuple, descending: bool):
+        """Filter clause keeping the rows after the cursor row, NULL sorting above every value"""
+        if len(columns) == 1:
+            return columns[0] < values[0] if descending else columns[0] > values[0]
+        
+        sort_column, id_column = columns
+        sort_value, id_value = values
+        if sort_value is None:
+            # Curseur dans le bloc des NULL: départage par id, puis (ordre décroissant) toutes les valeurs
+            if descending:
+                return or_(sort_column.isnot(None), id_column < id_value)
+            return and_(sort_column.is_(None), id_column > id_value)
+        
+        # (NULL, id) > (valeur, id) vaut NULL en SQL: le bloc des NULL est ajouté à part
+        if descending:
+            return tuple_(sort_column, id_column) < tuple_(sort_value, id_value)
+        return or_(tuple_(sort_column, id_column) > tuple_(sort_value, id_value), sort_column.is_(None))
+    
+    def _count(self, total_mode: str, filters: Optional[list] = None):
+        """(total, is_estimate) for get_page"""
+        if total_mode == TotalMode.NONE.value:
+            return None, False
+        
+        table = self.model.__tablename__
+        if not filters and total_mode == TotalMode.ESTIMATE.value:
+            # -1 (PG 14+) ou 0: table jamais analysée, l'estimation n'a pas de sens
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": table}
+            ).scalar()
+            if estimate is not None and estimate > 0:
+                return int(estimate), True
+        
+        if not filters:
+            cached = count_cache.get(table)
+            if cached is not None:
+                return cached, False
+        
+        query = self.db.query(func.count(self.model.id))
+        if filters:
+            query = query.filter(*filters)
+        total = query.scalar()
+        if not filters:
+            count_cache.set(table, total)
+        return total, False
+    
+    def create(self, commit: bool = True, **kwargs) -> ModelType:
+        """Create a new record (only flushed if commit is False, the caller commits)"""
         try:
             db_obj = self.model(**kwargs)
             self.db.add(db_obj)
-            self.db.commit()
+            self._save(commit)
             self.db.refresh(db_obj)
+            count_cache.invalidate(self.model.__tablename__)
             return db_obj
         except IntegrityError as e:
             self.db.rollback()
             raise ConflictError(f"Conflict creating {self.model.__name__}: {str(e)}")
     
-    def update(self, id: int, **kwargs) -> ModelType:
-        """Update a record by ID"""
+    def update(self, id: int, commit: bool = True, **kwargs) -> ModelType:
+        """Update a record by ID (only flushed if commit is False, the caller commits)"""
         db_obj = self.get_by_id(id)
         if not db_obj:
             raise NotFoundError(self.model.__name__, str(id))
@@ -49,23 +172,31 @@ class BaseRepository(Generic[ModelType]):
         try:
             for key, value in kwargs.items():
                 setattr(db_obj, key, value)
-            self.db.commit()
+            self._save(commit)
             self.db.refresh(db_obj)
             return db_obj
         except IntegrityError as e:
             self.db.rollback()
             raise ConflictError(f"Conflict updating {self.model.__name__}: {str(e)}")
     
-    def delete(self, id: int) -> bool:
-        """Delete a record by ID"""
+    def delete(self, id: int, commit: bool = True) -> bool:
+        """Delete a record by ID (only flushed if commit is False, the caller commits)"""
         db_obj = self.get_by_id(id)
         if not db_obj:
             raise NotFoundError(self.model.__name__, str(id))
         
         self.db.delete(db_obj)
-        self.db.commit()
+        self._save(commit)
+        count_cache.invalidate(self.model.__tablename__)
         return True
     
+    def _save(self, commit: bool) -> None:
+        """Commit the pending changes, or only flush them to let the caller commit"""
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+    
     def exists(self, id: int) -> bool:
         """Check if a record exists by ID"""
         return self.db.query(self.model).filter(self.model.id == id).first() is not None
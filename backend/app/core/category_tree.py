@@ -0,0 +1,112 @@
+"""
+In-memory category tree
+
+The categories table is small and mostly written by the ETL: it is loaded
+once into id -> node and parent -> children maps, so names, paths and
+sub-trees are resolved without a query. SQL aggregations go through the
+category_closure table instead (see CategoryRepository.in_subtree).
+The API never writes categories: those created by the ETL (another
+process) are picked up after CATEGORY_TREE_TTL_SECONDS.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+# (id, name, parent_id)
+CategoryRow = Tuple[int, str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    """Detached snapshot of a category"""
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+
+def _load_from_database() -> Iterable[CategoryRow]:
+    """Read every category with a short-lived session"""
+    from app.core.database import SessionLocal
+    from app.repositories.category_repository import CategoryRepository
+
+    db = SessionLocal()
+    try:
+        return CategoryRepository(db).get_tree_rows()
+    finally:
+        db.close()
+
+
+class CategoryTree:
+    """
+    Cached category tree, reloaded once its TTL has elapsed
+    """
+
+    def __init__(self, ttl_seconds: float, loader: Callable[[], Iterable[CategoryRow]] = _load_from_database):
+        self.ttl_seconds = ttl_seconds
+        self._loader = loader
+        # (id -> noeud, parent_id -> enfants triés par nom), remplacés ensemble au rechargement
+        self._compiled: Tuple[Dict[int, CategoryNode], Dict[Optional[int], List[CategoryNode]]] = ({}, {})
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, rows: Iterable[CategoryRow]) -> None:
+        """
+        Compile the tree from category rows
+
+        Args:
+            rows: (id, name, parent_id) tuples
+        """
+        nodes = {category_id: CategoryNode(category_id, name, parent_id) for category_id, name, parent_id in rows}
+        children: Dict[Optional[int], List[CategoryNode]] = {}
+        for node in sorted(nodes.values(), key=lambda node: (node.name, node.id)):
+            children.setdefault(node.parent_id, []).append(node)
+
+        with self._lock:
+            self._compiled = (nodes, children)
+            self._loaded_at = time.monotonic()
+
+    def _get_compiled(self) -> Tuple[Dict[int, CategoryNode], Dict[Optional[int], List[CategoryNode]]]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.ttl_seconds:
+            self.load(self._loader())
+        return self._compiled
+
+    def get(self, category_id: int) -> Optional[CategoryNode]:
+        """Get a category, or None if it does not exist"""
+        return self._get_compiled()[0].get(category_id)
+
+    def children(self, category_id: Optional[int]) -> List[CategoryNode]:
+        """Get the direct children of a category (None: top-level categories), sorted by name"""
+        return list(self._get_compiled()[1].get(category_id, []))
+
+    def path(self, category_id: int) -> List[CategoryNode]:
+        """
+        Get the categories from the top-level one down to a category
+
+        Returns:
+            Nodes root first, empty if the category does not exist
+        """
+        nodes = self._get_compiled()[0]
+        path = []
+        node = nodes.get(category_id)
+        # Arrêt sur une catégorie déjà vue: un cycle éventuel dans les données ne boucle pas
+        while node is not None and node not in path:
+            path.append(node)
+            node = nodes.get(node.parent_id) if node.parent_id is not None else None
+        return path[::-1]
+
+    def to_nested(self, parent_id: Optional[int] = None) -> List[dict]:
+        """Get the sub-tree below a category (None: whole tree) as nested dicts (id, name, children)"""
+        return self._nested(parent_id, {parent_id})
+
+    def _nested(self, parent_id: Optional[int], seen: set) -> List[dict]:
+        # Une catégorie déjà sur le chemin n'est pas redescendue: un cycle éventuel ne boucle pas
+        return [
+            {"id": node.id, "name": node.name, "children": self._nested(node.id, seen | {node.id})}
+            for node in self.children(parent_id) if node.id not in seen
+        ]
+
+
+category_tree = CategoryTree(ttl_seconds=settings.CATEGORY_TREE_TTL_SECONDS)
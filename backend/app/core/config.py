@@ -68,6 +68,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    
+    # Cache des utilisateurs authentifiés (par worker), 0 pour le désactiver
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    # Rechargement de la matrice des permissions (écritures faites par un autre worker)
+    PERMISSION_MATRIX_TTL_SECONDS: int = 60
+    # Jetons enrichis (rôles + bits de permissions) pour une autorisation sans requête SQL
+    JWT_EMBED_PERMISSIONS: bool = False
+
+    # Cache des COUNT(*) des listes paginées non filtrées (par worker), 0 pour le désactiver
+    COUNT_CACHE_TTL_SECONDS: int = 30
+
+    # Rechargement de l'arbre des catégories mis en cache (catégories créées par l'ETL)
+    CATEGORY_TREE_TTL_SECONDS: int = 300
+
+    # Répartition des frais opérationnels mensuels sur les lignes: "quantity" ou "revenue" (CA HT)
+    OPERATIONAL_COST_ALLOCATION_BASIS: str = "quantity"
+
+    # Partitions mensuelles de orders / order_items créées à l'avance au-delà du mois courant
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
 
 
 settings = Settings()
@@ -30,3 +30,110 @@ class OperationalCostCategory(str, Enum):
             cls.ABONNEMENT.value: "Abonnement"
         }
 
+    @classmethod
+    def get_order_item_column(cls, category: str) -> str:
+        """Get the OrderItem cost column a category is allocated to"""
+        columns = {
+            cls.CONDITIONNEMENT.value: "packaging_cost",
+            cls.LAVAGE.value: "washing_cost",
+        }
+        return columns.get(category, "other_costs")
+
+
+class CostAllocationBasis(str, Enum):
+    """How monthly operational costs are spread across the month's order items"""
+    QUANTITY = "quantity"
+    REVENUE = "revenue"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all basis values as a list"""
+        return [basis.value for basis in cls]
+
+
+class DashboardMetric(str, Enum):
+    """Dashboard KPI metrics computable from the daily sales rollup"""
+    ORDERS_COUNT = "orders_count"
+    ITEMS_COUNT = "items_count"
+    SUBTOTAL_HT = "subtotal_ht"
+    DISCOUNT_AMOUNT = "discount_amount"
+    TAX_AMOUNT = "tax_amount"
+    REVENUE_HT = "revenue_ht"
+    REVENUE_TTC = "revenue_ttc"
+    NET_REVENUE_TTC = "net_revenue_ttc"
+    AVERAGE_BASKET_TTC = "average_basket_ttc"
+    CANCELLED_COUNT = "cancelled_count"
+    CANCELLED_AMOUNT = "cancelled_amount"
+    CANCELLATION_RATE = "cancellation_rate"
+    REFUNDED_COUNT = "refunded_count"
+    REFUNDED_AMOUNT = "refunded_amount"
+    REFUND_RATE = "refund_rate"
+    RETURNS_COUNT = "returns_count"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all metric values as a list"""
+        return [metric.value for metric in cls]
+
+
+class TimeGranularity(str, Enum):
+    """Time-series bucket sizes (PostgreSQL date_trunc fields)"""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all granularity values as a list"""
+        return [granularity.value for granularity in cls]
+
+
+class SearchEntity(str, Enum):
+    """Entities covered by the global search"""
+    PRODUCT = "product"
+    CUSTOMER = "customer"
+    ORDER = "order"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all entity values as a list"""
+        return [entity.value for entity in cls]
+
+
+class CustomerSegment(str, Enum):
+    """RFM segments, from the recency and frequency scores (1-5, 5 = best)"""
+    CHAMPIONS = "champions"  # R >= 4, F >= 4
+    LOYAL = "loyal"  # R >= 3, F >= 3
+    RECENT = "recent"  # R >= 4, F <= 2
+    NEEDS_ATTENTION = "needs_attention"  # R = 3, F <= 2
+    AT_RISK = "at_risk"  # R <= 2, F >= 3
+    HIBERNATING = "hibernating"  # R <= 2, F <= 2
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all segment values as a list"""
+        return [segment.value for segment in cls]
+
+
+class ProductRankingMetric(str, Enum):
+    """Metrics the product leaderboard can rank by (product_daily_sales columns)"""
+    REVENUE_TTC = "revenue_ttc"
+    REVENUE_HT = "revenue_ht"
+    UNITS = "units"
+    NET_MARGIN = "net_margin"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all metric values as a list"""
+        return [metric.value for metric in cls]
+
+
+class ProductRankingGroup(str, Enum):
+    """Level the product leaderboard ranks"""
+    PRODUCT = "product"
+    CATEGORY = "category"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all group values as a list"""
+        return [group.value for group in cls]
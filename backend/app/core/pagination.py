@@ -0,0 +1,194 @@
+"""
+Pagination helpers: keyset cursors and cached / estimated total counts
+"""
+import base64
+import binascii
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+from fastapi import Query
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+
+ItemType = TypeVar("ItemType")
+
+
+class TotalMode(str, Enum):
+    """How the total of a paginated list is computed"""
+    EXACT = "exact"          # COUNT(*), mis en cache COUNT_CACHE_TTL_SECONDS quand la liste n'est pas filtrée
+    ESTIMATE = "estimate"    # pg_class.reltuples (statistiques de l'ANALYZE), COUNT(*) à défaut
+    NONE = "none"            # pas de total
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all mode values as a list"""
+        return [mode.value for mode in cls]
+
+
+class SortKey(str, Enum):
+    """Keyset sort keys, id is always the tie-breaker"""
+    ID = "id"
+    CREATED_AT = "created_at"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all sort key values as a list"""
+        return [key.value for key in cls]
+
+
+class OrderSortKey(str, Enum):
+    """Sort keys of the orders explorer"""
+    ORDER_DATE = "order_date"
+    TOTAL_TTC = "total_ttc"
+    ID = "id"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all sort key values as a list"""
+        return [key.value for key in cls]
+
+
+class ProductSortKey(str, Enum):
+    """Sort keys of the products explorer"""
+    ID = "id"
+    SKU = "sku"
+    CREATED_AT = "created_at"
+
+    @classmethod
+    def get_all_values(cls) -> list[str]:
+        """Get all sort key values as a list"""
+        return [key.value for key in cls]
+
+
+@dataclass
+class Page(Generic[ItemType]):
+    """One page of a list and what is needed to fetch the next one"""
+    items: List[ItemType]
+    next_cursor: Optional[str]
+    total: Optional[int]
+    total_is_estimate: bool = False
+
+
+@dataclass
+class PageRequest:
+    """Pagination parameters of a list endpoint (see BaseRepository.get_page)"""
+    limit: int = 100
+    cursor: Optional[str] = None
+    sort: str = SortKey.ID.value
+    descending: bool = False
+    total_mode: str = TotalMode.EXACT.value
+    skip: int = 0
+
+
+def page_request_dependency(sort_keys: Type[Enum] = None, default_sort: Enum = None, default_descending: bool = False):
+    """
+    Build a FastAPI dependency reading the shared pagination query parameters
+
+    Args:
+        sort_keys: Enum of the sort keys accepted by the endpoint (SortKey by default)
+        default_sort: Default sort key (first member of sort_keys by default)
+        default_descending: Default sort direction
+    """
+    sort_keys = sort_keys or SortKey
+    default_sort = default_sort or next(iter(sort_keys))
+
+    def get_page_request(
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of records"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+        sort: sort_keys = Query(default_sort, description="Sort key, id breaks ties"),
+        descending: bool = Query(default_descending, description="Sort newest / highest first"),
+        total: TotalMode = Query(TotalMode.EXACT, description="exact (cached COUNT), estimate (table statistics) or none"),
+        skip: int = Query(0, ge=0, description="Number of records to skip (ignored when a cursor is given)")
+    ) -> PageRequest:
+        return PageRequest(
+            limit=limit,
+            cursor=cursor,
+            sort=sort.value,
+            descending=descending,
+            total_mode=total.value,
+            skip=skip
+        )
+
+    return get_page_request
+
+
+get_page_request = page_request_dependency()
+
+
+def encode_cursor(values: Tuple[Any, ...]) -> str:
+    """Encode the sort key values of the last row of a page into an opaque cursor"""
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, default=str).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type], nullable: Sequence[bool] = ()) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: The opaque cursor
+        types: Python type of each sort column (e.g. (datetime, int))
+        nullable: Whether each sort column may be NULL (none by default)
+
+    Raises:
+        ValidationError: If the cursor is malformed or was made for other sort columns
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor length")
+        decoded = []
+        for index, (value, type_) in enumerate(zip(values, types)):
+            if value is None:
+                if index >= len(nullable) or not nullable[index]:
+                    raise ValueError("NULL sort value")
+                decoded.append(None)
+            elif type_ in (date, datetime):
+                decoded.append(type_.fromisoformat(value))
+            else:
+                decoded.append(type_(value))
+        return tuple(decoded)
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error):
+        raise ValidationError("Invalid pagination cursor")
+
+
+class CountCache:
+    """
+    Exact COUNT(*) results per table, kept for a short time (per worker)
+
+    Writes made through BaseRepository invalidate their table; writes made
+    elsewhere (ETL, another worker) show up once the entry expires.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, table: str) -> Optional[int]:
+        """Get a cached count, None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, table: str, count: int) -> None:
+        """Store a count"""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[table] = (time.monotonic() + self.ttl_seconds, count)
+
+    def invalidate(self, table: str) -> None:
+        """Forget the count of a table"""
+        with self._lock:
+            self._entries.pop(table, None)
+
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL_SECONDS)
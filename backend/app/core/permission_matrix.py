@@ -0,0 +1,205 @@
+"""
+In-memory role × section permission matrix
+
+The whole section_permissions table is small: it is loaded once into one
+integer bitmask per role, with two bits per section (view at 2*i, edit at
+2*i + 1). A permission check is then a bitwise OR over the user's roles,
+with no database access.
+Writes go through invalidate(), which bumps the version and forces a reload
+on the next check. Other workers pick up changes after
+PERMISSION_MATRIX_TTL_SECONDS.
+
+The matrix also keeps a fingerprint of the shared authorization data
+(permissions, roles), identical on every worker for the same database state,
+and the users whose own authorization (profile, status, roles) changed within
+the lifetime of a token. Enriched access tokens carry both so they can be
+trusted without a query as long as nothing they depend on changed since they
+were issued.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+from app.core.config import settings
+
+# (role_id, section, can_view, can_edit)
+PermissionRow = Tuple[int, str, Optional[bool], Optional[bool]]
+# user_id -> date (ISO) du dernier changement d'autorisation de l'utilisateur
+UserVersions = Dict[int, str]
+
+# Marge ajoutée à la durée de vie des jetons (écart d'horloge entre l'application et la base):
+# un changement plus ancien ne concerne plus que des jetons expirés
+USER_VERSIONS_MARGIN_MINUTES = 5
+
+VIEW_BIT = 1
+EDIT_BIT = 2
+
+
+def _load_from_database() -> Tuple[Iterable[PermissionRow], str, UserVersions]:
+    """Read every section permission, the authorization fingerprint and the recent user changes with a short-lived session"""
+    from app.core.database import SessionLocal
+    from app.repositories.section_permission_repository import SectionPermissionRepository
+    from app.repositories.user_repository import UserRepository
+
+    db = SessionLocal()
+    try:
+        repository = SectionPermissionRepository(db)
+        user_versions = UserRepository(db).get_recent_auth_versions(
+            settings.ACCESS_TOKEN_EXPIRE_MINUTES + USER_VERSIONS_MARGIN_MINUTES
+        )
+        return (
+            repository.get_all_flags(),
+            repository.get_authorization_fingerprint(),
+            {user_id: changed_at.isoformat() for user_id, changed_at in user_versions.items()}
+        )
+    finally:
+        db.close()
+
+
+def _mask_allows(sections: Dict[str, int], mask: int, section: str, action: str) -> bool:
+    index = sections.get(section)
+    if index is None:
+        return False
+    bit = VIEW_BIT if action == "view" else EDIT_BIT
+    return bool(mask >> (2 * index) & bit)
+
+
+class PermissionMatrix:
+    """
+    Compiled permissions of every role
+
+    Attributes:
+        version: Incremented on every (re)load or invalidation
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        loader: Callable[[], Tuple[Iterable[PermissionRow], str, UserVersions]] = _load_from_database
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._loader = loader
+        # (section -> index, role_id -> bitmask), remplacés ensemble au rechargement
+        self._compiled: Tuple[Dict[str, int], Dict[int, int]] = ({}, {})
+        self._fingerprint = ""
+        self._user_versions: UserVersions = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        rows: Iterable[PermissionRow],
+        fingerprint: str = "",
+        read_version: Optional[int] = None,
+        user_versions: Optional[UserVersions] = None
+    ) -> None:
+        """
+        Compile the matrix from permission rows
+
+        Args:
+            rows: (role_id, section, can_view, can_edit) tuples
+            fingerprint: Fingerprint of the authorization data the rows come from
+            read_version: Version observed before the rows were read; if an
+                invalidation happened meanwhile the matrix stays stale
+            user_versions: Users whose authorization changed recently, with the date of the change
+        """
+        rows = list(rows)
+        # Index des sections stable (ordre alphabétique) pour les bits
+        sections = {section: index for index, section in enumerate(sorted({row[1] for row in rows}))}
+        role_masks: Dict[int, int] = {}
+        for role_id, section, can_view, can_edit in rows:
+            bits = (VIEW_BIT if can_view else 0) | (EDIT_BIT if can_edit else 0)
+            role_masks[role_id] = role_masks.get(role_id, 0) | (bits << (2 * sections[section]))
+
+        with self._lock:
+            self._compiled = (sections, role_masks)
+            self._fingerprint = fingerprint
+            self._user_versions = dict(user_versions or {})
+            if read_version is None or read_version == self.version:
+                self._loaded_at = time.monotonic()
+            self.version += 1
+
+    def invalidate(self) -> None:
+        """Mark the matrix as stale after a role, permission or user authorization write"""
+        with self._lock:
+            self._loaded_at = None
+            self.version += 1
+
+    def _get_compiled(self) -> Tuple[Dict[str, int], Dict[int, int]]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.ttl_seconds:
+            read_version = self.version
+            rows, fingerprint, user_versions = self._loader()
+            self.load(rows, fingerprint, read_version, user_versions)
+        return self._compiled
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of the authorization data currently compiled"""
+        self._get_compiled()
+        return self._fingerprint
+
+    def user_version(self, user_id: int) -> Optional[str]:
+        """
+        Get the date (ISO) of the last authorization change of a user
+
+        Returns:
+            None if the user did not change within the lifetime of a token
+        """
+        self._get_compiled()
+        return self._user_versions.get(user_id)
+
+    def sections(self) -> Dict[str, int]:
+        """Get the section -> bit index mapping"""
+        return dict(self._get_compiled()[0])
+
+    def mask_for_roles(self, role_ids: Sequence[int]) -> int:
+        """
+        Get the permission bitmask of a set of roles
+
+        Args:
+            role_ids: The user's role IDs
+
+        Returns:
+            OR of the role bitmasks
+        """
+        role_masks = self._get_compiled()[1]
+        mask = 0
+        for role_id in role_ids:
+            mask |= role_masks.get(role_id, 0)
+        return mask
+
+    def allows(self, role_ids: Sequence[int], section: str, action: str) -> bool:
+        """
+        Check if any of the roles grants an action on a section
+
+        Args:
+            role_ids: The user's role IDs
+            section: The section name
+            action: "view" or "edit"
+
+        Returns:
+            True if at least one role has the permission
+        """
+        sections, role_masks = self._get_compiled()
+        mask = 0
+        for role_id in role_ids:
+            mask |= role_masks.get(role_id, 0)
+        return _mask_allows(sections, mask, section, action)
+
+    def mask_allows(self, mask: int, section: str, action: str) -> bool:
+        """
+        Check an action on a section against a precomputed role bitmask
+
+        Args:
+            mask: Bitmask from mask_for_roles() (e.g. embedded in a token)
+            section: The section name
+            action: "view" or "edit"
+
+        Returns:
+            True if the bitmask grants the permission
+        """
+        return _mask_allows(self._get_compiled()[0], mask, section, action)
+
+
+permission_matrix = PermissionMatrix(ttl_seconds=settings.PERMISSION_MATRIX_TTL_SECONDS)
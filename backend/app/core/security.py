@@ -4,11 +4,13 @@ Security utilities for JWT token management
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, object_session
 from app.core.config import settings
 from app.models import User
 from app.repositories.user_repository import UserRepository
 from app.core.exceptions import UnauthorizedError
+from app.core.auth_cache import AuthenticatedUser, principal_cache
+from app.core.permission_matrix import permission_matrix
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -42,6 +44,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_access_token(user: User) -> str:
+    """
+    Create the access token of a user
+    
+    With JWT_EMBED_PERMISSIONS enabled the token also carries the profile, the
+    role ids and names, the permission bitmask of the roles, the
+    authorization fingerprint ("pv") it was computed from and the version of
+    the user's own authorization data ("uv"), so that requests can be
+    authorized from the token alone while nothing has changed.
+    
+    Args:
+        user: User object (with user_roles loaded or loadable)
+    
+    Returns:
+        Encoded JWT token string
+    """
+    # Note: 'sub' must be a string according to JWT spec
+    token_data = {
+        "sub": str(user.id),  # Subject (user ID) - must be string
+        "email": user.email
+    }
+    
+    if settings.JWT_EMBED_PERMISSIONS:
+        role_ids = [user_role.role_id for user_role in user.user_roles]
+        auth_version = UserRepository(object_session(user)).get_auth_version(user.id)
+        token_data.update({
+            "name": user.name,
+            "ver": bool(user.is_verified),
+            "cat": user.created_at.isoformat() if user.created_at else None,
+            "rid": role_ids,
+            "rn": [user_role.role.name for user_role in user.user_roles],
+            # Masque en hexadécimal: 2 bits par section (voir app.core.permission_matrix)
+            "perm": format(permission_matrix.mask_for_roles(role_ids), "x"),
+            "pv": permission_matrix.fingerprint,
+            "uv": auth_version.isoformat() if auth_version else None
+        })
+    
+    return create_access_token(data=token_data)
+
+
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify and decode a JWT token
@@ -63,27 +105,22 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-def get_current_user(token: str, db: Session) -> User:
-    """
-    Get the current user from a JWT token
-    
-    Args:
-        token: JWT token string
-        db: Database session
-    
-    Returns:
-        User object if token is valid and user exists
-    
-    Raises:
-        UnauthorizedError: If token is invalid, expired, or user not found
-    """
-    # Verify the token
+def _verify_token_or_raise(token: str) -> dict:
     payload = verify_token(token)
     
     if payload is None:
         raise UnauthorizedError("Invalid or expired token")
     
-    # Extract user identifier from token (typically stored as 'sub')
+    return payload
+
+
+def _get_user_id_from_payload(payload: dict) -> int:
+    """
+    Extract the user id from the 'sub' claim of a verified token
+    
+    Raises:
+        UnauthorizedError: If the token has no valid user identifier
+    """
     # 'sub' is stored as string in JWT, convert to int
     user_id_str: Optional[str] = payload.get("sub")
     
@@ -91,9 +128,26 @@ def get_current_user(token: str, db: Session) -> User:
         raise UnauthorizedError("Token payload missing user identifier")
     
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
         raise UnauthorizedError("Invalid user identifier in token")
+
+
+def get_current_user(token: str, db: Session) -> User:
+    """
+    Get the current user from a JWT token
+    
+    Args:
+        token: JWT token string
+        db: Database session
+    
+    Returns:
+        User object if token is valid and user exists
+    
+    Raises:
+        UnauthorizedError: If token is invalid, expired, or user not found
+    """
+    user_id = _get_user_id_from_payload(_verify_token_or_raise(token))
     
     # Get user from database with roles loaded
     # Utiliser joinedload pour charger les relations user_roles et role
@@ -107,3 +161,86 @@ def get_current_user(token: str, db: Session) -> User:
     
     return user
 
+
+def get_current_principal(token: str, db: Session) -> AuthenticatedUser:
+    """
+    Get the authenticated principal from a JWT token, using the principal cache
+    
+    Enriched tokens whose "pv" claim matches the current authorization
+    fingerprint, and whose user did not change since ("uv"), are trusted as is. Otherwise, on a cache hit no query is
+    issued; on a miss the user and its roles are loaded and cached for
+    (user id, token).
+    
+    Args:
+        token: JWT token string
+        db: Database session (only used on a cache miss)
+    
+    Returns:
+        AuthenticatedUser snapshot
+    
+    Raises:
+        UnauthorizedError: If token is invalid, expired, or user not found
+    """
+    payload = _verify_token_or_raise(token)
+    user_id = _get_user_id_from_payload(payload)
+    
+    principal = _get_principal_from_claims(user_id, payload)
+    if principal is not None:
+        return principal
+    
+    cache_key = (user_id, token)
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+    
+    user = get_current_user(token, db)
+    principal = AuthenticatedUser(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        is_active=bool(user.is_active),
+        is_verified=bool(user.is_verified),
+        created_at=user.created_at,
+        role_ids=tuple(user_role.role_id for user_role in user.user_roles),
+        role_names=tuple(user_role.role.name for user_role in user.user_roles)
+    )
+    principal_cache.set(cache_key, principal)
+    return principal
+
+
+def _get_principal_from_claims(user_id: int, payload: dict) -> Optional[AuthenticatedUser]:
+    """
+    Build the principal from an enriched token, if it is still up to date
+    
+    Returns:
+        AuthenticatedUser, or None if the token is not enriched, its
+        permissions version is stale or the user changed since it was issued
+        (the caller then falls back to the DB)
+    """
+    if not settings.JWT_EMBED_PERMISSIONS or "pv" not in payload:
+        return None
+    
+    if payload["pv"] != permission_matrix.fingerprint:
+        return None
+    
+    # Profil, statut ou rôles modifiés (ou compte supprimé) après l'émission du jeton
+    user_version = permission_matrix.user_version(user_id)
+    if user_version is not None and user_version != payload.get("uv"):
+        return None
+    
+    try:
+        return AuthenticatedUser(
+            id=user_id,
+            name=payload["name"],
+            email=payload["email"],
+            # Les jetons ne sont émis que pour des comptes actifs, et toute
+            # désactivation change la version de l'utilisateur
+            is_active=True,
+            is_verified=bool(payload["ver"]),
+            created_at=datetime.fromisoformat(payload["cat"]) if payload.get("cat") else None,
+            role_ids=tuple(payload["rid"]),
+            role_names=tuple(payload["rn"]),
+            permission_mask=int(payload["perm"], 16)
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
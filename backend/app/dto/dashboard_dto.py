@@ -0,0 +1,146 @@
+"""
+Dashboard DTOs for request and response
+"""
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Dict, List, Optional, Union
+
+
+class OrdersCountResponse(BaseModel):
+    """Schema for orders count response"""
+    count: int
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    marketplace_id: Optional[int] = None
+
+
+class KPIResponse(BaseModel):
+    """Schema for batch KPI response (one entry per requested metric)"""
+    metrics: Dict[str, Optional[Union[int, float]]]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    marketplace_id: Optional[int] = None
+
+
+class TimeSeriesResponse(BaseModel):
+    """
+    Schema for time-series response in columnar form
+
+    `buckets` holds the first day of each bucket and every list in `series`
+    is aligned on it, which keeps the payload much smaller than a list of objects.
+    """
+    granularity: str
+    start_date: str
+    end_date: str
+    marketplace_id: Optional[int] = None
+    buckets: List[date]
+    series: Dict[str, List[Optional[Union[int, float]]]]
+
+
+class CohortResponse(BaseModel):
+    """
+    Schema for one acquisition cohort
+
+    Every list holds one value per month since the acquisition month
+    (index 0), rates are percentages of `customers`.
+    """
+    cohort_month: date
+    customers: int
+    active_customers: List[int]
+    retention_rate: List[Optional[float]]
+    repeat_rate: List[Optional[float]]  # Part cumulée des clients ayant recommandé
+    orders_count: List[int]
+    revenue_ttc: List[float]
+
+
+class CohortsResponse(BaseModel):
+    """Schema for the cohort retention matrix"""
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    months: int
+    cohorts: List[CohortResponse]
+
+
+class CustomerSegmentResponse(BaseModel):
+    """Schema for one RFM segment"""
+    segment: str
+    customers: int
+    share: float  # % des clients notés
+    total_ltv: float
+    average_ltv: float
+    average_orders: float
+
+
+class CustomerSegmentsResponse(BaseModel):
+    """Schema for the RFM segments summary"""
+    segments: List[CustomerSegmentResponse]
+
+
+class CustomerScoreResponse(BaseModel):
+    """Schema for the RFM scores and lifetime value of a customer"""
+    customer_id: int
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    first_order_date: datetime
+    last_order_date: datetime
+    orders_count: int
+    ltv: float
+    average_order_ttc: float
+    recency_score: Optional[int] = None
+    frequency_score: Optional[int] = None
+    monetary_score: Optional[int] = None
+    segment: Optional[str] = None
+
+
+class RankedCustomersResponse(BaseModel):
+    """Schema for the customers with the highest or lowest lifetime value"""
+    segment: Optional[str] = None
+    order: str
+    customers: List[CustomerScoreResponse]
+
+
+class ProductRankingEntry(BaseModel):
+    """
+    Schema for one entry of the product leaderboard
+
+    sku, category_id, subcategory_id and orders_count are set for products,
+    parent_id and products_count for categories.
+    """
+    rank: int
+    id: int
+    name: str
+    sku: Optional[str] = None
+    category_id: Optional[int] = None
+    subcategory_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    orders_count: Optional[int] = None
+    products_count: Optional[int] = None
+    units: int
+    revenue_ht: float
+    revenue_ttc: float
+    net_margin: float
+
+
+class ProductRankingResponse(BaseModel):
+    """Schema for the product leaderboard"""
+    start_date: str
+    end_date: str
+    metric: str
+    group_by: str
+    category_id: Optional[int] = None
+    entries: List[ProductRankingEntry]
+
+
+class CategoryNodeResponse(BaseModel):
+    """Schema for a category and its sub-categories"""
+    id: int
+    name: str
+    children: List["CategoryNodeResponse"] = []
+
+
+class CategoryTreeResponse(BaseModel):
+    """Schema for the category tree (below category_id if set)"""
+    category_id: Optional[int] = None
+    path: List[str] = []  # Noms depuis la catégorie racine jusqu'à category_id
+    categories: List[CategoryNodeResponse]
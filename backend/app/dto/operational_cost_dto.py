@@ -77,7 +77,40 @@ class OperationalCostResponse(OperationalCostBase):
 class OperationalCostListResponse(BaseModel):
     """Schema for paginated operational cost list response"""
     items: List[OperationalCostResponse]
-    total: int
+    total: Optional[int] = None  # None si total=none
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
 
+
+
+class OperationalCostSummaryRow(BaseModel):
+    """Total of one category for one month"""
+    month: date
+    category: str
+    total: Decimal
+    count: int
+
+
+class OperationalCostPivotRow(BaseModel):
+    """One category with one total per pivot month"""
+    category: str
+    values: List[Decimal]
+    total: Decimal
+
+
+class OperationalCostPivot(BaseModel):
+    """Category x month table (months as columns)"""
+    months: List[date]
+    rows: List[OperationalCostPivotRow]
+    totals: List[Decimal]
+
+
+class OperationalCostSummaryResponse(BaseModel):
+    """Schema for aggregated operational costs"""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    rows: List[OperationalCostSummaryRow]
+    total: Decimal
+    pivot: Optional[OperationalCostPivot] = None
@@ -0,0 +1,42 @@
+"""
+Order DTOs for request and response
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from decimal import Decimal
+
+
+class OrderResponse(BaseModel):
+    """Schema for order response"""
+    id: int
+    platform_order_id: Optional[str] = None
+    order_number: str
+    customer_id: int
+    marketplace_id: int
+    country_code: Optional[str] = None
+    order_date: datetime
+    subtotal_ht: Decimal
+    discount_amount: Optional[Decimal] = None
+    tax_amount: Optional[Decimal] = None
+    total_ht: Decimal
+    total_ttc: Decimal
+    status: Optional[str] = None
+    has_returns: Optional[bool] = None
+    is_refunded: Optional[bool] = None
+    is_cancelled: Optional[bool] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class OrderListResponse(BaseModel):
+    """Schema for paginated order list response"""
+    items: List[OrderResponse]
+    total: Optional[int] = None  # None si total=none
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
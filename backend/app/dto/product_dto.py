@@ -0,0 +1,39 @@
+"""
+Product DTOs for request and response
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from decimal import Decimal
+
+
+class ProductResponse(BaseModel):
+    """Schema for product response"""
+    id: int
+    platform_product_id: Optional[str] = None
+    sku: str
+    name: str
+    category_id: int
+    subcategory_id: Optional[int] = None
+    purchase_price: Optional[Decimal] = None
+    selling_price_ht: Optional[Decimal] = None
+    selling_price_ttc: Optional[Decimal] = None
+    status: Optional[str] = None
+    is_online: Optional[bool] = None
+    published_at: Optional[datetime] = None
+    sold_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ProductListResponse(BaseModel):
+    """Schema for paginated product list response"""
+    items: List[ProductResponse]
+    total: Optional[int] = None  # None si total=none
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
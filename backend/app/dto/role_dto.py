@@ -33,7 +33,9 @@ class RoleResponse(RoleBase):
 class RoleListResponse(BaseModel):
     """Schema for paginated role list response"""
     items: List[RoleResponse]
-    total: int
+    total: Optional[int] = None  # None si total=none
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
 
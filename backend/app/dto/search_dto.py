@@ -0,0 +1,21 @@
+"""
+Search DTOs for request and response
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class SearchResult(BaseModel):
+    """One search hit"""
+    type: str  # product, customer, order
+    id: int
+    label: Optional[str] = None  # Nom du produit / du client, numéro de commande
+    detail: Optional[str] = None  # SKU, email, statut
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Schema for search response"""
+    query: str
+    fuzzy: bool  # Correspondances floues / infixes (pg_trgm); False: préfixes plein texte seulement
+    results: List[SearchResult]
@@ -37,9 +37,11 @@ class SectionPermissionResponse(SectionPermissionBase):
 class SectionPermissionListResponse(BaseModel):
     """Schema for paginated section permission list response"""
     items: List[SectionPermissionResponse]
-    total: int
+    total: Optional[int] = None  # None si total=none
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
 
 
 class SetPermissionRequest(BaseModel):
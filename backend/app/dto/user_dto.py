@@ -40,9 +40,11 @@ class UserResponse(UserBase):
 class UserListResponse(BaseModel):
     """Schema for paginated user list response"""
     items: List[UserResponse]
-    total: int
+    total: Optional[int] = None  # None si total=none
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # A passer en cursor pour la page suivante, None sur la dernière
+    total_is_estimate: bool = False
 
 
 class DeleteResponse(BaseModel):
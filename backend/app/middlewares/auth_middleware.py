@@ -5,8 +5,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import get_current_principal
+from app.core.auth_cache import AuthenticatedUser
 from app.core.exceptions import UnauthorizedError, ForbiddenError
 
 security = HTTPBearer()
@@ -15,15 +15,17 @@ security = HTTPBearer()
 def get_current_user_required(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Dependency to get the current authenticated user (required)
     
+    The user is resolved through the principal cache (see app.core.auth_cache),
+    so repeated requests with the same token don't query the database.
     Raises 401 if token is missing, invalid, or user is not active
     """
     try:
         token = credentials.credentials
-        user = get_current_user(token, db)
+        user = get_current_principal(token, db)
         
         # Vérifier que le compte est actif
         if not user.is_active:
@@ -52,7 +54,7 @@ def get_current_user_required(
 def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User | None:
+) -> AuthenticatedUser | None:
     """
     Dependency to get the current authenticated user (optional)
     
@@ -60,31 +62,28 @@ def get_current_user_optional(
     """
     try:
         token = credentials.credentials
-        user = get_current_user(token, db)
+        user = get_current_principal(token, db)
         return user if user.is_active else None
     except Exception:
         return None
 
 
-def is_admin(user: User) -> bool:
+def is_admin(user: AuthenticatedUser) -> bool:
     """
     Check if a user has admin role
     
     Args:
-        user: User object
+        user: Authenticated user
     
     Returns:
         True if user has admin role, False otherwise
     """
-    if not user.user_roles:
-        return False
-    
-    return any(role.role.name.lower() == "admin" for role in user.user_roles)
+    return user.is_admin
 
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user_required)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user_required)
+) -> AuthenticatedUser:
     """
     Dependency to get the current authenticated admin user
     
@@ -1,10 +1,25 @@
-from sqlalchemy import Column, Float, Integer, String, DateTime, ForeignKey, Boolean, Numeric, Date, Time, Text
+import re
+from sqlalchemy import BigInteger, Column, Float, Integer, String, DateTime, ForeignKey, ForeignKeyConstraint, Boolean, Numeric, Date, Time, Text, UniqueConstraint, Index, Sequence
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 # Création bdd Postgresql
 
+# Objets créés par les migrations mais non mappés (expressions propres à Postgres):
+# colonnes tsvector générées et leurs index GIN, index pg_trgm (voir SearchRepository)
+DATABASE_ONLY_OBJECTS = {
+    "search_vector",
+    "ix_products_search_vector", "ix_customers_search_vector", "ix_orders_search_vector",
+    "ix_products_name_trgm", "ix_products_sku_trgm", "ix_customers_email_trgm",
+    "ix_customers_full_name_trgm", "ix_orders_order_number_trgm",
+}
+
+# Tables partitionnées par mois sur order_date: une partition <table>_AAAA_MM par mois,
+# créée par la fonction SQL ensure_monthly_partitions (voir PartitionRepository)
+PARTITIONED_TABLES = ("orders", "order_items")
+MONTHLY_PARTITION_NAME = re.compile(r"^(orders|order_items)_(\d{4})_(\d{2})$")
+
 class User(Base):
     __tablename__ = "users"
 
@@ -41,6 +56,9 @@ class UserRole(Base):
 
 class SectionPermission(Base):
     __tablename__ = "section_permissions"
+    __table_args__ = (
+        UniqueConstraint("role_id", "section", name="uq_section_permissions_role_section"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
@@ -68,6 +86,13 @@ class Category(Base):
         back_populates="category"
     )
 
+class CategoryClosure(Base):
+    __tablename__ = "category_closure"  # Tous les couples (ancêtre, descendant), maintenus par triggers sur categories
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True, index=True)
+    depth = Column(Integer, nullable=False)  # 0 = la catégorie elle-même, 1 = enfant direct...
+
 class Marketplace(Base):
     __tablename__ = "marketplaces"
 
@@ -88,23 +113,29 @@ class Customer(Base):
     email = Column(String(255), unique=True, nullable=False)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
-    first_order_date = Column(DateTime, nullable=True)
-    last_order_date = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    first_order_date = Column(DateTime, nullable=True)  # Commandes non annulées, maintenu par l'ETL
+    last_order_date = Column(DateTime, nullable=True, index=True)  # Récence sans parcourir orders
+    import_hash = Column(BigInteger, nullable=True)  # Empreinte de la dernière version importée (ETL)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)  # Watermark des rollups
 
     # Relations
     orders = relationship("Order", back_populates="customer")
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Filtres de l'explorateur produits (/products)
+        Index("ix_products_category_id_status", "category_id", "status"),
+        Index("ix_products_sku_pattern", "sku", postgresql_ops={"sku": "varchar_pattern_ops"}),  # Recherche par préfixe (LIKE 'abc%')
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     platform_product_id = Column(String(100), unique=True, nullable=True)  # ID depuis la plateforme
     sku = Column(String(100), unique=True, nullable=False)
     name = Column(String(255), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    subcategory_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    subcategory_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
     purchase_price = Column(Numeric(10, 2), nullable=True)  # Prix d'achat
     selling_price_ht = Column(Numeric(10, 2), nullable=True)
     selling_price_ttc = Column(Numeric(10, 2), nullable=True)
@@ -116,8 +147,9 @@ class Product(Base):
     published_at = Column(DateTime, nullable=True)
     sold_at = Column(DateTime, nullable=True)
     import_batch_id = Column(Integer, ForeignKey("import_batches.id"), nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    import_hash = Column(BigInteger, nullable=True)  # Empreinte de la dernière version importée (ETL)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)  # Watermark des rollups
 
     # Relations
     category = relationship("Category", foreign_keys=[category_id], back_populates="products")
@@ -140,14 +172,26 @@ class ProductMarketplace(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Filtres de l'explorateur commandes (/orders), toujours bornés / triés par order_date
+        Index("ix_orders_order_date_marketplace_id", "order_date", "marketplace_id"),
+        Index("ix_orders_marketplace_id_order_date", "marketplace_id", "order_date"),
+        Index("ix_orders_status_order_date", "status", "order_date"),
+        Index("ix_orders_country_code_order_date", "country_code", "order_date"),
+        Index("ix_orders_customer_id_order_date", "customer_id", "order_date"),  # Historique / cohortes clients
+        # Table partitionnée par mois: la clé de partition fait partie de toute contrainte d'unicité
+        UniqueConstraint("order_number", "order_date", name="uq_orders_order_number_order_date"),
+        UniqueConstraint("platform_order_id", "order_date", name="uq_orders_platform_order_id_order_date"),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    platform_order_id = Column(String(100), unique=True, nullable=True)  # ID depuis la plateforme externe
-    order_number = Column(String(100), unique=True, nullable=False)
+    # Clé primaire (id, order_date): id vient explicitement de sa séquence
+    id = Column(Integer, Sequence("orders_id_seq"), primary_key=True)
+    platform_order_id = Column(String(100), nullable=True, index=True)  # ID depuis la plateforme externe
+    order_number = Column(String(100), nullable=False)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
     marketplace_id = Column(Integer, ForeignKey("marketplaces.id"), nullable=False)
     country_code = Column(String(10), nullable=True)  # FR, US, etc.
-    order_date = Column(DateTime, nullable=False)
+    order_date = Column(DateTime, primary_key=True)  # Clé de partition (mois)
     subtotal_ht = Column(Numeric(10, 2), nullable=False)
     discount_amount = Column(Numeric(10, 2), default=0.00)
     tax_amount = Column(Numeric(10, 2), default=0.00)
@@ -159,22 +203,34 @@ class Order(Base):
     is_cancelled = Column(Boolean, default=False)
     promo_code_id = Column(Integer, ForeignKey("promo_codes.id"), nullable=True)
     import_batch_id = Column(Integer, ForeignKey("import_batches.id"), nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    import_hash = Column(BigInteger, nullable=True)  # Empreinte de la dernière version importée (ETL, commande + lignes)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)  # Watermark des rollups
 
     # Relations
     customer = relationship("Customer", back_populates="orders")
     marketplace = relationship("Marketplace", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order")
     promo_code = relationship("PromoCode", foreign_keys=[promo_code_id])
-    order_promo_codes = relationship("OrderPromoCode", back_populates="order")
+    order_promo_codes = relationship(
+        "OrderPromoCode", back_populates="order",
+        primaryjoin="Order.id == foreign(OrderPromoCode.order_id)"
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # Une commande qui change de date entraîne ses lignes dans la partition du nouveau mois
+        ForeignKeyConstraint(
+            ["order_id", "order_date"], ["orders.id", "orders.order_date"],
+            name="fk_order_items_order", onupdate="CASCADE"
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=True)  # Nullable au cas où produit supprimé
+    id = Column(Integer, Sequence("order_items_id_seq"), primary_key=True)  # Clé primaire (id, order_date)
+    order_id = Column(Integer, nullable=False, index=True)
+    order_date = Column(DateTime, primary_key=True)  # Copie de Order.order_date, clé de partition (mois)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=True, index=True)  # Nullable au cas où produit supprimé
     product_name = Column(String(255), nullable=False)  # Sauvegardé au cas où produit supprimé
     quantity = Column(Integer, default=1, nullable=False)
     unit_price_ht = Column(Numeric(10, 2), nullable=False)
@@ -189,7 +245,7 @@ class OrderItem(Base):
     marketplace_commission = Column(Numeric(10, 2), default=0.00)  # Commissions marketplace
     other_costs = Column(Numeric(10, 2), default=0.00)  # Divers
     calculated_net_margin = Column(Numeric(10, 2), nullable=True)  # Marge nette recalculée après frais
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), index=True)  # Watermark des rollups
 
     # Relations
     order = relationship("Order", back_populates="order_items")
@@ -217,13 +273,16 @@ class OrderPromoCode(Base):
     __tablename__ = "order_promo_codes"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, nullable=False)  # Sans clé étrangère: la clé de orders inclut order_date
     promo_code_id = Column(Integer, ForeignKey("promo_codes.id"), nullable=False)
     discount_applied = Column(Numeric(10, 2), nullable=False)
     used_at = Column(DateTime, default=func.now())
 
     # Relations
-    order = relationship("Order", back_populates="order_promo_codes")
+    order = relationship(
+        "Order", back_populates="order_promo_codes",
+        primaryjoin="foreign(OrderPromoCode.order_id) == Order.id"
+    )
     promo_code = relationship("PromoCode", back_populates="order_promo_codes")
 
 class ImportBatch(Base):
@@ -268,6 +327,9 @@ class WebsiteAnalytics(Base):
 
 class OperationalCost(Base):
     __tablename__ = "operational_costs"
+    __table_args__ = (
+        Index("ix_operational_costs_month_category", "month", "category"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     month = Column(Date, nullable=False)  # Mois du coût (ex: 2025-11-01)
@@ -280,3 +342,118 @@ class OperationalCost(Base):
 
     # Relation avec User
     creator = relationship("User", backref="operational_costs")
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+    __table_args__ = (
+        UniqueConstraint("day", "marketplace_id", "country_code", name="uq_daily_sales_rollup_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)  # Jour de la commande (order_date tronqué)
+    marketplace_id = Column(Integer, ForeignKey("marketplaces.id"), nullable=False)
+    country_code = Column(String(10), nullable=False, default="")  # "" si pays inconnu
+    orders_count = Column(Integer, nullable=False, default=0)
+    items_count = Column(Integer, nullable=False, default=0)  # Unités vendues (somme des quantités OrderItem)
+    subtotal_ht = Column(Numeric(14, 2), nullable=False, default=0.00)
+    discount_amount = Column(Numeric(14, 2), nullable=False, default=0.00)
+    tax_amount = Column(Numeric(14, 2), nullable=False, default=0.00)
+    total_ht = Column(Numeric(14, 2), nullable=False, default=0.00)
+    total_ttc = Column(Numeric(14, 2), nullable=False, default=0.00)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    cancelled_amount = Column(Numeric(14, 2), nullable=False, default=0.00)  # total_ttc des commandes annulées
+    refunded_count = Column(Integer, nullable=False, default=0)
+    refunded_amount = Column(Numeric(14, 2), nullable=False, default=0.00)  # total_ttc des commandes remboursées
+    excluded_amount = Column(Numeric(14, 2), nullable=False, default=0.00)  # total_ttc des commandes annulées et/ou remboursées (comptées une fois)
+    returns_count = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relations
+    marketplace = relationship("Marketplace")
+
+class ProductDailySales(Base):
+    __tablename__ = "product_daily_sales"
+    __table_args__ = (
+        UniqueConstraint("day", "product_id", name="uq_product_daily_sales_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)  # Jour de la commande (order_date tronqué)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    orders_count = Column(Integer, nullable=False, default=0)  # Commandes non annulées contenant le produit
+    units = Column(Integer, nullable=False, default=0)  # Somme des quantités OrderItem
+    revenue_ht = Column(Numeric(14, 2), nullable=False, default=0.00)
+    revenue_ttc = Column(Numeric(14, 2), nullable=False, default=0.00)
+    net_margin = Column(Numeric(14, 2), nullable=False, default=0.00)  # Somme des calculated_net_margin
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relations
+    product = relationship("Product")
+
+class CustomerCohort(Base):
+    __tablename__ = "customer_cohorts"
+
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True)
+    cohort_month = Column(Date, nullable=False, index=True)  # Mois de la première commande non annulée
+    first_order_date = Column(DateTime, nullable=False)
+    second_order_date = Column(DateTime, nullable=True)  # Premier réachat, None si une seule commande
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class CustomerCohortActivity(Base):
+    __tablename__ = "customer_cohort_activity"
+    __table_args__ = (
+        UniqueConstraint("cohort_month", "activity_month", name="uq_customer_cohort_activity_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cohort_month = Column(Date, nullable=False)  # Mois d'acquisition (voir CustomerCohort)
+    activity_month = Column(Date, nullable=False)  # Mois des commandes
+    months_since = Column(Integer, nullable=False)  # Écart en mois entre les deux (0 = mois d'acquisition)
+    active_customers = Column(Integer, nullable=False, default=0)  # Clients de la cohorte ayant commandé ce mois
+    repeat_customers = Column(Integer, nullable=False, default=0)  # Clients de la cohorte dont le premier réachat tombe ce mois
+    orders_count = Column(Integer, nullable=False, default=0)
+    revenue_ttc = Column(Numeric(14, 2), nullable=False, default=0.00)
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class CustomerScore(Base):
+    __tablename__ = "customer_scores"
+    __table_args__ = (
+        Index("ix_customer_scores_segment_ltv", "segment", "ltv"),  # Meilleurs / moins bons clients d'un segment
+        Index("ix_customer_scores_ltv", "ltv"),
+    )
+
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True)
+    first_order_date = Column(DateTime, nullable=False)  # Commandes non annulées uniquement
+    last_order_date = Column(DateTime, nullable=False)
+    orders_count = Column(Integer, nullable=False, default=0)
+    ltv = Column(Numeric(14, 2), nullable=False, default=0.00)  # Cumul des total_ttc
+    average_order_ttc = Column(Numeric(10, 2), nullable=False, default=0.00)
+    recency_score = Column(Integer, nullable=True)  # Quintiles 1-5 sur l'ensemble des clients (5 = meilleur)
+    frequency_score = Column(Integer, nullable=True)
+    monetary_score = Column(Integer, nullable=True)
+    segment = Column(String(30), nullable=True)  # Voir CustomerSegment
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    source = Column(String(100), primary_key=True)  # Ex: "orders", "order_items"
+    last_seen_at = Column(DateTime, nullable=True)  # Plus grand updated_at/created_at déjà traité
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class OrderChange(Base):
+    __tablename__ = "order_changes"  # Journal rempli par triggers sur orders / order_items, purgé après traitement
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    order_id = Column(Integer, nullable=False)  # Pas de clé étrangère: la commande peut avoir été supprimée
+    order_date = Column(DateTime, nullable=False)  # Valeurs AVANT la modification
+    marketplace_id = Column(Integer, nullable=False)
+    customer_id = Column(Integer, nullable=False)
+    changed_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+class UserAuthVersion(Base):
+    __tablename__ = "user_auth_versions"  # Tenue par triggers sur users / users_roles
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)  # Pas de clé étrangère: survit à la suppression de l'utilisateur
+    changed_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)  # Dernier changement du profil, du statut ou des rôles
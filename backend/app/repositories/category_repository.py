@@ -0,0 +1,40 @@
+"""
+Category repository - Data access layer for Category model and its closure table
+"""
+from typing import List, Tuple, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Category, CategoryClosure
+from app.core.base_repository import BaseRepository
+
+
+class CategoryRepository(BaseRepository[Category]):
+    """
+    Repository for Category model operations
+    The category_closure table is maintained by triggers on categories, it is only read here.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(Category, db)
+
+    def get_tree_rows(self) -> List[Tuple[int, str, Optional[int]]]:
+        """
+        Get every category as a flat list
+
+        Returns:
+            Tuples (id, name, parent_id)
+        """
+        rows = self.db.execute(select(Category.id, Category.name, Category.parent_id)).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def in_subtree(column, category_id: int):
+        """
+        Filter clause matching the category IDs in the sub-tree of a category (itself included)
+
+        Args:
+            column: Category ID column to filter
+            category_id: Root of the sub-tree
+        """
+        c = CategoryClosure
+        return column.in_(select(c.descendant_id).where(c.ancestor_id == category_id))
@@ -0,0 +1,212 @@
+"""
+CustomerCohort repository - Data access layer for the materialized customer cohorts
+"""
+from typing import Iterable, List, Optional, Set, Tuple
+from datetime import date, datetime
+from sqlalchemy import Date, Integer, cast, delete, extract, func, insert, select
+from sqlalchemy.orm import Session
+from app.models import CustomerCohort, CustomerCohortActivity, Order
+
+# Nombre de clients / de cohortes recalculés par requête
+CUSTOMER_CHUNK_SIZE = 1000
+COHORT_CHUNK_SIZE = 24
+
+
+def _month(column):
+    """First day of the month of a timestamp column"""
+    return cast(func.date_trunc("month", column), Date)
+
+
+class CustomerCohortRepository:
+    """
+    Repository for the customer cohort tables
+
+    customer_cohorts keeps the acquisition month and first repeat purchase of
+    each customer, customer_cohort_activity one row per cohort month x
+    activity month. Cancelled orders are not purchases and are ignored.
+    Keyed by customer / month rather than an integer id, hence no BaseRepository.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rebuild_customers(self, customer_ids: Iterable[int]) -> int:
+        """
+        Recompute the cohort of some customers, then the activity of every cohort they left or joined
+
+        The caller is responsible for committing.
+
+        Args:
+            customer_ids: Customers whose orders changed
+
+        Returns:
+            Number of activity rows written
+        """
+        ids = sorted(set(customer_ids))
+        months: Set[date] = set()
+        for i in range(0, len(ids), CUSTOMER_CHUNK_SIZE):
+            chunk = ids[i:i + CUSTOMER_CHUNK_SIZE]
+            # Cohorte avant et après: un achat antidaté déplace le client vers une cohorte plus ancienne
+            months |= self._get_cohort_months(chunk)
+            self.db.execute(delete(CustomerCohort).where(CustomerCohort.customer_id.in_(chunk)))
+            self._insert_cohorts(Order.customer_id.in_(chunk))
+            months |= self._get_cohort_months(chunk)
+        return self.rebuild_cohort_months(months)
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild both cohort tables from every order
+
+        The caller is responsible for committing.
+
+        Returns:
+            Number of activity rows written
+        """
+        self.db.execute(delete(CustomerCohort))
+        self._insert_cohorts()
+        months = {month for (month,) in self.db.execute(select(CustomerCohort.cohort_month).distinct())}
+        self.db.execute(delete(CustomerCohortActivity))
+        return self.rebuild_cohort_months(months)
+
+    def rebuild_cohort_months(self, months: Iterable[date]) -> int:
+        """
+        Recompute the activity rows of some cohorts from their customers' orders
+
+        The caller is responsible for committing.
+
+        Args:
+            months: Cohort months (first days of the months)
+
+        Returns:
+            Number of activity rows written
+        """
+        ordered = sorted(set(months))
+        written = 0
+        for i in range(0, len(ordered), COHORT_CHUNK_SIZE):
+            chunk = ordered[i:i + COHORT_CHUNK_SIZE]
+            self.db.execute(delete(CustomerCohortActivity).where(CustomerCohortActivity.cohort_month.in_(chunk)))
+            written += self._insert_activity(chunk)
+        return written
+
+    def _get_cohort_months(self, customer_ids: List[int]) -> Set[date]:
+        """Cohort months currently stored for some customers"""
+        return set(self.db.execute(
+            select(CustomerCohort.cohort_month).where(CustomerCohort.customer_id.in_(customer_ids)).distinct()
+        ).scalars())
+
+    def _insert_cohorts(self, *filters) -> None:
+        """Insert the cohort rows of the customers with orders matching the filters"""
+        # Deux premières commandes non annulées de chaque client
+        ranked = (
+            select(
+                Order.customer_id.label("customer_id"),
+                Order.order_date.label("order_date"),
+                func.row_number().over(
+                    partition_by=Order.customer_id, order_by=(Order.order_date, Order.id)
+                ).label("rank")
+            )
+            .where(Order.is_cancelled.isnot(True), *filters)
+            .subquery()
+        )
+        first_order = func.min(ranked.c.order_date)
+        cohorts = (
+            select(
+                ranked.c.customer_id,
+                _month(first_order),
+                first_order,
+                func.max(ranked.c.order_date).filter(ranked.c.rank == 2),
+                func.now()
+            )
+            .where(ranked.c.rank <= 2)
+            .group_by(ranked.c.customer_id)
+        )
+        self.db.execute(
+            insert(CustomerCohort).from_select(
+                ["customer_id", "cohort_month", "first_order_date", "second_order_date", "refreshed_at"],
+                cohorts
+            )
+        )
+
+    def _insert_activity(self, months: List[date]) -> int:
+        """Aggregate the orders of the customers of some cohorts by activity month"""
+        cohort = CustomerCohort
+        activity_month = _month(Order.order_date)
+        months_since = (
+            (extract("year", Order.order_date) - extract("year", cohort.cohort_month)) * 12
+            + extract("month", Order.order_date) - extract("month", cohort.cohort_month)
+        )
+        aggregates = (
+            select(
+                cohort.cohort_month,
+                activity_month,
+                cast(months_since, Integer),
+                func.count(Order.customer_id.distinct()),
+                func.count(Order.customer_id.distinct()).filter(_month(cohort.second_order_date) == activity_month),
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.total_ttc), 0),
+                func.now()
+            )
+            .select_from(Order)
+            .join(cohort, cohort.customer_id == Order.customer_id)
+            .where(
+                cohort.cohort_month.in_(months),
+                Order.is_cancelled.isnot(True),
+                # Aucune commande d'un client avant sa cohorte: élague les partitions antérieures
+                Order.order_date >= datetime.combine(months[0], datetime.min.time())
+            )
+            .group_by(cohort.cohort_month, activity_month, months_since)
+        )
+        result = self.db.execute(
+            insert(CustomerCohortActivity).from_select(
+                [
+                    "cohort_month", "activity_month", "months_since", "active_customers",
+                    "repeat_customers", "orders_count", "revenue_ttc", "refreshed_at"
+                ],
+                aggregates
+            )
+        )
+        return result.rowcount
+
+    def get_activity(
+        self,
+        start_month: date,
+        end_month: date,
+        max_months_since: int
+    ) -> List[Tuple[date, int, int, int, int, object]]:
+        """
+        Get the activity rows of a range of cohorts
+
+        Args:
+            start_month: First cohort month (inclusive)
+            end_month: Last cohort month (inclusive)
+            max_months_since: Rows with a larger month offset are skipped
+
+        Returns:
+            List of (cohort_month, months_since, active_customers, repeat_customers,
+            orders_count, revenue_ttc), ordered by cohort then offset
+        """
+        a = CustomerCohortActivity
+        return self.db.query(
+            a.cohort_month, a.months_since, a.active_customers, a.repeat_customers, a.orders_count, a.revenue_ttc
+        ).filter(
+            a.cohort_month >= start_month,
+            a.cohort_month <= end_month,
+            a.months_since <= max_months_since
+        ).order_by(a.cohort_month, a.months_since).all()
+
+    def get_customers_for_changed_orders(self, since: Optional[datetime]) -> Tuple[Set[int], Optional[datetime]]:
+        """
+        Get the customers of orders updated since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take every order
+
+        Returns:
+            Tuple (customer ids, newest updated_at seen), the timestamp is None if nothing changed
+        """
+        query = self.db.query(Order.customer_id, func.max(Order.updated_at))
+        if since is not None:
+            query = query.filter(Order.updated_at > since)
+        rows = query.group_by(Order.customer_id).all()
+        timestamps = [ts for _, ts in rows if ts is not None]
+        return {customer_id for customer_id, _ in rows}, max(timestamps) if timestamps else None
@@ -0,0 +1,185 @@
+"""
+CustomerScore repository - Data access layer for the RFM / lifetime value scores
+"""
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.models import Customer, CustomerScore, Order
+from app.core.constants import CustomerSegment
+
+# Nombre de clients recalculés par requête
+CUSTOMER_CHUNK_SIZE = 1000
+
+# Nombre de classes des scores R, F et M
+SCORE_BUCKETS = 5
+
+
+class CustomerScoreRepository:
+    """
+    Repository for the customer_scores table
+
+    Order aggregates (last order, frequency, LTV) only depend on the customer's
+    own orders and are recomputed per customer. Scores are quintiles over every
+    scored customer and are re-ranked in one windowed UPDATE of the side table,
+    which never reads orders.
+    Keyed by customer rather than an integer id, hence no BaseRepository.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rebuild_customers(self, customer_ids: Iterable[int]) -> int:
+        """
+        Recompute the aggregates of some customers, then re-rank every score
+
+        The caller is responsible for committing.
+
+        Args:
+            customer_ids: Customers whose orders changed
+
+        Returns:
+            Number of customers whose scores or segment changed
+        """
+        ids = sorted(set(customer_ids))
+        if not ids:
+            return 0
+        for i in range(0, len(ids), CUSTOMER_CHUNK_SIZE):
+            chunk = ids[i:i + CUSTOMER_CHUNK_SIZE]
+            self.db.execute(delete(CustomerScore).where(CustomerScore.customer_id.in_(chunk)))
+            self._insert_aggregates(Order.customer_id.in_(chunk))
+        return self.rescore()
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild the whole table from every order
+
+        The caller is responsible for committing.
+
+        Returns:
+            Number of customers whose scores or segment changed
+        """
+        self.db.execute(delete(CustomerScore))
+        self._insert_aggregates()
+        return self.rescore()
+
+    def _insert_aggregates(self, *filters) -> None:
+        """Insert the order aggregates of the customers with non-cancelled orders matching the filters"""
+        ltv = func.sum(Order.total_ttc)
+        aggregates = (
+            select(
+                Order.customer_id,
+                func.min(Order.order_date),
+                func.max(Order.order_date),
+                func.count(Order.id),
+                ltv,
+                func.round(ltv / func.count(Order.id), 2),
+                func.now()
+            )
+            .where(Order.is_cancelled.isnot(True), *filters)
+            .group_by(Order.customer_id)
+        )
+        self.db.execute(
+            insert(CustomerScore).from_select(
+                [
+                    "customer_id", "first_order_date", "last_order_date", "orders_count",
+                    "ltv", "average_order_ttc", "refreshed_at"
+                ],
+                aggregates
+            )
+        )
+
+    def rescore(self) -> int:
+        """
+        Re-rank the recency, frequency and monetary scores of every customer
+
+        Only rows whose scores or segment change are written. The caller is
+        responsible for committing.
+
+        Returns:
+            Number of rows updated
+        """
+        s = CustomerScore
+        # Départage par client: des scores stables d'un passage à l'autre à données égales
+        ranked = select(
+            s.customer_id,
+            func.ntile(SCORE_BUCKETS).over(order_by=(s.last_order_date, s.customer_id)).label("recency"),
+            func.ntile(SCORE_BUCKETS).over(order_by=(s.orders_count, s.last_order_date, s.customer_id)).label("frequency"),
+            func.ntile(SCORE_BUCKETS).over(order_by=(s.ltv, s.customer_id)).label("monetary"),
+        ).subquery()
+        segment = self._segment(ranked.c.recency, ranked.c.frequency)
+        result = self.db.execute(
+            update(s)
+            .where(
+                s.customer_id == ranked.c.customer_id,
+                or_(
+                    s.recency_score.is_distinct_from(ranked.c.recency),
+                    s.frequency_score.is_distinct_from(ranked.c.frequency),
+                    s.monetary_score.is_distinct_from(ranked.c.monetary),
+                    s.segment.is_distinct_from(segment),
+                )
+            )
+            .values(
+                recency_score=ranked.c.recency,
+                frequency_score=ranked.c.frequency,
+                monetary_score=ranked.c.monetary,
+                segment=segment,
+                refreshed_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def _segment(recency, frequency):
+        """CASE expression giving the CustomerSegment of recency / frequency scores"""
+        return case(
+            (and_(recency >= 4, frequency >= 4), CustomerSegment.CHAMPIONS.value),
+            (and_(recency >= 3, frequency >= 3), CustomerSegment.LOYAL.value),
+            (recency >= 4, CustomerSegment.RECENT.value),
+            (recency == 3, CustomerSegment.NEEDS_ATTENTION.value),
+            (frequency >= 3, CustomerSegment.AT_RISK.value),
+            else_=CustomerSegment.HIBERNATING.value
+        )
+
+    def get_segment_summary(self) -> List[Tuple[str, int, object, object, object]]:
+        """
+        Get the size and value of each segment
+
+        Returns:
+            List of (segment, customers, total ltv, average ltv, average orders count),
+            most valuable segment first
+        """
+        s = CustomerScore
+        return self.db.query(
+            s.segment,
+            func.count(s.customer_id),
+            func.sum(s.ltv),
+            func.avg(s.ltv),
+            func.avg(s.orders_count)
+        ).filter(s.segment.isnot(None)).group_by(s.segment).order_by(func.sum(s.ltv).desc()).all()
+
+    def get_ranked_customers(
+        self,
+        segment: Optional[str],
+        descending: bool,
+        limit: int
+    ) -> List[Tuple[CustomerScore, str, Optional[str], Optional[str]]]:
+        """
+        Get the customers with the highest or lowest lifetime value
+
+        Args:
+            segment: Segment filter, optional
+            descending: True for the highest values first
+            limit: Maximum number of customers
+
+        Returns:
+            List of (CustomerScore, email, first name, last name)
+        """
+        s = CustomerScore
+        query = self.db.query(s, Customer.email, Customer.first_name, Customer.last_name).join(
+            Customer, Customer.id == s.customer_id
+        )
+        if segment is not None:
+            query = query.filter(s.segment == segment)
+        order = (s.ltv.desc(), s.customer_id.desc()) if descending else (s.ltv.asc(), s.customer_id.asc())
+        return query.order_by(*order).limit(limit).all()
@@ -0,0 +1,354 @@
+"""
+DailySalesRollup repository - Data access layer for the pre-aggregated daily sales table
+"""
+from typing import Dict, Optional, List, Set, Tuple, Iterable
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import and_, or_, func, cast, insert, delete, select, tuple_, literal, Date, DateTime, Interval, Numeric
+from sqlalchemy.orm import Session
+from app.models import DailySalesRollup, Order, OrderItem
+from app.core.base_repository import BaseRepository
+from app.core.constants import DashboardMetric
+
+# Nombre de buckets (jour, marketplace) recalculés par requête
+BUCKET_CHUNK_SIZE = 500
+
+
+def _ratio(numerator, denominator, scale: int = 1):
+    """SQL ratio rounded to 2 decimals, NULL when the denominator is 0"""
+    return func.round(
+        cast(numerator, Numeric) * scale / func.nullif(denominator, 0),
+        2
+    )
+
+
+def metric_expressions() -> Dict[str, object]:
+    """
+    SQL aggregate expression for each dashboard metric over the rollup
+
+    Ratios are computed from sums so they stay correct at any aggregation level
+    (whole period or time bucket).
+    """
+    r = DailySalesRollup
+    orders = func.sum(r.orders_count)
+    return {
+        DashboardMetric.ORDERS_COUNT.value: orders,
+        DashboardMetric.ITEMS_COUNT.value: func.sum(r.items_count),
+        DashboardMetric.SUBTOTAL_HT.value: func.sum(r.subtotal_ht),
+        DashboardMetric.DISCOUNT_AMOUNT.value: func.sum(r.discount_amount),
+        DashboardMetric.TAX_AMOUNT.value: func.sum(r.tax_amount),
+        DashboardMetric.REVENUE_HT.value: func.sum(r.total_ht),
+        DashboardMetric.REVENUE_TTC.value: func.sum(r.total_ttc),
+        # Une commande annulée et remboursée n'est déduite qu'une fois
+        DashboardMetric.NET_REVENUE_TTC.value: func.sum(r.total_ttc - r.excluded_amount),
+        DashboardMetric.AVERAGE_BASKET_TTC.value: _ratio(func.sum(r.total_ttc), orders),
+        DashboardMetric.CANCELLED_COUNT.value: func.sum(r.cancelled_count),
+        DashboardMetric.CANCELLED_AMOUNT.value: func.sum(r.cancelled_amount),
+        DashboardMetric.CANCELLATION_RATE.value: _ratio(func.sum(r.cancelled_count), orders, 100),
+        DashboardMetric.REFUNDED_COUNT.value: func.sum(r.refunded_count),
+        DashboardMetric.REFUNDED_AMOUNT.value: func.sum(r.refunded_amount),
+        DashboardMetric.REFUND_RATE.value: _ratio(func.sum(r.refunded_count), orders, 100),
+        DashboardMetric.RETURNS_COUNT.value: func.sum(r.returns_count),
+    }
+
+
+class DailySalesRollupRepository(BaseRepository[DailySalesRollup]):
+    """
+    Repository for DailySalesRollup model operations
+    One row per day x marketplace x country, rebuilt from orders/order_items
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(DailySalesRollup, db)
+
+    def rebuild_range(self, start_day: date, end_day: date) -> int:
+        """
+        Recompute every rollup bucket between two days from the raw orders
+
+        The buckets are deleted then re-inserted with a single INSERT ... SELECT,
+        so the rebuild is idempotent and never hydrates ORM objects.
+        The caller is responsible for committing.
+
+        Args:
+            start_day: First day to rebuild (inclusive)
+            end_day: Last day to rebuild (inclusive)
+
+        Returns:
+            Number of rollup rows written
+        """
+        self.db.execute(
+            delete(DailySalesRollup).where(
+                DailySalesRollup.day >= start_day,
+                DailySalesRollup.day <= end_day
+            )
+        )
+        return self._insert_aggregates(start_day, end_day)
+
+    def rebuild_buckets(self, buckets: Iterable[Tuple[date, int]]) -> int:
+        """
+        Recompute only the given (day, marketplace_id) buckets
+
+        Buckets are processed in chunks so the tuple IN lists stay small.
+        The caller is responsible for committing.
+
+        Args:
+            buckets: (day, marketplace_id) pairs to rebuild
+
+        Returns:
+            Number of rollup rows written
+        """
+        ordered = sorted(set(buckets))
+        written = 0
+        for i in range(0, len(ordered), BUCKET_CHUNK_SIZE):
+            chunk = ordered[i:i + BUCKET_CHUNK_SIZE]
+            self.db.execute(
+                delete(DailySalesRollup).where(
+                    tuple_(DailySalesRollup.day, DailySalesRollup.marketplace_id).in_(chunk)
+                )
+            )
+            written += self._insert_aggregates(chunk[0][0], max(day for day, _ in chunk), chunk)
+        return written
+
+    def _insert_aggregates(
+        self,
+        start_day: date,
+        end_day: date,
+        buckets: Optional[List[Tuple[date, int]]] = None
+    ) -> int:
+        """Aggregate orders between two days (optionally restricted to buckets) into the rollup"""
+        # Bornes sur order_date (et non CAST(order_date AS DATE)) pour rester indexable
+        start_dt = datetime.combine(start_day, time.min)
+        end_dt = datetime.combine(end_day + timedelta(days=1), time.min)
+        day = cast(Order.order_date, Date)
+
+        order_filter = [Order.order_date >= start_dt, Order.order_date < end_dt]
+        if buckets is not None:
+            order_filter.append(tuple_(day, Order.marketplace_id).in_(buckets))
+
+        # Bornes répétées sur OrderItem.order_date: seules les partitions de la période sont lues
+        units = (
+            select(
+                OrderItem.order_id.label("order_id"),
+                func.sum(OrderItem.quantity).label("units")
+            )
+            .join(Order, and_(Order.id == OrderItem.order_id, Order.order_date == OrderItem.order_date))
+            .where(*order_filter, OrderItem.order_date >= start_dt, OrderItem.order_date < end_dt)
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+
+        country = func.coalesce(Order.country_code, "")
+        aggregates = (
+            select(
+                day,
+                Order.marketplace_id,
+                country,
+                func.count(Order.id),
+                func.coalesce(func.sum(units.c.units), 0),
+                func.coalesce(func.sum(Order.subtotal_ht), 0),
+                func.coalesce(func.sum(Order.discount_amount), 0),
+                func.coalesce(func.sum(Order.tax_amount), 0),
+                func.coalesce(func.sum(Order.total_ht), 0),
+                func.coalesce(func.sum(Order.total_ttc), 0),
+                func.count(Order.id).filter(Order.is_cancelled.is_(True)),
+                func.coalesce(func.sum(Order.total_ttc).filter(Order.is_cancelled.is_(True)), 0),
+                func.count(Order.id).filter(Order.is_refunded.is_(True)),
+                func.coalesce(func.sum(Order.total_ttc).filter(Order.is_refunded.is_(True)), 0),
+                func.count(Order.id).filter(Order.has_returns.is_(True)),
+                func.coalesce(
+                    func.sum(Order.total_ttc).filter(or_(Order.is_cancelled.is_(True), Order.is_refunded.is_(True))), 0
+                ),
+                func.now()
+            )
+            .select_from(Order)
+            .outerjoin(units, units.c.order_id == Order.id)
+            .where(*order_filter)
+            .group_by(day, Order.marketplace_id, country)
+        )
+
+        result = self.db.execute(
+            insert(DailySalesRollup).from_select(
+                [
+                    "day", "marketplace_id", "country_code", "orders_count", "items_count",
+                    "subtotal_ht", "discount_amount", "tax_amount", "total_ht", "total_ttc",
+                    "cancelled_count", "cancelled_amount", "refunded_count", "refunded_amount",
+                    "returns_count", "excluded_amount", "refreshed_at"
+                ],
+                aggregates
+            )
+        )
+        return result.rowcount
+
+    def get_buckets_for_changed_orders(
+        self,
+        since: Optional[datetime]
+    ) -> Tuple[Set[Tuple[date, int]], Optional[datetime]]:
+        """
+        Get the (day, marketplace_id) buckets of orders updated since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take every order
+
+        Returns:
+            Tuple (buckets, newest updated_at seen), the timestamp is None if nothing changed
+        """
+        query = self.db.query(
+            cast(Order.order_date, Date),
+            Order.marketplace_id,
+            func.max(Order.updated_at)
+        )
+        if since is not None:
+            query = query.filter(Order.updated_at > since)
+        rows = query.group_by(cast(Order.order_date, Date), Order.marketplace_id).all()
+        return self._split_changes(rows)
+
+    def get_buckets_for_new_items(
+        self,
+        since: Optional[datetime]
+    ) -> Tuple[Set[Tuple[date, int]], Optional[datetime]]:
+        """
+        Get the buckets of orders that received order_items since a watermark
+
+        order_items has no updated_at, so created_at is used as the watermark column.
+
+        Args:
+            since: Watermark (exclusive), None to take every item
+
+        Returns:
+            Tuple (buckets, newest created_at seen), the timestamp is None if nothing changed
+        """
+        query = self.db.query(
+            cast(Order.order_date, Date),
+            Order.marketplace_id,
+            func.max(OrderItem.created_at)
+        ).join(Order, and_(Order.id == OrderItem.order_id, Order.order_date == OrderItem.order_date))
+        if since is not None:
+            query = query.filter(OrderItem.created_at > since)
+        rows = query.group_by(cast(Order.order_date, Date), Order.marketplace_id).all()
+        return self._split_changes(rows)
+
+    @staticmethod
+    def _split_changes(rows) -> Tuple[Set[Tuple[date, int]], Optional[datetime]]:
+        """Split (day, marketplace_id, max_ts) rows into a bucket set and the newest timestamp"""
+        buckets = {(day, marketplace_id) for day, marketplace_id, _ in rows}
+        timestamps = [ts for _, _, ts in rows if ts is not None]
+        return buckets, max(timestamps) if timestamps else None
+
+    def get_order_date_bounds(self) -> Tuple[Optional[date], Optional[date]]:
+        """
+        Get the first and last order days present in the raw orders table
+
+        Returns:
+            Tuple (first_day, last_day), both None if there are no orders
+        """
+        first, last = self.db.query(
+            func.min(Order.order_date),
+            func.max(Order.order_date)
+        ).one()
+        if first is None:
+            return None, None
+        return first.date(), last.date()
+
+    def count_orders(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        marketplace_id: Optional[int] = None
+    ) -> int:
+        """
+        Count orders from the rollup within an optional day range
+
+        Args:
+            start_day: First day (inclusive), unbounded if None
+            end_day: Last day (inclusive), unbounded if None
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Number of orders
+        """
+        query = self.db.query(func.coalesce(func.sum(DailySalesRollup.orders_count), 0))
+        query = self._apply_filters(query, start_day, end_day, marketplace_id)
+        return int(query.scalar() or 0)
+
+    def aggregate_metrics(
+        self,
+        metrics: List[str],
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        marketplace_id: Optional[int] = None
+    ) -> Dict[str, object]:
+        """
+        Compute several metrics over the rollup in a single SELECT
+
+        Args:
+            metrics: Metric names (see DashboardMetric)
+            start_day: First day (inclusive), unbounded if None
+            end_day: Last day (inclusive), unbounded if None
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Dict metric name -> value (None for ratios over an empty period)
+        """
+        expressions = metric_expressions()
+        query = self.db.query(*[expressions[name].label(name) for name in metrics])
+        query = self._apply_filters(query, start_day, end_day, marketplace_id)
+        row = query.one()
+        return dict(zip(metrics, row))
+
+    def aggregate_time_series(
+        self,
+        metrics: List[str],
+        granularity: str,
+        start_day: date,
+        end_day: date,
+        marketplace_id: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Compute metrics per time bucket, with one row for every bucket of the range
+
+        Buckets come from generate_series() LEFT JOINed to the rollup aggregates,
+        so empty periods are returned with NULL values instead of being skipped.
+
+        Args:
+            metrics: Metric names (see DashboardMetric)
+            granularity: date_trunc field ("day", "week" or "month")
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Rows (bucket_start_date, value_1, ..., value_n) ordered by bucket
+        """
+        expressions = metric_expressions()
+        # CAST explicite : date_trunc(date) passerait par timestamptz (dépendant du fuseau)
+        bucket = func.date_trunc(granularity, cast(DailySalesRollup.day, DateTime))
+
+        aggregates = select(bucket.label("bucket"), *[expressions[name].label(name) for name in metrics])
+        aggregates = self._apply_filters(aggregates, start_day, end_day, marketplace_id)
+        aggregates = aggregates.group_by(bucket).subquery()
+
+        series = select(
+            func.generate_series(
+                func.date_trunc(granularity, cast(literal(start_day), DateTime)),
+                func.date_trunc(granularity, cast(literal(end_day), DateTime)),
+                cast(literal(f"1 {granularity}"), Interval)
+            ).label("bucket")
+        ).subquery()
+
+        query = (
+            select(cast(series.c.bucket, Date), *[aggregates.c[name] for name in metrics])
+            .select_from(series)
+            .outerjoin(aggregates, aggregates.c.bucket == series.c.bucket)
+            .order_by(series.c.bucket)
+        )
+        return [tuple(row) for row in self.db.execute(query).all()]
+
+    @staticmethod
+    def _apply_filters(query, start_day: Optional[date], end_day: Optional[date], marketplace_id: Optional[int]):
+        """Apply the shared day range / marketplace filters to a rollup query or select"""
+        if start_day:
+            query = query.filter(DailySalesRollup.day >= start_day)
+        if end_day:
+            query = query.filter(DailySalesRollup.day <= end_day)
+        if marketplace_id is not None:
+            query = query.filter(DailySalesRollup.marketplace_id == marketplace_id)
+        return query
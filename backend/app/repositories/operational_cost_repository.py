@@ -1,8 +1,10 @@
 """
 OperationalCost repository - Data access layer for OperationalCost model
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import date
+from decimal import Decimal
+from sqlalchemy import Date, cast, func
 from sqlalchemy.orm import Session
 from app.models import OperationalCost
 from app.core.base_repository import BaseRepository
@@ -75,3 +77,77 @@ class OperationalCostRepository(BaseRepository[OperationalCost]):
             OperationalCost.created_by == user_id
         ).order_by(OperationalCost.month.desc()).all()
 
+
+    @staticmethod
+    def _month():
+        """First day of the cost month (costs may be entered on any day)"""
+        return cast(func.date_trunc("month", OperationalCost.month), Date)
+
+    def _apply_summary_filters(self, query, start_date: Optional[date], end_date: Optional[date], category: Optional[str]):
+        """Apply the shared range / category filters to a summary query (whole months, like the grouping)"""
+        # Bornes ramenées au mois: un coût saisi le 1er mars compte dans un résumé commençant le 15 mars
+        if start_date:
+            query = query.filter(OperationalCost.month >= start_date.replace(day=1))
+        if end_date:
+            next_month = date(end_date.year + end_date.month // 12, end_date.month % 12 + 1, 1)
+            query = query.filter(OperationalCost.month < next_month)
+        if category:
+            query = query.filter(OperationalCost.category == category)
+        return query
+
+    def get_totals_by_month_and_category(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category: Optional[str] = None
+    ) -> List[Tuple[date, str, Decimal, int]]:
+        """
+        Sum costs per month and category with a single GROUP BY
+
+        Args:
+            start_date: Start date (inclusive), unbounded if None
+            end_date: End date (inclusive), unbounded if None
+            category: Restrict to one category if provided
+
+        Returns:
+            Rows (month, category, total, count) ordered by month then category
+        """
+        month = self._month()
+        query = self.db.query(
+            month,
+            OperationalCost.category,
+            func.sum(OperationalCost.amount),
+            func.count(OperationalCost.id)
+        )
+        query = self._apply_summary_filters(query, start_date, end_date, category)
+        query = query.group_by(month, OperationalCost.category).order_by(month, OperationalCost.category)
+        return [tuple(row) for row in query.all()]
+
+    def get_category_pivot(
+        self,
+        months: List[date],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        Sum costs per category with one column per month (FILTER aggregates)
+
+        Args:
+            months: First days of the month columns, in output order
+            start_date: Start date (inclusive), unbounded if None
+            end_date: End date (inclusive), unbounded if None
+            category: Restrict to one category if provided
+
+        Returns:
+            Rows (category, month_1_total, ..., month_n_total, total) ordered by category
+        """
+        month = self._month()
+        columns = [
+            func.coalesce(func.sum(OperationalCost.amount).filter(month == m), 0)
+            for m in months
+        ]
+        query = self.db.query(OperationalCost.category, *columns, func.sum(OperationalCost.amount))
+        query = self._apply_summary_filters(query, start_date, end_date, category)
+        query = query.group_by(OperationalCost.category).order_by(OperationalCost.category)
+        return [tuple(row) for row in query.all()]
@@ -0,0 +1,87 @@
+"""
+OrderChange repository - Data access layer for the order change log
+"""
+from typing import Optional, Set, Tuple
+from datetime import date, datetime
+from sqlalchemy import Date, cast, delete, func
+from sqlalchemy.orm import Session
+from app.models import OrderChange
+
+
+class OrderChangeRepository:
+    """
+    Repository for OrderChange model operations
+    The log is written by triggers on orders / order_items with the values
+    BEFORE a change (date, marketplace or customer changed, order or items
+    deleted): the rollups rebuild those old buckets, the new ones being found
+    through the updated_at / created_at watermarks. Read-only here but for the purge.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_changed_buckets(self, since: Optional[datetime]) -> Tuple[Set[Tuple[date, int]], Optional[datetime]]:
+        """
+        Get the former (day, marketplace_id) buckets of orders changed since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take the whole log
+
+        Returns:
+            Tuple (buckets, newest changed_at seen), the timestamp is None if nothing changed
+        """
+        day = cast(OrderChange.order_date, Date)
+        rows = self._changes(since, day, OrderChange.marketplace_id)
+        return {(day, marketplace_id) for day, marketplace_id, _ in rows}, self._newest(rows)
+
+    def get_changed_months(self, since: Optional[datetime]) -> Tuple[Set[date], Optional[datetime]]:
+        """
+        Get the former months of orders changed since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take the whole log
+
+        Returns:
+            Tuple (first days of months, newest changed_at seen), the timestamp is None if nothing changed
+        """
+        month = cast(func.date_trunc("month", OrderChange.order_date), Date)
+        rows = self._changes(since, month)
+        return {month for month, _ in rows}, self._newest(rows)
+
+    def get_changed_customers(self, since: Optional[datetime]) -> Tuple[Set[int], Optional[datetime]]:
+        """
+        Get the former customers of orders changed since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take the whole log
+
+        Returns:
+            Tuple (customer IDs, newest changed_at seen), the timestamp is None if nothing changed
+        """
+        rows = self._changes(since, OrderChange.customer_id)
+        return {customer_id for customer_id, _ in rows}, self._newest(rows)
+
+    def purge(self, processed_until: datetime) -> int:
+        """
+        Delete the changes every consumer has processed (flushed, not committed)
+
+        Args:
+            processed_until: Lowest watermark of the consumers (inclusive)
+
+        Returns:
+            Number of deleted changes
+        """
+        result = self.db.execute(delete(OrderChange).where(OrderChange.changed_at <= processed_until))
+        return result.rowcount
+
+    def _changes(self, since: Optional[datetime], *keys) -> list:
+        """Distinct keys of the changes newer than a watermark, with their newest changed_at"""
+        query = self.db.query(*keys, func.max(OrderChange.changed_at))
+        if since is not None:
+            query = query.filter(OrderChange.changed_at > since)
+        return query.group_by(*keys).all()
+
+    @staticmethod
+    def _newest(rows) -> Optional[datetime]:
+        """Newest changed_at of grouped change rows (last column)"""
+        return max((row[-1] for row in rows), default=None)
@@ -0,0 +1,270 @@
+"""
+OrderItem repository - Data access layer for OrderItem model
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, and_, case, cast, func, select, tuple_, update
+from sqlalchemy.orm import Session
+from app.models import Marketplace, OperationalCost, Order, OrderItem, Product
+from app.core.base_repository import BaseRepository
+from app.core.constants import CostAllocationBasis, OperationalCostCategory
+
+# Colonnes de frais de OrderItem alimentées par les coûts opérationnels
+ITEM_COST_COLUMNS = ["packaging_cost", "washing_cost", "other_costs"]
+
+
+def margin_expressions(cost, commission_rate) -> Dict[str, object]:
+    """
+    SQL expressions of the order item margin columns
+
+    Same formulas as the ETL (etl/margins.py):
+        gross_margin = total_price_ht - cost * quantity
+        marketplace_commission = total_price_ttc * commission_rate / 100
+        net_margin = gross_margin - marketplace_commission
+        calculated_net_margin = net_margin - packaging - washing - other costs
+
+    Margins stay NULL when no cost is known. Every column reference is the
+    pre-update value, so each expression is self-contained.
+
+    Args:
+        cost: Unit cost expression (item cost_price, else product purchase_price)
+        commission_rate: Marketplace commission rate expression (%)
+    """
+    gross = func.round(OrderItem.total_price_ht - cost * OrderItem.quantity, 2)
+    commission = func.round(OrderItem.total_price_ttc * func.coalesce(commission_rate, 0) / 100, 2)
+    operational = (
+        func.coalesce(OrderItem.packaging_cost, 0)
+        + func.coalesce(OrderItem.washing_cost, 0)
+        + func.coalesce(OrderItem.other_costs, 0)
+    )
+    return {
+        "gross_margin": gross,
+        "marketplace_commission": commission,
+        "net_margin": gross - commission,
+        "calculated_net_margin": gross - commission - operational,
+    }
+
+
+def _same_order():
+    """Join condition of an item and its order, on the whole key (partition-wise joins)"""
+    return and_(Order.id == OrderItem.order_id, Order.order_date == OrderItem.order_date)
+
+
+def _date_bounds(column, start: Optional[datetime], end: Optional[datetime]) -> list:
+    """Half-open bounds on an order_date column, None meaning unbounded"""
+    bounds = []
+    if start is not None:
+        bounds.append(column >= start)
+    if end is not None:
+        bounds.append(column < end)
+    return bounds
+
+
+class OrderItemRepository(BaseRepository[OrderItem]):
+    """Repository for OrderItem model operations"""
+
+    def __init__(self, db: Session):
+        super().__init__(OrderItem, db)
+
+    def recompute_margins(
+        self,
+        order_ids: Optional[Iterable[int]] = None,
+        marketplace_id: Optional[int] = None,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> int:
+        """
+        Recompute the margin columns of order items with a single UPDATE ... FROM
+
+        Only rows whose margins actually change are rewritten.
+        The caller is responsible for committing.
+
+        Args:
+            order_ids: Restrict to these orders if provided
+            marketplace_id: Restrict to one marketplace if provided
+            start_day: First order day (inclusive), unbounded if None
+            end_day: Last order day (inclusive), unbounded if None
+
+        Returns:
+            Number of order items updated
+        """
+        # Coût et taux de chaque ligne visée, résolus une seule fois par jointure
+        source = (
+            select(
+                OrderItem.id.label("id"),
+                OrderItem.order_date.label("order_date"),
+                func.coalesce(OrderItem.cost_price, Product.purchase_price).label("cost"),
+                Marketplace.commission_rate.label("commission_rate")
+            )
+            .join(Order, _same_order())
+            .join(Marketplace, Marketplace.id == Order.marketplace_id)
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+        )
+        if order_ids is not None:
+            source = source.where(OrderItem.order_id.in_(list(order_ids)))
+        if marketplace_id is not None:
+            source = source.where(Order.marketplace_id == marketplace_id)
+        # Bornes sur order_date (et non CAST(order_date AS DATE)) pour rester indexable, répétées
+        # sur OrderItem.order_date pour ne lire / modifier que les partitions de la période
+        start = datetime.combine(start_day, time.min) if start_day else None
+        end = datetime.combine(end_day + timedelta(days=1), time.min) if end_day else None
+        item_bounds = _date_bounds(OrderItem.order_date, start, end)
+        source = source.where(*_date_bounds(Order.order_date, start, end), *item_bounds).subquery()
+
+        expressions = margin_expressions(source.c.cost, source.c.commission_rate)
+        columns = [getattr(OrderItem, name) for name in expressions]
+        statement = (
+            update(OrderItem)
+            .where(
+                OrderItem.id == source.c.id,
+                OrderItem.order_date == source.c.order_date,
+                *item_bounds,
+                tuple_(*columns).is_distinct_from(tuple_(*expressions.values()))
+            )
+            .values(**expressions)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(statement).rowcount
+
+    def allocate_operational_costs(
+        self,
+        months: Optional[Iterable[date]] = None,
+        basis: str = CostAllocationBasis.QUANTITY.value
+    ) -> int:
+        """
+        Spread each month's operational costs across that month's order items
+
+        Costs are allocated per OrderItem cost column (see
+        OperationalCostCategory.get_order_item_column) proportionally to the
+        item quantity or HT revenue; cancelled orders get nothing. Shares are
+        rounded on the running total (round(cost * cumulative weight / total)
+        minus the previous one), so the items of a month add up exactly to the
+        month's costs. calculated_net_margin is updated accordingly, and items
+        of months without costs are reset to 0.
+
+        Everything is done with a single UPDATE ... FROM (window functions per
+        month); only rows whose costs change are rewritten.
+        The caller is responsible for committing.
+
+        Args:
+            months: First days of the months to allocate, every month if None
+            basis: Allocation weight (see CostAllocationBasis)
+
+        Returns:
+            Number of order items updated
+        """
+        month = cast(func.date_trunc("month", Order.order_date), Date)
+
+        column_of = {
+            category: OperationalCostCategory.get_order_item_column(category)
+            for category in OperationalCostCategory.get_all_values()
+        }
+        cost_month = cast(func.date_trunc("month", OperationalCost.month), Date)
+        costs = (
+            select(
+                cost_month.label("month"),
+                *[
+                    func.sum(OperationalCost.amount).filter(
+                        OperationalCost.category.in_([c for c, col in column_of.items() if col == column])
+                    ).label(column)
+                    for column in ITEM_COST_COLUMNS
+                ]
+            )
+            .group_by(cost_month)
+            .subquery()
+        )
+
+        base = OrderItem.total_price_ht if basis == CostAllocationBasis.REVENUE.value else OrderItem.quantity
+        weight = case((Order.is_cancelled.is_(True), 0), else_=func.greatest(base, 0))
+        source = (
+            select(
+                OrderItem.id.label("id"),
+                OrderItem.order_date.label("order_date"),
+                weight.label("weight"),
+                func.sum(weight).over(partition_by=month, order_by=OrderItem.id).label("cumulative"),
+                func.sum(weight).over(partition_by=month).label("total"),
+                *[costs.c[column] for column in ITEM_COST_COLUMNS]
+            )
+            .join(Order, _same_order())
+            .outerjoin(costs, costs.c.month == month)
+        )
+        item_bounds = []
+        if months is not None:
+            months = sorted({m.replace(day=1) for m in months})
+            if not months:
+                return 0
+            # Bornes sur order_date pour rester indexable, répétées sur OrderItem.order_date
+            # (partitions de ces mois seulement), puis filtre exact sur le mois
+            last = months[-1]
+            next_month = date(last.year + last.month // 12, last.month % 12 + 1, 1)
+            start, end = datetime.combine(months[0], time.min), datetime.combine(next_month, time.min)
+            item_bounds = _date_bounds(OrderItem.order_date, start, end)
+            source = source.where(*_date_bounds(Order.order_date, start, end), *item_bounds, month.in_(months))
+        source = source.subquery()
+
+        total = func.nullif(source.c.total, 0)
+        shares = {
+            column: func.coalesce(
+                func.round(source.c[column] * source.c.cumulative / total, 2)
+                - func.round(source.c[column] * (source.c.cumulative - source.c.weight) / total, 2),
+                0
+            )
+            for column in ITEM_COST_COLUMNS
+        }
+        statement = (
+            update(OrderItem)
+            .where(
+                OrderItem.id == source.c.id,
+                OrderItem.order_date == source.c.order_date,
+                *item_bounds,
+                tuple_(*[getattr(OrderItem, column) for column in ITEM_COST_COLUMNS])
+                .is_distinct_from(tuple_(*shares.values()))
+            )
+            .values(
+                calculated_net_margin=OrderItem.net_margin - sum(shares.values()),
+                **shares
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(statement).rowcount
+
+    def get_months_for_changed_orders(self, since: Optional[datetime]) -> Tuple[Set[date], Optional[datetime]]:
+        """
+        Get the months of orders updated since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take every order
+
+        Returns:
+            Tuple (first days of months, newest updated_at seen), the timestamp is None if nothing changed
+        """
+        month = cast(func.date_trunc("month", Order.order_date), Date)
+        query = self.db.query(month, func.max(Order.updated_at))
+        if since is not None:
+            query = query.filter(Order.updated_at > since)
+        return self._split_months(query.group_by(month).all())
+
+    def get_months_for_changed_costs(self, since: Optional[datetime]) -> Tuple[Set[date], Optional[datetime]]:
+        """
+        Get the months of operational costs updated since a watermark
+
+        Deleted costs leave no row behind: OperationalCostService reallocates
+        their month directly.
+
+        Args:
+            since: Watermark (exclusive), None to take every cost
+
+        Returns:
+            Tuple (first days of months, newest updated_at seen), the timestamp is None if nothing changed
+        """
+        month = cast(func.date_trunc("month", OperationalCost.month), Date)
+        query = self.db.query(month, func.max(OperationalCost.updated_at))
+        if since is not None:
+            query = query.filter(OperationalCost.updated_at > since)
+        return self._split_months(query.group_by(month).all())
+
+    @staticmethod
+    def _split_months(rows) -> Tuple[Set[date], Optional[datetime]]:
+        """Split (month, max_ts) rows into a month set and the newest timestamp"""
+        timestamps = [ts for _, ts in rows if ts is not None]
+        return {month for month, _ in rows}, max(timestamps) if timestamps else None
@@ -0,0 +1,58 @@
+"""
+Order repository - Data access layer for Order model
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Order, OrderItem, Product
+from app.core.base_repository import BaseRepository
+from app.core.pagination import OrderSortKey
+
+
+class OrderRepository(BaseRepository[Order]):
+    """
+    Repository for Order model operations
+    Extends BaseRepository with Order-specific methods
+    """
+    
+    sort_keys = tuple(OrderSortKey.get_all_values())
+    
+    def __init__(self, db: Session):
+        super().__init__(Order, db)
+    
+    def contains_products_filter(
+        self,
+        category_id: Optional[int] = None,
+        sku: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        """
+        Filter clause keeping the orders with at least one matching item
+        
+        Args:
+            category_id: Product category of the item
+            sku: Exact product SKU of the item
+            start: Lower bound of the orders' order_date, repeated on the items
+            end: Upper bound (exclusive) of the orders' order_date, repeated on the items
+        
+        Returns:
+            EXISTS clause to pass to get_page
+        """
+        # EXISTS plutôt qu'une jointure: pas de doublons ni de DISTINCT sur la page.
+        # Corrélé sur toute la clé: seule la partition du mois de la commande est lue
+        items = select(OrderItem.id).join(Product, Product.id == OrderItem.product_id).where(
+            OrderItem.order_id == Order.id,
+            OrderItem.order_date == Order.order_date
+        )
+        if category_id is not None:
+            items = items.where(Product.category_id == category_id)
+        if sku is not None:
+            items = items.where(Product.sku == sku)
+        # Bornes de la période répétées sur les lignes: partitions de order_items élaguées au plan
+        if start is not None:
+            items = items.where(OrderItem.order_date >= start)
+        if end is not None:
+            items = items.where(OrderItem.order_date < end)
+        return items.exists()
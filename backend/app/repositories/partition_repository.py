@@ -0,0 +1,83 @@
+"""
+Partition repository - Monthly partitions of the orders / order_items tables
+"""
+import re
+from typing import List, Tuple
+from datetime import date, datetime
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Bornes d'une partition telles que rendues par pg_get_expr(relpartbound)
+_RANGE_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class PartitionRepository:
+    """
+    Repository for the range partitions of the tables partitioned by order_date
+
+    Partitions are named <table>_YYYY_MM and created by the
+    ensure_monthly_partitions SQL function (migration partition_orders_by_month),
+    which the ETL also calls for the months it loads.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ensure_monthly_partitions(self, table: str, first_month: date, last_month: date) -> int:
+        """
+        Create the missing monthly partitions of a table
+
+        Args:
+            table: Partitioned table name
+            first_month: Any day of the first month
+            last_month: Any day of the last month (inclusive)
+
+        Returns:
+            Number of partitions created
+        """
+        return self.db.execute(
+            text("SELECT ensure_monthly_partitions(CAST(:table AS regclass), :first_month, :last_month)"),
+            {"table": table, "first_month": first_month, "last_month": last_month}
+        ).scalar()
+
+    def get_partitions(self, table: str) -> List[Tuple[str, datetime, datetime, int]]:
+        """
+        Get the partitions attached to a table
+
+        Args:
+            table: Partitioned table name
+
+        Returns:
+            List of (partition name, lower bound, upper bound exclusive, estimated rows), oldest first
+        """
+        rows = self.db.execute(text("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), greatest(c.reltuples, 0)::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+        """), {"table": table}).all()
+
+        partitions = []
+        for name, bounds, estimated_rows in rows:
+            match = _RANGE_BOUNDS.search(bounds or "")
+            if match is None:
+                continue  # Partition par défaut: pas de bornes
+            lower, upper = (datetime.fromisoformat(value) for value in match.groups())
+            partitions.append((name, lower, upper, estimated_rows))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    def detach_partition(self, table: str, partition: str) -> None:
+        """
+        Detach a partition, which becomes a standalone table with its data
+
+        The caller is responsible for committing.
+        """
+        self.db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"'))
+
+    def drop_constraint(self, table: str, constraint: str) -> None:
+        """Drop a constraint of a (detached) table if it exists"""
+        self.db.execute(text(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{constraint}"'))
+
+    def drop_table(self, table: str) -> None:
+        """Drop a (detached) table"""
+        self.db.execute(text(f'DROP TABLE "{table}"'))
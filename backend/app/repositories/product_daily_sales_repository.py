@@ -0,0 +1,235 @@
+"""
+ProductDailySales repository - Data access layer for the per-product daily sales aggregate
+"""
+from typing import Iterable, List, Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, and_, cast, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from app.models import Category, CategoryClosure, Order, OrderItem, Product, ProductDailySales
+from app.core.base_repository import BaseRepository
+from app.repositories.category_repository import CategoryRepository
+from app.core.constants import ProductRankingMetric
+
+
+def _add_month(month: date) -> date:
+    """First day of the month after a first day of month"""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class ProductDailySalesRepository(BaseRepository[ProductDailySales]):
+    """
+    Repository for ProductDailySales model operations
+    One row per day x product, rebuilt from the order_items of non-cancelled orders.
+    Rebuilt by whole months: allocating a month's operational costs changes the
+    margin of every item of that month.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(ProductDailySales, db)
+
+    def rebuild_range(self, start_day: date, end_day: date) -> int:
+        """
+        Recompute every product bucket between two days
+
+        The caller is responsible for committing.
+
+        Args:
+            start_day: First day to rebuild (inclusive)
+            end_day: Last day to rebuild (inclusive)
+
+        Returns:
+            Number of rows written
+        """
+        self.db.execute(
+            delete(ProductDailySales).where(
+                ProductDailySales.day >= start_day,
+                ProductDailySales.day <= end_day
+            )
+        )
+        return self._insert_aggregates(start_day, end_day)
+
+    def rebuild_months(self, months: Iterable[date]) -> int:
+        """
+        Recompute the product buckets of whole months, one month per statement
+
+        The caller is responsible for committing.
+
+        Args:
+            months: First days of the months to rebuild
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        for month in sorted({month.replace(day=1) for month in months}):
+            written += self.rebuild_range(month, _add_month(month) - timedelta(days=1))
+        return written
+
+    def _insert_aggregates(self, start_day: date, end_day: date) -> int:
+        """Aggregate the items of non-cancelled orders between two days into the table"""
+        # Bornes sur les deux order_date: seules les partitions de la période sont lues
+        start_dt = datetime.combine(start_day, time.min)
+        end_dt = datetime.combine(end_day + timedelta(days=1), time.min)
+        day = cast(OrderItem.order_date, Date)
+        aggregates = (
+            select(
+                day,
+                OrderItem.product_id,
+                func.count(OrderItem.order_id.distinct()),
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.total_price_ht),
+                func.sum(OrderItem.total_price_ttc),
+                func.coalesce(func.sum(OrderItem.calculated_net_margin), 0),
+                func.now()
+            )
+            .join(Order, and_(Order.id == OrderItem.order_id, Order.order_date == OrderItem.order_date))
+            .where(
+                OrderItem.product_id.isnot(None),
+                Order.is_cancelled.isnot(True),
+                OrderItem.order_date >= start_dt, OrderItem.order_date < end_dt,
+                Order.order_date >= start_dt, Order.order_date < end_dt
+            )
+            .group_by(day, OrderItem.product_id)
+        )
+        result = self.db.execute(
+            insert(ProductDailySales).from_select(
+                [
+                    "day", "product_id", "orders_count", "units",
+                    "revenue_ht", "revenue_ttc", "net_margin", "refreshed_at"
+                ],
+                aggregates
+            )
+        )
+        return result.rowcount
+
+    def get_months_for_new_items(self, since: Optional[datetime]) -> Tuple[Set[date], Optional[datetime]]:
+        """
+        Get the months of order_items created since a watermark
+
+        Args:
+            since: Watermark (exclusive), None to take every item
+
+        Returns:
+            Tuple (first days of months, newest created_at seen), the timestamp is None if nothing changed
+        """
+        month = cast(func.date_trunc("month", OrderItem.order_date), Date)
+        query = self.db.query(month, func.max(OrderItem.created_at))
+        if since is not None:
+            query = query.filter(OrderItem.created_at > since)
+        rows = query.group_by(month).all()
+        timestamps = [ts for _, ts in rows if ts is not None]
+        return {month for month, _ in rows}, max(timestamps) if timestamps else None
+
+    def get_months_with_items(self, start_day: Optional[date] = None, end_day: Optional[date] = None) -> Set[date]:
+        """
+        Get the months having order_items within an optional day range
+
+        Args:
+            start_day: First day (inclusive), unbounded if None
+            end_day: Last day (inclusive), unbounded if None
+
+        Returns:
+            First days of months
+        """
+        month = cast(func.date_trunc("month", OrderItem.order_date), Date)
+        query = select(month).distinct()
+        if start_day:
+            query = query.where(OrderItem.order_date >= datetime.combine(start_day, time.min))
+        if end_day:
+            query = query.where(OrderItem.order_date < datetime.combine(end_day + timedelta(days=1), time.min))
+        return set(self.db.execute(query).scalars())
+
+    def get_months_for_orders(self, order_ids: List[int]) -> Set[date]:
+        """Get the months of some orders"""
+        month = cast(func.date_trunc("month", Order.order_date), Date)
+        return set(self.db.execute(select(month).where(Order.id.in_(order_ids)).distinct()).scalars())
+
+    def get_top_products(
+        self,
+        metric: str,
+        start_day: date,
+        end_day: date,
+        limit: int,
+        category_id: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Rank products by a metric over a day range
+
+        Args:
+            metric: Ranking metric (see ProductRankingMetric)
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+            limit: Number of products
+            category_id: Only products in the sub-tree of this category, optional
+
+        Returns:
+            Rows (product_id, sku, name, category_id, subcategory_id, orders_count,
+            units, revenue_ht, revenue_ttc, net_margin), best first
+        """
+        s = ProductDailySales
+        totals = self._totals()
+        query = self.db.query(
+            Product.id, Product.sku, Product.name, Product.category_id, Product.subcategory_id,
+            func.sum(s.orders_count), *totals.values()
+        ).select_from(s).join(Product, Product.id == s.product_id).filter(s.day >= start_day, s.day <= end_day)
+        if category_id is not None:
+            query = query.filter(or_(
+                CategoryRepository.in_subtree(Product.category_id, category_id),
+                CategoryRepository.in_subtree(Product.subcategory_id, category_id)
+            ))
+        return query.group_by(Product.id).order_by(totals[metric].desc(), Product.id).limit(limit).all()
+
+    def get_top_categories(
+        self,
+        metric: str,
+        start_day: date,
+        end_day: date,
+        limit: int,
+        parent_id: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Rank categories by a metric over a day range
+
+        Each product counts for its most specific category (sub-category,
+        else category) and rolls up through category_closure: without
+        parent_id, products are grouped by top-level category whatever the
+        depth of the tree. With a parent_id, they are grouped by direct child
+        of that category; products attached to the category itself are
+        grouped under it.
+
+        Args:
+            metric: Ranking metric (see ProductRankingMetric)
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+            limit: Number of categories
+            parent_id: Category to drill down into, optional
+
+        Returns:
+            Rows (category_id, name, parent_id, products_count, units, revenue_ht,
+            revenue_ttc, net_margin), best first
+        """
+        s, c = ProductDailySales, CategoryClosure
+        totals = self._totals()
+        leaf = func.coalesce(Product.subcategory_id, Product.category_id)
+        query = self.db.query(
+            Category.id, Category.name, Category.parent_id, func.count(s.product_id.distinct()), *totals.values()
+        ).select_from(s).join(Product, Product.id == s.product_id).join(
+            c, c.descendant_id == leaf
+        ).join(Category, Category.id == c.ancestor_id).filter(s.day >= start_day, s.day <= end_day)
+        # Un seul ancêtre par produit: la racine, ou l'enfant direct de parent_id (ou parent_id lui-même)
+        if parent_id is None:
+            query = query.filter(Category.parent_id.is_(None))
+        else:
+            query = query.filter(or_(Category.parent_id == parent_id, and_(Category.id == parent_id, c.depth == 0)))
+        return query.group_by(Category.id).order_by(totals[metric].desc(), Category.id).limit(limit).all()
+
+    @staticmethod
+    def _totals():
+        """Sum of each ranking metric, in the column order of the returned rows"""
+        s = ProductDailySales
+        return {
+            ProductRankingMetric.UNITS.value: func.sum(s.units),
+            ProductRankingMetric.REVENUE_HT.value: func.sum(s.revenue_ht),
+            ProductRankingMetric.REVENUE_TTC.value: func.sum(s.revenue_ttc),
+            ProductRankingMetric.NET_MARGIN.value: func.sum(s.net_margin),
+        }
@@ -0,0 +1,44 @@
+"""
+Product repository - Data access layer for Product model
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models import Product
+from app.core.base_repository import BaseRepository
+from app.core.pagination import ProductSortKey
+
+
+class ProductRepository(BaseRepository[Product]):
+    """
+    Repository for Product model operations
+    Extends BaseRepository with Product-specific methods
+    """
+    
+    sort_keys = tuple(ProductSortKey.get_all_values())
+    
+    def __init__(self, db: Session):
+        super().__init__(Product, db)
+    
+    def get_by_sku(self, sku: str) -> Optional[Product]:
+        """
+        Get a product by its SKU
+        
+        Args:
+            sku: The product SKU
+        
+        Returns:
+            Product object or None if not found
+        """
+        return self.db.query(Product).filter(Product.sku == sku).first()
+    
+    @staticmethod
+    def sku_prefix_filter(prefix: str):
+        """
+        Filter clause matching the SKUs starting with prefix (served by ix_products_sku_pattern)
+        
+        Args:
+            prefix: Beginning of the SKU, taken literally
+        """
+        # % et _ saisis par l'utilisateur ne sont pas des jokers
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return Product.sku.like(f"{escaped}%", escape="\\")
@@ -0,0 +1,45 @@
+"""
+RollupWatermark repository - Data access layer for RollupWatermark model
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models import RollupWatermark
+
+
+class RollupWatermarkRepository:
+    """
+    Repository for RollupWatermark model operations
+    Keyed by source name rather than an integer id, hence no BaseRepository
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, source: str) -> Optional[datetime]:
+        """
+        Get the last processed timestamp for a source
+
+        Args:
+            source: The source name (e.g., "orders")
+
+        Returns:
+            The stored watermark, or None if the source was never processed
+        """
+        watermark = self.db.get(RollupWatermark, source)
+        return watermark.last_seen_at if watermark else None
+
+    def set(self, source: str, last_seen_at: datetime) -> None:
+        """
+        Store the last processed timestamp for a source (flushed, not committed)
+
+        Args:
+            source: The source name
+            last_seen_at: The new watermark
+        """
+        watermark = self.db.get(RollupWatermark, source)
+        if watermark is None:
+            watermark = RollupWatermark(source=source)
+            self.db.add(watermark)
+        watermark.last_seen_at = last_seen_at
+        self.db.flush()
@@ -0,0 +1,131 @@
+"""
+Search repository - Full-text and trigram search over products, customers and orders
+"""
+import re
+from typing import List, Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.constants import SearchEntity
+
+# Caractères ayant un sens dans la syntaxe tsquery: jamais repris des saisies
+_TSQUERY_SEPARATORS = re.compile(r"[\s&|!():*<>'\\]+")
+
+# Une requête par entité: (colonnes affichées, colonnes comparées par trigrammes en %, colonnes en ILIKE)
+# Les expressions doivent rester identiques à celles des index de la migration add_search_vectors
+_ENTITY_QUERIES = {
+    SearchEntity.PRODUCT.value: {
+        "table": "products",
+        "label": "name",
+        "detail": "sku",
+        "similar": ["name"],
+        "contains": ["sku"],
+    },
+    SearchEntity.CUSTOMER.value: {
+        "table": "customers",
+        "label": "nullif(trim(coalesce(first_name, '') || ' ' || coalesce(last_name, '')), '')",
+        "detail": "email",
+        "similar": ["(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"],
+        "contains": ["email"],
+    },
+    SearchEntity.ORDER.value: {
+        "table": "orders",
+        "label": "order_number",
+        "detail": "status",
+        "similar": [],
+        "contains": ["order_number"],
+    },
+}
+
+# Disponibilité de pg_trgm, lue une fois par processus
+_trigram_available: Optional[bool] = None
+
+
+def build_prefix_tsquery(term: str) -> Optional[str]:
+    """
+    Turn a search box input into a tsquery where every word is a prefix
+
+    "robe ble" -> 'robe':* & 'ble':*
+
+    Returns:
+        The tsquery text, None if the input has no searchable word
+    """
+    words = [word for word in _TSQUERY_SEPARATORS.split(term.lower()) if word]
+    if not words:
+        return None
+    return " & ".join(f"'{word}':*" for word in words)
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so that term is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SearchRepository:
+    """
+    Repository for the global search
+    
+    Every entity has a generated tsvector column with a GIN index
+    (search_vector). When pg_trgm is installed, fuzzy (%) and infix (ILIKE)
+    matches served by trigram GIN indexes are added and ranked by similarity.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def trigram_available(self) -> bool:
+        """Whether the pg_trgm extension is installed"""
+        global _trigram_available
+        if _trigram_available is None:
+            _trigram_available = bool(self.db.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            ).scalar())
+        return _trigram_available
+    
+    def _entity_query(self, entity: str, trigram: bool) -> str:
+        """SELECT of one entity, ranked and limited"""
+        spec = _ENTITY_QUERIES[entity]
+        conditions = ["search_vector @@ query"]
+        # Les mots complets passent devant les simples préfixes ("sku1" avant "sku10")
+        ranks = ["ts_rank(search_vector, query) + ts_rank(search_vector, exact)"]
+        if trigram:
+            for column in spec["similar"]:
+                conditions.append(f"{column} % :term")
+                ranks.append(f"similarity({column}, :term)")
+            for column in spec["contains"]:
+                conditions.append(f"{column} ILIKE :pattern")
+                ranks.append(f"similarity({column}, :term)")
+        rank = f"greatest({', '.join(ranks)})" if len(ranks) > 1 else ranks[0]
+        return (
+            f"(SELECT '{entity}' AS type, id, {spec['label']} AS label, {spec['detail']} AS detail, {rank} AS rank"
+            f" FROM {spec['table']}, to_tsquery('simple', :tsquery) AS query, plainto_tsquery('simple', :term) AS exact"
+            f" WHERE {' OR '.join(conditions)}"
+            f" ORDER BY rank DESC, id LIMIT :limit)"
+        )
+    
+    def search(self, term: str, tsquery: str, entities: Sequence[str], limit: int) -> List[dict]:
+        """
+        Search the given entities, best matches first
+        
+        Args:
+            term: Raw search input (trigram matches)
+            tsquery: Prefix tsquery built from term (see build_prefix_tsquery)
+            entities: SearchEntity values to search
+            limit: Maximum number of results overall
+        
+        Returns:
+            List of dicts with type, id, label, detail and rank
+        """
+        trigram = self.trigram_available()
+        # Chaque branche est limitée et servie par ses index, puis fusionnée par pertinence
+        branches = [self._entity_query(entity, trigram) for entity in entities]
+        sql = (
+            f"SELECT * FROM ({' UNION ALL '.join(branches)}) AS results"
+            " ORDER BY rank DESC, type, id LIMIT :limit"
+        )
+        rows = self.db.execute(text(sql), {
+            "term": term,
+            "tsquery": tsquery,
+            "pattern": f"%{escape_like(term)}%",
+            "limit": limit,
+        })
+        return [dict(row._mapping) for row in rows]
@@ -1,10 +1,12 @@
 """
 SectionPermission repository - Data access layer for SectionPermission model
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.models import SectionPermission
 from app.core.base_repository import BaseRepository
+from app.core.pagination import count_cache
 
 
 class SectionPermissionRepository(BaseRepository[SectionPermission]):
@@ -46,6 +48,46 @@ class SectionPermissionRepository(BaseRepository[SectionPermission]):
             SectionPermission.role_id == role_id
         ).all()
     
+    def get_all_flags(self) -> List[Tuple[int, str, Optional[bool], Optional[bool]]]:
+        """
+        Get every permission as plain tuples (used to compile the permission matrix)
+        
+        Returns:
+            List of (role_id, section, can_view, can_edit)
+        """
+        rows = self.db.query(
+            SectionPermission.role_id,
+            SectionPermission.section,
+            SectionPermission.can_view,
+            SectionPermission.can_edit
+        ).all()
+        return [tuple(row) for row in rows]
+    
+    def get_authorization_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the authorization data shared by every user
+        
+        Covers the section permissions and the roles (ids and names). Changes
+        of a single user (profile, status, role memberships) are tracked per
+        user instead (see UserRepository.get_auth_version), so registrations
+        and per-user updates leave the other users' tokens valid.
+        
+        Returns:
+            Hex digest, identical for identical data
+        """
+        return self.db.execute(text("""
+            SELECT md5(
+                coalesce((
+                    SELECT string_agg(
+                        concat_ws(':', role_id, section, coalesce(can_view, false), coalesce(can_edit, false)),
+                        ',' ORDER BY role_id, section
+                    )
+                    FROM section_permissions
+                ), '')
+                || '|' || coalesce((SELECT string_agg(concat_ws(':', id, name), ',' ORDER BY id) FROM roles), '')
+            )
+        """)).scalar()
+    
     def get_permissions_by_section(self, section: str) -> List[SectionPermission]:
         """
         Get all permissions for a specific section across all roles
@@ -75,6 +117,7 @@ class SectionPermissionRepository(BaseRepository[SectionPermission]):
         if permission:
             self.db.delete(permission)
             self.db.commit()
+            count_cache.invalidate(SectionPermission.__tablename__)
             return True
         return False
 
@@ -1,9 +1,11 @@
 """
 User repository - Data access layer for User model
 """
-from typing import Optional
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.models import User
+from app.models import User, UserAuthVersion
 from app.core.base_repository import BaseRepository
 
 
@@ -23,4 +25,30 @@ class UserRepository(BaseRepository[User]):
     def email_exists(self, email: str) -> bool:
         """Check if an email already exists"""
         return self.db.query(User).filter(User.email == email).first() is not None
-
+    
+    def get_auth_version(self, user_id: int) -> Optional[datetime]:
+        """
+        Get the date of the last authorization change of a user (profile, status, roles)
+        
+        Returns:
+            Timestamp maintained by triggers, None if the user never changed since its creation
+        """
+        return self.db.execute(
+            select(UserAuthVersion.changed_at).where(UserAuthVersion.user_id == user_id)
+        ).scalar()
+    
+    def get_recent_auth_versions(self, minutes: int) -> Dict[int, datetime]:
+        """
+        Get the users whose authorization changed recently (deleted users included)
+        
+        Args:
+            minutes: Look-back window
+        
+        Returns:
+            user_id -> date of the last change
+        """
+        rows = self.db.execute(
+            select(UserAuthVersion.user_id, UserAuthVersion.changed_at)
+            .where(UserAuthVersion.changed_at > func.now() - timedelta(minutes=minutes))
+        ).all()
+        return dict(rows)
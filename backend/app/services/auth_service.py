@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from app.services.user_service import UserService
 from app.dto.auth_dto import RegisterRequest, LoginResponse
 from app.dto.user_dto import UserResponse, UserCreate
-from app.core.security import create_access_token
+from app.core.security import create_user_access_token
 from app.core.exceptions import UnauthorizedError
 
 
@@ -48,12 +48,7 @@ class AuthService:
             raise UnauthorizedError("Account is not verified. Please wait for administrator approval.")
         
         # Create JWT token
-        # Note: 'sub' must be a string according to JWT spec
-        token_data = {
-            "sub": str(user.id),  # Subject (user ID) - must be string
-            "email": user.email
-        }
-        access_token = create_access_token(data=token_data)
+        access_token = create_user_access_token(user)
         
         # Return login response
         return LoginResponse(
@@ -85,12 +80,7 @@ class AuthService:
         user = self.user_service.create_user(user_create)
         
         # Create JWT token for immediate login
-        # Note: 'sub' must be a string according to JWT spec
-        token_data = {
-            "sub": str(user.id),  # Subject (user ID) - must be string
-            "email": user.email
-        }
-        access_token = create_access_token(data=token_data)
+        access_token = create_user_access_token(user)
         
         # Return login response
         return LoginResponse(
@@ -0,0 +1,107 @@
+"""
+Cohort service - Business logic for customer acquisition cohorts and retention
+"""
+from typing import Dict, List, Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from app.repositories.customer_cohort_repository import CustomerCohortRepository
+from app.services.partition_service import add_months
+from app.core.exceptions import ValidationError
+
+# Nombre maximal de cohortes et de mois de suivi renvoyés
+MAX_COHORTS = 60
+MAX_COHORT_MONTHS = 36
+
+
+def months_between(start: date, end: date) -> int:
+    """Number of months from the month of start to the month of end"""
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+class CohortService:
+    """
+    Service for customer cohorts
+    Reads the materialized cohort tables, kept up to date by RollupRefreshService
+    ("customer_cohorts") as orders land
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = CustomerCohortRepository(db)
+
+    def get_cohorts(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        months: int = 12
+    ) -> List[Dict]:
+        """
+        Get the retention and repeat-purchase matrices of monthly acquisition cohorts
+
+        Every cohort has one value per month since acquisition (0 = acquisition
+        month), up to `months` values and never past the current month.
+
+        Args:
+            start_date: Any day of the first cohort month, 11 months before end_date if None
+            end_date: Any day of the last cohort month, current month if None
+            months: Number of months followed after the acquisition month
+
+        Returns:
+            List of dicts (cohort_month, customers, active_customers, retention_rate,
+            repeat_rate, orders_count, revenue_ttc), oldest cohort first. Rates are
+            percentages of the cohort size; repeat_rate is cumulative.
+
+        Raises:
+            ValidationError: If the range or the number of months is invalid
+        """
+        if months < 1 or months > MAX_COHORT_MONTHS:
+            raise ValidationError(f"Months must be between 1 and {MAX_COHORT_MONTHS}")
+        current_month = date.today().replace(day=1)
+        end_month = (end_date or current_month).replace(day=1)
+        start_month = start_date.replace(day=1) if start_date else add_months(end_month, -11)
+        if start_month > end_month:
+            raise ValidationError("Start date must be before or equal to end date")
+        if months_between(start_month, end_month) + 1 > MAX_COHORTS:
+            raise ValidationError(f"Too many cohorts: use a shorter range (max {MAX_COHORTS} months)")
+
+        rows_by_cohort: Dict[date, Dict[int, tuple]] = {}
+        for cohort_month, offset, *values in self.repository.get_activity(start_month, end_month, months - 1):
+            rows_by_cohort.setdefault(cohort_month, {})[offset] = values
+
+        cohorts = []
+        for cohort_month, rows in rows_by_cohort.items():
+            size = rows.get(0, (0,))[0]
+            # Mois futurs exclus: une cohorte récente a moins de valeurs
+            length = min(months, months_between(cohort_month, current_month) + 1)
+            columns = [rows.get(offset, (0, 0, 0, 0)) for offset in range(length)]
+            repeat_total = 0
+            repeat_rate = []
+            for _, repeat, _, _ in columns:
+                repeat_total += repeat
+                repeat_rate.append(self._rate(repeat_total, size))
+            cohorts.append({
+                "cohort_month": cohort_month,
+                "customers": size,
+                "active_customers": [active for active, _, _, _ in columns],
+                "retention_rate": [self._rate(active, size) for active, _, _, _ in columns],
+                "repeat_rate": repeat_rate,
+                "orders_count": [orders for _, _, orders, _ in columns],
+                "revenue_ttc": [float(revenue) for _, _, _, revenue in columns],
+            })
+        return cohorts
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild the cohort tables from every order
+
+        Returns:
+            Number of activity rows written
+        """
+        written = self.repository.rebuild_all()
+        self.db.commit()
+        return written
+
+    @staticmethod
+    def _rate(count: int, size: int) -> Optional[float]:
+        """Percentage of the cohort size rounded to 2 decimals, None for an empty cohort"""
+        return round(count * 100 / size, 2) if size else None
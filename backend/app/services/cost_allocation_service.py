@@ -0,0 +1,60 @@
+"""
+CostAllocation service - Business logic for spreading operational costs onto order items
+"""
+from typing import Iterable, Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.core.config import settings
+from app.core.constants import CostAllocationBasis
+from app.core.exceptions import ValidationError
+
+
+class CostAllocationService:
+    """
+    Service for operational cost allocation
+    Keeps OrderItem packaging / washing / other costs and calculated_net_margin
+    in line with the monthly operational costs, one month at a time, along with
+    the margins of the product_daily_sales aggregate
+    """
+
+    def __init__(self, db: Session, basis: Optional[str] = None):
+        self.db = db
+        self.repository = OrderItemRepository(db)
+        self.product_sales_repository = ProductDailySalesRepository(db)
+        self.basis = basis or settings.OPERATIONAL_COST_ALLOCATION_BASIS
+        if self.basis not in CostAllocationBasis.get_all_values():
+            raise ValidationError(
+                f"Invalid allocation basis. Must be one of: {', '.join(CostAllocationBasis.get_all_values())}"
+            )
+
+    def allocate_months(self, months: Iterable[date]) -> int:
+        """
+        Reallocate the costs of the given months
+
+        Args:
+            months: Any day of each month to reallocate
+
+        Returns:
+            Number of order items updated
+        """
+        months = {month.replace(day=1) for month in months}
+        if not months:
+            return 0
+        updated = self.repository.allocate_operational_costs(months, self.basis)
+        self.product_sales_repository.rebuild_months(months)
+        self.db.commit()
+        return updated
+
+    def allocate_all(self) -> int:
+        """
+        Reallocate every month (e.g. after changing the allocation basis)
+
+        Returns:
+            Number of order items updated
+        """
+        updated = self.repository.allocate_operational_costs(None, self.basis)
+        self.product_sales_repository.rebuild_months(self.product_sales_repository.get_months_with_items())
+        self.db.commit()
+        return updated
@@ -0,0 +1,106 @@
+"""
+CustomerScore service - Business logic for the RFM segments and customer lifetime value
+"""
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.repositories.customer_score_repository import CustomerScoreRepository
+from app.core.constants import CustomerSegment
+from app.core.exceptions import ValidationError
+
+# Nombre maximal de clients renvoyés par classement
+MAX_RANKED_CUSTOMERS = 200
+
+
+class CustomerScoreService:
+    """
+    Service for customer scores
+    Reads the customer_scores side table, kept up to date by RollupRefreshService
+    ("customer_scores") as orders land
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = CustomerScoreRepository(db)
+
+    def get_segments(self) -> List[Dict]:
+        """
+        Get the size and value of every RFM segment
+
+        Returns:
+            List of dicts (segment, customers, share, total_ltv, average_ltv,
+            average_orders), most valuable segment first. share is the percentage
+            of scored customers.
+        """
+        rows = self.repository.get_segment_summary()
+        total = sum(customers for _, customers, *_ in rows)
+        return [
+            {
+                "segment": segment,
+                "customers": customers,
+                "share": round(customers * 100 / total, 2) if total else 0.0,
+                "total_ltv": float(total_ltv or 0),
+                "average_ltv": round(float(average_ltv or 0), 2),
+                "average_orders": round(float(average_orders or 0), 2),
+            }
+            for segment, customers, total_ltv, average_ltv, average_orders in rows
+        ]
+
+    def get_ranked_customers(
+        self,
+        segment: Optional[str] = None,
+        order: str = "top",
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Get the customers with the highest ("top") or lowest ("bottom") lifetime value
+
+        Args:
+            segment: Segment filter, all customers if None
+            order: "top" or "bottom"
+            limit: Maximum number of customers
+
+        Returns:
+            List of dicts with the customer, its order aggregates and its scores
+
+        Raises:
+            ValidationError: If the segment, order or limit is invalid
+        """
+        if segment is not None and segment not in CustomerSegment.get_all_values():
+            raise ValidationError(
+                f"Invalid segment. Must be one of: {', '.join(CustomerSegment.get_all_values())}"
+            )
+        if order not in ("top", "bottom"):
+            raise ValidationError("Invalid order. Must be one of: top, bottom")
+        if limit < 1 or limit > MAX_RANKED_CUSTOMERS:
+            raise ValidationError(f"Limit must be between 1 and {MAX_RANKED_CUSTOMERS}")
+
+        rows = self.repository.get_ranked_customers(segment, order == "top", limit)
+        return [
+            {
+                "customer_id": score.customer_id,
+                "email": email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "first_order_date": score.first_order_date,
+                "last_order_date": score.last_order_date,
+                "orders_count": score.orders_count,
+                "ltv": float(score.ltv),
+                "average_order_ttc": float(score.average_order_ttc),
+                "recency_score": score.recency_score,
+                "frequency_score": score.frequency_score,
+                "monetary_score": score.monetary_score,
+                "segment": score.segment,
+            }
+            for score, email, first_name, last_name in rows
+        ]
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild every score from the orders
+
+        Returns:
+            Number of customers whose scores or segment changed
+        """
+        updated = self.repository.rebuild_all()
+        self.db.commit()
+        return updated
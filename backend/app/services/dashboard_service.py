@@ -0,0 +1,168 @@
+"""
+Dashboard service - Business logic for dashboard KPIs
+"""
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.core.exceptions import ValidationError
+from app.core.constants import DashboardMetric, TimeGranularity
+
+# Ratios : None (et non 0) quand la période ne contient aucune commande
+RATIO_METRICS = {
+    DashboardMetric.AVERAGE_BASKET_TTC.value,
+    DashboardMetric.CANCELLATION_RATE.value,
+    DashboardMetric.REFUND_RATE.value,
+}
+
+# Limite du nombre de points renvoyés par une série temporelle
+MAX_TIME_SERIES_BUCKETS = 1000
+
+
+class DashboardService:
+    """
+    Service for dashboard KPIs
+    Reads from the daily sales rollup instead of the raw orders table
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rollup_repository = DailySalesRollupRepository(db)
+
+    def get_orders_count(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        marketplace_id: Optional[int] = None
+    ) -> int:
+        """
+        Get the number of orders within a date range
+
+        Args:
+            start_date: First day (inclusive), unbounded if None
+            end_date: Last day (inclusive), unbounded if None
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Number of orders
+
+        Raises:
+            ValidationError: If start_date is after end_date
+        """
+        self._validate_date_range(start_date, end_date)
+        return self.rollup_repository.count_orders(start_date, end_date, marketplace_id)
+
+    def get_kpis(
+        self,
+        metrics: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        marketplace_id: Optional[int] = None
+    ) -> Dict[str, Optional[Union[int, float]]]:
+        """
+        Compute several dashboard KPIs sharing the same filters in one query
+
+        Args:
+            metrics: Metric names (see DashboardMetric), all metrics if None or empty
+            start_date: First day (inclusive), unbounded if None
+            end_date: Last day (inclusive), unbounded if None
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Dict metric name -> value, in the requested order
+
+        Raises:
+            ValidationError: If a metric is unknown or the date range is invalid
+        """
+        metrics = self._validate_metrics(metrics)
+        self._validate_date_range(start_date, end_date)
+
+        values = self.rollup_repository.aggregate_metrics(metrics, start_date, end_date, marketplace_id)
+        return {name: self._to_number(name, value) for name, value in values.items()}
+
+    def get_time_series(
+        self,
+        metrics: List[str],
+        granularity: str,
+        start_date: date,
+        end_date: date,
+        marketplace_id: Optional[int] = None
+    ) -> Tuple[List[date], Dict[str, List[Optional[Union[int, float]]]]]:
+        """
+        Compute metrics bucketed by day, week or month, gaps included
+
+        Args:
+            metrics: Metric names (see DashboardMetric), all metrics if empty
+            granularity: "day", "week" (ISO, starting Monday) or "month"
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            marketplace_id: Restrict to one marketplace if provided
+
+        Returns:
+            Tuple (bucket start dates, {metric: values aligned on the buckets})
+
+        Raises:
+            ValidationError: If a parameter is invalid or the range has too many buckets
+        """
+        metrics = self._validate_metrics(metrics)
+        if granularity not in TimeGranularity.get_all_values():
+            raise ValidationError(
+                f"Invalid granularity. Must be one of: {', '.join(TimeGranularity.get_all_values())}"
+            )
+        if not start_date or not end_date:
+            raise ValidationError("Start date and end date are required for a time series")
+        self._validate_date_range(start_date, end_date)
+        if self._count_buckets(granularity, start_date, end_date) > MAX_TIME_SERIES_BUCKETS:
+            raise ValidationError(
+                f"Too many buckets: use a coarser granularity or a shorter range (max {MAX_TIME_SERIES_BUCKETS})"
+            )
+
+        rows = self.rollup_repository.aggregate_time_series(
+            metrics, granularity, start_date, end_date, marketplace_id
+        )
+        buckets = [row[0] for row in rows]
+        series = {
+            name: [self._to_number(name, row[index + 1]) for row in rows]
+            for index, name in enumerate(metrics)
+        }
+        return buckets, series
+
+    @staticmethod
+    def _count_buckets(granularity: str, start_date: date, end_date: date) -> int:
+        """Upper bound of the number of buckets between two dates"""
+        if granularity == TimeGranularity.MONTH.value:
+            return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+        days = (end_date - start_date).days + 1
+        if granularity == TimeGranularity.WEEK.value:
+            return days // 7 + 2
+        return days
+
+    @staticmethod
+    def _validate_metrics(metrics: Optional[List[str]]) -> List[str]:
+        """Check metric names, dropping duplicates; default to every metric"""
+        if not metrics:
+            return DashboardMetric.get_all_values()
+
+        allowed = DashboardMetric.get_all_values()
+        unknown = [name for name in metrics if name not in allowed]
+        if unknown:
+            raise ValidationError(
+                f"Unknown metric(s): {', '.join(unknown)}. Must be one of: {', '.join(allowed)}"
+            )
+        return list(dict.fromkeys(metrics))
+
+    @staticmethod
+    def _validate_date_range(start_date: Optional[date], end_date: Optional[date]) -> None:
+        """Raise a ValidationError if the start date is after the end date"""
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError("Start date must be before or equal to end date")
+
+    @staticmethod
+    def _to_number(name: str, value) -> Optional[Union[int, float]]:
+        """Convert a SQL aggregate to a JSON-friendly number (empty sums become 0)"""
+        if value is None:
+            return None if name in RATIO_METRICS else 0
+        if isinstance(value, Decimal):
+            return float(value)
+        return value
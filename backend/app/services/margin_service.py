@@ -0,0 +1,77 @@
+"""
+Margin service - Business logic for order item margins
+"""
+from typing import Iterable, Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.core.exceptions import ValidationError
+
+
+class MarginService:
+    """
+    Service for order item margins
+    Recomputes the margin columns in the database (set-based), e.g. after a
+    commission rate, purchase price or operational cost change, then the margins
+    of the product_daily_sales months they belong to
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = OrderItemRepository(db)
+        self.product_sales_repository = ProductDailySalesRepository(db)
+
+    def recompute(
+        self,
+        marketplace_id: Optional[int] = None,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> int:
+        """
+        Recompute margins for the order items matching the filters
+
+        Args:
+            marketplace_id: Restrict to one marketplace if provided
+            start_day: First order day (inclusive), unbounded if None
+            end_day: Last order day (inclusive), unbounded if None
+
+        Returns:
+            Number of order items updated
+
+        Raises:
+            ValidationError: If start_day is after end_day
+        """
+        if start_day and end_day and start_day > end_day:
+            raise ValidationError("Start date must be before or equal to end date")
+
+        updated = self.repository.recompute_margins(
+            marketplace_id=marketplace_id,
+            start_day=start_day,
+            end_day=end_day
+        )
+        if updated:
+            self.product_sales_repository.rebuild_months(
+                self.product_sales_repository.get_months_with_items(start_day, end_day)
+            )
+        self.db.commit()
+        return updated
+
+    def recompute_orders(self, order_ids: Iterable[int]) -> int:
+        """
+        Recompute margins for the items of the given orders
+
+        Args:
+            order_ids: Order IDs
+
+        Returns:
+            Number of order items updated
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return 0
+        updated = self.repository.recompute_margins(order_ids=order_ids)
+        if updated:
+            self.product_sales_repository.rebuild_months(self.product_sales_repository.get_months_for_orders(order_ids))
+        self.db.commit()
+        return updated
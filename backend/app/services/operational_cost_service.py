@@ -1,28 +1,35 @@
 """
 OperationalCost service - Business logic for OperationalCost operations
 """
-from typing import List
+from typing import List, Optional
 from datetime import date
 from sqlalchemy.orm import Session
 from decimal import Decimal
 from app.repositories.operational_cost_repository import OperationalCostRepository
 from app.repositories.user_repository import UserRepository
+from app.services.cost_allocation_service import CostAllocationService
 from app.dto.operational_cost_dto import OperationalCostCreate, OperationalCostUpdate
 from app.models import OperationalCost
 from app.core.exceptions import NotFoundError, ValidationError
 from app.core.constants import OperationalCostCategory
+from app.core.pagination import Page, PageRequest
+
+# Colonnes (mois) au plus dans le tableau croisé du résumé
+MAX_PIVOT_MONTHS = 36
 
 
 class OperationalCostService:
     """
     Service for OperationalCost business logic
     Handles CRUD operations and business rules
+    Every write reallocates the affected month(s) onto the order items
     """
     
     def __init__(self, db: Session):
         self.db = db
         self.repository = OperationalCostRepository(db)
         self.user_repository = UserRepository(db)
+        self.allocation_service = CostAllocationService(db)
     
     def create_cost(self, cost_data: OperationalCostCreate, created_by: int) -> OperationalCost:
         """
@@ -54,14 +61,17 @@ class OperationalCostService:
                 f"Invalid category. Must be one of: {', '.join(OperationalCostCategory.get_all_values())}"
             )
         
-        # Créer le coût
-        return self.repository.create(
+        # Créer le coût, validé avec la répartition du mois
+        cost = self.repository.create(
+            commit=False,
             month=cost_data.month,
             amount=cost_data.amount,
             category=cost_data.category,
             description=cost_data.description,
             created_by=created_by
         )
+        self._allocate([cost.month])
+        return cost
     
     def get_cost_by_id(self, cost_id: int) -> OperationalCost:
         """
@@ -94,6 +104,18 @@ class OperationalCostService:
         """
         return self.repository.get_all(skip=skip, limit=limit)
     
+    def get_costs_page(self, page_request: PageRequest) -> Page[OperationalCost]:
+        """
+        Get a page of costs (keyset pagination, see BaseRepository.get_page)
+        
+        Args:
+            page_request: Pagination parameters
+        
+        Returns:
+            Page of OperationalCost objects
+        """
+        return self.repository.get_page(**vars(page_request))
+    
     def update_cost(self, cost_id: int, cost_data: OperationalCostUpdate) -> OperationalCost:
         """
         Update a cost
@@ -123,8 +145,12 @@ class OperationalCostService:
         
         # Préparer les données de mise à jour
         update_data = cost_data.model_dump(exclude_unset=True)
+        previous_month = cost.month
         
-        return self.repository.update(cost_id, **update_data)
+        cost = self.repository.update(cost_id, commit=False, **update_data)
+        # Un changement de mois libère l'ancien mois et charge le nouveau
+        self._allocate([previous_month, cost.month])
+        return cost
     
     def delete_cost(self, cost_id: int) -> bool:
         """
@@ -140,7 +166,24 @@ class OperationalCostService:
             NotFoundError: If cost doesn't exist
         """
         cost = self.get_cost_by_id(cost_id)
-        return self.repository.delete(cost_id)
+        month = cost.month
+        deleted = self.repository.delete(cost_id, commit=False)
+        self._allocate([month])
+        return deleted
+    
+    def _allocate(self, months: List[date]) -> None:
+        """
+        Reallocate the months in the transaction of the pending cost write
+        
+        allocate_months commits the write and the allocation together; if the
+        allocation fails the write is rolled back, so a month never keeps an
+        allocation that no longer matches its costs.
+        """
+        try:
+            self.allocation_service.allocate_months(months)
+        except Exception:
+            self.db.rollback()
+            raise
     
     def get_costs_by_month(self, month: date) -> List[OperationalCost]:
         """
@@ -182,3 +225,78 @@ class OperationalCostService:
         
         return self.repository.get_by_month_range(start_date, end_date)
 
+    
+    def get_cost_summary(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category: Optional[str] = None,
+        pivot: bool = False
+    ) -> dict:
+        """
+        Get cost totals per month and category, aggregated in SQL
+        
+        Args:
+            start_date: Start date (inclusive), unbounded if None
+            end_date: End date (inclusive), unbounded if None
+            category: Restrict to one category if provided
+            pivot: Also return a category x month table (months as columns)
+        
+        Returns:
+            Dict with start_date, end_date, rows, total and pivot (None if not requested)
+        
+        Raises:
+            ValidationError: If the range, category or pivot size is invalid
+        """
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError("Start date must be before or equal to end date")
+        if category is not None and category not in OperationalCostCategory.get_all_values():
+            raise ValidationError(
+                f"Invalid category. Must be one of: {', '.join(OperationalCostCategory.get_all_values())}"
+            )
+        
+        rows = self.repository.get_totals_by_month_and_category(start_date, end_date, category)
+        summary = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "rows": [
+                {"month": month, "category": cat, "total": total, "count": count}
+                for month, cat, total, count in rows
+            ],
+            "total": sum((total for _, _, total, _ in rows), Decimal("0")),
+            "pivot": None
+        }
+        if not pivot:
+            return summary
+        
+        # Plage connue: un mois par colonne, même vide; sinon les mois présents
+        if start_date and end_date:
+            months = self._months_between(start_date, end_date)
+        else:
+            months = sorted({month for month, _, _, _ in rows})
+        if len(months) > MAX_PIVOT_MONTHS:
+            raise ValidationError(f"Pivot is limited to {MAX_PIVOT_MONTHS} months, narrow the date range")
+        
+        pivot_rows = self.repository.get_category_pivot(months, start_date, end_date, category)
+        summary["pivot"] = {
+            "months": months,
+            "rows": [
+                {"category": row[0], "values": list(row[1:-1]), "total": row[-1]}
+                for row in pivot_rows
+            ],
+            "totals": [
+                sum((row[i + 1] for row in pivot_rows), Decimal("0"))
+                for i in range(len(months))
+            ]
+        }
+        return summary
+    
+    @staticmethod
+    def _months_between(start_date: date, end_date: date) -> List[date]:
+        """First day of every month from start_date to end_date (inclusive)"""
+        months = []
+        current = start_date.replace(day=1)
+        while current <= end_date:
+            months.append(current)
+            current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        return months
@@ -0,0 +1,72 @@
+"""
+Order service - Business logic for the orders explorer
+"""
+from typing import Optional
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.orm import Session
+from app.repositories.order_repository import OrderRepository
+from app.models import Order
+from app.core.exceptions import ValidationError
+from app.core.pagination import Page, PageRequest
+
+
+class OrderService:
+    """
+    Service for browsing orders
+    Contains the business logic of the orders explorer
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = OrderRepository(db)
+    
+    def get_orders_page(
+        self,
+        page_request: PageRequest,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        marketplace_id: Optional[int] = None,
+        status: Optional[str] = None,
+        country_code: Optional[str] = None,
+        category_id: Optional[int] = None,
+        sku: Optional[str] = None
+    ) -> Page[Order]:
+        """
+        Get a page of orders (keyset pagination, see BaseRepository.get_page)
+        
+        Args:
+            page_request: Pagination parameters
+            start_date: Orders placed on or after this day
+            end_date: Orders placed on or before this day (inclusive)
+            marketplace_id: Restrict to one marketplace if provided
+            status: Restrict to one status if provided
+            country_code: Restrict to one country if provided (case insensitive)
+            category_id: Orders with at least one product of this category
+            sku: Orders with at least one item of this product SKU
+        
+        Returns:
+            Page of Order objects
+        
+        Raises:
+            ValidationError: If the date range is invalid
+        """
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError("start_date must be before or equal to end_date")
+        
+        # Bornes en demi-intervalle sur order_date pour rester indexables (et élaguer les partitions)
+        start = datetime.combine(start_date, time.min) if start_date is not None else None
+        end = datetime.combine(end_date + timedelta(days=1), time.min) if end_date is not None else None
+        filters = []
+        if start is not None:
+            filters.append(Order.order_date >= start)
+        if end is not None:
+            filters.append(Order.order_date < end)
+        if marketplace_id is not None:
+            filters.append(Order.marketplace_id == marketplace_id)
+        if status is not None:
+            filters.append(Order.status == status)
+        if country_code is not None:
+            filters.append(Order.country_code == country_code.upper())
+        if category_id is not None or sku is not None:
+            filters.append(self.repository.contains_products_filter(category_id, sku, start, end))
+        return self.repository.get_page(**vars(page_request), filters=filters)
@@ -0,0 +1,109 @@
+"""
+Partition service - Maintenance of the monthly partitions of orders / order_items
+"""
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from app.models import PARTITIONED_TABLES
+from app.repositories.partition_repository import PartitionRepository
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+
+# Clé étrangère order_items -> orders, recopiée sur chaque partition de order_items
+ORDER_ITEMS_FOREIGN_KEY = "fk_order_items_order"
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after the month of a date"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionService:
+    """
+    Service for the monthly partitions of orders and order_items
+    Creates partitions ahead of time and detaches old months, which is a
+    catalog-only operation (no row is deleted or copied)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = PartitionRepository(db)
+
+    def ensure_future_partitions(self, months_ahead: Optional[int] = None) -> Dict[str, int]:
+        """
+        Create the partitions of the current month and of the next months
+
+        Args:
+            months_ahead: Months created after the current one, settings.ORDER_PARTITION_MONTHS_AHEAD if None
+
+        Returns:
+            Dict table -> number of partitions created
+
+        Raises:
+            ValidationError: If months_ahead is negative
+        """
+        if months_ahead is None:
+            months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+        if months_ahead < 0:
+            raise ValidationError("Months ahead must be greater than or equal to 0")
+
+        current = date.today().replace(day=1)
+        created = {
+            table: self.repository.ensure_monthly_partitions(table, current, add_months(current, months_ahead))
+            for table in PARTITIONED_TABLES
+        }
+        self.db.commit()
+        return created
+
+    def get_partitions(self) -> Dict[str, List[Tuple[str, datetime, datetime, int]]]:
+        """
+        Get the attached partitions of every partitioned table
+
+        Returns:
+            Dict table -> list of (partition name, lower bound, upper bound exclusive, estimated rows)
+        """
+        return {table: self.repository.get_partitions(table) for table in PARTITIONED_TABLES}
+
+    def detach_before(self, month: date, drop: bool = False) -> List[str]:
+        """
+        Detach (and optionally drop) the partitions of the months before a month
+
+        The order_items partitions are detached first and lose their foreign
+        key to orders, so that the matching orders partitions can be detached
+        in turn. Detached partitions stay in the database as standalone tables
+        (archive) unless drop is True. Everything is done in one transaction.
+
+        Args:
+            month: First month kept (any day of it)
+            drop: Drop the detached tables
+
+        Returns:
+            Names of the detached partitions
+
+        Raises:
+            ValidationError: If month is after the current month
+        """
+        cutoff = datetime.combine(month.replace(day=1), datetime.min.time())
+        if cutoff.date() > date.today().replace(day=1):
+            raise ValidationError("Only months before the current month can be detached")
+
+        detached = []
+        try:
+            # order_items référence orders: ses partitions sont détachées en premier
+            for table in reversed(PARTITIONED_TABLES):
+                for name, _, upper, _ in self.repository.get_partitions(table):
+                    if upper > cutoff:
+                        continue
+                    self.repository.detach_partition(table, name)
+                    if table == "order_items":
+                        self.repository.drop_constraint(name, ORDER_ITEMS_FOREIGN_KEY)
+                    detached.append(name)
+            if drop:
+                for name in detached:
+                    self.repository.drop_table(name)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return detached
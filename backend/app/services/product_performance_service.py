@@ -0,0 +1,170 @@
+"""
+ProductPerformance service - Business logic for the product and category leaderboard
+"""
+from typing import Dict, List, Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.services.partition_service import add_months
+from app.core.category_tree import category_tree
+from app.core.constants import ProductRankingGroup, ProductRankingMetric
+from app.core.exceptions import NotFoundError, ValidationError
+
+# Nombre maximal de produits / catégories renvoyés
+MAX_RANKING_SIZE = 100
+
+
+class ProductPerformanceService:
+    """
+    Service for the product leaderboard
+    Ranks from the product_daily_sales aggregate instead of scanning order_items
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = ProductDailySalesRepository(db)
+
+    def get_top(
+        self,
+        start_date: date,
+        end_date: date,
+        metric: str = ProductRankingMetric.REVENUE_TTC.value,
+        group_by: str = ProductRankingGroup.PRODUCT.value,
+        category_id: Optional[int] = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Get the top products or categories by a metric over a date range
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            metric: Ranking metric (see ProductRankingMetric)
+            group_by: "product" or "category"
+            category_id: Products: only the sub-tree of this category.
+                Categories: rank the direct children of this category.
+            limit: Number of entries
+
+        Returns:
+            List of dicts (rank, id, name, units, revenue_ht, revenue_ttc, net_margin
+            and level-specific fields), best first
+
+        Raises:
+            ValidationError: If a parameter is invalid
+        """
+        if metric not in ProductRankingMetric.get_all_values():
+            raise ValidationError(
+                f"Invalid metric. Must be one of: {', '.join(ProductRankingMetric.get_all_values())}"
+            )
+        if group_by not in ProductRankingGroup.get_all_values():
+            raise ValidationError(
+                f"Invalid group. Must be one of: {', '.join(ProductRankingGroup.get_all_values())}"
+            )
+        if not start_date or not end_date:
+            raise ValidationError("Start date and end date are required for a ranking")
+        if start_date > end_date:
+            raise ValidationError("Start date must be before or equal to end date")
+        if limit < 1 or limit > MAX_RANKING_SIZE:
+            raise ValidationError(f"Limit must be between 1 and {MAX_RANKING_SIZE}")
+
+        if group_by == ProductRankingGroup.PRODUCT.value:
+            rows = self.repository.get_top_products(metric, start_date, end_date, limit, category_id)
+            return [
+                {
+                    "rank": rank,
+                    "id": product_id,
+                    "name": name,
+                    "sku": sku,
+                    "category_id": product_category_id,
+                    "subcategory_id": subcategory_id,
+                    "orders_count": orders_count,
+                    **self._totals(totals),
+                }
+                for rank, (product_id, sku, name, product_category_id, subcategory_id, orders_count, *totals)
+                in enumerate(rows, start=1)
+            ]
+
+        rows = self.repository.get_top_categories(metric, start_date, end_date, limit, category_id)
+        return [
+            {
+                "rank": rank,
+                "id": row_category_id,
+                "name": name,
+                "parent_id": parent_id,
+                "products_count": products_count,
+                **self._totals(totals),
+            }
+            for rank, (row_category_id, name, parent_id, products_count, *totals) in enumerate(rows, start=1)
+        ]
+
+    def get_category_tree(self, category_id: Optional[int] = None) -> Dict:
+        """
+        Get the category tree to navigate the leaderboard, from the cached tree
+
+        Args:
+            category_id: Only the sub-tree below this category, optional
+
+        Returns:
+            Dict with category_id, path (names from the top-level category) and nested categories
+
+        Raises:
+            NotFoundError: If the category does not exist
+        """
+        path = []
+        if category_id is not None:
+            path = category_tree.path(category_id)
+            if not path:
+                raise NotFoundError("Category", str(category_id))
+        return {
+            "category_id": category_id,
+            "path": [node.name for node in path],
+            "categories": category_tree.to_nested(category_id),
+        }
+
+    def refresh_range(self, start_day: date, end_day: date) -> int:
+        """
+        Rebuild the aggregate for the whole months of a range of days
+
+        Args:
+            start_day: Any day of the first month
+            end_day: Any day of the last month
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ValidationError: If start_day is after end_day
+        """
+        if start_day > end_day:
+            raise ValidationError("Start date must be before or equal to end date")
+
+        months = [start_day.replace(day=1)]
+        while months[-1] < end_day.replace(day=1):
+            months.append(add_months(months[-1], 1))
+        written = self.repository.rebuild_months(months)
+        self.db.commit()
+        return written
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild the aggregate from the first to the last order
+
+        Returns:
+            Number of rows written
+        """
+        first_day, last_day = DailySalesRollupRepository(self.db).get_order_date_bounds()
+        if first_day is None:
+            return 0
+        return self.refresh_range(first_day, last_day)
+
+    @staticmethod
+    def _totals(totals) -> Dict:
+        """Map the (units, revenue_ht, revenue_ttc, net_margin) sums of a row to JSON-friendly numbers"""
+        units, revenue_ht, revenue_ttc, net_margin = totals
+        return {
+            "units": int(units or 0),
+            "revenue_ht": float(revenue_ht or 0),
+            "revenue_ttc": float(revenue_ttc or 0),
+            "net_margin": float(net_margin or 0),
+        }
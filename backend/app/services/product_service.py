@@ -0,0 +1,51 @@
+"""
+Product service - Business logic for the products explorer
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.repositories.product_repository import ProductRepository
+from app.models import Product
+from app.core.pagination import Page, PageRequest
+
+
+class ProductService:
+    """
+    Service for browsing products
+    Contains the business logic of the products explorer
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = ProductRepository(db)
+    
+    def get_products_page(
+        self,
+        page_request: PageRequest,
+        category_id: Optional[int] = None,
+        subcategory_id: Optional[int] = None,
+        status: Optional[str] = None,
+        sku: Optional[str] = None
+    ) -> Page[Product]:
+        """
+        Get a page of products (keyset pagination, see BaseRepository.get_page)
+        
+        Args:
+            page_request: Pagination parameters
+            category_id: Restrict to one category if provided
+            subcategory_id: Restrict to one subcategory if provided
+            status: Restrict to one status if provided (published, draft, sold, archived)
+            sku: SKU prefix
+        
+        Returns:
+            Page of Product objects
+        """
+        filters = []
+        if category_id is not None:
+            filters.append(Product.category_id == category_id)
+        if subcategory_id is not None:
+            filters.append(Product.subcategory_id == subcategory_id)
+        if status is not None:
+            filters.append(Product.status == status)
+        if sku:
+            filters.append(self.repository.sku_prefix_filter(sku))
+        return self.repository.get_page(**vars(page_request), filters=filters)
@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session
 from app.models import Role
 from app.repositories.role_repository import RoleRepository
 from app.core.exceptions import NotFoundError, ConflictError
+from app.core.auth_cache import principal_cache
+from app.core.permission_matrix import permission_matrix
+from app.core.pagination import Page, PageRequest
 
 
 class RoleService:
@@ -62,6 +65,10 @@ class RoleService:
         """Get all roles with pagination"""
         return self.repository.get_all(skip=skip, limit=limit)
     
+    def get_roles_page(self, page_request: PageRequest) -> Page[Role]:
+        """Get a page of roles (keyset pagination, see BaseRepository.get_page)"""
+        return self.repository.get_page(**vars(page_request))
+    
     def update_role(self, role_id: int, name: Optional[str] = None, description: Optional[str] = None) -> Role:
         """
         Update a role
@@ -91,6 +98,9 @@ class RoleService:
         
         self.db.commit()
         self.db.refresh(role)
+        # Le nom du rôle (ex: "admin") est mis en cache avec les utilisateurs
+        principal_cache.clear()
+        permission_matrix.invalidate()
         
         return role
     
@@ -117,6 +127,8 @@ class RoleService:
         
         self.repository.delete(role_id)
         self.db.commit()
+        # Les permissions du rôle supprimé disparaissent de la matrice
+        permission_matrix.invalidate()
         
         return True
 
@@ -0,0 +1,175 @@
+"""
+RollupRefresh service - Incremental refresh of rollup tables driven by updated_at watermarks
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.repositories.customer_cohort_repository import CustomerCohortRepository
+from app.repositories.customer_score_repository import CustomerScoreRepository
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.repositories.order_change_repository import OrderChangeRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.repositories.rollup_watermark_repository import RollupWatermarkRepository
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+
+# (since) -> (buckets touchés, plus grand timestamp vu)
+ChangeDetector = Callable[[Optional[datetime]], Tuple[Set, Optional[datetime]]]
+
+# Source des anciens buckets (journal rempli par triggers), purgée une fois lue par tous ses consommateurs
+ORDER_CHANGES_SOURCE = "order_changes"
+
+# Une transaction plus longue que ce délai pourrait committer des lignes sous le watermark
+WATERMARK_SAFETY_LAG = timedelta(minutes=10)
+
+
+class RollupRefreshService:
+    """
+    Service for incremental rollup refreshes
+    Remembers the last processed timestamp per rollup and source table, and
+    rebuilds only the buckets touched by rows changed since then.
+    Buckets left by a change (old date, marketplace or customer, deleted rows)
+    come from the order_changes log.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.watermark_repository = RollupWatermarkRepository(db)
+        self.sales_repository = DailySalesRollupRepository(db)
+        self.item_repository = OrderItemRepository(db)
+        self.change_repository = OrderChangeRepository(db)
+        self.product_sales_repository = ProductDailySalesRepository(db)
+        self.cohort_repository = CustomerCohortRepository(db)
+        self.score_repository = CustomerScoreRepository(db)
+
+    def _rollups(self) -> Dict[str, Tuple[Dict[str, ChangeDetector], Callable[[Iterable], int]]]:
+        """
+        Registry of refreshable rollups
+
+        Returns:
+            Dict rollup name -> ({source table: change detector}, bucket rebuild function)
+        """
+        return {
+            "daily_sales_rollup": (
+                {
+                    "orders": self.sales_repository.get_buckets_for_changed_orders,
+                    "order_items": self.sales_repository.get_buckets_for_new_items,
+                    ORDER_CHANGES_SOURCE: self.change_repository.get_changed_buckets,
+                },
+                self.sales_repository.rebuild_buckets,
+            ),
+            # Mois dont les commandes (imports) ou les coûts ont changé hors OperationalCostService,
+            # et mois quittés par des commandes (le poids de leurs lignes y reste sinon)
+            "operational_cost_allocation": (
+                {
+                    "orders": self.item_repository.get_months_for_changed_orders,
+                    "operational_costs": self.item_repository.get_months_for_changed_costs,
+                    ORDER_CHANGES_SOURCE: self.change_repository.get_changed_months,
+                },
+                lambda months: self.item_repository.allocate_operational_costs(
+                    months, settings.OPERATIONAL_COST_ALLOCATION_BASIS
+                ),
+            ),
+            # Mois entiers: l'allocation des coûts d'un mois change la marge de toutes ses lignes
+            # (placé après operational_cost_allocation pour en reprendre les marges)
+            "product_daily_sales": (
+                {
+                    "orders": self.item_repository.get_months_for_changed_orders,
+                    "order_items": self.product_sales_repository.get_months_for_new_items,
+                    "operational_costs": self.item_repository.get_months_for_changed_costs,
+                    ORDER_CHANGES_SOURCE: self.change_repository.get_changed_months,
+                },
+                self.product_sales_repository.rebuild_months,
+            ),
+            # Clients dont les commandes ont changé, anciens clients des commandes réattribuées
+            # ou supprimées compris: leur cohorte et celles qu'ils quittent
+            "customer_cohorts": (
+                {
+                    "orders": self.cohort_repository.get_customers_for_changed_orders,
+                    ORDER_CHANGES_SOURCE: self.change_repository.get_changed_customers,
+                },
+                self.cohort_repository.rebuild_customers,
+            ),
+            # Agrégats des clients dont les commandes ont changé (anciens clients compris: leur
+            # ligne disparaît s'il ne leur reste aucune commande), puis reclassement de tous les scores
+            "customer_scores": (
+                {
+                    "orders": self.cohort_repository.get_customers_for_changed_orders,
+                    ORDER_CHANGES_SOURCE: self.change_repository.get_changed_customers,
+                },
+                self.score_repository.rebuild_customers,
+            ),
+        }
+
+    def get_rollup_names(self) -> List[str]:
+        """Get the names of the refreshable rollups"""
+        return list(self._rollups().keys())
+
+    def refresh(self, rollups: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Refresh rollups incrementally
+
+        Rows strictly newer than the stored watermark are considered. Since
+        now() is the transaction start time, a row may become visible after
+        newer ones: watermarks therefore never advance past the database clock
+        minus WATERMARK_SAFETY_LAG, and the few rows above that cutoff are
+        simply reprocessed on the next run (bucket rebuilds are idempotent).
+        Each rollup is rebuilt and its watermarks advanced in one transaction.
+
+        Args:
+            rollups: Rollup names to refresh, all of them if None
+
+        Returns:
+            Dict rollup name -> {"buckets": n, "rows": n}
+
+        Raises:
+            ValidationError: If an unknown rollup name is given
+        """
+        registry = self._rollups()
+        names = rollups or list(registry.keys())
+        unknown = [name for name in names if name not in registry]
+        if unknown:
+            raise ValidationError(
+                f"Unknown rollup(s): {', '.join(unknown)}. Must be one of: {', '.join(registry.keys())}"
+            )
+
+        cutoff = self.db.execute(select(func.now())).scalar().replace(tzinfo=None) - WATERMARK_SAFETY_LAG
+
+        stats = {}
+        for name in names:
+            sources, rebuild = registry[name]
+            buckets: Set = set()
+            new_watermarks: Dict[str, datetime] = {}
+
+            for source, detect_changes in sources.items():
+                key = f"{name}:{source}"
+                touched, newest = detect_changes(self.watermark_repository.get(key))
+                buckets |= touched
+                if newest is not None:
+                    new_watermarks[key] = min(newest, cutoff)
+
+            try:
+                rows = rebuild(buckets) if buckets else 0
+                for key, newest in new_watermarks.items():
+                    self.watermark_repository.set(key, newest)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            stats[name] = {"buckets": len(buckets), "rows": rows}
+
+        self._purge_order_changes(registry)
+        return stats
+
+    def _purge_order_changes(self, registry) -> None:
+        """Delete the order changes below the watermark of every rollup reading them"""
+        keys = [f"{name}:{ORDER_CHANGES_SOURCE}" for name, (sources, _) in registry.items() if ORDER_CHANGES_SOURCE in sources]
+        watermarks = [self.watermark_repository.get(key) for key in keys]
+        # Un consommateur jamais rafraîchi n'a encore rien lu
+        if not watermarks or None in watermarks:
+            return
+        self.change_repository.purge(min(watermarks))
+        self.db.commit()
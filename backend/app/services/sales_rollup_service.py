@@ -0,0 +1,67 @@
+"""
+SalesRollup service - Business logic for maintaining the daily sales rollup
+"""
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.core.exceptions import ValidationError
+
+
+class SalesRollupService:
+    """
+    Service for the daily sales rollup
+    Rebuilds rollup buckets from orders so dashboard KPIs never scan the raw tables
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = DailySalesRollupRepository(db)
+
+    def refresh_range(self, start_day: date, end_day: date) -> int:
+        """
+        Rebuild the rollup for a range of days
+
+        Args:
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+
+        Returns:
+            Number of rollup rows written
+
+        Raises:
+            ValidationError: If start_day is after end_day
+        """
+        if start_day > end_day:
+            raise ValidationError("Start date must be before or equal to end date")
+
+        written = self.repository.rebuild_range(start_day, end_day)
+        self.db.commit()
+        return written
+
+    def refresh_recent(self, days: int = 3) -> int:
+        """
+        Rebuild the last N days (late orders and status changes land on recent days)
+
+        Args:
+            days: Number of days to rebuild, today included
+
+        Returns:
+            Number of rollup rows written
+        """
+        if days < 1:
+            raise ValidationError("Days must be greater than 0")
+
+        today = date.today()
+        return self.refresh_range(today - timedelta(days=days - 1), today)
+
+    def rebuild_all(self) -> int:
+        """
+        Rebuild the whole rollup from the first to the last order
+
+        Returns:
+            Number of rollup rows written
+        """
+        first_day, last_day = self.repository.get_order_date_bounds()
+        if first_day is None:
+            return 0
+        return self.refresh_range(first_day, last_day)
@@ -0,0 +1,61 @@
+"""
+Search service - Business logic for the global search
+"""
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.repositories.search_repository import SearchRepository, build_prefix_tsquery
+from app.core.constants import SearchEntity
+from app.core.exceptions import ValidationError
+
+# Saisie minimale avant de lancer une recherche
+MIN_SEARCH_LENGTH = 2
+
+
+class SearchService:
+    """
+    Service for the global search (products, customers, orders)
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = SearchRepository(db)
+    
+    def search(self, term: str, entities: Optional[List[str]] = None, limit: int = 20) -> List[dict]:
+        """
+        Search products, customers and orders
+        
+        Args:
+            term: Search input (words are matched as prefixes)
+            entities: SearchEntity values to search, all if None
+            limit: Maximum number of results
+        
+        Returns:
+            List of dicts with type, id, label, detail and rank, best matches first
+        
+        Raises:
+            ValidationError: If the input is too short or an entity is unknown
+        """
+        term = term.strip()
+        if len(term) < MIN_SEARCH_LENGTH:
+            raise ValidationError(f"Search must contain at least {MIN_SEARCH_LENGTH} characters")
+        entities = entities or SearchEntity.get_all_values()
+        unknown = [entity for entity in entities if entity not in SearchEntity.get_all_values()]
+        if unknown:
+            raise ValidationError(
+                f"Invalid search type. Must be one of: {', '.join(SearchEntity.get_all_values())}"
+            )
+        
+        tsquery = build_prefix_tsquery(term)
+        if tsquery is None:
+            return []
+        # Ordre stable des branches, sans doublons
+        entities = [entity for entity in SearchEntity.get_all_values() if entity in entities]
+        return self.repository.search(term, tsquery, entities, limit)
+    
+    def fuzzy_available(self) -> bool:
+        """
+        Whether fuzzy and infix matching is enabled (pg_trgm installed)
+        
+        Without it the search is degraded to full-text prefix matching.
+        """
+        return self.repository.trigram_available()
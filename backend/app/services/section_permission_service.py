@@ -6,7 +6,9 @@ from sqlalchemy.orm import Session
 from app.repositories.section_permission_repository import SectionPermissionRepository
 from app.repositories.role_repository import RoleRepository
 from app.models import SectionPermission
-from app.core.exceptions import NotFoundError, ValidationError
+from app.core.exceptions import ConflictError, NotFoundError, ValidationError
+from app.core.permission_matrix import permission_matrix
+from app.core.pagination import Page, PageRequest
 
 
 class SectionPermissionService:
@@ -38,15 +40,7 @@ class SectionPermissionService:
         if action not in ["view", "edit"]:
             raise ValidationError(f"Invalid action: {action}. Must be 'view' or 'edit'")
         
-        permission = self.repository.get_by_role_and_section(role_id, section)
-        
-        if not permission:
-            return False
-        
-        if action == "view":
-            return permission.can_view
-        else:  # action == "edit"
-            return permission.can_edit
+        return permission_matrix.allows([role_id], section, action)
     
     def set_permission(self, role_id: int, section: str, can_view: bool, can_edit: bool) -> SectionPermission:
         """
@@ -74,19 +68,32 @@ class SectionPermissionService:
         
         if existing_permission:
             # Mettre à jour la permission existante
-            return self.repository.update(
+            permission = self.repository.update(
                 existing_permission.id,
                 can_view=can_view,
                 can_edit=can_edit
             )
         else:
             # Créer une nouvelle permission
-            return self.repository.create(
-                role_id=role_id,
-                section=section,
-                can_view=can_view,
-                can_edit=can_edit
-            )
+            try:
+                permission = self.repository.create(
+                    role_id=role_id,
+                    section=section,
+                    can_view=can_view,
+                    can_edit=can_edit
+                )
+            except ConflictError:
+                # Créée entre-temps par une requête concurrente (uq_section_permissions_role_section)
+                existing_permission = self.repository.get_by_role_and_section(role_id, section)
+                if not existing_permission:
+                    raise
+                permission = self.repository.update(
+                    existing_permission.id,
+                    can_view=can_view,
+                    can_edit=can_edit
+                )
+        permission_matrix.invalidate()
+        return permission
     
     def get_all_permissions_for_role(self, role_id: int) -> List[SectionPermission]:
         """
@@ -124,7 +131,10 @@ class SectionPermissionService:
         Returns:
             True if deleted, False if not found
         """
-        return self.repository.delete_by_role_and_section(role_id, section)
+        deleted = self.repository.delete_by_role_and_section(role_id, section)
+        if deleted:
+            permission_matrix.invalidate()
+        return deleted
     
     def get_all_permissions(self, skip: int = 0, limit: int = 100) -> List[SectionPermission]:
         """
@@ -138,4 +148,28 @@ class SectionPermissionService:
             List of SectionPermission objects
         """
         return self.repository.get_all(skip=skip, limit=limit)
+    
+    def get_permissions_page(
+        self,
+        page_request: PageRequest,
+        role_id: Optional[int] = None,
+        section: Optional[str] = None
+    ) -> Page[SectionPermission]:
+        """
+        Get a page of permissions (keyset pagination, see BaseRepository.get_page)
+        
+        Args:
+            page_request: Pagination parameters
+            role_id: Restrict to one role if provided
+            section: Restrict to one section if provided
+        
+        Returns:
+            Page of SectionPermission objects
+        """
+        filters = []
+        if role_id is not None:
+            filters.append(SectionPermission.role_id == role_id)
+        if section is not None:
+            filters.append(SectionPermission.section == section)
+        return self.repository.get_page(**vars(page_request), filters=filters)
 
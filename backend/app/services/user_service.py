@@ -9,6 +9,9 @@ from app.repositories.role_repository import RoleRepository
 from app.dto.user_dto import UserCreate, UserUpdate
 from app.models import User, UserRole
 from app.core.exceptions import NotFoundError, ConflictError, ValidationError
+from app.core.auth_cache import principal_cache
+from app.core.permission_matrix import permission_matrix
+from app.core.pagination import Page, PageRequest
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -110,6 +113,10 @@ class UserService:
         """Get all users with pagination"""
         return self.repository.get_all(skip=skip, limit=limit)
     
+    def get_users_page(self, page_request: PageRequest) -> Page[User]:
+        """Get a page of users (keyset pagination, see BaseRepository.get_page)"""
+        return self.repository.get_page(**vars(page_request))
+    
     def update_user(self, user_id: int, user_data: UserUpdate) -> User:
         """Update a user"""
         # Check if user exists
@@ -127,11 +134,18 @@ class UserService:
         if "password" in update_data:
             update_data["hashed_password"] = self._hash_password(update_data.pop("password"))
         
-        return self.repository.update(user_id, **update_data)
+        user = self.repository.update(user_id, **update_data)
+        # Le profil / statut actif mis en cache n'est plus à jour
+        principal_cache.invalidate_user(user_id)
+        permission_matrix.invalidate()
+        return user
     
     def delete_user(self, user_id: int) -> bool:
         """Delete a user"""
-        return self.repository.delete(user_id)
+        deleted = self.repository.delete(user_id)
+        principal_cache.invalidate_user(user_id)
+        permission_matrix.invalidate()
+        return deleted
     
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate a user by email and password"""
@@ -179,6 +193,8 @@ class UserService:
         user_role = UserRole(user_id=user_id, role_id=role_id)
         self.db.add(user_role)
         self.db.commit()
+        principal_cache.invalidate_user(user_id)
+        permission_matrix.invalidate()
         self.db.refresh(user)
         
         # Reload user with roles
@@ -223,6 +239,8 @@ class UserService:
         # Remove the role
         self.db.delete(user_role)
         self.db.commit()
+        principal_cache.invalidate_user(user_id)
+        permission_matrix.invalidate()
         self.db.refresh(user)
         
         # Reload user with roles
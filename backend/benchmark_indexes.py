@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmark des index de clés étrangères (migration add_foreign_key_indexes)
+
+Génère des données (préfixe BENCH-IDX-), puis compare les plans et les temps
+des jointures / filtres analytiques avec les index, puis sans (DROP INDEX dans
+la même transaction). Tout est annulé à la fin (ROLLBACK): ni les données ni
+les index ne sont modifiés, les statistiques sont recalculées. Les tables restent verrouillées pendant la mesure,
+à lancer sur une base de développement.
+
+Usage:
+    python benchmark_indexes.py --orders 50000
+    python benchmark_indexes.py --orders 50000 --plans    # plans complets
+"""
+import sys
+import argparse
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+PREFIX = "BENCH-IDX-"
+
+# Tables analysées après génération des données
+ANALYZED_TABLES = ("customers", "products", "orders", "order_items", "operational_costs", "section_permissions")
+
+# Index et contrainte créés par la migration add_foreign_key_indexes
+INDEXES = [
+    "ix_order_items_order_id",
+    "ix_order_items_product_id",
+    "ix_orders_customer_id_order_date",
+    "ix_products_subcategory_id",
+    "ix_operational_costs_month_category",
+]
+UNIQUE_CONSTRAINT = ("section_permissions", "uq_section_permissions_role_section")
+
+# Requêtes mesurées: (libellé, SQL). Les paramètres viennent de sample_parameters()
+QUERIES = [
+    (
+        "Lignes d'une commande",
+        "SELECT * FROM order_items WHERE order_id = :order_id",
+    ),
+    (
+        "Commandes + lignes d'un client",
+        "SELECT o.id, o.order_date, oi.product_name, oi.total_price_ttc"
+        " FROM orders o JOIN order_items oi ON oi.order_id = o.id AND oi.order_date = o.order_date"
+        " WHERE o.customer_id = :customer_id ORDER BY o.order_date",
+    ),
+    (
+        "Première commande d'un client",
+        "SELECT min(order_date) FROM orders WHERE customer_id = :customer_id",
+    ),
+    (
+        "Ventes d'un produit",
+        "SELECT sum(quantity), sum(total_price_ht) FROM order_items WHERE product_id = :product_id",
+    ),
+    (
+        "Produits d'une sous-catégorie",
+        "SELECT count(*) FROM products WHERE subcategory_id = :subcategory_id",
+    ),
+    (
+        "Coûts d'un mois par catégorie",
+        "SELECT category, sum(amount) FROM operational_costs WHERE month = :month GROUP BY category",
+    ),
+    (
+        "Permission d'un rôle sur une section",
+        "SELECT can_view, can_edit FROM section_permissions WHERE role_id = :role_id AND section = :section",
+    ),
+]
+
+
+def seed(db, orders: int) -> None:
+    """Génère clients, produits, commandes, lignes, coûts et permissions de test (ensembliste)"""
+    customers = max(orders // 5, 1)
+    db.execute(text("INSERT INTO categories (name) VALUES (:name), (:sub)"), {
+        "name": f"{PREFIX}cat", "sub": f"{PREFIX}sub"
+    })
+    db.execute(text("INSERT INTO marketplaces (name) VALUES (:name)"), {"name": f"{PREFIX}mkt"})
+    db.execute(text("""
+        INSERT INTO customers (email, created_at, updated_at)
+        SELECT :prefix || n || '@bench.invalid', now(), now() FROM generate_series(1, :customers) AS n
+    """), {"prefix": PREFIX, "customers": customers})
+    db.execute(text("""
+        INSERT INTO products (sku, name, category_id, subcategory_id, created_at, updated_at)
+        SELECT :prefix || n, 'Produit ' || n,
+               (SELECT id FROM categories WHERE name = :prefix || 'cat'),
+               CASE WHEN n % 10 = 0 THEN (SELECT id FROM categories WHERE name = :prefix || 'sub') END,
+               now(), now()
+        FROM generate_series(1, 2000) AS n
+    """), {"prefix": PREFIX})
+    # orders / order_items sont partitionnées par mois: partitions des deux années générées
+    db.execute(text("""
+        SELECT ensure_monthly_partitions(parent, date '2024-01-01', date '2025-12-01')
+        FROM (VALUES ('orders'::regclass), ('order_items'::regclass)) AS tables (parent)
+    """))
+    db.execute(text("""
+        INSERT INTO orders (order_number, customer_id, marketplace_id, order_date,
+                            subtotal_ht, total_ht, total_ttc, status, created_at, updated_at)
+        SELECT :prefix || n, c.first_id + (n * 7919) % :customers,
+               (SELECT id FROM marketplaces WHERE name = :prefix || 'mkt'),
+               timestamp '2024-01-01' + (n % 730) * interval '1 day' + (n % 24) * interval '1 hour',
+               20, 20, 24, 'completed', now(), now()
+        FROM generate_series(1, :orders) AS n,
+             (SELECT min(id) AS first_id FROM customers WHERE email LIKE :prefix || '%') AS c
+    """), {"prefix": PREFIX, "orders": orders, "customers": customers})
+    db.execute(text("""
+        INSERT INTO order_items (order_id, order_date, product_id, product_name, quantity, unit_price_ht, unit_price_ttc,
+                                 total_price_ht, total_price_ttc, created_at)
+        SELECT o.id, o.order_date, p.first_id + (o.id * 31 + line) % 2000, 'Produit', 1, 10, 12, 10, 12, now()
+        FROM orders o
+        CROSS JOIN generate_series(1, 2) AS line
+        CROSS JOIN (SELECT min(id) AS first_id FROM products WHERE sku LIKE :prefix || '%') AS p
+        WHERE o.order_number LIKE :prefix || '%'
+    """), {"prefix": PREFIX})
+    db.execute(text("""
+        INSERT INTO users (name, email, hashed_password) VALUES ('bench', :prefix || 'user@bench.invalid', 'x')
+    """), {"prefix": PREFIX})
+    db.execute(text("""
+        INSERT INTO operational_costs (month, amount, category, created_by, created_at, updated_at)
+        SELECT date '2020-01-01' + (n % 120) * interval '1 month', 10, 'divers',
+               (SELECT id FROM users WHERE email = :prefix || 'user@bench.invalid'), now(), now()
+        FROM generate_series(1, 5000) AS n
+    """), {"prefix": PREFIX})
+    db.execute(text("INSERT INTO roles (name) VALUES (:name)"), {"name": f"{PREFIX}role"})
+    db.execute(text("""
+        INSERT INTO section_permissions (role_id, section, can_view, can_edit)
+        SELECT r.id, 'section-' || n, true, false
+        FROM generate_series(1, 5000) AS n, (SELECT id FROM roles WHERE name = :prefix || 'role') AS r
+    """), {"prefix": PREFIX})
+    for table in ANALYZED_TABLES:
+        db.execute(text(f"ANALYZE {table}"))
+
+
+def sample_parameters(db) -> dict:
+    """Identifiants de test utilisés par les requêtes mesurées"""
+    return dict(db.execute(text("""
+        SELECT
+            (SELECT max(id) FROM orders WHERE order_number LIKE :prefix || '%') AS order_id,
+            (SELECT max(customer_id) FROM orders WHERE order_number LIKE :prefix || '%') AS customer_id,
+            (SELECT max(id) FROM products WHERE sku LIKE :prefix || '%') AS product_id,
+            (SELECT id FROM categories WHERE name = :prefix || 'sub') AS subcategory_id,
+            date '2021-03-01' AS month,
+            (SELECT id FROM roles WHERE name = :prefix || 'role') AS role_id,
+            'section-42' AS section
+    """), {"prefix": PREFIX}).one()._mapping)
+
+
+def explain(db, sql: str, parameters: dict):
+    """(lignes du plan, temps d'exécution en ms)"""
+    lines = [row[0] for row in db.execute(text(f"EXPLAIN (ANALYZE, COSTS OFF) {sql}"), parameters)]
+    execution = next((line for line in lines if line.startswith("Execution Time")), "Execution Time: 0 ms")
+    return lines, float(execution.split(":")[1].split()[0])
+
+
+def measure(db, parameters: dict) -> list:
+    """Plan et meilleur temps sur 3 exécutions de chaque requête"""
+    results = []
+    for label, sql in QUERIES:
+        runs = [explain(db, sql, parameters) for _ in range(3)]
+        results.append((label, runs[-1][0], min(duration for _, duration in runs)))
+    return results
+
+
+def scan_lines(plan: list) -> list:
+    """Noeuds d'accès aux tables d'un plan (Seq Scan, Index Scan...)"""
+    return [line.strip().lstrip("-> ").split(" (actual")[0] for line in plan if "Scan" in line]
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(description="Comparer les plans avec et sans les index de clés étrangères")
+    parser.add_argument("--orders", type=int, default=50000, help="Nombre de commandes générées (2 lignes chacune)")
+    parser.add_argument("--plans", action="store_true", help="Afficher les plans complets")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        missing = [
+            name for name in INDEXES
+            if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None
+        ]
+        if missing:
+            print(f"❌ Index absents ({', '.join(missing)}): lancer d'abord 'alembic upgrade head'")
+            sys.exit(1)
+
+        print(f"Génération de {args.orders} commande(s)...")
+        seed(db, args.orders)
+        parameters = sample_parameters(db)
+
+        after = measure(db, parameters)
+        db.execute(text(f"ALTER TABLE {UNIQUE_CONSTRAINT[0]} DROP CONSTRAINT {UNIQUE_CONSTRAINT[1]}"))
+        for name in INDEXES:
+            db.execute(text(f"DROP INDEX {name}"))
+        before = measure(db, parameters)
+
+        for (label, plan_before, before_ms), (_, plan_after, after_ms) in zip(before, after):
+            print(f"\n{label}")
+            print(f"  sans index : {before_ms:8.2f} ms  {', '.join(scan_lines(plan_before))}")
+            print(f"  avec index : {after_ms:8.2f} ms  {', '.join(scan_lines(plan_after))}")
+            if args.plans:
+                print("  --- plan sans index ---")
+                print("\n".join(f"    {line}" for line in plan_before))
+                print("  --- plan avec index ---")
+                print("\n".join(f"    {line}" for line in plan_after))
+        print("\n✓ Benchmark terminé (données et index restaurés)")
+    finally:
+        # Données de test et suppressions d'index annulées
+        db.rollback()
+        # pg_class.reltuples n'est pas transactionnel: recalculer les statistiques sans les données de test
+        for table in ANALYZED_TABLES:
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script de maintenance des partitions mensuelles de orders / order_items
+
+Usage:
+    python manage_partitions.py                        # crée les partitions des prochains mois (cron)
+    python manage_partitions.py --months-ahead 6
+    python manage_partitions.py --list
+    python manage_partitions.py --detach-before 2024-01-01          # archive les mois antérieurs
+    python manage_partitions.py --detach-before 2024-01-01 --drop   # et les supprime
+"""
+import sys
+import argparse
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.services.partition_service import PartitionService
+from app.core.exceptions import BaseAppException
+
+
+def parse_day(value: str):
+    """Parse une date au format YYYY-MM-DD pour argparse"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide: {value} (format attendu: YYYY-MM-DD)")
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Créer, lister ou détacher les partitions mensuelles des commandes"
+    )
+    parser.add_argument("--months-ahead", type=int, help="Mois créés à l'avance après le mois courant")
+    parser.add_argument("--list", action="store_true", help="Lister les partitions attachées")
+    parser.add_argument("--detach-before", type=parse_day, help="Détacher les mois antérieurs à cette date")
+    parser.add_argument("--drop", action="store_true", help="Supprimer les partitions détachées")
+    args = parser.parse_args()
+    if args.drop and not args.detach_before:
+        parser.error("--drop nécessite --detach-before")
+
+    db = SessionLocal()
+    try:
+        service = PartitionService(db)
+        if args.list:
+            for table, partitions in service.get_partitions().items():
+                print(f"{table}: {len(partitions)} partition(s)")
+                for name, lower, upper, rows in partitions:
+                    print(f"  {name:<24} {lower:%Y-%m-%d} → {upper:%Y-%m-%d}  ~{rows} ligne(s)")
+        elif args.detach_before:
+            detached = service.detach_before(args.detach_before, drop=args.drop)
+            action = "supprimée(s)" if args.drop else "détachée(s)"
+            print(f"✓ {len(detached)} partition(s) {action}: {', '.join(detached) or 'aucune'}")
+        else:
+            created = service.ensure_future_partitions(args.months_ahead)
+            for table, count in created.items():
+                print(f"✓ {table}: {count} partition(s) créée(s)")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Script pour recalculer les marges des lignes de commande (order_items)
+
+A lancer après un changement de taux de commission, de prix d'achat ou de
+frais opérationnels. Seules les lignes dont les marges changent sont réécrites.
+
+Usage:
+    python recompute_margins.py                              # toutes les lignes
+    python recompute_margins.py --marketplace-id 2
+    python recompute_margins.py --start 2025-01-01 --end 2025-01-31
+"""
+import sys
+import argparse
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.services.margin_service import MarginService
+from app.core.exceptions import BaseAppException
+
+
+def parse_day(value: str):
+    """Parse une date au format YYYY-MM-DD pour argparse"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide: {value} (format attendu: YYYY-MM-DD)")
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Recalculer les marges des lignes de commande"
+    )
+    parser.add_argument("--marketplace-id", type=int, help="Limiter à une marketplace")
+    parser.add_argument("--start", type=parse_day, help="Premier jour de commande (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_day, help="Dernier jour de commande (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = MarginService(db).recompute(args.marketplace_id, args.start, args.end)
+        print(f"✓ Marges recalculées ({updated} ligne(s) modifiée(s))")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Script pour rafraîchir les cohortes clients (customer_cohorts / customer_cohort_activity)
+
+Usage:
+    python refresh_cohorts.py           # incrémental (clients des commandes modifiées depuis le dernier passage)
+    python refresh_cohorts.py --full    # reconstruire toutes les cohortes
+"""
+import sys
+import argparse
+from app.core.database import SessionLocal
+from app.services.cohort_service import CohortService
+from app.services.rollup_refresh_service import RollupRefreshService
+from app.core.exceptions import BaseAppException
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Rafraîchir les cohortes clients à partir des commandes"
+    )
+    parser.add_argument("--full", action="store_true", help="Reconstruire toutes les cohortes")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.full:
+            rows = CohortService(db).rebuild_all()
+        else:
+            stats = RollupRefreshService(db).refresh(["customer_cohorts"])["customer_cohorts"]
+            print(f"✓ {stats['buckets']} client(s) avec des commandes modifiées depuis le dernier passage")
+            rows = stats["rows"]
+        print(f"✓ Cohortes rafraîchies ({rows} ligne(s) écrite(s))")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
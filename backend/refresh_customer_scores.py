@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Script pour rafraîchir les scores RFM et la valeur vie des clients (customer_scores)
+
+Usage:
+    python refresh_customer_scores.py           # incrémental (clients des commandes modifiées depuis le dernier passage)
+    python refresh_customer_scores.py --full    # recalculer tous les clients
+"""
+import sys
+import argparse
+from app.core.database import SessionLocal
+from app.services.customer_score_service import CustomerScoreService
+from app.services.rollup_refresh_service import RollupRefreshService
+from app.core.exceptions import BaseAppException
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Rafraîchir les scores RFM et la valeur vie des clients à partir des commandes"
+    )
+    parser.add_argument("--full", action="store_true", help="Recalculer tous les clients")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.full:
+            updated = CustomerScoreService(db).rebuild_all()
+        else:
+            stats = RollupRefreshService(db).refresh(["customer_scores"])["customer_scores"]
+            print(f"✓ {stats['buckets']} client(s) avec des commandes modifiées depuis le dernier passage")
+            updated = stats["rows"]
+        print(f"✓ Scores rafraîchis ({updated} client(s) changé(s) de score ou de segment)")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Script pour rafraîchir la table product_daily_sales (ventes par produit et par jour)
+
+Usage:
+    python refresh_product_sales.py                              # incrémental (watermarks)
+    python refresh_product_sales.py --start 2025-01-01 --end 2025-03-31
+    python refresh_product_sales.py --full
+
+Les mois sont toujours recalculés en entier.
+"""
+import sys
+import argparse
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.services.product_performance_service import ProductPerformanceService
+from app.services.rollup_refresh_service import RollupRefreshService
+from app.core.exceptions import BaseAppException
+
+
+def parse_day(value: str):
+    """Parse une date au format YYYY-MM-DD pour argparse"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide: {value} (format attendu: YYYY-MM-DD)")
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Rafraîchir la table product_daily_sales à partir des lignes de commande"
+    )
+    parser.add_argument("--start", type=parse_day, help="Jour du premier mois à recalculer (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_day, help="Jour du dernier mois à recalculer (YYYY-MM-DD)")
+    parser.add_argument("--full", action="store_true", help="Reconstruire toute la table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = ProductPerformanceService(db)
+        if args.full:
+            rows = service.rebuild_all()
+        elif args.start or args.end:
+            if not (args.start and args.end):
+                parser.error("--start et --end doivent être fournis ensemble")
+            rows = service.refresh_range(args.start, args.end)
+        else:
+            stats = RollupRefreshService(db).refresh(["product_daily_sales"])["product_daily_sales"]
+            print(f"✓ {stats['buckets']} mois modifié(s) depuis le dernier passage")
+            rows = stats["rows"]
+        print(f"✓ product_daily_sales rafraîchi ({rows} ligne(s) écrite(s))")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script pour rafraîchir la table daily_sales_rollup
+
+Usage:
+    python refresh_sales_rollup.py                 # incrémental (watermarks updated_at)
+    python refresh_sales_rollup.py --days 7
+    python refresh_sales_rollup.py --start 2025-01-01 --end 2025-01-31
+    python refresh_sales_rollup.py --full
+"""
+import sys
+import argparse
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.services.sales_rollup_service import SalesRollupService
+from app.services.rollup_refresh_service import RollupRefreshService
+from app.core.exceptions import BaseAppException
+
+
+def parse_day(value: str):
+    """Parse une date au format YYYY-MM-DD pour argparse"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide: {value} (format attendu: YYYY-MM-DD)")
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(
+        description="Rafraîchir la table daily_sales_rollup à partir des commandes"
+    )
+    parser.add_argument("--days", type=int, help="Nombre de jours récents à recalculer")
+    parser.add_argument("--start", type=parse_day, help="Premier jour à recalculer (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_day, help="Dernier jour à recalculer (YYYY-MM-DD)")
+    parser.add_argument("--full", action="store_true", help="Reconstruire tout le rollup")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = SalesRollupService(db)
+        if args.full:
+            rows = service.rebuild_all()
+        elif args.start or args.end:
+            if not (args.start and args.end):
+                parser.error("--start et --end doivent être fournis ensemble")
+            rows = service.refresh_range(args.start, args.end)
+        elif args.days:
+            rows = service.refresh_recent(args.days)
+        else:
+            stats = RollupRefreshService(db).refresh(["daily_sales_rollup"])["daily_sales_rollup"]
+            print(f"✓ {stats['buckets']} bucket(s) (jour, marketplace) modifié(s) depuis le dernier passage")
+            rows = stats["rows"]
+        print(f"✓ daily_sales_rollup rafraîchi ({rows} ligne(s) écrite(s))")
+    except BaseAppException as e:
+        print(f"❌ Erreur: {e.message}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
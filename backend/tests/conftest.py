@@ -0,0 +1,133 @@
+"""
+Shared fixtures
+"""
+import itertools
+import pytest
+from datetime import date
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.repositories.partition_repository import PartitionRepository
+
+
+@pytest.fixture
+def pg_db():
+    """PostgreSQL session (settings.DATABASE_URL) rolled back after the test, skipped without database"""
+    url = settings.DATABASE_URL or ""
+    if not url.startswith("postgresql"):
+        pytest.skip("Test needs DATABASE_URL pointing to PostgreSQL")
+    engine = create_engine(url)
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQL is not reachable")
+    transaction = connection.begin()
+    # Tables de test trop petites: interdire le parcours séquentiel pour voir si un index est utilisable
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    session = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")()
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def index_names(pg_db):
+    """Function giving an index name and the names of its partition indexes (partitioned tables)"""
+    def names(index: str) -> set:
+        rows = pg_db.execute(text("""
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:index)
+        """), {"index": index}).scalars()
+        return {index, *rows}
+    return names
+
+
+class OrderFactory:
+    """
+    Seeds users, marketplaces, customers, categories, products, orders and items in a test session
+
+    Every method inserts one row and returns its id. Orders create the monthly
+    partitions of their month (orders and order_items) on first use.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._numbers = itertools.count(1)
+        self._order_dates = {}
+        self._partitioned = set()
+
+    def _insert(self, table: str, **values) -> int:
+        """INSERT one row and return its id"""
+        columns = ", ".join(values)
+        params = ", ".join(f":{column}" for column in values)
+        return self.db.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({params}) RETURNING id"), values).scalar()
+
+    def partitions(self, first_month: date, last_month: date) -> None:
+        """Create the monthly partitions of orders and order_items from first_month to last_month"""
+        repository = PartitionRepository(self.db)
+        for table in ("orders", "order_items"):
+            repository.ensure_monthly_partitions(table, first_month, last_month)
+
+    def user(self, email: str) -> int:
+        return self._insert("users", name=email.split("@")[0][:50], email=email, hashed_password="x")
+
+    def marketplace(self, name: str, commission_rate=None) -> int:
+        return self._insert("marketplaces", name=name, commission_rate=commission_rate)
+
+    def customer(self, email: str, **columns) -> int:
+        return self._insert("customers", email=email, **columns)
+
+    def category(self, name: str, parent_id: Optional[int] = None, level: int = 1) -> int:
+        return self._insert("categories", name=name, parent_id=parent_id, level=level)
+
+    def product(self, sku: str, category_id: int, **columns) -> int:
+        return self._insert("products", sku=sku, name=columns.pop("name", sku), category_id=category_id, **columns)
+
+    def order(self, customer_id: int, marketplace_id: int, day, total_ttc, total_ht=None, **columns) -> int:
+        """
+        Insert an order (subtotal_ht = total_ht, total_ttc by default)
+
+        Args:
+            day: Order date, date or ISO string
+            columns: Other orders columns (is_cancelled, order_number, created_at...)
+        """
+        order_date = date.fromisoformat(str(day)[:10])
+        month = order_date.replace(day=1)
+        if month not in self._partitioned:
+            self.partitions(month, month)
+            self._partitioned.add(month)
+        total_ht = total_ttc if total_ht is None else total_ht
+        columns.setdefault("order_number", f"FACTORY-{next(self._numbers)}")
+        order_id = self._insert(
+            "orders", customer_id=customer_id, marketplace_id=marketplace_id, order_date=str(day),
+            subtotal_ht=total_ht, total_ht=total_ht, total_ttc=total_ttc, **columns
+        )
+        self._order_dates[order_id] = str(day)
+        return order_id
+
+    def item(self, order_id: int, total_ttc, total_ht=None, quantity: int = 1, **columns) -> int:
+        """
+        Insert an item of an order created by the factory (unit prices = totals by default)
+
+        Args:
+            columns: Other order_items columns (product_id, cost_price, net_margin...)
+        """
+        total_ht = total_ttc if total_ht is None else total_ht
+        columns.setdefault("product_name", "test")
+        columns.setdefault("unit_price_ht", total_ht)
+        columns.setdefault("unit_price_ttc", total_ttc)
+        return self._insert(
+            "order_items", order_id=order_id, order_date=self._order_dates[order_id], quantity=quantity,
+            total_price_ht=total_ht, total_price_ttc=total_ttc, **columns
+        )
+
+
+@pytest.fixture
+def order_factory(pg_db):
+    """OrderFactory over the rolled back PostgreSQL session"""
+    return OrderFactory(pg_db)
@@ -0,0 +1,176 @@
+"""
+Unit tests for the authenticated principal cache
+"""
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from app.core.auth_cache import AuthenticatedUser, TTLCache
+from app.core.permission_matrix import PermissionMatrix
+from app.core.security import create_access_token, get_current_principal
+from app.repositories.section_permission_repository import SectionPermissionRepository
+from app.repositories.user_repository import UserRepository
+
+
+def _principal(user_id: int = 1, role_names=("user",)) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        id=user_id,
+        name="Test",
+        email="test@example.com",
+        is_active=True,
+        is_verified=True,
+        created_at=datetime(2025, 1, 1),
+        role_ids=tuple(range(len(role_names))),
+        role_names=tuple(role_names)
+    )
+
+
+def test_authenticated_user_is_admin():
+    """Test admin detection from role names"""
+    assert _principal(role_names=("Admin",)).is_admin
+    assert not _principal(role_names=("user",)).is_admin
+
+
+def test_ttl_cache_expiry(monkeypatch):
+    """Test that entries expire after the TTL"""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.auth_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+
+    cache.set((1, "token"), "value")
+    assert cache.get((1, "token")) == "value"
+
+    now[0] += 61
+    assert cache.get((1, "token")) is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test LRU eviction when the cache is full"""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set((1, "a"), "a")
+    cache.set((2, "b"), "b")
+    cache.get((1, "a"))
+    cache.set((3, "c"), "c")
+
+    assert cache.get((2, "b")) is None
+    assert cache.get((1, "a")) == "a"
+    assert cache.get((3, "c")) == "c"
+
+
+def test_ttl_cache_invalidate_user():
+    """Test that invalidate_user drops every token of the user only"""
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set((1, "a"), "a")
+    cache.set((1, "b"), "b")
+    cache.set((2, "c"), "c")
+
+    cache.invalidate_user(1)
+
+    assert len(cache) == 1
+    assert cache.get((2, "c")) == "c"
+
+
+def test_ttl_cache_disabled():
+    """Test that a zero TTL disables caching"""
+    cache = TTLCache(ttl_seconds=0, max_entries=10)
+    cache.set((1, "a"), "a")
+
+    assert cache.get((1, "a")) is None
+
+
+def test_get_current_principal_cache_hit_skips_database(monkeypatch):
+    """Test that a cached principal is returned without touching the session"""
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr("app.core.security.principal_cache", cache)
+    token = create_access_token({"sub": "1"})
+    principal = _principal()
+    cache.set((1, token), principal)
+
+    # db=None: toute requête SQL lèverait une AttributeError
+    assert get_current_principal(token, None) is principal
+
+
+class _NoDatabase:
+    def query(self, *args, **kwargs):
+        raise LookupError("database fallback")
+
+
+def _enriched_token(pv: str, uv=None) -> str:
+    return create_access_token({
+        "sub": "7",
+        "email": "test@example.com",
+        "name": "Test",
+        "ver": True,
+        "cat": "2025-01-01T00:00:00",
+        "rid": [1],
+        "rn": ["analyst"],
+        "perm": "1",
+        "pv": pv,
+        "uv": uv
+    })
+
+
+def test_get_current_principal_from_enriched_token(monkeypatch):
+    """Test that an up-to-date enriched token is authorized without the database"""
+    matrix = PermissionMatrix(ttl_seconds=60, loader=lambda: ([(1, "dashboard", True, False)], "v1", {}))
+    monkeypatch.setattr("app.core.security.settings.JWT_EMBED_PERMISSIONS", True)
+    monkeypatch.setattr("app.core.security.permission_matrix", matrix)
+    monkeypatch.setattr("app.core.auth_cache.permission_matrix", matrix)
+
+    principal = get_current_principal(_enriched_token("v1"), None)
+
+    assert principal.id == 7
+    assert principal.role_names == ("analyst",)
+    assert principal.can("dashboard", "view")
+    assert not principal.can("dashboard", "edit")
+
+
+def test_get_current_principal_stale_enriched_token_falls_back(monkeypatch):
+    """Test that a token with an outdated permissions version is not trusted"""
+    matrix = PermissionMatrix(ttl_seconds=60, loader=lambda: ([], "v2", {}))
+    monkeypatch.setattr("app.core.security.settings.JWT_EMBED_PERMISSIONS", True)
+    monkeypatch.setattr("app.core.security.permission_matrix", matrix)
+    monkeypatch.setattr("app.core.security.principal_cache", TTLCache(ttl_seconds=60, max_entries=10))
+
+    with pytest.raises(LookupError):
+        get_current_principal(_enriched_token("v1"), _NoDatabase())
+
+
+def test_get_current_principal_changed_user_falls_back(monkeypatch):
+    """Test that a token issued before a change of its own user is not trusted, other users' tokens are"""
+    # L'utilisateur 7 a changé (rôle, statut...) après l'émission des jetons "2025-01-01"
+    matrix = PermissionMatrix(ttl_seconds=60, loader=lambda: ([], "v1", {7: "2025-01-02T00:00:00", 8: "2025-01-01T00:00:00"}))
+    monkeypatch.setattr("app.core.security.settings.JWT_EMBED_PERMISSIONS", True)
+    monkeypatch.setattr("app.core.security.permission_matrix", matrix)
+    monkeypatch.setattr("app.core.security.principal_cache", TTLCache(ttl_seconds=60, max_entries=10))
+
+    with pytest.raises(LookupError):
+        get_current_principal(_enriched_token("v1", uv="2025-01-01T00:00:00"), _NoDatabase())
+    assert get_current_principal(_enriched_token("v1", uv="2025-01-02T00:00:00"), None).id == 7
+
+
+def test_user_changes_keep_fingerprint(pg_db):
+    """Test that registrations and per-user changes bump the user's version, not the shared fingerprint"""
+    repository = SectionPermissionRepository(pg_db)
+    fingerprint = repository.get_authorization_fingerprint()
+
+    user_id = pg_db.execute(text(
+        "INSERT INTO users (name, email, hashed_password) VALUES ('auth', 'auth-version@example.com', 'x') RETURNING id"
+    )).scalar()
+    role_id = pg_db.execute(text("INSERT INTO roles (name) VALUES ('auth-version') RETURNING id")).scalar()
+    assert UserRepository(pg_db).get_auth_version(user_id) is None
+    # Le nouveau rôle change l'empreinte partagée
+    fingerprint_with_role = repository.get_authorization_fingerprint()
+    assert fingerprint_with_role != fingerprint
+
+    pg_db.execute(text("INSERT INTO users_roles (user_id, role_id) VALUES (:user, :role)"), {"user": user_id, "role": role_id})
+    pg_db.execute(text("UPDATE users SET is_active = false WHERE id = :user"), {"user": user_id})
+
+    assert repository.get_authorization_fingerprint() == fingerprint_with_role
+    assert UserRepository(pg_db).get_auth_version(user_id) is not None
+    assert user_id in UserRepository(pg_db).get_recent_auth_versions(30)
+
+    # Suppression: la version survit à l'utilisateur
+    pg_db.execute(text("DELETE FROM users_roles WHERE user_id = :user"), {"user": user_id})
+    pg_db.execute(text("DELETE FROM users WHERE id = :user"), {"user": user_id})
+    assert user_id in UserRepository(pg_db).get_recent_auth_versions(30)
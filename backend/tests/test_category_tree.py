@@ -0,0 +1,136 @@
+"""
+Unit tests for the cached category tree and the category_closure triggers
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.core.category_tree import CategoryTree
+
+
+ROWS = [
+    (1, "Maison", None),
+    (2, "Cuisine", 1),
+    (3, "Casseroles", 2),
+    (4, "Bureau", 1),
+    (5, "Sport", None),
+]
+
+
+def _tree(rows=ROWS, ttl_seconds=60):
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return list(rows)
+
+    return CategoryTree(ttl_seconds=ttl_seconds, loader=loader), loads
+
+
+def test_children_sorted_by_name():
+    """Test the top-level categories and direct children, sorted by name"""
+    tree, _ = _tree()
+
+    assert [node.id for node in tree.children(None)] == [1, 5]
+    assert [node.id for node in tree.children(1)] == [4, 2]
+    assert tree.children(3) == []
+
+
+def test_path():
+    """Test the path from the top-level category"""
+    tree, _ = _tree()
+
+    assert [node.name for node in tree.path(3)] == ["Maison", "Cuisine", "Casseroles"]
+    assert tree.path(99) == []
+
+
+def test_to_nested():
+    """Test the nested representation of a sub-tree"""
+    tree, _ = _tree()
+
+    assert tree.to_nested(2) == [{"id": 3, "name": "Casseroles", "children": []}]
+    assert [node["name"] for node in tree.to_nested()] == ["Maison", "Sport"]
+
+
+def test_cycle_does_not_loop():
+    """Test that a parent_id cycle in the data ends the walks instead of looping"""
+    tree, _ = _tree(rows=[(1, "A", 2), (2, "B", 1)])
+
+    assert [node.id for node in tree.path(1)] == [2, 1]
+    assert tree.to_nested(1) == [{"id": 2, "name": "B", "children": []}]
+
+
+def test_loaded_once_within_ttl():
+    """Test that lookups don't reload the tree before the TTL has elapsed"""
+    tree, loads = _tree()
+
+    for _ in range(5):
+        tree.get(1)
+        tree.children(1)
+
+    assert len(loads) == 1
+
+
+def test_reloaded_after_ttl(monkeypatch):
+    """Test that the tree is reloaded once the TTL has elapsed"""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.category_tree.time.monotonic", lambda: now[0])
+    tree, loads = _tree(ttl_seconds=60)
+
+    tree.get(1)
+    now[0] += 61
+    tree.get(1)
+
+    assert len(loads) == 2
+
+
+@pytest.fixture
+def categories(pg_db):
+    """Tree Closure A > A1 > A11 and Closure B (rolled back), returns the ids"""
+    ids = {}
+    for name, parent in (("A", None), ("B", None), ("A1", "A"), ("A11", "A1")):
+        ids[name] = pg_db.execute(
+            text("INSERT INTO categories (name, parent_id) VALUES (:name, :parent) RETURNING id"),
+            {"name": f"Closure {name}", "parent": ids.get(parent)}
+        ).scalar()
+    return ids
+
+
+def _descendants(db, category_id) -> list:
+    """Category and sub-tree ids from category_closure, the category first"""
+    return list(db.execute(text(
+        "SELECT descendant_id FROM category_closure WHERE ancestor_id = :id ORDER BY depth, descendant_id"
+    ), {"id": category_id}).scalars())
+
+
+def _ancestors(db, category_id) -> list:
+    """(ancestor_id, depth) of a category from category_closure"""
+    return [tuple(row) for row in db.execute(text(
+        "SELECT ancestor_id, depth FROM category_closure WHERE descendant_id = :id ORDER BY depth"
+    ), {"id": category_id})]
+
+
+def test_closure_maintained_on_insert(pg_db, categories):
+    """Test that inserting a category adds its paths to every ancestor"""
+    ids = categories
+
+    assert _ancestors(pg_db, ids["A11"]) == [(ids["A11"], 0), (ids["A1"], 1), (ids["A"], 2)]
+    assert _descendants(pg_db, ids["A"]) == [ids["A"], ids["A1"], ids["A11"]]
+
+
+def test_closure_maintained_on_move(pg_db, categories):
+    """Test that moving a category moves its whole sub-tree"""
+    ids = categories
+
+    pg_db.execute(text("UPDATE categories SET parent_id = :b WHERE id = :a1"), {"b": ids["B"], "a1": ids["A1"]})
+
+    assert _ancestors(pg_db, ids["A11"]) == [(ids["A11"], 0), (ids["A1"], 1), (ids["B"], 2)]
+    assert _descendants(pg_db, ids["A"]) == [ids["A"]]
+
+
+def test_closure_rejects_cycle(pg_db, categories):
+    """Test that a category can't be moved below one of its descendants"""
+    ids = categories
+
+    with pytest.raises(DBAPIError):
+        with pg_db.begin_nested():
+            pg_db.execute(text("UPDATE categories SET parent_id = :a11 WHERE id = :a"), {"a11": ids["A11"], "a": ids["A"]})
@@ -0,0 +1,81 @@
+"""
+Unit tests for the customer cohorts
+"""
+import pytest
+from datetime import date
+from app.core.exceptions import ValidationError
+from app.repositories.customer_cohort_repository import CustomerCohortRepository
+from app.services.cohort_service import CohortService, months_between
+
+
+def test_months_between():
+    """Test month differences across years"""
+    assert months_between(date(2025, 1, 31), date(2025, 1, 1)) == 0
+    assert months_between(date(2024, 11, 15), date(2025, 2, 1)) == 3
+
+
+def test_cohort_validation():
+    """Test that invalid ranges are rejected before touching the database"""
+    service = CohortService(None)
+
+    with pytest.raises(ValidationError):
+        service.get_cohorts(months=0)
+    with pytest.raises(ValidationError):
+        service.get_cohorts(months=37)
+    with pytest.raises(ValidationError):
+        service.get_cohorts(date(2025, 3, 1), date(2025, 2, 1))
+    with pytest.raises(ValidationError):
+        service.get_cohorts(date(2015, 1, 1), date(2025, 1, 1))
+
+
+@pytest.fixture
+def cohort_customers(order_factory):
+    """Three customers with orders in 2001 (rolled back), returns their ids and the marketplace id"""
+    ids = {"marketplace": order_factory.marketplace("cohort-test")}
+    for name in ("a", "b", "c"):
+        ids[name] = order_factory.customer(f"cohort-{name}@example.com")
+    orders = [
+        ("a", "2001-01-05", 10, False), ("a", "2001-01-20", 20, False), ("a", "2001-03-10", 30, False),
+        ("b", "2001-01-10", 40, False), ("b", "2001-02-15", 50, False),
+        ("c", "2001-01-02", 60, True), ("c", "2001-02-01", 70, False),
+    ]
+    for name, day, total, cancelled in orders:
+        order_factory.order(ids[name], ids["marketplace"], day, total, is_cancelled=cancelled)
+    return ids
+
+
+def test_cohort_matrix(pg_db, cohort_customers):
+    """Test retention, cumulative repeat rate and revenue of the cohorts"""
+    ids = cohort_customers
+    CustomerCohortRepository(pg_db).rebuild_customers([ids["a"], ids["b"], ids["c"]])
+
+    cohorts = CohortService(pg_db).get_cohorts(date(2001, 1, 1), date(2001, 2, 28), months=3)
+
+    assert [cohort["cohort_month"] for cohort in cohorts] == [date(2001, 1, 1), date(2001, 2, 1)]
+    january, february = cohorts
+    # Janvier: a et b, la commande annulée de c ne compte pas
+    assert january["customers"] == 2
+    assert january["active_customers"] == [2, 1, 1]
+    assert january["retention_rate"] == [100.0, 50.0, 50.0]
+    assert january["repeat_rate"] == [50.0, 100.0, 100.0]
+    assert january["orders_count"] == [3, 1, 1]
+    assert january["revenue_ttc"] == [70.0, 50.0, 30.0]
+    assert february["customers"] == 1
+    assert february["active_customers"] == [1, 0, 0]
+    assert february["repeat_rate"] == [0.0, 0.0, 0.0]
+
+
+def test_antedated_order_moves_customer(pg_db, order_factory, cohort_customers):
+    """Test that an earlier order moves the customer and refreshes both cohorts"""
+    ids = cohort_customers
+    repository = CustomerCohortRepository(pg_db)
+    repository.rebuild_customers([ids["a"], ids["b"], ids["c"]])
+    order_factory.order(ids["c"], ids["marketplace"], "2001-01-25", 80)
+
+    repository.rebuild_customers([ids["c"]])
+
+    cohorts = CohortService(pg_db).get_cohorts(date(2001, 1, 1), date(2001, 2, 28), months=2)
+    assert [cohort["cohort_month"] for cohort in cohorts] == [date(2001, 1, 1)]
+    assert cohorts[0]["customers"] == 3
+    assert cohorts[0]["active_customers"] == [3, 2]
+    assert cohorts[0]["repeat_rate"] == [33.33, 100.0]
@@ -0,0 +1,88 @@
+"""
+Load test: a slow database call must not block other requests on the worker
+"""
+import asyncio
+import time
+from app.main import app
+from app.core.database import get_db
+from app.controllers.dashboard_controller import DashboardController
+from app.dto.dashboard_dto import OrdersCountResponse
+from app.middlewares.auth_middleware import get_current_user_required
+
+SLOW_QUERY_SECONDS = 0.5
+CONCURRENT_REQUESTS = 8
+
+
+def _fake_db():
+    """Session stand-in: the slow controller below never touches it"""
+    yield None
+
+
+def _slow_orders_count(start_date, end_date, marketplace_id, db):
+    """Simulate a blocking KPI query"""
+    time.sleep(SLOW_QUERY_SECONDS)
+    return OrdersCountResponse(count=1)
+
+
+async def _get(path: str) -> int:
+    """Send a GET request straight to the ASGI app and return the status code"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def _run_load():
+    """Fire concurrent slow requests plus a health check, return timings"""
+    started = time.perf_counter()
+    slow = [
+        asyncio.create_task(_get("/api/v1/dashboard/orders/count"))
+        for _ in range(CONCURRENT_REQUESTS)
+    ]
+    await asyncio.sleep(0.05)
+
+    health_started = time.perf_counter()
+    health = await _get("/health")
+    health_elapsed = time.perf_counter() - health_started
+
+    statuses = await asyncio.gather(*slow)
+    total_elapsed = time.perf_counter() - started
+    return statuses, health, health_elapsed, total_elapsed
+
+
+def test_slow_query_does_not_block_event_loop(monkeypatch):
+    """Test that slow sync handlers run in parallel and leave the event loop free"""
+    monkeypatch.setattr(DashboardController, "get_orders_count", staticmethod(_slow_orders_count))
+    app.dependency_overrides[get_db] = _fake_db
+    app.dependency_overrides[get_current_user_required] = lambda: None
+    try:
+        statuses, health, health_elapsed, total_elapsed = asyncio.run(_run_load())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert statuses == [200] * CONCURRENT_REQUESTS
+    assert health == 200
+    # La boucle d'événements reste disponible pendant les requêtes lentes
+    assert health_elapsed < SLOW_QUERY_SECONDS / 2
+    # Exécution en parallèle : bien moins que la somme des durées
+    assert total_elapsed < SLOW_QUERY_SECONDS * CONCURRENT_REQUESTS / 2
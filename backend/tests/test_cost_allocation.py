@@ -0,0 +1,122 @@
+"""
+Unit tests for the operational cost allocation
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import text
+from app.repositories.order_item_repository import OrderItemRepository
+from app.services.operational_cost_service import OperationalCostService
+from app.dto.operational_cost_dto import OperationalCostCreate, OperationalCostUpdate
+from app.core.constants import OperationalCostCategory
+
+
+def test_category_columns():
+    """Test that each cost category feeds one OrderItem cost column"""
+    assert OperationalCostCategory.get_order_item_column("conditionnement") == "packaging_cost"
+    assert OperationalCostCategory.get_order_item_column("lavage") == "washing_cost"
+    assert OperationalCostCategory.get_order_item_column("abonnement") == "other_costs"
+
+
+def test_allocation_without_months():
+    """Test that an empty month list does not touch the database"""
+    # db=None: toute requête SQL lèverait une AttributeError
+    assert OrderItemRepository(None).allocate_operational_costs([]) == 0
+
+
+def test_update_cost_reallocates_both_months():
+    """Test that moving a cost to another month reallocates the old and the new month"""
+    cost = SimpleNamespace(id=1, month=date(2025, 1, 1))
+    service = OperationalCostService(db=None)
+    service.repository = SimpleNamespace(
+        get_by_id=lambda cost_id: cost,
+        update=lambda cost_id, **data: SimpleNamespace(id=cost_id, **data)
+    )
+    allocated = []
+    service.allocation_service = SimpleNamespace(allocate_months=allocated.extend)
+
+    service.update_cost(1, OperationalCostUpdate(month=date(2025, 2, 1)))
+
+    assert allocated == [date(2025, 1, 1), date(2025, 2, 1)]
+
+
+@pytest.fixture
+def allocation_items(order_factory):
+    """Three single-unit items and a cancelled one in March 2001, net margin 5 each (rolled back), returns the order ids"""
+    marketplace_id = order_factory.marketplace("allocation-test")
+    customer_id = order_factory.customer("allocation-test@example.com")
+    order_factory.user("allocation@example.com")
+    order_ids = []
+    for day, cancelled in (("2001-03-02", False), ("2001-03-10", False), ("2001-03-20", False), ("2001-03-21", True)):
+        order_id = order_factory.order(customer_id, marketplace_id, day, 12, 10, is_cancelled=cancelled)
+        order_factory.item(order_id, 12, 10, net_margin=5)
+        order_ids.append(order_id)
+    return order_ids
+
+
+def _add_cost(db, amount: str, category: str) -> None:
+    db.execute(text("""
+        INSERT INTO operational_costs (month, amount, category, created_by)
+        SELECT DATE '2001-03-01', :amount, :category, id FROM users WHERE email = 'allocation@example.com'
+    """), {"amount": amount, "category": category})
+
+
+def _allocations(db, order_ids) -> list:
+    """(packaging_cost, washing_cost, other_costs, calculated_net_margin) of the items, by order"""
+    return [tuple(row) for row in db.execute(text("""
+        SELECT packaging_cost, washing_cost, other_costs, calculated_net_margin
+        FROM order_items WHERE order_id = ANY(:ids) ORDER BY order_id
+    """), {"ids": order_ids})]
+
+
+def test_allocation_values(pg_db, allocation_items):
+    """Test that a month's costs are split exactly over its items, nothing on the cancelled order"""
+    _add_cost(pg_db, "10.00", "conditionnement")
+    _add_cost(pg_db, "1.00", "abonnement")
+
+    OrderItemRepository(pg_db).allocate_operational_costs([date(2001, 3, 1)])
+
+    # Arrondi sur le cumul: 3.33 / 3.34 / 3.33, la somme retombe exactement sur 10.00
+    d = Decimal
+    assert _allocations(pg_db, allocation_items) == [
+        (d("3.33"), d("0.00"), d("0.33"), d("1.34")),
+        (d("3.34"), d("0.00"), d("0.34"), d("1.32")),
+        (d("3.33"), d("0.00"), d("0.33"), d("1.34")),
+        (d("0.00"), d("0.00"), d("0.00"), d("5.00")),
+    ]
+
+
+def test_allocation_reset_without_costs(pg_db, allocation_items):
+    """Test that the items of a month whose costs are gone go back to 0"""
+    _add_cost(pg_db, "10.00", "lavage")
+    repository = OrderItemRepository(pg_db)
+    repository.allocate_operational_costs([date(2001, 3, 1)])
+
+    pg_db.execute(text("DELETE FROM operational_costs WHERE month = DATE '2001-03-01'"))
+    repository.allocate_operational_costs([date(2001, 3, 1)])
+
+    assert set(_allocations(pg_db, allocation_items)) == {(0, 0, 0, 5)}
+
+
+def _fail_allocation(months):
+    raise RuntimeError("allocation failed")
+
+
+def test_failed_allocation_rolls_back_cost_write(pg_db, allocation_items):
+    """Test that a cost write is not kept when the allocation of its month fails"""
+    _add_cost(pg_db, "10.00", "lavage")
+    OrderItemRepository(pg_db).allocate_operational_costs([date(2001, 3, 1)])
+    pg_db.commit()
+    cost_id, user_id = pg_db.execute(text("SELECT id, created_by FROM operational_costs WHERE month = DATE '2001-03-01'")).one()
+    service = OperationalCostService(pg_db)
+    service.allocation_service = SimpleNamespace(allocate_months=_fail_allocation)
+
+    with pytest.raises(RuntimeError):
+        service.create_cost(OperationalCostCreate(month=date(2001, 3, 1), amount=Decimal("5.00"), category="lavage"), user_id)
+    with pytest.raises(RuntimeError):
+        service.delete_cost(cost_id)
+
+    # Seul le coût d'origine reste, toujours réparti sur les articles
+    assert pg_db.execute(text("SELECT array_agg(id) FROM operational_costs WHERE month = DATE '2001-03-01'")).scalar() == [cost_id]
+    assert _allocations(pg_db, allocation_items)[0][1] == Decimal("3.33")
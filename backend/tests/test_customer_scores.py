@@ -0,0 +1,98 @@
+"""
+Unit tests for the RFM scores and customer lifetime value
+"""
+import pytest
+from sqlalchemy import delete, text
+from app.core.exceptions import ValidationError
+from app.models import CustomerScore
+from app.repositories.customer_score_repository import CustomerScoreRepository
+from app.services.customer_score_service import CustomerScoreService
+
+
+def test_ranked_customers_validation():
+    """Test that invalid parameters are rejected before touching the database"""
+    service = CustomerScoreService(None)
+
+    with pytest.raises(ValidationError):
+        service.get_ranked_customers(segment="vip")
+    with pytest.raises(ValidationError):
+        service.get_ranked_customers(order="middle")
+    with pytest.raises(ValidationError):
+        service.get_ranked_customers(limit=0)
+
+
+@pytest.fixture
+def scored_customers(pg_db, order_factory):
+    """Five customers with distinct profiles in 2001, scored alone (rolled back), returns their ids"""
+    marketplace_id = order_factory.marketplace("score-test")
+    orders = {
+        # Client fidèle qui ne commande plus
+        "a": [("2001-01-01", 20), ("2001-01-02", 20), ("2001-01-03", 20), ("2001-01-04", 20), ("2001-01-05", 20)],
+        # Un seul gros achat récent
+        "b": [("2001-06-30", 500)],
+        "c": [("2001-06-17", 10), ("2001-06-18", 10), ("2001-06-19", 10), ("2001-06-20", 10)],
+        "d": [("2001-02-01", 15), ("2001-03-01", 15)],
+        "e": [("2001-04-01", 5), ("2001-04-15", 5), ("2001-05-01", 5)],
+    }
+    ids = {}
+    for name, rows in orders.items():
+        ids[name] = order_factory.customer(f"score-{name}@example.com")
+        for day, total in rows:
+            order_factory.order(ids[name], marketplace_id, day, total)
+    order_factory.order(ids["d"], marketplace_id, "2001-06-29", 1000, is_cancelled=True)
+    # Quintiles calculés sur ces seuls clients
+    pg_db.execute(delete(CustomerScore))
+    CustomerScoreRepository(pg_db).rebuild_customers(ids.values())
+    return ids
+
+
+def _scores(db, ids):
+    """(recency, frequency, monetary, segment, orders_count, ltv) per customer name"""
+    rows = {score.customer_id: score for score in db.query(CustomerScore).all()}
+    return {
+        name: (
+            rows[customer_id].recency_score, rows[customer_id].frequency_score, rows[customer_id].monetary_score,
+            rows[customer_id].segment, rows[customer_id].orders_count, float(rows[customer_id].ltv)
+        )
+        for name, customer_id in ids.items()
+    }
+
+
+def test_scores_and_segments(pg_db, scored_customers):
+    """Test the quintiles, segments and lifetime value of each profile"""
+    assert _scores(pg_db, scored_customers) == {
+        "a": (1, 5, 4, "at_risk", 5, 100.0),
+        "b": (5, 1, 5, "recent", 1, 500.0),
+        "c": (4, 4, 3, "champions", 4, 40.0),
+        "d": (2, 2, 2, "hibernating", 2, 30.0),  # Commande annulée ignorée
+        "e": (3, 3, 1, "loyal", 3, 15.0),
+    }
+
+
+def test_new_order_rescores_everyone(pg_db, order_factory, scored_customers):
+    """Test that one customer's new order updates its aggregates and re-ranks the others"""
+    marketplace_id = pg_db.execute(text("SELECT id FROM marketplaces WHERE name = 'score-test'")).scalar()
+    order_factory.order(scored_customers["e"], marketplace_id, "2001-07-01", 1000)
+
+    updated = CustomerScoreRepository(pg_db).rebuild_customers([scored_customers["e"]])
+
+    scores = _scores(pg_db, scored_customers)
+    assert scores["e"] == (5, 4, 5, "champions", 4, 1015.0)
+    assert scores["c"][:4] == (3, 3, 2, "loyal")
+    assert updated == 5
+
+
+def test_ranked_customers(pg_db, scored_customers):
+    """Test the top and bottom customers by lifetime value"""
+    service = CustomerScoreService(pg_db)
+
+    top = service.get_ranked_customers(limit=2)
+    bottom = service.get_ranked_customers(order="bottom", limit=1)
+    at_risk = service.get_ranked_customers(segment="at_risk")
+
+    assert [customer["email"] for customer in top] == ["score-b@example.com", "score-a@example.com"]
+    assert [customer["email"] for customer in bottom] == ["score-e@example.com"]
+    assert [customer["customer_id"] for customer in at_risk] == [scored_customers["a"]]
+    assert {segment["segment"]: segment["customers"] for segment in service.get_segments()} == {
+        "at_risk": 1, "recent": 1, "champions": 1, "hibernating": 1, "loyal": 1
+    }
@@ -0,0 +1,90 @@
+"""
+Unit tests for dashboard service validation and the rollup metrics
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.services.dashboard_service import DashboardService
+from app.core.constants import DashboardMetric
+from app.core.exceptions import ValidationError
+
+
+def test_validate_metrics_defaults_to_all():
+    """Test that an empty metric list selects every metric"""
+    assert DashboardService._validate_metrics(None) == DashboardMetric.get_all_values()
+    assert DashboardService._validate_metrics([]) == DashboardMetric.get_all_values()
+
+
+def test_validate_metrics_removes_duplicates():
+    """Test that duplicated metrics are only computed once, order preserved"""
+    metrics = DashboardService._validate_metrics(["revenue_ttc", "orders_count", "revenue_ttc"])
+
+    assert metrics == ["revenue_ttc", "orders_count"]
+
+
+def test_validate_metrics_unknown():
+    """Test that unknown metrics are rejected"""
+    with pytest.raises(ValidationError) as exc_info:
+        DashboardService._validate_metrics(["orders_count", "unknown_metric"])
+
+    assert "unknown_metric" in exc_info.value.message
+
+
+def test_get_kpis_invalid_date_range():
+    """Test that an inverted date range is rejected before querying"""
+    service = DashboardService(db=None)
+
+    with pytest.raises(ValidationError):
+        service.get_kpis(["orders_count"], date(2025, 2, 1), date(2025, 1, 1))
+
+
+def test_to_number():
+    """Test conversion of SQL aggregates to JSON numbers"""
+    assert DashboardService._to_number("revenue_ttc", Decimal("12.50")) == 12.5
+    assert DashboardService._to_number("orders_count", None) == 0
+    assert DashboardService._to_number("refund_rate", None) is None
+
+
+def test_count_buckets():
+    """Test the bucket count estimate used to cap time series"""
+    assert DashboardService._count_buckets("day", date(2025, 1, 1), date(2025, 1, 31)) == 31
+    assert DashboardService._count_buckets("month", date(2024, 11, 15), date(2025, 7, 1)) == 9
+    assert DashboardService._count_buckets("week", date(2025, 1, 1), date(2025, 1, 31)) >= 5
+
+
+def test_get_time_series_invalid_granularity():
+    """Test that unsupported granularities are rejected before querying"""
+    service = DashboardService(db=None)
+
+    with pytest.raises(ValidationError):
+        service.get_time_series(["orders_count"], "hour", date(2025, 1, 1), date(2025, 1, 31))
+
+
+def test_get_time_series_too_many_buckets():
+    """Test that overly long daily series are rejected"""
+    service = DashboardService(db=None)
+
+    with pytest.raises(ValidationError):
+        service.get_time_series(["orders_count"], "day", date(2015, 1, 1), date(2025, 1, 1))
+
+
+def test_net_revenue_deducts_each_order_once(pg_db, order_factory):
+    """Test that an order both cancelled and refunded is deducted once from the net revenue"""
+    marketplace_id = order_factory.marketplace("net-revenue")
+    customer_id = order_factory.customer("net-revenue@example.com")
+    # (total TTC, annulée, remboursée)
+    for total, cancelled, refunded in ((100, False, False), (30, True, True), (20, False, True), (10, True, False)):
+        order_factory.order(customer_id, marketplace_id, "2001-03-05", total, is_cancelled=cancelled, is_refunded=refunded)
+    repository = DailySalesRollupRepository(pg_db)
+    repository.rebuild_range(date(2001, 3, 5), date(2001, 3, 5))
+
+    metrics = repository.aggregate_metrics(
+        ["revenue_ttc", "cancelled_amount", "refunded_amount", "net_revenue_ttc"],
+        date(2001, 3, 5), date(2001, 3, 5), marketplace_id
+    )
+
+    assert metrics == {
+        "revenue_ttc": Decimal("160"), "cancelled_amount": Decimal("40"),
+        "refunded_amount": Decimal("50"), "net_revenue_ttc": Decimal("100")
+    }
@@ -0,0 +1,174 @@
+"""
+Unit tests for the orders / products explorer filters, and index usage
+of the generated queries on PostgreSQL
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.exceptions import ValidationError
+from app.core.pagination import PageRequest
+from app.models import Category, Customer, Marketplace, Order, OrderItem, Product
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+
+
+@pytest.fixture
+def db():
+    """In-memory database: 2 marketplaces, 2 categories, 20 orders over 10 days"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Category.__table__, Marketplace.__table__, Customer.__table__,
+        Product.__table__, Order.__table__, OrderItem.__table__
+    ])
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Category(id=1, name="Hauts"), Category(id=2, name="Bas"),
+        Marketplace(id=1, name="Vinted"), Marketplace(id=2, name="Etsy"),
+        Customer(id=1, email="client@example.com"),
+        Product(id=1, sku="TSH_001", name="T-shirt", category_id=1, status="published"),
+        Product(id=2, sku="TSHX001", name="T-shirt XL", category_id=1, status="sold"),
+        Product(id=3, sku="PAN-001", name="Pantalon", category_id=2, status="published"),
+    ])
+    start = datetime(2025, 3, 1)
+    for i in range(20):
+        order_date = start + timedelta(hours=12 * i)
+        session.add(Order(
+            id=i + 1, order_number=f"N{i + 1}", customer_id=1, marketplace_id=1 + i % 2,
+            country_code="FR" if i % 3 else "BE", order_date=order_date,
+            subtotal_ht=10 + i, total_ht=10 + i, total_ttc=12 + i,
+            status="cancelled" if i % 5 == 0 else "completed"
+        ))
+        session.add(OrderItem(
+            id=i + 1, order_id=i + 1, order_date=order_date,
+            product_id=3 if i % 4 == 0 else 1, product_name="x", quantity=1,
+            unit_price_ht=10, unit_price_ttc=12, total_price_ht=10, total_price_ttc=12
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _walk(fetch, **kwargs):
+    """Follow next_cursor until the last page, returning every item in order"""
+    items, cursor = [], None
+    while True:
+        page = fetch(PageRequest(limit=3, cursor=cursor, total_mode="none", **kwargs))
+        items += page.items
+        cursor = page.next_cursor
+        if cursor is None:
+            return items
+
+
+def test_orders_newest_first_with_filters(db):
+    """Test that the date range is inclusive and the cursor walk keeps the order"""
+    service = OrderService(db)
+
+    orders = _walk(
+        lambda page_request: service.get_orders_page(
+            page_request, start_date=date(2025, 3, 2), end_date=date(2025, 3, 8), marketplace_id=1
+        ),
+        sort="order_date", descending=True
+    )
+
+    dates = [order.order_date for order in orders]
+    assert dates == sorted(dates, reverse=True)
+    assert dates[0] == datetime(2025, 3, 8)
+    assert dates[-1] == datetime(2025, 3, 2)
+    assert {order.marketplace_id for order in orders} == {1}
+
+
+def test_orders_sorted_by_amount(db):
+    """Test that decimal sort keys survive the cursor round trip"""
+    orders = _walk(OrderService(db).get_orders_page, sort="total_ttc")
+
+    assert [order.id for order in orders] == list(range(1, 21))
+
+
+def test_orders_filtered_by_status_country_and_products(db):
+    """Test the order and product filters"""
+    service = OrderService(db)
+    request = PageRequest(limit=100)
+
+    cancelled_be = service.get_orders_page(request, status="cancelled", country_code="be")
+    by_category = service.get_orders_page(request, category_id=2)
+    by_sku = service.get_orders_page(request, sku="TSH_001")
+
+    assert [order.id for order in cancelled_be.items] == [1, 16]
+    assert cancelled_be.total == 2
+    assert [order.id for order in by_category.items] == [1, 5, 9, 13, 17]
+    assert by_sku.total == 15
+
+
+def test_orders_invalid_date_range(db):
+    """Test that an inverted date range is rejected"""
+    with pytest.raises(ValidationError):
+        OrderService(db).get_orders_page(PageRequest(), start_date=date(2025, 3, 2), end_date=date(2025, 3, 1))
+
+
+def test_products_sku_prefix_is_literal(db):
+    """Test that _ and % in the SKU prefix are not wildcards"""
+    service = ProductService(db)
+
+    page = service.get_products_page(PageRequest(), sku="TSH_")
+    published = service.get_products_page(PageRequest(), category_id=1, status="published")
+
+    assert [product.sku for product in page.items] == ["TSH_001"]
+    assert [product.sku for product in published.items] == ["TSH_001"]
+
+
+@pytest.fixture
+def explorer_db(pg_db):
+    """PostgreSQL session, skipped if the explorer indexes are not migrated"""
+    if pg_db.execute(text("SELECT to_regclass('ix_orders_status_order_date')")).scalar() is None:
+        pytest.skip("Explorer indexes are not migrated")
+    return pg_db
+
+
+def _explain_first_query(session, run) -> str:
+    """Plan of the first statement executed by run()"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(session.bind, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(session.bind, "before_cursor_execute", capture)
+    statement, parameters = statements[0]
+    return "\n".join(row[0] for row in session.connection().exec_driver_sql("EXPLAIN " + statement, parameters))
+
+
+# Une plage de dates seule est servie par l'élagage des partitions (voir test_partitions.py)
+@pytest.mark.parametrize("filters, index", [
+    ({"marketplace_id": 1, "start_date": date(2025, 3, 1)}, "ix_orders_marketplace_id_order_date"),
+    ({"status": "cancelled", "start_date": date(2025, 3, 1)}, "ix_orders_status_order_date"),
+    ({"country_code": "FR"}, "ix_orders_country_code_order_date"),
+])
+def test_orders_filters_use_index(explorer_db, index_names, filters, index):
+    """Test that each orders filter is served by its composite index"""
+    service = OrderService(explorer_db)
+
+    plan = _explain_first_query(
+        explorer_db,
+        lambda: service.get_orders_page(PageRequest(sort="order_date", descending=True, total_mode="none"), **filters)
+    )
+
+    # Table partitionnée: le plan nomme les index des partitions
+    assert any(name in plan for name in index_names(index))
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({"category_id": 1, "status": "published"}, "ix_products_category_id_status"),
+    ({"sku": "TSH-"}, "ix_products_sku_pattern"),
+])
+def test_products_filters_use_index(explorer_db, filters, index):
+    """Test that the products filters are served by their indexes"""
+    service = ProductService(explorer_db)
+
+    plan = _explain_first_query(explorer_db, lambda: service.get_products_page(PageRequest(total_mode="none"), **filters))
+
+    assert index in plan
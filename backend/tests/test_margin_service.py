@@ -0,0 +1,67 @@
+"""
+Unit tests for the set-based margin recompute
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import text
+from app.repositories.order_item_repository import OrderItemRepository
+from app.services.margin_service import MarginService
+from app.core.exceptions import ValidationError
+
+# (commission %, quantité, total HT, total TTC, coût de la ligne, prix d'achat du produit, frais de conditionnement)
+# -> (marge brute, commission, marge nette, marge nette recalculée); mêmes cas que etl/tests/test_margins.py
+MARGIN_CASES = [
+    (15, 1, "8.75", "10.50", "5.00", None, "0.50", ("3.75", "1.58", "2.17", "1.67")),  # 1.575 -> 1.58
+    (5, 2, "0.42", "0.50", "0.10", None, "0", ("0.22", "0.03", "0.19", "0.19")),  # 0.025 -> 0.03
+    (15, 1, "10.00", "12.00", None, "12.50", "0", ("-2.50", "1.80", "-4.30", "-4.30")),  # Prix d'achat du produit
+    (15, 1, "10.00", "12.00", None, None, "0", (None, "1.80", None, None)),  # Coût inconnu
+]
+
+
+def test_recompute_orders_empty():
+    """Test that an empty order list does not touch the database"""
+    # db=None: toute requête SQL lèverait une AttributeError
+    assert MarginService(db=None).recompute_orders([]) == 0
+
+
+def test_recompute_invalid_date_range():
+    """Test that an inverted date range is rejected before querying"""
+    service = MarginService(db=None)
+
+    with pytest.raises(ValidationError):
+        service.recompute(start_day=date(2025, 2, 1), end_day=date(2025, 1, 1))
+
+
+@pytest.fixture
+def margin_items(order_factory):
+    """One order of March 2001 per margin case, margins not computed yet (rolled back), returns the order ids"""
+    customer_id = order_factory.customer("margin-test@example.com")
+    category_id = order_factory.category("margin-test")
+    marketplaces = {rate: order_factory.marketplace(f"margin-{rate}", rate) for rate in {case[0] for case in MARGIN_CASES}}
+    order_ids = []
+    for number, (rate, quantity, total_ht, total_ttc, cost, purchase_price, packaging, _) in enumerate(MARGIN_CASES):
+        product_id = order_factory.product(f"MARGIN-{number}", category_id, purchase_price=purchase_price)
+        order_id = order_factory.order(customer_id, marketplaces[rate], "2001-03-05", total_ttc, total_ht)
+        order_factory.item(order_id, total_ttc, total_ht, quantity, product_id=product_id,
+                           cost_price=cost, packaging_cost=packaging)
+        order_ids.append(order_id)
+    return order_ids
+
+
+def test_recompute_margins_values(pg_db, margin_items):
+    """Test the recomputed margins, half-cents rounded away from zero like the ETL"""
+    repository = OrderItemRepository(pg_db)
+
+    assert repository.recompute_margins(order_ids=margin_items) == len(MARGIN_CASES)
+
+    rows = pg_db.execute(text("""
+        SELECT gross_margin, marketplace_commission, net_margin, calculated_net_margin
+        FROM order_items WHERE order_id = ANY(:ids) ORDER BY order_id
+    """), {"ids": margin_items}).all()
+    expected = [
+        tuple(Decimal(value) if value is not None else None for value in case[-1]) for case in MARGIN_CASES
+    ]
+    assert [tuple(row) for row in rows] == expected
+    # Marges déjà à jour: rien n'est réécrit
+    assert repository.recompute_margins(order_ids=margin_items) == 0
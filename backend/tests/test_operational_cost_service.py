@@ -0,0 +1,87 @@
+"""
+Unit tests for the operational cost summary
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import text
+from app.repositories.operational_cost_repository import OperationalCostRepository
+from app.services.operational_cost_service import OperationalCostService, MAX_PIVOT_MONTHS
+from app.core.exceptions import ValidationError
+
+
+def _service(rows, pivot_rows=()):
+    """Service backed by a fake repository returning pre-aggregated rows"""
+    service = OperationalCostService(db=None)
+    service.repository = SimpleNamespace(
+        get_totals_by_month_and_category=lambda *args: list(rows),
+        get_category_pivot=lambda months, *args: list(pivot_rows)
+    )
+    return service
+
+
+def test_months_between():
+    """Test month columns across a year boundary"""
+    months = OperationalCostService._months_between(date(2024, 11, 15), date(2025, 2, 1))
+
+    assert months == [date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)]
+
+
+def test_summary_totals():
+    """Test that the grand total is the sum of the grouped rows"""
+    service = _service([
+        (date(2025, 1, 1), "lavage", Decimal("15.50"), 2),
+        (date(2025, 2, 1), "divers", Decimal("7.00"), 1),
+    ])
+
+    summary = service.get_cost_summary()
+
+    assert summary["total"] == Decimal("22.50")
+    assert summary["pivot"] is None
+    assert summary["rows"][0] == {"month": date(2025, 1, 1), "category": "lavage", "total": Decimal("15.50"), "count": 2}
+
+
+def test_summary_pivot_columns():
+    """Test that the pivot has one column per month of the range, empty months included"""
+    service = _service(
+        [(date(2025, 1, 1), "lavage", Decimal("15.50"), 2)],
+        [("lavage", Decimal("15.50"), Decimal("0"), Decimal("15.50"))]
+    )
+
+    pivot = service.get_cost_summary(date(2025, 1, 1), date(2025, 2, 28), pivot=True)["pivot"]
+
+    assert pivot["months"] == [date(2025, 1, 1), date(2025, 2, 1)]
+    assert pivot["rows"] == [{"category": "lavage", "values": [Decimal("15.50"), Decimal("0")], "total": Decimal("15.50")}]
+    assert pivot["totals"] == [Decimal("15.50"), Decimal("0")]
+
+
+def test_summary_pivot_too_wide():
+    """Test that pivots wider than MAX_PIVOT_MONTHS are rejected"""
+    service = _service([])
+
+    with pytest.raises(ValidationError):
+        service.get_cost_summary(date(2020, 1, 1), date(2020 + MAX_PIVOT_MONTHS // 12 + 1, 1, 1), pivot=True)
+
+
+def test_summary_invalid_category():
+    """Test that unknown categories are rejected before querying"""
+    with pytest.raises(ValidationError):
+        _service([]).get_cost_summary(category="unknown")
+
+
+def test_summary_range_covers_whole_months(pg_db, order_factory):
+    """Test that a range starting or ending mid-month keeps every cost of those months"""
+    user_id = order_factory.user("summary@example.com")
+    for month, amount in (("2001-03-01", 10), ("2001-04-20", 5), ("2001-05-01", 7)):
+        pg_db.execute(text("""
+            INSERT INTO operational_costs (month, amount, category, created_by)
+            VALUES (CAST(:month AS date), :amount, 'lavage', :user)
+        """), {"month": month, "amount": amount, "user": user_id})
+    repository = OperationalCostRepository(pg_db)
+
+    rows = repository.get_totals_by_month_and_category(date(2001, 3, 15), date(2001, 4, 10))
+    pivot = repository.get_category_pivot([date(2001, 3, 1), date(2001, 4, 1)], date(2001, 3, 15), date(2001, 4, 10))
+
+    assert rows == [(date(2001, 3, 1), "lavage", Decimal("10.00"), 1), (date(2001, 4, 1), "lavage", Decimal("5.00"), 1)]
+    assert pivot == [("lavage", Decimal("10.00"), Decimal("5.00"), Decimal("15.00"))]
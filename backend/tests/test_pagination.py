@@ -0,0 +1,121 @@
+"""
+Unit tests for keyset pagination and cached counts
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.exceptions import ValidationError
+from app.core.pagination import CountCache, count_cache, decode_cursor, encode_cursor
+from app.models import OperationalCost
+from app.repositories.operational_cost_repository import OperationalCostRepository
+
+
+@pytest.fixture
+def repository():
+    """Repository over an in-memory table of 25 costs"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[OperationalCost.__table__])
+    db = sessionmaker(bind=engine)()
+    start = datetime(2025, 1, 1)
+    for i in range(25):
+        # created_at dans le désordre par rapport à id, avec des doublons
+        db.add(OperationalCost(
+            month=date(2025, 1, 1), amount=i + 1, category="divers", created_by=1,
+            created_at=start + timedelta(minutes=(i * 7) % 10), updated_at=start
+        ))
+    db.commit()
+    count_cache.invalidate(OperationalCost.__tablename__)
+    yield OperationalCostRepository(db)
+    db.close()
+
+
+def _walk(repository, **kwargs):
+    """Follow next_cursor until the last page, returning every id in order"""
+    ids, cursor = [], None
+    while True:
+        page = repository.get_page(cursor=cursor, **kwargs)
+        ids += [cost.id for cost in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids, page
+
+
+def test_cursor_round_trip():
+    """Test that cursors encode the sort key values"""
+    created_at = datetime(2025, 1, 2, 3, 4, 5)
+
+    assert decode_cursor(encode_cursor((created_at, 42)), [datetime, int]) == (created_at, 42)
+    assert decode_cursor(encode_cursor((42,)), [int]) == (42,)
+
+
+def test_invalid_cursor():
+    """Test that malformed cursors are rejected"""
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", [int])
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor((42,)), [datetime, int])
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor((None, 42)), [datetime, int])
+    assert decode_cursor(encode_cursor((None, 42)), [datetime, int], [True, False]) == (None, 42)
+
+
+def test_keyset_pages_by_id(repository):
+    """Test that following cursors returns every row exactly once, in order"""
+    ids, last_page = _walk(repository, limit=10)
+
+    assert ids == list(range(1, 26))
+    assert last_page.total == 25
+
+
+def test_keyset_pages_by_created_at_desc(repository):
+    """Test keyset pagination on a non-unique column, id breaking ties"""
+    ids, _ = _walk(repository, limit=4, sort="created_at", descending=True)
+    costs = {cost.id: cost for cost in repository.get_all(limit=100)}
+
+    assert sorted(ids) == list(range(1, 26))
+    keys = [(costs[i].created_at, i) for i in ids]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_across_null_created_at(repository, descending):
+    """Test that rows without created_at are paged once each, after (or before) the dated rows"""
+    for cost in repository.get_all(limit=100):
+        if cost.id % 3 == 0:
+            cost.created_at = None
+    repository.db.commit()
+
+    ids, _ = _walk(repository, limit=4, sort="created_at", descending=descending)
+    costs = {cost.id: cost for cost in repository.get_all(limit=100)}
+
+    assert sorted(ids) == list(range(1, 26))
+    # NULL au-dessus de toutes les valeurs, comme l'ordre par défaut de PostgreSQL
+    keys = [(costs[i].created_at is None, costs[i].created_at or datetime.min, i) for i in ids]
+    assert keys == sorted(keys, reverse=descending)
+
+
+def test_total_modes(repository):
+    """Test the none mode and the filtered exact count"""
+    assert repository.get_page(limit=5, total_mode="none").total is None
+    page = repository.get_page(limit=5, filters=[OperationalCost.amount > 20])
+    assert page.total == 5
+    assert page.next_cursor is None
+
+
+def test_invalid_sort_key(repository):
+    """Test that unknown sort keys are rejected"""
+    with pytest.raises(ValidationError):
+        repository.get_page(sort="amount")
+
+
+def test_count_cache_invalidate():
+    """Test that invalidated counts are not served"""
+    cache = CountCache(ttl_seconds=60)
+    cache.set("roles", 3)
+    assert cache.get("roles") == 3
+
+    cache.invalidate("roles")
+
+    assert cache.get("roles") is None
@@ -0,0 +1,117 @@
+"""
+Unit tests for the monthly partitions of orders / order_items: pruning of the
+dashboard queries and partition maintenance on PostgreSQL
+"""
+import re
+import pytest
+from datetime import date, datetime
+from sqlalchemy import event, text
+from app.core.exceptions import ValidationError
+from app.core.pagination import PageRequest
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.partition_repository import PartitionRepository
+from app.services.order_service import OrderService
+from app.services.partition_service import PartitionService, add_months
+
+# Partitions parcourues dans un plan: "Seq Scan on orders_2025_03 orders", "Index Scan using ... on order_items_2025_04 ..."
+_SCANNED_PARTITION = re.compile(r" on ((?:orders|order_items)_\d{4}_\d{2})\b")
+
+# 30 jours à cheval sur deux mois
+START, END = date(2025, 3, 10), date(2025, 4, 8)
+
+
+def test_add_months():
+    """Test month arithmetic across years"""
+    assert add_months(date(2025, 11, 17), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 31), -1) == date(2024, 12, 1)
+    assert add_months(date(2025, 6, 1), 0) == date(2025, 6, 1)
+
+
+def test_partition_validation():
+    """Test that invalid maintenance parameters are rejected before touching the database"""
+    service = PartitionService(None)
+
+    with pytest.raises(ValidationError):
+        service.ensure_future_partitions(-1)
+    with pytest.raises(ValidationError):
+        service.detach_before(add_months(date.today(), 1))
+
+
+@pytest.fixture
+def partitioned_db(pg_db, order_factory):
+    """PostgreSQL session with the partitions of 2025 (rolled back)"""
+    order_factory.partitions(date(2025, 1, 1), date(2025, 12, 1))
+    return pg_db
+
+
+def _scanned_partitions(session, run) -> set:
+    """Partitions read by the plans of the statements executed by run()"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(session.bind, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(session.bind, "before_cursor_execute", capture)
+
+    scanned = set()
+    for statement, parameters in statements:
+        plan = "\n".join(row[0] for row in session.connection().exec_driver_sql("EXPLAIN " + statement, parameters))
+        scanned |= set(_SCANNED_PARTITION.findall(plan))
+    return scanned
+
+
+def test_orders_explorer_last_30_days_prunes(partitioned_db):
+    """Test that the orders explorer over 30 days reads two orders and order_items partitions at most"""
+    service = OrderService(partitioned_db)
+
+    scanned = _scanned_partitions(partitioned_db, lambda: service.get_orders_page(
+        PageRequest(sort="order_date", descending=True, total_mode="none"),
+        start_date=START, end_date=END, category_id=1
+    ))
+
+    assert scanned == {"orders_2025_03", "orders_2025_04", "order_items_2025_03", "order_items_2025_04"}
+
+
+def test_sales_rollup_rebuild_prunes(partitioned_db):
+    """Test that rebuilding 30 days of the daily sales rollup only reads their months"""
+    repository = DailySalesRollupRepository(partitioned_db)
+
+    scanned = _scanned_partitions(partitioned_db, lambda: repository.rebuild_range(START, END))
+
+    assert scanned == {"orders_2025_03", "orders_2025_04", "order_items_2025_03", "order_items_2025_04"}
+
+
+def test_item_updates_prune(partitioned_db):
+    """Test that margin recomputation and cost allocation only read and write their months"""
+    repository = OrderItemRepository(partitioned_db)
+
+    margins = _scanned_partitions(partitioned_db, lambda: repository.recompute_margins(start_day=START, end_day=END))
+    costs = _scanned_partitions(partitioned_db, lambda: repository.allocate_operational_costs([date(2025, 3, 1)]))
+
+    assert margins <= {"orders_2025_03", "orders_2025_04", "order_items_2025_03", "order_items_2025_04"}
+    assert {"order_items_2025_03", "order_items_2025_04"} <= margins
+    assert costs == {"orders_2025_03", "order_items_2025_03"}
+
+
+def test_detach_before(partitioned_db, order_factory):
+    """Test that old months are detached with their rows and kept as standalone tables"""
+    db = partitioned_db
+    repository = PartitionRepository(db)
+    order_id = order_factory.order(
+        order_factory.customer("partition-test@example.com"), order_factory.marketplace("partition-test"),
+        "2001-01-15 10:00", 12, 10
+    )
+    order_factory.item(order_id, 12, 10)
+
+    detached = PartitionService(db).detach_before(date(2001, 2, 15))
+
+    assert detached == ["order_items_2001_01", "orders_2001_01"]
+    assert db.execute(text("SELECT count(*) FROM orders WHERE id = :id"), {"id": order_id}).scalar() == 0
+    assert db.execute(text("SELECT count(*) FROM orders_2001_01")).scalar() == 1
+    assert db.execute(text("SELECT count(*) FROM order_items_2001_01")).scalar() == 1
+    assert "orders_2001_01" not in [name for name, *_ in repository.get_partitions("orders")]
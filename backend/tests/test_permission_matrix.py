@@ -0,0 +1,108 @@
+"""
+Unit tests for the compiled permission matrix
+"""
+from app.core.permission_matrix import PermissionMatrix
+
+
+ROWS = [
+    (1, "dashboard", True, True),
+    (1, "users", True, False),
+    (2, "analytics", True, False),
+    (2, "dashboard", True, None),
+]
+
+
+def _matrix(rows=ROWS, ttl_seconds=60):
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return list(rows), "fingerprint-%d" % len(loads), {7: "version-%d" % len(loads)}
+
+    return PermissionMatrix(ttl_seconds=ttl_seconds, loader=loader), loads
+
+
+def test_allows_single_role():
+    """Test view/edit bits of a single role"""
+    matrix, _ = _matrix()
+
+    assert matrix.allows([1], "dashboard", "edit")
+    assert matrix.allows([1], "users", "view")
+    assert not matrix.allows([1], "users", "edit")
+    assert not matrix.allows([1], "analytics", "view")
+
+
+def test_allows_merges_roles():
+    """Test that permissions are OR-ed across the user's roles"""
+    matrix, _ = _matrix()
+
+    assert matrix.allows([1, 2], "analytics", "view")
+    assert matrix.allows([2, 1], "dashboard", "edit")
+    assert not matrix.allows([2], "dashboard", "edit")
+
+
+def test_unknown_role_or_section():
+    """Test that unknown roles and sections grant nothing"""
+    matrix, _ = _matrix()
+
+    assert not matrix.allows([], "dashboard", "view")
+    assert not matrix.allows([99], "dashboard", "view")
+    assert not matrix.allows([1], "missing", "view")
+
+
+def test_loaded_once_until_invalidated():
+    """Test that checks don't reload the matrix until invalidate()"""
+    matrix, loads = _matrix()
+
+    for _ in range(5):
+        matrix.allows([1], "dashboard", "view")
+    assert len(loads) == 1
+
+    version = matrix.version
+    matrix.invalidate()
+    assert matrix.version > version
+
+    matrix.allows([1], "dashboard", "view")
+    assert len(loads) == 2
+
+
+def test_reloaded_after_ttl(monkeypatch):
+    """Test that the matrix is reloaded once the TTL has elapsed"""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.permission_matrix.time.monotonic", lambda: now[0])
+    matrix, loads = _matrix(ttl_seconds=60)
+
+    matrix.allows([1], "dashboard", "view")
+    now[0] += 61
+    matrix.allows([1], "dashboard", "view")
+
+    assert len(loads) == 2
+
+
+def test_mask_allows_matches_roles():
+    """Test that a bitmask from mask_for_roles() gives the same answers"""
+    matrix, _ = _matrix()
+    mask = matrix.mask_for_roles([1, 2])
+
+    assert matrix.mask_allows(mask, "analytics", "view")
+    assert matrix.mask_allows(mask, "dashboard", "edit")
+    assert not matrix.mask_allows(mask, "users", "edit")
+
+
+def test_fingerprint_follows_reloads():
+    """Test that the fingerprint is the one returned by the last load"""
+    matrix, _ = _matrix()
+
+    assert matrix.fingerprint == "fingerprint-1"
+    matrix.invalidate()
+    assert matrix.fingerprint == "fingerprint-2"
+
+
+def test_user_versions_follow_reloads():
+    """Test that the recently changed users are the ones returned by the last load"""
+    matrix, _ = _matrix()
+
+    assert matrix.user_version(7) == "version-1"
+    assert matrix.user_version(8) is None
+    matrix.invalidate()
+    assert matrix.user_version(7) == "version-2"
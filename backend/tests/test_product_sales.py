@@ -0,0 +1,120 @@
+"""
+Unit tests for the per-product daily sales aggregate and the product leaderboard
+"""
+import pytest
+from datetime import date
+from sqlalchemy import text
+from app.core.exceptions import ValidationError
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.services.product_performance_service import ProductPerformanceService
+
+
+def test_ranking_validation():
+    """Test that invalid parameters are rejected before touching the database"""
+    service = ProductPerformanceService(None)
+    start, end = date(2025, 1, 1), date(2025, 1, 31)
+
+    with pytest.raises(ValidationError):
+        service.get_top(start, end, metric="clicks")
+    with pytest.raises(ValidationError):
+        service.get_top(start, end, group_by="marketplace")
+    with pytest.raises(ValidationError):
+        service.get_top(end, start)
+    with pytest.raises(ValidationError):
+        service.get_top(start, end, limit=101)
+
+
+@pytest.fixture
+def product_sales(pg_db, order_factory):
+    """Categories, products and orders of March / April 2001 aggregated (rolled back), returns the ids"""
+    ids = {"A": order_factory.category("Ranking A"), "B": order_factory.category("Ranking B")}
+    ids["A1"] = order_factory.category("Ranking A1", parent_id=ids["A"], level=2)
+    for name, category, subcategory in (("p1", "A", "A1"), ("p2", "A", None), ("p3", "B", None)):
+        ids[name] = order_factory.product(f"RANKING-{name}", ids[category], subcategory_id=ids.get(subcategory))
+    marketplace_id = order_factory.marketplace("ranking-test")
+    customer_id = order_factory.customer("ranking-test@example.com")
+
+    orders = [
+        ("2001-03-05", False, [("p1", 2, 20, 24, 8), ("p3", 1, 50, 60, 5)]),
+        ("2001-03-20", False, [("p1", 1, 10, 12, 4)]),
+        ("2001-03-21", True, [("p2", 10, 500, 600, 100)]),  # Annulée: ignorée
+        ("2001-04-02", False, [("p2", 1, 25, 30, 20)]),
+    ]
+    for day, cancelled, items in orders:
+        order_id = order_factory.order(customer_id, marketplace_id, day, 0, is_cancelled=cancelled)
+        for product, quantity, total_ht, total_ttc, margin in items:
+            order_factory.item(order_id, total_ttc, total_ht, quantity, product_id=ids[product], calculated_net_margin=margin)
+
+    ProductDailySalesRepository(pg_db).rebuild_months([date(2001, 3, 1), date(2001, 4, 1)])
+    return ids
+
+
+def _top(db, **params) -> list:
+    """(id, metric values) of a March-April 2001 ranking"""
+    entries = ProductPerformanceService(db).get_top(date(2001, 3, 1), date(2001, 4, 30), **params)
+    return [(entry["id"], entry["units"], entry["revenue_ttc"], entry["net_margin"]) for entry in entries]
+
+
+def test_top_products_by_metric(pg_db, product_sales):
+    """Test the product ranking for each metric, cancelled orders excluded"""
+    ids = product_sales
+    p1, p2, p3 = (ids["p1"], 3, 36.0, 12.0), (ids["p2"], 1, 30.0, 20.0), (ids["p3"], 1, 60.0, 5.0)
+
+    assert _top(pg_db, metric="revenue_ttc") == [p3, p1, p2]
+    assert _top(pg_db, metric="revenue_ttc", category_id=ids["A"]) == [p1, p2]
+    assert _top(pg_db, metric="units", category_id=ids["A"]) == [p1, p2]
+    assert _top(pg_db, metric="net_margin", category_id=ids["A"]) == [p2, p1]
+    assert _top(pg_db, metric="net_margin", category_id=ids["B"]) == [p3]
+    assert _top(pg_db, category_id=ids["A1"]) == [p1]
+
+
+def test_top_products_date_range(pg_db, product_sales):
+    """Test that days outside the range are not counted"""
+    service = ProductPerformanceService(pg_db)
+
+    entries = service.get_top(date(2001, 3, 10), date(2001, 3, 31), category_id=product_sales["A"])
+
+    assert [(entry["id"], entry["orders_count"], entry["units"]) for entry in entries] == [(product_sales["p1"], 1, 1)]
+
+
+def test_top_categories_and_drill_down(pg_db, product_sales):
+    """Test the category ranking and the sub-category drill-down through Category.parent_id"""
+    ids = product_sales
+    service = ProductPerformanceService(pg_db)
+
+    categories = service.get_top(date(2001, 3, 1), date(2001, 4, 30), group_by="category")
+    drill_down = service.get_top(date(2001, 3, 1), date(2001, 4, 30), group_by="category", category_id=ids["A"])
+
+    ranking = {entry["id"]: (entry["products_count"], entry["revenue_ttc"]) for entry in categories}
+    assert ranking[ids["A"]] == (2, 66.0)
+    assert ranking[ids["B"]] == (1, 60.0)
+    # Produits sans sous-catégorie comptés pour la catégorie elle-même
+    assert [(entry["id"], entry["parent_id"], entry["revenue_ttc"]) for entry in drill_down] == [
+        (ids["A1"], ids["A"], 36.0), (ids["A"], None, 30.0)
+    ]
+
+
+def test_rebuild_months_replaces_rows(pg_db, product_sales):
+    """Test that rebuilding a month drops the products it no longer sells"""
+    pg_db.execute(text("DELETE FROM order_items WHERE product_id = :id"), {"id": product_sales["p3"]})
+
+    ProductDailySalesRepository(pg_db).rebuild_months([date(2001, 3, 15)])
+
+    assert _top(pg_db, category_id=product_sales["B"]) == []
+
+
+def test_top_categories_roll_up_deeper_trees(pg_db, product_sales):
+    """Test that a third level rolls up to its top-level category through category_closure"""
+    ids = product_sales
+    a11 = pg_db.execute(text(
+        "INSERT INTO categories (name, parent_id, level) VALUES ('Ranking A11', :parent, 3) RETURNING id"
+    ), {"parent": ids["A1"]}).scalar()
+    pg_db.execute(text("UPDATE products SET subcategory_id = :sub WHERE id = :id"), {"sub": a11, "id": ids["p1"]})
+    service = ProductPerformanceService(pg_db)
+
+    categories = service.get_top(date(2001, 3, 1), date(2001, 4, 30), group_by="category")
+    drill_down = service.get_top(date(2001, 3, 1), date(2001, 4, 30), group_by="category", category_id=ids["A"])
+
+    assert {entry["id"]: entry["revenue_ttc"] for entry in categories}[ids["A"]] == 66.0
+    assert [(entry["id"], entry["revenue_ttc"]) for entry in drill_down] == [(ids["A1"], 36.0), (ids["A"], 30.0)]
+    assert [entry["id"] for entry in service.get_top(date(2001, 3, 1), date(2001, 4, 30), category_id=ids["A1"])] == [ids["p1"]]
@@ -0,0 +1,126 @@
+"""
+Unit tests for the incremental rollup refresh of orders that move or disappear
+"""
+import pytest
+from datetime import date
+from sqlalchemy import func, select, text
+from app.repositories.customer_cohort_repository import CustomerCohortRepository
+from app.repositories.customer_score_repository import CustomerScoreRepository
+from app.repositories.daily_sales_rollup_repository import DailySalesRollupRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.product_daily_sales_repository import ProductDailySalesRepository
+from app.services.rollup_refresh_service import RollupRefreshService
+
+
+@pytest.fixture
+def refreshed_orders(pg_db, order_factory):
+    """Three orders of March 2001 already rolled up and older than every watermark (rolled back), returns the ids"""
+    db = pg_db
+    order_factory.partitions(date(2001, 3, 1), date(2001, 4, 1))
+    ids = {name: order_factory.marketplace(f"refresh-{name}") for name in ("A", "B")}
+    for name in ("x", "y"):
+        ids[name] = order_factory.customer(f"refresh-{name}@example.com")
+    ids["product"] = order_factory.product("REFRESH-P", order_factory.category("refresh"))
+    for name, day, customer, total in (("o1", "2001-03-05", "x", 10), ("o2", "2001-03-05", "x", 20), ("o3", "2001-03-06", "y", 30)):
+        ids[name] = order_factory.order(ids[customer], ids["A"], day, total,
+                                        created_at="2001-04-01", updated_at="2001-04-01")
+        order_factory.item(ids[name], total, product_id=ids["product"], created_at="2001-04-01")
+
+    DailySalesRollupRepository(db).rebuild_range(date(2001, 3, 1), date(2001, 4, 30))
+    # Tout ce qui précède est déjà traité: timestamps antérieurs aux watermarks
+    service = RollupRefreshService(db)
+    processed = db.execute(select(func.now() - text("interval '1 minute'"))).scalar().replace(tzinfo=None)
+    for name, (sources, _) in service._rollups().items():
+        for source in sources:
+            service.watermark_repository.set(f"{name}:{source}", processed)
+    return ids
+
+
+def _move(db, order_id, **values):
+    """Update columns of an order"""
+    assignments = ", ".join(f"{column} = :{column}" for column in values)
+    db.execute(text(f"UPDATE orders SET {assignments}, updated_at = now() WHERE id = :id"), {"id": order_id, **values})
+
+
+def _delete_order(db, order_id):
+    """Delete an order and its items"""
+    db.execute(text("DELETE FROM order_items WHERE order_id = :id"), {"id": order_id})
+    db.execute(text("DELETE FROM orders WHERE id = :id"), {"id": order_id})
+
+
+def test_sales_rollup_follows_moved_and_deleted_orders(pg_db, refreshed_orders):
+    """Test that the buckets an order leaves are rebuilt: new date, new marketplace, deletion"""
+    ids = refreshed_orders
+    _move(pg_db, ids["o1"], order_date="2001-03-09")
+    _move(pg_db, ids["o2"], marketplace_id=ids["B"])
+    _delete_order(pg_db, ids["o3"])
+
+    RollupRefreshService(pg_db).refresh(["daily_sales_rollup"])
+
+    rows = pg_db.execute(text("""
+        SELECT r.day, m.name, r.orders_count, r.items_count, r.total_ttc
+        FROM daily_sales_rollup r JOIN marketplaces m ON m.id = r.marketplace_id
+        WHERE m.name LIKE 'refresh-%' ORDER BY r.day, m.name
+    """)).all()
+    assert [tuple(row) for row in rows] == [
+        (date(2001, 3, 5), "refresh-B", 1, 1, 20), (date(2001, 3, 9), "refresh-A", 1, 1, 10)
+    ]
+
+
+def test_month_rollups_follow_moved_orders(pg_db, order_factory, refreshed_orders):
+    """Test that the month an order leaves gets its product sales and cost allocation rebuilt"""
+    ids = refreshed_orders
+    # Coût déjà pris en compte: updated_at antérieur aux watermarks
+    pg_db.execute(text("""
+        INSERT INTO operational_costs (month, amount, category, created_by, created_at, updated_at)
+        VALUES (DATE '2001-03-01', 9, 'divers', :user, TIMESTAMP '2001-04-01', TIMESTAMP '2001-04-01')
+    """), {"user": order_factory.user("refresh@example.com")})
+    OrderItemRepository(pg_db).allocate_operational_costs([date(2001, 3, 1)])
+    ProductDailySalesRepository(pg_db).rebuild_months([date(2001, 3, 1), date(2001, 4, 1)])
+
+    _move(pg_db, ids["o1"], order_date="2001-04-02")
+    RollupRefreshService(pg_db).refresh(["operational_cost_allocation", "product_daily_sales"])
+
+    allocations = pg_db.execute(text("""
+        SELECT order_id, other_costs FROM order_items WHERE product_id = :product ORDER BY order_id
+    """), {"product": ids["product"]}).all()
+    sales = pg_db.execute(text("""
+        SELECT day, units, revenue_ttc FROM product_daily_sales WHERE product_id = :product ORDER BY day
+    """), {"product": ids["product"]}).all()
+    # Les 9 du mois de mars répartis sur les deux lignes restantes
+    assert [tuple(row) for row in allocations] == [(ids["o1"], 0), (ids["o2"], 4.5), (ids["o3"], 4.5)]
+    assert [tuple(row) for row in sales] == [
+        (date(2001, 3, 5), 1, 20), (date(2001, 3, 6), 1, 30), (date(2001, 4, 2), 1, 10)
+    ]
+
+
+def test_cohorts_follow_reassigned_orders(pg_db, refreshed_orders):
+    """Test that the previous customer of a reassigned order leaves its cohort once it has no order left"""
+    ids = refreshed_orders
+    CustomerCohortRepository(pg_db).rebuild_customers([ids["x"], ids["y"]])
+
+    _move(pg_db, ids["o3"], customer_id=ids["x"])
+    RollupRefreshService(pg_db).refresh(["customer_cohorts"])
+
+    cohorts = pg_db.execute(text(
+        "SELECT customer_id FROM customer_cohorts WHERE customer_id IN (:x, :y)"
+    ), {"x": ids["x"], "y": ids["y"]}).scalars().all()
+    activity = pg_db.execute(text(
+        "SELECT active_customers, orders_count FROM customer_cohort_activity WHERE cohort_month = DATE '2001-03-01'"
+    )).one()
+    assert cohorts == [ids["x"]]
+    assert tuple(activity) == (1, 3)
+
+
+def test_scores_follow_reassigned_orders(pg_db, refreshed_orders):
+    """Test that the previous customer of a reassigned order loses it, and its score row once it has no order"""
+    ids = refreshed_orders
+    CustomerScoreRepository(pg_db).rebuild_customers([ids["x"], ids["y"]])
+
+    _move(pg_db, ids["o3"], customer_id=ids["x"])
+    RollupRefreshService(pg_db).refresh(["customer_scores"])
+
+    scores = pg_db.execute(text(
+        "SELECT customer_id, orders_count, ltv FROM customer_scores WHERE customer_id IN (:x, :y) ORDER BY customer_id"
+    ), {"x": ids["x"], "y": ids["y"]}).all()
+    assert [tuple(row) for row in scores] == [(ids["x"], 3, 60)]
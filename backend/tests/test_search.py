@@ -0,0 +1,89 @@
+"""
+Unit tests for the global search
+"""
+import pytest
+from datetime import date
+from sqlalchemy import text
+from app.controllers.search_controller import SearchController
+from app.core.exceptions import ValidationError
+from app.repositories.search_repository import SearchRepository, build_prefix_tsquery, escape_like
+from app.services.search_service import SearchService
+
+
+def test_prefix_tsquery():
+    """Test that every word becomes a prefix and tsquery operators are dropped"""
+    assert build_prefix_tsquery("Robe  ble") == "'robe':* & 'ble':*"
+    assert build_prefix_tsquery("TSH-001") == "'tsh-001':*"
+    assert build_prefix_tsquery("l'été & (x|y)") == "'l':* & 'été':* & 'x':* & 'y':*"
+    assert build_prefix_tsquery("'&!") is None
+
+
+def test_escape_like():
+    """Test that LIKE wildcards are matched literally"""
+    assert escape_like("10%_a\\b") == "10\\%\\_a\\\\b"
+
+
+def test_search_validation():
+    """Test that too short inputs and unknown types are rejected before querying"""
+    service = SearchService(db=None)
+
+    with pytest.raises(ValidationError):
+        service.search(" a ")
+    with pytest.raises(ValidationError):
+        service.search("robe", ["invoice"])
+    assert service.search("'&!") == []
+
+
+@pytest.fixture
+def search_db(pg_db, order_factory):
+    """PostgreSQL session with a few searchable rows (rolled back)"""
+    category_id = order_factory.category("SEARCH-TEST")
+    for sku, name in (("ZQX-1", "Robe bleue zqxtest"), ("ZQX-10", "Robe rouge zqxtest")):
+        order_factory.product(sku, category_id, name=name, description="Coton bio")
+    customer_id = order_factory.customer("zoe.searchtest@example.com", first_name="Zoé", last_name="Searchtest")
+    order_factory.order(customer_id, order_factory.marketplace("SEARCH-TEST"), date.today(), 12, 10,
+                        order_number="ZQX-ORDER-1", status="completed")
+    return pg_db
+
+
+def test_search_ranks_exact_words_first(search_db):
+    """Test that prefixes match and exact words rank first"""
+    results = SearchService(search_db).search("zqx-1", ["product"])
+
+    assert [result["detail"] for result in results] == ["ZQX-1", "ZQX-10"]
+    assert results[0]["rank"] > results[1]["rank"]
+
+
+def test_search_all_entities(search_db):
+    """Test that customers and orders are searched with products"""
+    customers = SearchService(search_db).search("zoé search")
+    orders = SearchService(search_db).search("ZQX-ORDER", ["order"])
+
+    assert [(result["type"], result["label"]) for result in customers] == [("customer", "Zoé Searchtest")]
+    assert [result["label"] for result in orders] == ["ZQX-ORDER-1"]
+
+
+def test_search_uses_gin_index(search_db, index_names):
+    """Test that each entity branch is served by its search_vector index"""
+    repository = SearchRepository(search_db)
+
+    for entity, index in (
+        ("product", "ix_products_search_vector"),
+        ("customer", "ix_customers_search_vector"),
+        ("order", "ix_orders_search_vector"),
+    ):
+        sql = "EXPLAIN " + repository._entity_query(entity, repository.trigram_available())
+        plan = "\n".join(row[0] for row in search_db.execute(
+            text(sql), {"term": "zqx", "tsquery": "'zqx':*", "pattern": "%zqx%", "limit": 10}
+        ))
+        assert any(name in plan for name in index_names(index))
+
+
+def test_search_response_reports_fuzzy_matching(search_db):
+    """Test that the response tells whether fuzzy matching (pg_trgm) was available"""
+    installed = search_db.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar()
+
+    response = SearchController.search("zqx", ["product"], 10, search_db)
+
+    assert response.fuzzy is installed
+    assert [result.detail for result in response.results] == ["ZQX-1", "ZQX-10"]
@@ -0,0 +1,53 @@
+"""
+Unit tests for SectionPermissionService.set_permission
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models import Role, SectionPermission
+from app.services.section_permission_service import SectionPermissionService
+
+
+def _session():
+    """In-memory database with one role"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Role.__table__, SectionPermission.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add(Role(id=1, name="viewer"))
+    db.commit()
+    return db
+
+
+def test_set_permission_updates_existing_row():
+    """Test that setting a permission twice keeps a single row"""
+    db = _session()
+    service = SectionPermissionService(db)
+
+    service.set_permission(1, "dashboard", can_view=True, can_edit=False)
+    permission = service.set_permission(1, "dashboard", can_view=True, can_edit=True)
+
+    assert db.query(SectionPermission).count() == 1
+    assert permission.can_edit is True
+
+
+def test_set_permission_falls_back_to_update_on_concurrent_create():
+    """Test that a row created by a concurrent request is updated instead of failing"""
+    db = _session()
+    service = SectionPermissionService(db)
+    db.add(SectionPermission(role_id=1, section="dashboard", can_view=False, can_edit=False))
+    db.commit()
+    # La requête concurrente n'était pas encore visible lors de la vérification
+    original = service.repository.get_by_role_and_section
+    calls = []
+
+    def stale_first_lookup(role_id, section):
+        calls.append(section)
+        return None if len(calls) == 1 else original(role_id, section)
+
+    service.repository.get_by_role_and_section = stale_first_lookup
+
+    permission = service.set_permission(1, "dashboard", can_view=True, can_edit=False)
+
+    assert len(calls) == 2
+    assert db.query(SectionPermission).count() == 1
+    assert permission.can_view is True
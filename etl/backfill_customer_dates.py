@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Recalcule customers.first_order_date / last_order_date à partir des commandes
+
+À lancer une fois sur une base importée avant que l'ETL ne maintienne ces
+colonnes, ou après des corrections faites hors ETL. Les clients sont traités
+par plages d'ids, une transaction par plage.
+
+Usage:
+    python backfill_customer_dates.py
+    python backfill_customer_dates.py --batch-size 20000
+"""
+import argparse
+import sys
+
+import psycopg2
+
+from config import get_database_url
+from loader import Loader
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(description="Recalculer les dates de première / dernière commande des clients")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Clients (plage d'ids) par transaction")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size doit être positif")
+
+    conn = psycopg2.connect(get_database_url())
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT min(id), max(id) FROM customers")
+            first_id, last_id = cur.fetchone()
+        conn.commit()
+        if first_id is None:
+            print("Aucun client")
+            return
+
+        loader = Loader(conn)
+        updated = 0
+        for start in range(first_id, last_id + 1, args.batch_size):
+            updated += loader.backfill_customer_order_dates(start, start + args.batch_size - 1)
+        print(f"✓ {updated} client(s) mis à jour")
+    except psycopg2.Error as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement: COPY + upsert ensembliste vs insertion ligne à ligne
+
+Le chemin "ligne à ligne" reproduit BaseRepository.create côté backend
+(INSERT, COMMIT puis relecture de la ligne: trois allers-retours par ligne).
+Les données générées (préfixe BENCH-) sont supprimées à la fin.
+
+Usage:
+    python benchmark_loader.py --orders 2000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import psycopg2
+
+from config import get_database_url
+from loader import Loader
+from readers import iter_complete_orders
+from transform import build_entities, normalize_columns, prepare_lines
+
+PREFIX = "BENCH-"
+
+
+def generate_lines(orders: int) -> pd.DataFrame:
+    """Génère un export synthétique (1 à 3 lignes par commande)"""
+    random.seed(42)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for order in range(orders):
+        order_date = start + timedelta(minutes=random.randint(0, 525600))
+        customer = random.randint(0, orders // 3)
+        for _ in range(random.randint(1, 3)):
+            product = random.randint(0, 999)
+            rows.append({
+                "order_id": f"{PREFIX}{order}",
+                "order_date": order_date.isoformat(),
+                "marketplace": "Benchmark",
+                "country": "FR",
+                "customer_id": f"{PREFIX}C{customer}",
+                "email": f"bench{customer}@bench.invalid",
+                "sku": f"{PREFIX}SKU{product}",
+                "product_name": f"Produit {product}",
+                "quantity": str(random.randint(1, 2)),
+                "price_ttc": f"{random.uniform(5, 80):.2f}",
+                "purchase_price": f"{random.uniform(2, 20):.2f}",
+            })
+    lines, _ = prepare_lines(normalize_columns(pd.DataFrame(rows)))
+    return lines
+
+
+def load_row_by_row(conn, entities, batch_id: int, loader: Loader) -> int:
+    """Insère chaque ligne avec INSERT + COMMIT + SELECT (comme BaseRepository.create)"""
+    written = 0
+
+    def create(cur, sql, params):
+        nonlocal written
+        cur.execute(sql + " RETURNING id", params)
+        new_id = cur.fetchone()[0]
+        conn.commit()
+        table = sql.split()[2]
+        cur.execute(f"SELECT * FROM {table} WHERE id = %s", (new_id,))
+        cur.fetchone()
+        written += 1
+        return new_id
+
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO marketplaces (name, created_at) VALUES ('Benchmark', now()) ON CONFLICT DO NOTHING")
+        cur.execute("SELECT id FROM marketplaces WHERE name = 'Benchmark'")
+        marketplace_id = cur.fetchone()[0]
+        category_id = loader.get_category_id("Benchmark")
+        conn.commit()
+
+        customer_ids = {}
+        for customer in entities["customers"].itertuples(index=False):
+            cur.execute("SELECT id FROM customers WHERE email = %s", (customer.email,))
+            row = cur.fetchone()
+            customer_ids[customer.email] = row[0] if row else create(
+                cur,
+                "INSERT INTO customers (email, platform_customer_id, created_at, updated_at) VALUES (%s, %s, now(), now())",
+                (customer.email, customer.platform_customer_id)
+            )
+
+        product_ids = {}
+        for product in entities["products"].itertuples(index=False):
+            cur.execute("SELECT id FROM products WHERE sku = %s", (product.sku,))
+            row = cur.fetchone()
+            product_ids[product.sku] = row[0] if row else create(
+                cur,
+                "INSERT INTO products (sku, name, category_id, purchase_price, created_at, updated_at)"
+                " VALUES (%s, %s, %s, round(%s::numeric, 2), now(), now())",
+                (product.sku, product.name, category_id, product.purchase_price)
+            )
+
+        order_ids = {}
+        for order in entities["orders"].itertuples(index=False):
+            order_ids[order.platform_order_id] = create(
+                cur,
+                "INSERT INTO orders (platform_order_id, order_number, customer_id, marketplace_id, country_code,"
+                " order_date, subtotal_ht, tax_amount, total_ht, total_ttc, status, import_batch_id, created_at, updated_at)"
+                " VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now(), now())",
+                (
+                    order.platform_order_id, order.order_number, customer_ids[order.customer_email],
+                    marketplace_id, order.country_code, order.order_date.to_pydatetime(), order.subtotal_ht,
+                    order.tax_amount, order.total_ht, order.total_ttc, order.status, batch_id
+                )
+            )
+
+        for item in entities["items"].itertuples(index=False):
+            create(
+                cur,
+                "INSERT INTO order_items (order_id, product_id, product_name, quantity, unit_price_ht, unit_price_ttc,"
+                " total_price_ht, total_price_ttc, cost_price, created_at)"
+                " VALUES (%s, %s, %s, %s, %s, %s, %s, %s, round(%s::numeric, 2), now())",
+                (
+                    order_ids[item.platform_order_id], product_ids[item.sku], item.product_name, item.quantity,
+                    item.unit_price_ht, item.unit_price_ttc, item.total_price_ht, item.total_price_ttc, item.cost_price
+                )
+            )
+    return written
+
+
+def cleanup(conn) -> None:
+    """Supprime les données du benchmark"""
+    with conn.cursor() as cur:
+        cur.execute(f"DELETE FROM order_items WHERE order_id IN (SELECT id FROM orders WHERE platform_order_id LIKE '{PREFIX}%%')")
+        cur.execute(f"DELETE FROM orders WHERE platform_order_id LIKE '{PREFIX}%%'")
+        cur.execute(f"DELETE FROM products WHERE sku LIKE '{PREFIX}%%'")
+        cur.execute(f"DELETE FROM customers WHERE platform_customer_id LIKE '{PREFIX}%%'")
+        cur.execute("DELETE FROM import_batches WHERE batch_number LIKE 'benchmark-%%'")
+        cur.execute("DELETE FROM categories WHERE name = 'Benchmark'")
+        cur.execute("DELETE FROM marketplaces WHERE name = 'Benchmark'")
+    conn.commit()
+
+
+def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(description="Comparer le chargement COPY au chargement ligne à ligne")
+    parser.add_argument("--orders", type=int, default=2000, help="Nombre de commandes générées")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Lignes par bloc pour le chemin COPY")
+    args = parser.parse_args()
+
+    lines = generate_lines(args.orders)
+    entities = build_entities(lines)
+    total_rows = sum(len(df) for df in entities.values())
+    print(f"{args.orders} commande(s), {len(lines)} ligne(s), {total_rows} enregistrement(s) à écrire")
+
+    conn = psycopg2.connect(get_database_url())
+    try:
+        cleanup(conn)
+        loader = Loader(conn)
+
+        batch_id = loader.start_batch(f"benchmark-row-{datetime.now():%Y%m%d%H%M%S}")
+        started = time.perf_counter()
+        written = load_row_by_row(conn, entities, batch_id, loader)
+        row_seconds = time.perf_counter() - started
+        print(f"Ligne à ligne : {written} ligne(s) en {row_seconds:.2f}s → {written / row_seconds:,.0f} lignes/s")
+
+        cleanup(conn)
+        loader = Loader(conn)
+        batch_id = loader.start_batch(f"benchmark-copy-{datetime.now():%Y%m%d%H%M%S}")
+        started = time.perf_counter()
+        chunks = (lines.iloc[start:start + args.chunk_size] for start in range(0, len(lines), args.chunk_size))
+        for chunk in iter_complete_orders(chunks, key="platform_order_id"):
+            loader.load(build_entities(chunk), batch_id)
+        copy_seconds = time.perf_counter() - started
+        print(f"COPY + upsert : {total_rows} ligne(s) en {copy_seconds:.2f}s → {total_rows / copy_seconds:,.0f} lignes/s")
+        print(f"Accélération  : x{row_seconds / copy_seconds:.1f}")
+    finally:
+        cleanup(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
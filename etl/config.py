@@ -0,0 +1,38 @@
+"""
+Configuration de l'ETL (variables d'environnement, même .env que le backend)
+"""
+import os
+
+
+def get_database_url() -> str:
+    """Retourne la DATABASE_URL, ou la construit à partir des variables POSTGRES_*"""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    user = os.getenv("POSTGRES_USER")
+    password = os.getenv("POSTGRES_PASSWORD")
+    if not user or not password:
+        raise RuntimeError(
+            "Veuillez définir soit DATABASE_URL, soit POSTGRES_USER et POSTGRES_PASSWORD"
+        )
+    host = os.getenv("POSTGRES_HOST", "localhost")
+    port = os.getenv("POSTGRES_PORT", "5432")
+    database = os.getenv("POSTGRES_DB", "dashboard")
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+# Nombre de lignes lues par bloc: borne la mémoire quelle que soit la taille du fichier
+CHUNK_SIZE = int(os.getenv("ETL_CHUNK_SIZE", "5000"))
+
+# Dossier surveillé par le cron (fichiers d'export des marketplaces)
+IMPORT_DIR = os.getenv("ETL_IMPORT_DIR", "/app/imports")
+
+# Catégorie utilisée pour les produits sans catégorie dans l'export
+DEFAULT_CATEGORY = "Non classé"
+
+# Processus de parsing / transformation (1 = tout dans le processus principal)
+WORKERS = int(os.getenv("ETL_WORKERS", str(os.cpu_count() or 1)))
+
+# Blocs transformés en attente de chargement (borne la mémoire si la base est lente)
+LOAD_QUEUE_SIZE = int(os.getenv("ETL_LOAD_QUEUE_SIZE", "4"))
@@ -1,31 +1,125 @@
 #!/usr/bin/env python3
 """
-Script ETL simple pour le dashboard analytics
+ETL des exports marketplaces vers orders / order_items
+
+Usage:
+    python etl.py                                  # fichiers de ETL_IMPORT_DIR (cron)
+    python etl.py exports/etsy_2025.csv --marketplace Etsy
+    python etl.py exports/*.jsonl --chunk-size 20000 --workers 4
+
+Les fichiers sont lus par blocs (mémoire bornée quelle que soit leur taille),
+parsés et transformés en parallèle puis chargés dans l'ordre (voir pipeline.py).
+Chaque import est tracé dans import_batches.
 """
+import argparse
+import glob
+import os
+import shutil
+import sys
+from datetime import datetime
 
-import pandas as pd
 import psycopg2
-from datetime import datetime
-import os
+
+from config import CHUNK_SIZE, IMPORT_DIR, LOAD_QUEUE_SIZE, WORKERS, get_database_url
+from loader import Loader
+from pipeline import run_pipeline
+
+
+def format_notes(stats: dict) -> str:
+    """Résumé d'un import pour ImportBatch.notes"""
+    parts = []
+    for entity, label in (("orders", "commandes"), ("customers", "clients"), ("products", "produits")):
+        parts.append(
+            f"{label}: {stats.get(f'{entity}_inserted', 0)} créé(e)s, "
+            f"{stats.get(f'{entity}_updated', 0)} mis(es) à jour, "
+            f"{stats.get(f'{entity}_skipped', 0)} inchangé(e)s"
+        )
+    parts.append(f"lignes de commande écrites: {stats.get('items', 0)}")
+    parts.append(f"dates de commande clients mises à jour: {stats.get('customers_dated', 0)}")
+    parts.append(f"lignes rejetées: {stats.get('rejected', 0)}")
+    return "; ".join(parts)
+
+
+def import_file(conn, path: str, chunk_size: int, default_marketplace: str = None, workers: int = 1) -> dict:
+    """
+    Importe un fichier d'export
+
+    Returns:
+        Compteurs de l'import (commandes, lignes, rejets)
+    """
+    loader = Loader(conn)
+    batch_number = f"{os.path.basename(path)}-{datetime.now():%Y%m%d%H%M%S}"
+    batch_id = loader.start_batch(batch_number)
+    stats = {"items": 0, "rejected": 0}
+
+    def load(entities):
+        counts = loader.load(entities, batch_id)
+        for key, value in counts.items():
+            stats[key] = stats.get(key, 0) + value
+        print(
+            f"  ... {stats['orders_inserted']} commande(s) créée(s), "
+            f"{stats['orders_updated']} mise(s) à jour, {stats['orders_skipped']} inchangée(s)"
+        )
+
+    try:
+        stats["rejected"] = run_pipeline(path, load, chunk_size, workers, LOAD_QUEUE_SIZE, default_marketplace)
+    except Exception as e:
+        imported = stats.get("orders_inserted", 0) + stats.get("orders_updated", 0)
+        loader.finish_batch(batch_id, imported, "failed" if imported == 0 else "partial", f"Erreur: {e}")
+        raise
+
+    imported = stats.get("orders_inserted", 0) + stats.get("orders_updated", 0)
+    loader.finish_batch(batch_id, imported, "success" if stats["rejected"] == 0 else "partial", format_notes(stats))
+    return stats
+
 
 def main():
+    """Point d'entrée principal du script"""
+    parser = argparse.ArgumentParser(description="Importer des exports de commandes marketplaces")
+    parser.add_argument("files", nargs="*", help="Fichiers CSV / JSON Lines / JSON à importer")
+    parser.add_argument("--marketplace", help="Marketplace à utiliser si l'export n'a pas de colonne marketplace")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Nombre de lignes lues par bloc")
+    parser.add_argument(
+        "--workers", type=int, default=WORKERS,
+        help="Processus de parsing / transformation (1 = séquentiel, défaut: nombre de cœurs)"
+    )
+    args = parser.parse_args()
+
     print(f"ETL démarré à {datetime.now()}")
-    
-    # Simulation de traitement ETL
-    data = {
-        'timestamp': [datetime.now()],
-        'processed_records': [100],
-        'status': ['success']
-    }
-    
-    df = pd.DataFrame(data)
-    print(f"Données traitées: {len(df)} enregistrements")
-    
-    # Ici vous pourriez sauvegarder en base de données
-    # connection = psycopg2.connect(os.getenv('DATABASE_URL'))
-    # ...
-    
+
+    # Sans fichier: traiter le dossier d'import puis archiver les fichiers traités
+    archive = not args.files
+    files = args.files or sorted(
+        path for pattern in ("*.csv", "*.jsonl", "*.ndjson", "*.json")
+        for path in glob.glob(os.path.join(IMPORT_DIR, pattern))
+    )
+    if not files:
+        print("Aucun fichier à importer")
+        return
+
+    conn = psycopg2.connect(get_database_url())
+    failed = False
+    try:
+        for path in files:
+            print(f"→ Import de {path}")
+            try:
+                stats = import_file(conn, path, args.chunk_size, args.marketplace, args.workers)
+            except Exception as e:
+                print(f"❌ Erreur sur {path}: {e}")
+                failed = True
+                continue
+            print(f"✓ {format_notes(stats)}")
+            if archive:
+                processed_dir = os.path.join(IMPORT_DIR, "processed")
+                os.makedirs(processed_dir, exist_ok=True)
+                shutil.move(path, os.path.join(processed_dir, os.path.basename(path)))
+    finally:
+        conn.close()
+
+    if failed:
+        sys.exit(1)
     print("ETL terminé avec succès")
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,531 @@
+"""
+Chargement des entités transformées dans PostgreSQL
+
+Chaque bloc est copié (COPY FROM STDIN) dans des tables de staging
+temporaires, puis fusionné dans les tables cibles par des requêtes
+ensemblistes INSERT ... ON CONFLICT DO UPDATE, le tout dans une transaction
+par bloc: un import interrompu garde les blocs déjà validés et peut être
+relancé sans doublon.
+
+Les marges des lignes sont calculées par bloc, de façon vectorisée (voir
+margins.py), avec les taux de commission des marketplaces.
+
+Chaque enregistrement porte une empreinte (import_hash, voir transform.py):
+un enregistrement déjà importé à l'identique n'est pas réécrit (ni
+updated_at, ni les rollups ne bougent), seules ses différences le sont.
+
+orders et order_items sont partitionnées par mois sur order_date: les
+partitions des mois du bloc sont créées au besoin avant la fusion.
+
+customers.first_order_date / last_order_date (commandes non annulées) sont
+recalculées dans la même transaction pour les clients des commandes du bloc,
+par une seule requête ensembliste.
+"""
+import io
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from margins import compute_margins
+
+# Tables de staging (vidées à chaque commit)
+STAGING_TABLES = """
+CREATE TEMP TABLE IF NOT EXISTS stg_customers (
+    email varchar(255),
+    platform_customer_id varchar(100),
+    first_name varchar(100),
+    last_name varchar(100),
+    import_hash bigint
+) ON COMMIT DELETE ROWS;
+
+CREATE TEMP TABLE IF NOT EXISTS stg_products (
+    sku varchar(100),
+    platform_product_id varchar(100),
+    name varchar(255),
+    category_id integer,
+    subcategory_id integer,
+    purchase_price numeric,
+    selling_price_ht numeric,
+    selling_price_ttc numeric,
+    import_hash bigint
+) ON COMMIT DELETE ROWS;
+
+CREATE TEMP TABLE IF NOT EXISTS stg_orders (
+    platform_order_id varchar(100),
+    order_number varchar(100),
+    customer_email varchar(255),
+    platform_customer_id varchar(100),
+    marketplace varchar(100),
+    country_code varchar(10),
+    order_date timestamp,
+    subtotal_ht numeric,
+    discount_amount numeric,
+    tax_amount numeric,
+    total_ht numeric,
+    total_ttc numeric,
+    status varchar(50),
+    has_returns boolean,
+    is_refunded boolean,
+    is_cancelled boolean,
+    import_hash bigint,
+    customer_id integer
+) ON COMMIT DELETE ROWS;
+
+-- Commandes créées ou modifiées par le bloc (les autres gardent leurs lignes)
+CREATE TEMP TABLE IF NOT EXISTS stg_changed_orders (
+    order_id integer,
+    order_date timestamp,
+    platform_order_id varchar(100),
+    customer_id integer,
+    previous_customer_id integer,
+    inserted boolean
+) ON COMMIT DELETE ROWS;
+
+CREATE TEMP TABLE IF NOT EXISTS stg_items (
+    platform_order_id varchar(100),
+    sku varchar(100),
+    product_name varchar(255),
+    quantity integer,
+    unit_price_ht numeric,
+    unit_price_ttc numeric,
+    total_price_ht numeric,
+    total_price_ttc numeric,
+    cost_price numeric,
+    gross_margin numeric,
+    net_margin numeric,
+    marketplace_commission numeric,
+    calculated_net_margin numeric
+) ON COMMIT DELETE ROWS;
+"""
+
+# Dates de première / dernière commande non annulée des clients de la sous-requête {customers}
+# (une colonne customer_id); les lignes déjà à jour ne sont pas réécrites
+CUSTOMER_ORDER_DATES = """
+UPDATE customers c SET first_order_date = d.first_order_date, last_order_date = d.last_order_date
+FROM (
+    SELECT t.customer_id, min(o.order_date) AS first_order_date, max(o.order_date) AS last_order_date
+    FROM ({customers}) AS t (customer_id)
+    LEFT JOIN orders o ON o.customer_id = t.customer_id AND o.is_cancelled IS NOT TRUE
+    GROUP BY t.customer_id
+) d
+WHERE c.id = d.customer_id
+  AND (c.first_order_date IS DISTINCT FROM d.first_order_date OR c.last_order_date IS DISTINCT FROM d.last_order_date)
+"""
+
+
+def copy_dataframe(cur, table: str, df: pd.DataFrame, columns: List[str]) -> None:
+    """
+    Copie un DataFrame dans une table avec COPY FROM STDIN (format CSV)
+
+    Les valeurs vides et NaN deviennent NULL.
+    """
+    buffer = io.StringIO()
+    df[columns].to_csv(buffer, index=False, header=False, na_rep="", date_format="%Y-%m-%d %H:%M:%S")
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _split_counts(rows: List[tuple], staged: int) -> Tuple[int, int, int]:
+    """(créés, mis à jour, inchangés) à partir des lignes RETURNING (xmax = 0)"""
+    inserted = sum(1 for row in rows if row[0])
+    return inserted, len(rows) - inserted, staged - len(rows)
+
+
+class Loader:
+    """
+    Écrit les blocs de l'ETL (clients, produits, commandes, lignes)
+
+    Les identifiants des catégories sont mis en cache pour toute la durée de
+    l'import.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._staging_ready = False
+        self._categories: Dict[Tuple[str, Optional[int]], int] = {}
+
+    # --- Lots d'import -------------------------------------------------
+
+    def start_batch(self, batch_number: str) -> int:
+        """Crée la ligne ImportBatch de l'import (statut "partial" tant qu'il tourne)"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO import_batches (batch_number, import_date, records_imported, status, created_at)
+                VALUES (%s, %s, 0, 'partial', now())
+                RETURNING id
+                """,
+                (batch_number, datetime.utcnow())
+            )
+            batch_id = cur.fetchone()[0]
+        self.conn.commit()
+        return batch_id
+
+    def finish_batch(self, batch_id: int, records_imported: int, status: str, notes: Optional[str] = None) -> None:
+        """Met à jour le compteur et le statut final du lot"""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "UPDATE import_batches SET records_imported = %s, status = %s, notes = %s WHERE id = %s",
+                (records_imported, status, notes, batch_id)
+            )
+        self.conn.commit()
+
+    # --- Référentiels ----------------------------------------------------
+
+    def get_category_id(self, name: str, parent_id: Optional[int] = None) -> int:
+        """Retourne l'id d'une catégorie (ou sous-catégorie), en la créant si besoin"""
+        key = (name, parent_id)
+        if key not in self._categories:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id FROM categories WHERE name = %s AND parent_id IS NOT DISTINCT FROM %s ORDER BY id LIMIT 1",
+                    key
+                )
+                row = cur.fetchone()
+                if row is None:
+                    cur.execute(
+                        "INSERT INTO categories (name, parent_id, level, created_at) VALUES (%s, %s, %s, now()) RETURNING id",
+                        (name, parent_id, 1 if parent_id is None else 2)
+                    )
+                    row = cur.fetchone()
+            self._categories[key] = row[0]
+        return self._categories[key]
+
+    # --- Entités ----------------------------------------------------------
+
+    def _ensure_staging(self, cur) -> None:
+        if not self._staging_ready:
+            cur.execute(STAGING_TABLES)
+            self._staging_ready = True
+
+    def load_customers(self, cur, customers: pd.DataFrame) -> Tuple[int, int, int]:
+        """
+        Fusionne les clients du bloc (clé: email)
+
+        Returns:
+            (créés, mis à jour, inchangés)
+        """
+        copy_dataframe(cur, "stg_customers", customers, [
+            "email", "platform_customer_id", "first_name", "last_name", "import_hash"
+        ])
+        cur.execute("""
+            INSERT INTO customers (email, platform_customer_id, first_name, last_name, import_hash, created_at, updated_at)
+            SELECT s.email, s.platform_customer_id, s.first_name, s.last_name, s.import_hash, now(), now()
+            FROM stg_customers s
+            -- Client déjà connu sous un autre email: retrouvé par son identifiant plateforme
+            WHERE NOT EXISTS (
+                SELECT 1 FROM customers c
+                WHERE c.platform_customer_id = s.platform_customer_id AND c.email <> s.email
+            )
+            ON CONFLICT (email) DO UPDATE SET
+                platform_customer_id = COALESCE(customers.platform_customer_id, EXCLUDED.platform_customer_id),
+                first_name = COALESCE(EXCLUDED.first_name, customers.first_name),
+                last_name = COALESCE(EXCLUDED.last_name, customers.last_name),
+                import_hash = EXCLUDED.import_hash,
+                updated_at = now()
+            WHERE customers.import_hash IS DISTINCT FROM EXCLUDED.import_hash
+            RETURNING (xmax = 0)
+        """)
+        return _split_counts(cur.fetchall(), len(customers))
+
+    def load_products(self, cur, products: pd.DataFrame, batch_id: int) -> Tuple[int, int, int]:
+        """
+        Fusionne les produits du bloc (clé: sku)
+
+        Returns:
+            (créés, mis à jour, inchangés)
+        """
+        products = products.copy()
+        products["category_id"] = [self.get_category_id(name) for name in products["category"]]
+        products["subcategory_id"] = pd.array([
+            self.get_category_id(sub, parent) if sub else None
+            for sub, parent in zip(products["subcategory"], products["category_id"])
+        ], dtype="Int64")
+        copy_dataframe(cur, "stg_products", products, [
+            "sku", "platform_product_id", "name", "category_id", "subcategory_id",
+            "purchase_price", "selling_price_ht", "selling_price_ttc", "import_hash"
+        ])
+        cur.execute("""
+            INSERT INTO products (
+                sku, platform_product_id, name, category_id, subcategory_id,
+                purchase_price, selling_price_ht, selling_price_ttc, import_batch_id, import_hash,
+                photos_count, status, is_online, is_draft, created_at, updated_at
+            )
+            SELECT
+                s.sku, s.platform_product_id, s.name, s.category_id, s.subcategory_id,
+                round(s.purchase_price, 2), round(s.selling_price_ht, 2), round(s.selling_price_ttc, 2),
+                %(batch_id)s, s.import_hash,
+                0, 'sold', false, false, now(), now()
+            FROM stg_products s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM products p
+                WHERE p.platform_product_id = s.platform_product_id AND p.sku <> s.sku
+            )
+            ON CONFLICT (sku) DO UPDATE SET
+                platform_product_id = COALESCE(products.platform_product_id, EXCLUDED.platform_product_id),
+                name = EXCLUDED.name,
+                category_id = EXCLUDED.category_id,
+                subcategory_id = COALESCE(EXCLUDED.subcategory_id, products.subcategory_id),
+                purchase_price = COALESCE(EXCLUDED.purchase_price, products.purchase_price),
+                selling_price_ht = EXCLUDED.selling_price_ht,
+                selling_price_ttc = EXCLUDED.selling_price_ttc,
+                import_hash = EXCLUDED.import_hash,
+                updated_at = now()
+            WHERE products.import_hash IS DISTINCT FROM EXCLUDED.import_hash
+            RETURNING (xmax = 0)
+        """, {"batch_id": batch_id})
+        return _split_counts(cur.fetchall(), len(products))
+
+    def load_orders(self, cur, orders: pd.DataFrame, batch_id: int) -> Tuple[int, int, int]:
+        """
+        Fusionne les commandes du bloc (clé: platform_order_id)
+
+        Les commandes créées ou modifiées sont notées dans stg_changed_orders.
+
+        Returns:
+            (créées, mises à jour, inchangées)
+
+        Raises:
+            ValueError: clé de commande en double ou client introuvable (voir
+                _check_order_keys et _resolve_customers), rien n'est écrit
+        """
+        copy_dataframe(cur, "stg_orders", orders, [
+            "platform_order_id", "order_number", "customer_email", "platform_customer_id", "marketplace",
+            "country_code", "order_date", "subtotal_ht", "discount_amount", "tax_amount", "total_ht",
+            "total_ttc", "status", "has_returns", "is_refunded", "is_cancelled", "import_hash"
+        ])
+        cur.execute("""
+            INSERT INTO marketplaces (name, created_at)
+            SELECT DISTINCT marketplace, now() FROM stg_orders
+            ON CONFLICT (name) DO NOTHING
+        """)
+        # Partitions mensuelles des dates du bloc (mois déjà créés: rien à faire)
+        cur.execute("""
+            SELECT ensure_monthly_partitions(parent, bounds.first_day, bounds.last_day)
+            FROM (VALUES ('orders'::regclass), ('order_items'::regclass)) AS tables (parent),
+                 (SELECT min(order_date)::date AS first_day, max(order_date)::date AS last_day FROM stg_orders) AS bounds
+        """)
+        self._check_order_keys(cur)
+        self._resolve_customers(cur)
+        # platform_order_id n'est unique que par order_date (clé de partition): une commande
+        # dont la date change est d'abord déplacée, ses lignes suivent (ON UPDATE CASCADE).
+        # Les anciens jour / marketplace / client sont journalisés par trigger (order_changes)
+        cur.execute("""
+            UPDATE orders o SET order_date = s.order_date
+            FROM stg_orders s
+            WHERE o.platform_order_id = s.platform_order_id AND o.order_date <> s.order_date
+        """)
+        # xmax n'est pas lisible dans le RETURNING d'une table partitionnée: les commandes
+        # déjà présentes sont relevées dans le même instantané que l'upsert
+        cur.execute("""
+            WITH existing AS (
+                SELECT o.platform_order_id, o.customer_id FROM orders o
+                JOIN stg_orders s ON s.platform_order_id = o.platform_order_id AND s.order_date = o.order_date
+            ),
+            upserted AS (
+                INSERT INTO orders (
+                    platform_order_id, order_number, customer_id, marketplace_id, country_code,
+                    order_date, subtotal_ht, discount_amount, tax_amount, total_ht, total_ttc,
+                    status, has_returns, is_refunded, is_cancelled, import_batch_id, import_hash,
+                    created_at, updated_at
+                )
+                SELECT
+                    s.platform_order_id, s.order_number, s.customer_id, m.id, s.country_code,
+                    s.order_date, s.subtotal_ht, s.discount_amount, s.tax_amount, s.total_ht, s.total_ttc,
+                    s.status, s.has_returns, s.is_refunded, s.is_cancelled, %(batch_id)s, s.import_hash,
+                    now(), now()
+                FROM stg_orders s
+                JOIN marketplaces m ON m.name = s.marketplace
+                ON CONFLICT (platform_order_id, order_date) DO UPDATE SET
+                    order_number = EXCLUDED.order_number,
+                    customer_id = EXCLUDED.customer_id,
+                    marketplace_id = EXCLUDED.marketplace_id,
+                    country_code = EXCLUDED.country_code,
+                    subtotal_ht = EXCLUDED.subtotal_ht,
+                    discount_amount = EXCLUDED.discount_amount,
+                    tax_amount = EXCLUDED.tax_amount,
+                    total_ht = EXCLUDED.total_ht,
+                    total_ttc = EXCLUDED.total_ttc,
+                    status = EXCLUDED.status,
+                    has_returns = EXCLUDED.has_returns,
+                    is_refunded = EXCLUDED.is_refunded,
+                    is_cancelled = EXCLUDED.is_cancelled,
+                    import_batch_id = EXCLUDED.import_batch_id,
+                    import_hash = EXCLUDED.import_hash,
+                    updated_at = now()
+                WHERE orders.import_hash IS DISTINCT FROM EXCLUDED.import_hash
+                RETURNING id, order_date, platform_order_id, customer_id
+            )
+            INSERT INTO stg_changed_orders (order_id, order_date, platform_order_id, customer_id, previous_customer_id, inserted)
+            SELECT u.id, u.order_date, u.platform_order_id, u.customer_id, e.customer_id, e.platform_order_id IS NULL
+            FROM upserted u
+            LEFT JOIN existing e ON e.platform_order_id = u.platform_order_id
+            RETURNING inserted
+        """, {"batch_id": batch_id})
+        return _split_counts(cur.fetchall(), len(orders))
+
+    def _check_order_keys(self, cur) -> None:
+        """
+        Vérifie l'unicité de order_number et platform_order_id, que les contraintes de la
+        table partitionnée ne garantissent que par order_date
+
+        Raises:
+            ValueError: numéro de commande déjà porté par une autre commande (en base ou
+                dans le bloc), ou commande présente en base à plusieurs dates
+        """
+        cur.execute("""
+            SELECT 'numéro ' || s.order_number FROM stg_orders s
+            JOIN orders o ON o.order_number = s.order_number
+            WHERE o.platform_order_id IS DISTINCT FROM s.platform_order_id
+            UNION
+            SELECT 'numéro ' || order_number FROM stg_orders
+            GROUP BY order_number HAVING count(DISTINCT platform_order_id) > 1
+            UNION
+            SELECT 'commande ' || o.platform_order_id FROM orders o
+            JOIN stg_orders s ON s.platform_order_id = o.platform_order_id
+            GROUP BY o.platform_order_id HAVING count(*) > 1
+            LIMIT 10
+        """)
+        duplicates = [key for key, in cur.fetchall()]
+        if duplicates:
+            raise ValueError(f"Commandes en double (order_number / platform_order_id): {', '.join(sorted(duplicates))}")
+
+    def _resolve_customers(self, cur) -> None:
+        """
+        Renseigne stg_orders.customer_id (email, à défaut platform_customer_id)
+
+        Une commande sans client ne serait pas fusionnée et passerait pour inchangée:
+        le bloc échoue avant d'avoir écrit quoi que ce soit.
+
+        Raises:
+            ValueError: commande dont le client n'est pas en base
+        """
+        cur.execute("""
+            UPDATE stg_orders s SET customer_id = (
+                SELECT id FROM customers
+                WHERE email = s.customer_email OR platform_customer_id = s.platform_customer_id
+                ORDER BY email = s.customer_email DESC
+                LIMIT 1
+            )
+        """)
+        cur.execute("SELECT platform_order_id FROM stg_orders WHERE customer_id IS NULL ORDER BY 1 LIMIT 10")
+        unresolved = [order_id for order_id, in cur.fetchall()]
+        if unresolved:
+            raise ValueError(f"Commandes dont le client est introuvable: {', '.join(unresolved)}")
+
+    def update_customer_order_dates(self, cur) -> int:
+        """
+        Recalcule les dates de première / dernière commande des clients des commandes
+        créées ou modifiées par le bloc (et de leur ancien client si elles ont changé de client)
+
+        Returns:
+            Nombre de clients mis à jour
+        """
+        cur.execute(CUSTOMER_ORDER_DATES.format(customers="""
+            SELECT customer_id FROM stg_changed_orders
+            UNION
+            SELECT previous_customer_id FROM stg_changed_orders WHERE previous_customer_id IS NOT NULL
+        """))
+        return cur.rowcount
+
+    def backfill_customer_order_dates(self, first_id: int, last_id: int) -> int:
+        """
+        Recalcule les dates de première / dernière commande d'une plage d'ids clients (une transaction)
+
+        Returns:
+            Nombre de clients mis à jour
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    CUSTOMER_ORDER_DATES.format(customers="SELECT id FROM customers WHERE id BETWEEN %(first_id)s AND %(last_id)s"),
+                    {"first_id": first_id, "last_id": last_id}
+                )
+                updated = cur.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return updated
+
+    def _get_margin_inputs(self, cur, items: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """(prix d'achat par sku, taux de commission par marketplace) pour les lignes du bloc"""
+        purchase_prices = pd.Series(dtype="float64")
+        # Prix d'achat du produit: seulement utile aux lignes sans coût dans l'export
+        if items["cost_price"].isna().any():
+            cur.execute("""
+                SELECT p.sku, p.purchase_price FROM products p
+                JOIN stg_products s ON s.sku = p.sku
+                WHERE p.purchase_price IS NOT NULL
+            """)
+            purchase_prices = pd.Series(dict(cur.fetchall()), dtype="float64")
+        cur.execute("""
+            SELECT name, commission_rate FROM marketplaces
+            WHERE name IN (SELECT DISTINCT marketplace FROM stg_orders) AND commission_rate IS NOT NULL
+        """)
+        commission_rates = pd.Series(dict(cur.fetchall()), dtype="float64")
+        return purchase_prices, commission_rates
+
+    def load_items(self, cur, items: pd.DataFrame, orders: pd.DataFrame) -> int:
+        """Remplace les lignes des commandes créées ou modifiées par le bloc, marges comprises"""
+        items = items.assign(
+            marketplace=items["platform_order_id"].map(orders.set_index("platform_order_id")["marketplace"])
+        )
+        items = compute_margins(items, *self._get_margin_inputs(cur, items))
+        copy_dataframe(cur, "stg_items", items, [
+            "platform_order_id", "sku", "product_name", "quantity", "unit_price_ht", "unit_price_ttc",
+            "total_price_ht", "total_price_ttc", "cost_price",
+            "gross_margin", "net_margin", "marketplace_commission", "calculated_net_margin"
+        ])
+        # Une commande réimportée remplace ses lignes (l'export fait foi)
+        cur.execute("""
+            DELETE FROM order_items
+            WHERE (order_id, order_date) IN (SELECT order_id, order_date FROM stg_changed_orders WHERE NOT inserted)
+        """)
+        cur.execute("""
+            INSERT INTO order_items (
+                order_id, order_date, product_id, product_name, quantity, unit_price_ht, unit_price_ttc,
+                total_price_ht, total_price_ttc, cost_price,
+                gross_margin, net_margin, packaging_cost, washing_cost, marketplace_commission, other_costs,
+                calculated_net_margin, created_at
+            )
+            SELECT
+                changed.order_id, changed.order_date, p.id, s.product_name, s.quantity, round(s.unit_price_ht, 2), round(s.unit_price_ttc, 2),
+                s.total_price_ht, s.total_price_ttc, round(s.cost_price, 2),
+                s.gross_margin, s.net_margin, 0, 0, s.marketplace_commission, 0,
+                s.calculated_net_margin, now()
+            FROM stg_items s
+            JOIN stg_changed_orders changed ON changed.platform_order_id = s.platform_order_id
+            LEFT JOIN products p ON p.sku = s.sku
+        """)
+        return cur.rowcount
+
+    def load(self, entities: Dict[str, pd.DataFrame], batch_id: int) -> Dict[str, int]:
+        """
+        Charge un bloc dans une transaction
+
+        Returns:
+            Compteurs du bloc: créés / mis à jour / inchangés par entité, lignes écrites
+        """
+        counts = {}
+        try:
+            with self.conn.cursor() as cur:
+                self._ensure_staging(cur)
+                for entity, result in (
+                    ("customers", self.load_customers(cur, entities["customers"])),
+                    ("products", self.load_products(cur, entities["products"], batch_id)),
+                    ("orders", self.load_orders(cur, entities["orders"], batch_id)),
+                ):
+                    for key, value in zip(("inserted", "updated", "skipped"), result):
+                        counts[f"{entity}_{key}"] = value
+                counts["items"] = self.load_items(cur, entities["items"], entities["orders"])
+                counts["customers_dated"] = self.update_customer_order_dates(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # Les ids mis en cache pendant la transaction annulée n'existent plus
+            self._categories.clear()
+            self._staging_ready = False
+            raise
+        return counts
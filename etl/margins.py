@@ -0,0 +1,69 @@
+"""
+Calcul vectorisé des marges des lignes de commande
+
+Mêmes formules que le recalcul ensembliste du backend
+(OrderItemRepository.recompute_margins):
+
+    coût                   = cost_price de la ligne, sinon purchase_price du produit
+    marge brute            = total_price_ht - coût x quantité
+    commission marketplace = total_price_ttc x commission_rate / 100
+    marge nette            = marge brute - commission
+    marge nette recalculée = marge nette - conditionnement - lavage - divers
+
+Sans coût connu, les marges restent NULL (la commission est toujours calculée).
+"""
+import numpy as np
+import pandas as pd
+
+# Frais opérationnels par ligne (répartis plus tard par le backend, 0 à l'import)
+OPERATIONAL_COST_COLUMNS = ["packaging_cost", "washing_cost", "other_costs"]
+
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    """
+    Arrondi au centime, demi-centime loin de zéro comme round() sur numeric
+
+    (np.round arrondit au pair le plus proche, et 2.675 vaut 2.67499... en float.)
+    """
+    return np.sign(values) * np.floor(np.abs(values) * 100 + 0.5 + 1e-6) / 100
+
+
+def compute_margins(items: pd.DataFrame, purchase_prices: pd.Series, commission_rates: pd.Series) -> pd.DataFrame:
+    """
+    Ajoute les colonnes de marge à des lignes de commande
+
+    Args:
+        items: Lignes (platform_order_id, sku, quantity, total_price_ht, total_price_ttc,
+            cost_price, marketplace, et éventuellement les frais opérationnels)
+        purchase_prices: Prix d'achat connus par sku (repli si la ligne n'a pas de coût)
+        commission_rates: Taux de commission (%) par nom de marketplace
+
+    Returns:
+        Copie des lignes avec gross_margin, marketplace_commission, net_margin,
+        calculated_net_margin et les frais opérationnels (0 si absents)
+    """
+    items = items.copy()
+    for column in OPERATIONAL_COST_COLUMNS:
+        if column not in items.columns:
+            items[column] = 0.0
+
+    cost = items["cost_price"].to_numpy(dtype="float64", na_value=np.nan)
+    fallback = items["sku"].map(purchase_prices).to_numpy(dtype="float64", na_value=np.nan)
+    cost = np.where(np.isnan(cost), fallback, cost)
+
+    quantity = items["quantity"].to_numpy(dtype="float64")
+    total_ht = items["total_price_ht"].to_numpy(dtype="float64")
+    total_ttc = items["total_price_ttc"].to_numpy(dtype="float64")
+    rate = items["marketplace"].map(commission_rates).to_numpy(dtype="float64", na_value=np.nan)
+
+    gross = round_cents(total_ht - round_cents(cost) * quantity)
+    commission = round_cents(total_ttc * np.nan_to_num(rate) / 100)
+    net = round_cents(gross - commission)
+    operational = items[OPERATIONAL_COST_COLUMNS].to_numpy(dtype="float64", na_value=0.0).sum(axis=1)
+
+    # NaN (coût inconnu) se propage: la colonne sera NULL après COPY
+    items["gross_margin"] = gross
+    items["marketplace_commission"] = commission
+    items["net_margin"] = net
+    items["calculated_net_margin"] = round_cents(net - operational)
+    return items
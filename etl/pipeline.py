@@ -0,0 +1,191 @@
+"""
+Pipeline d'import en trois étages: parse → transform → load
+
+Le parsing et la transformation (dates, montants, pays, empreintes) sont
+limités par le CPU: ils sont répartis par blocs sur un ProcessPoolExecutor.
+Le chargement reste dans un seul thread (une connexion, une transaction par
+bloc) qui consomme une file bornée: si la base ralentit, la file se remplit
+et la lecture du fichier s'arrête au lieu d'accumuler des blocs en mémoire.
+
+Les blocs sont chargés dans l'ordre du fichier, comme en séquentiel: les
+deux modes passent par les mêmes étages (iter_raw_chunks → parse_stage →
+iter_complete_orders → transform_stage). Les workers sont lancés en
+"spawn": un fork copierait l'état du thread de chargement (connexion
+psycopg2, verrous tenus au moment du fork).
+"""
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from readers import RawChunk, iter_complete_orders, iter_raw_chunks, parse_raw_chunk
+from transform import build_entities, normalize_columns, prepare_lines
+
+Entities = Dict[str, pd.DataFrame]
+
+# Délai entre deux vérifications que le thread de chargement est toujours vivant (s)
+QUEUE_POLL_SECONDS = 1.0
+
+
+def parse_stage(raw_chunk: RawChunk) -> pd.DataFrame:
+    """Étage parse: bloc brut → DataFrame aux colonnes canoniques"""
+    return normalize_columns(parse_raw_chunk(raw_chunk))
+
+
+def transform_stage(chunk: pd.DataFrame, default_marketplace: Optional[str] = None) -> Tuple[Optional[Entities], int]:
+    """Étage transform: lignes normalisées → (entités à charger ou None, lignes rejetées)"""
+    lines, rejected = prepare_lines(chunk, default_marketplace)
+    if lines.empty:
+        return None, rejected
+    return build_entities(lines), rejected
+
+
+def _serial_map(fn: Callable, items: Iterable, *args) -> Iterator:
+    """Applique un étage dans le processus courant"""
+    for item in items:
+        yield fn(item, *args)
+
+
+def _ordered_map(executor: Executor, fn: Callable, items: Iterable, max_pending: int, *args) -> Iterator:
+    """
+    executor.map paresseux: au plus max_pending tâches en cours, résultats dans l'ordre
+
+    (Executor.map soumet tout l'itérable d'un coup, ce qui lirait le fichier entier.)
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item, *args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _iter_entities(
+    path: str, chunk_size: int, map_stage: Callable, default_marketplace: Optional[str] = None
+) -> Iterator[Tuple[Optional[Entities], int]]:
+    """
+    Blocs transformés dans l'ordre du fichier
+
+    Args:
+        map_stage: map_stage(étage, blocs, *args) applique un étage à chaque bloc, dans l'ordre
+    """
+    parsed = map_stage(parse_stage, iter_raw_chunks(path, chunk_size))
+    # Le report de la dernière commande d'un bloc est séquentiel par nature: il reste ici
+    complete = iter_complete_orders(parsed, key="platform_order_id")
+    return map_stage(transform_stage, complete, default_marketplace)
+
+
+class _LoadThread(threading.Thread):
+    """Consomme la file des blocs transformés et les charge un par un"""
+
+    _DONE = object()
+
+    def __init__(self, load: Callable[[Entities], None], queue_size: int):
+        super().__init__(name="etl-loader", daemon=True)
+        self.load = load
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        while True:
+            entities = self.queue.get()
+            if entities is self._DONE:
+                return
+            try:
+                self.load(entities)
+            except BaseException as e:
+                # Le producteur s'en aperçoit au prochain put() et arrête la lecture
+                self.error = e
+                return
+
+    def put(self, entities) -> None:
+        """Ajoute un bloc, en attendant tant que la file est pleine et le chargeur vivant"""
+        while True:
+            if self.error is not None:
+                raise self.error
+            if not self.is_alive():
+                raise RuntimeError("Le thread de chargement s'est arrêté")
+            try:
+                self.queue.put(entities, timeout=QUEUE_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self) -> None:
+        """Signale la fin des blocs, attend le chargement et relaie son erreur éventuelle"""
+        while self.is_alive():
+            try:
+                self.queue.put(self._DONE, timeout=QUEUE_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def abort(self) -> None:
+        """Vide la file et arrête le chargeur après le bloc en cours"""
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.queue.put(self._DONE)
+        self.join()
+
+
+def run_pipeline(
+    path: str,
+    load: Callable[[Entities], None],
+    chunk_size: int,
+    workers: int,
+    queue_size: int,
+    default_marketplace: Optional[str] = None
+) -> int:
+    """
+    Lit, transforme et charge un fichier d'export
+
+    Args:
+        path: Fichier CSV / JSON Lines / JSON
+        load: Chargement d'un bloc d'entités (appelé depuis un seul thread, dans l'ordre du fichier)
+        chunk_size: Enregistrements par bloc
+        workers: Processus de parsing / transformation (<= 1: tout dans le processus courant)
+        queue_size: Blocs transformés en attente de chargement
+        default_marketplace: Marketplace utilisée quand l'export n'en indique pas
+
+    Returns:
+        Nombre de lignes rejetées
+    """
+    rejected = 0
+
+    if workers <= 1:
+        for entities, chunk_rejected in _iter_entities(path, chunk_size, _serial_map, default_marketplace):
+            rejected += chunk_rejected
+            if entities is not None:
+                load(entities)
+        return rejected
+
+    # Deux tâches d'avance par processus: les workers ne chôment pas pendant le report des commandes
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        loader = _LoadThread(load, queue_size)
+        loader.start()
+        try:
+            for entities, chunk_rejected in _iter_entities(
+                path, chunk_size,
+                lambda fn, items, *args: _ordered_map(executor, fn, items, max_pending, *args),
+                default_marketplace
+            ):
+                rejected += chunk_rejected
+                if entities is not None:
+                    loader.put(entities)
+        except BaseException:
+            loader.abort()
+            raise
+        loader.finish()
+    return rejected
@@ -0,0 +1,170 @@
+"""
+Lecture en flux des exports marketplaces (CSV, JSON Lines, tableau JSON)
+
+Un export est découpé en blocs bruts de chunk_size enregistrements
+(iter_raw_chunks), décodés en DataFrames aux colonnes texte par
+parse_raw_chunk, dans ce processus ou dans un worker: le typage est fait
+par transform.py.
+"""
+import io
+import json
+import os
+from typing import Iterator, List, Tuple, Union
+
+import pandas as pd
+
+# Taille des blocs lus dans les fichiers JSON (octets)
+JSON_READ_SIZE = 1 << 16
+
+
+def detect_format(path: str) -> str:
+    """Déduit le format d'un fichier à partir de son extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".csv", ".txt"):
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".json":
+        return "json"
+    raise ValueError(f"Format non supporté: {path} (attendu: .csv, .jsonl, .ndjson, .json)")
+
+
+def _as_text(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Toutes les colonnes en texte, valeurs nulles vides (quelle que soit la version de pandas)"""
+    return chunk.astype(object).where(chunk.notna(), "").astype(str)
+
+
+def _sniff_csv_separator(path: str) -> str:
+    with open(path, "r", encoding="utf-8-sig") as f:
+        header = f.readline()
+    # Les exports français utilisent souvent ';'
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def _iter_json_array(path: str) -> Iterator[dict]:
+    """Décode un tableau JSON objet par objet sans charger le fichier entier"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    with open(path, "r", encoding="utf-8-sig") as f:
+        eof = False
+        while True:
+            # Sauter les blancs et séparateurs entre deux objets
+            buffer = buffer.lstrip()
+            if not started and buffer:
+                if buffer[0] != "[":
+                    raise ValueError(f"{path}: un tableau JSON est attendu")
+                buffer = buffer[1:]
+                started = True
+                continue
+            if buffer.startswith(","):
+                buffer = buffer[1:]
+                continue
+            if buffer.startswith("]"):
+                return
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    if buffer:
+                        raise ValueError(f"{path}: JSON tronqué ou invalide")
+                    return
+                block = f.read(JSON_READ_SIZE)
+                eof = not block
+                buffer += block
+                continue
+            yield obj
+            buffer = buffer[end:]
+
+
+# Bloc brut: (format, contenu, séparateur CSV). Le contenu est du texte pour
+# csv / jsonl et une liste d'objets pour json. Il est décodé par parse_raw_chunk,
+# éventuellement dans un autre processus.
+RawChunk = Tuple[str, Union[str, List[dict]], str]
+
+
+def iter_raw_chunks(path: str, chunk_size: int) -> Iterator[RawChunk]:
+    """
+    Découpe un export en blocs bruts de chunk_size enregistrements, sans les parser
+
+    Pour les CSV, l'en-tête est répété dans chaque bloc et un bloc n'est coupé
+    qu'entre deux enregistrements (un champ entre guillemets peut contenir des
+    retours à la ligne).
+    """
+    file_format = detect_format(path)
+
+    if file_format == "json":
+        records: List[dict] = []
+        for record in _iter_json_array(path):
+            records.append(record)
+            if len(records) >= chunk_size:
+                yield file_format, records, ""
+                records = []
+        if records:
+            yield file_format, records, ""
+        return
+
+    separator = _sniff_csv_separator(path) if file_format == "csv" else ""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        header = f.readline() if file_format == "csv" else ""
+        lines: List[str] = []
+        records_count = 0
+        open_quote = False
+        for line in f:
+            lines.append(line)
+            if line.count('"') % 2:
+                open_quote = not open_quote
+            if open_quote:
+                continue
+            records_count += 1
+            if records_count >= chunk_size:
+                yield file_format, header + "".join(lines), separator
+                lines = []
+                records_count = 0
+        if lines:
+            yield file_format, header + "".join(lines), separator
+
+
+def parse_raw_chunk(raw_chunk: RawChunk) -> pd.DataFrame:
+    """Décode un bloc brut en DataFrame (colonnes texte)"""
+    file_format, content, separator = raw_chunk
+    if file_format == "csv":
+        return pd.read_csv(io.StringIO(content), sep=separator, dtype=str, keep_default_na=False)
+    if file_format == "jsonl":
+        chunk = pd.read_json(io.StringIO(content), lines=True, dtype=False)
+    else:
+        chunk = pd.DataFrame.from_records(content)
+    return _as_text(chunk)
+
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Lit un export par blocs, quel que soit son format (blocs bruts décodés sur place)"""
+    for raw_chunk in iter_raw_chunks(path, chunk_size):
+        yield parse_raw_chunk(raw_chunk)
+
+
+def iter_complete_orders(chunks: Iterator[pd.DataFrame], key: str) -> Iterator[pd.DataFrame]:
+    """
+    Regroupe les blocs pour qu'une commande ne soit jamais coupée en deux
+
+    Les lignes d'une même commande sont supposées contiguës dans l'export: les
+    lignes de la dernière commande d'un bloc sont reportées au bloc suivant.
+    """
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+            carry = None
+        if key not in chunk.columns or chunk.empty:
+            yield chunk
+            continue
+        last_key = chunk[key].iloc[-1]
+        tail = chunk[key] == last_key
+        # Bloc composé d'une seule commande: le garder en entier jusqu'au suivant
+        if tail.all():
+            carry = chunk
+            continue
+        carry = chunk[tail]
+        yield chunk[~tail]
+    if carry is not None and not carry.empty:
+        yield carry
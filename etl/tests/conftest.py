@@ -0,0 +1,48 @@
+"""
+Fixtures partagées des tests de l'ETL
+"""
+import psycopg2
+import pytest
+
+from config import get_database_url
+
+# Tables de staging du Loader, vidées à chaque commit (ON COMMIT DELETE ROWS)
+STAGING_TABLES = ("stg_customers", "stg_products", "stg_orders", "stg_changed_orders", "stg_items")
+
+
+class RolledBackConnection:
+    """
+    Connexion dont les commit() ne valident rien: tout est annulé en fin de test
+
+    commit() vide seulement les tables de staging, comme le ferait un vrai commit.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def commit(self):
+        with self._conn.cursor() as cur:
+            for table in STAGING_TABLES:
+                cur.execute(f"SELECT to_regclass('pg_temp.{table}') IS NOT NULL")
+                if cur.fetchone()[0]:
+                    cur.execute(f"TRUNCATE {table}")
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+@pytest.fixture
+def pg_conn():
+    """Connexion PostgreSQL (DATABASE_URL ou POSTGRES_*) annulée après le test, test ignoré sans base"""
+    try:
+        conn = psycopg2.connect(get_database_url())
+    except (RuntimeError, psycopg2.OperationalError):
+        pytest.skip("PostgreSQL n'est pas configuré ou pas joignable")
+    try:
+        yield RolledBackConnection(conn)
+    finally:
+        conn.rollback()
+        conn.close()
@@ -0,0 +1,125 @@
+"""
+Tests du chargement: réimport sans réécriture des enregistrements inchangés
+"""
+import pandas as pd
+import pytest
+
+from loader import Loader
+from transform import build_entities, normalize_columns, prepare_lines
+
+# Ligne d'export de référence (une commande d'une ligne)
+EXPORT_LINE = {
+    "order_id": "LOADER-TEST-1",
+    "date": "2001-03-05 10:00:00",
+    "status": "delivered",
+    "marketplace": "loader-test",
+    "email": "loader-test@example.com",
+    "first_name": "Ana",
+    "sku": "LOADER-TEST-SKU",
+    "product_name": "Robe",
+    "quantity": "1",
+    "price": "12,00",
+}
+
+
+def _entities(**changes) -> dict:
+    """Entités de la ligne de référence, avec des champs modifiés"""
+    lines, _ = prepare_lines(normalize_columns(pd.DataFrame([{**EXPORT_LINE, **changes}], dtype=str)))
+    return build_entities(lines)
+
+
+def _order(conn) -> tuple:
+    """(order_date de la commande, order_date de ses lignes, quantité totale, statut)"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT o.order_date, min(i.order_date), sum(i.quantity), o.status
+            FROM orders o JOIN order_items i ON i.order_id = o.id
+            WHERE o.platform_order_id = 'LOADER-TEST-1'
+            GROUP BY o.id, o.order_date, o.status
+        """)
+        return cur.fetchone()
+
+
+def test_reimport_skips_unchanged_records(pg_conn):
+    """Un enregistrement réimporté à l'identique n'est pas réécrit, ses lignes non plus"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    first = loader.load(_entities(), batch_id)
+
+    again = loader.load(_entities(), batch_id)
+
+    assert (first["orders_inserted"], first["items"]) == (1, 1)
+    assert (again["orders_inserted"], again["orders_updated"], again["orders_skipped"]) == (0, 0, 1)
+    assert (again["customers_skipped"], again["products_skipped"], again["items"]) == (1, 1, 0)
+
+
+def test_reimport_applies_any_hashed_change(pg_conn):
+    """Toute différence d'un champ de l'empreinte est appliquée, date de commande comprise"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    loader.load(_entities(), batch_id)
+
+    for changes in ({"quantity": "2"}, {"status": "cancelled"}, {"price": "13"}, {"date": "2001-04-02 10:00:00"}):
+        counts = loader.load(_entities(**changes), batch_id)
+        assert (counts["orders_updated"], counts["orders_skipped"]) == (1, 0), changes
+
+    # Dernier import: changement de mois, les lignes suivent la commande dans sa nouvelle partition
+    order_date, items_date, quantity, status = _order(pg_conn)
+    assert order_date == items_date == pd.Timestamp("2001-04-02 10:00:00")
+    assert (quantity, status) == (1, "completed")
+
+
+def test_reimport_updates_customer_fields(pg_conn):
+    """Un client dont un champ change est mis à jour, les autres entités restent inchangées"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    loader.load(_entities(), batch_id)
+
+    counts = loader.load(_entities(first_name="Anna"), batch_id)
+
+    assert (counts["customers_updated"], counts["products_skipped"], counts["orders_skipped"]) == (1, 1, 1)
+
+
+def test_move_logs_previous_bucket(pg_conn):
+    """Une commande déplacée par réimport laisse son ancien jour dans order_changes"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    loader.load(_entities(), batch_id)
+
+    loader.load(_entities(date="2001-04-02 10:00:00"), batch_id)
+
+    with pg_conn.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT c.order_date FROM order_changes c
+            JOIN orders o ON o.id = c.order_id WHERE o.platform_order_id = 'LOADER-TEST-1'
+        """)
+        logged = {order_date for order_date, in cur.fetchall()}
+    # Le nouveau jour y figure aussi: les lignes remplacées sont journalisées
+    assert pd.Timestamp("2001-03-05 10:00:00") in logged
+
+
+def test_rejects_duplicate_order_number(pg_conn):
+    """Un numéro de commande déjà porté par une autre commande fait échouer le bloc"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    loader.load(_entities(order_number="LOADER-TEST-N"), batch_id)
+
+    # Autre commande, autre mois: la contrainte (order_number, order_date) ne la refuserait pas
+    with pytest.raises(ValueError, match="LOADER-TEST-N"):
+        loader.load(_entities(order_id="LOADER-TEST-2", order_number="LOADER-TEST-N", date="2001-04-02 10:00:00"), batch_id)
+
+
+def test_rejects_order_without_customer(pg_conn):
+    """Une commande dont le client est introuvable fait échouer le bloc avant tout déplacement"""
+    loader = Loader(pg_conn)
+    batch_id = loader.start_batch("loader-test")
+    loader.load(_entities(), batch_id)
+    # Client absent de la base: le bloc n'a pas chargé ses clients
+    orders = _entities(email="loader-unknown@example.com", date="2001-04-02 10:00:00")["orders"]
+
+    with pg_conn.cursor() as cur:
+        loader._ensure_staging(cur)
+        with pytest.raises(ValueError, match="LOADER-TEST-1"):
+            loader.load_orders(cur, orders, batch_id)
+
+    assert _order(pg_conn)[0] == pd.Timestamp("2001-03-05 10:00:00")
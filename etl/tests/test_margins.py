@@ -0,0 +1,43 @@
+"""
+Tests du calcul vectorisé des marges (mêmes cas que backend/tests/test_margin_service.py)
+"""
+import numpy as np
+import pandas as pd
+
+from margins import compute_margins, round_cents
+
+# (commission %, quantité, total HT, total TTC, coût de la ligne, prix d'achat du produit, frais de conditionnement)
+# -> (marge brute, commission, marge nette, marge nette recalculée)
+MARGIN_CASES = [
+    (15, 1, 8.75, 10.50, 5.00, None, 0.50, (3.75, 1.58, 2.17, 1.67)),  # 1.575 -> 1.58
+    (5, 2, 0.42, 0.50, 0.10, None, 0, (0.22, 0.03, 0.19, 0.19)),  # 0.025 -> 0.03
+    (15, 1, 10.00, 12.00, None, 12.50, 0, (-2.50, 1.80, -4.30, -4.30)),  # Prix d'achat du produit
+    (15, 1, 10.00, 12.00, None, None, 0, (None, 1.80, None, None)),  # Coût inconnu
+]
+
+
+def test_round_cents_half_away_from_zero():
+    """Demi-centimes arrondis loin de zéro, comme round() sur numeric (et non au pair)"""
+    values = np.array([2.675, 0.025, 1.005, -2.675, -0.125, 3.14159])
+
+    assert round_cents(values).tolist() == [2.68, 0.03, 1.01, -2.68, -0.13, 3.14]
+
+
+def test_compute_margins():
+    """Marges, commission et repli sur le prix d'achat du produit; sans coût les marges restent NaN"""
+    items = pd.DataFrame([
+        {"sku": f"S{number}", "marketplace": f"m{rate}", "quantity": quantity, "total_price_ht": total_ht,
+         "total_price_ttc": total_ttc, "cost_price": cost, "packaging_cost": packaging}
+        for number, (rate, quantity, total_ht, total_ttc, cost, _, packaging, _) in enumerate(MARGIN_CASES)
+    ])
+    purchase_prices = pd.Series({f"S{number}": case[5] for number, case in enumerate(MARGIN_CASES) if case[5]})
+    commission_rates = pd.Series({"m15": 15.0, "m5": 5.0})
+
+    result = compute_margins(items, purchase_prices, commission_rates)
+
+    columns = ["gross_margin", "marketplace_commission", "net_margin", "calculated_net_margin"]
+    expected = np.array([[np.nan if value is None else value for value in case[-1]] for case in MARGIN_CASES])
+    np.testing.assert_array_equal(result[columns].to_numpy(), expected)
+    assert result[["washing_cost", "other_costs"]].to_numpy().sum() == 0
+    # Les lignes d'origine ne sont pas modifiées
+    assert "gross_margin" not in items.columns
@@ -0,0 +1,42 @@
+"""
+Tests du pipeline: le mode parallèle produit les mêmes blocs que le mode séquentiel
+"""
+import pandas as pd
+
+from pipeline import run_pipeline
+
+# Commandes de plusieurs lignes, à cheval sur les blocs de 2 enregistrements, et une ligne rejetée
+EXPORT = (
+    "order_id;date;email;sku;product_name;quantity;price\n"
+    "P1;05/03/2025;a@example.com;S1;Robe;1;12,50\n"
+    "P2;06/03/2025;b@example.com;S1;Robe;2;12,50\n"
+    "P2;06/03/2025;b@example.com;S2;\"Sac\nen cuir\";1;30\n"
+    "P2;06/03/2025;b@example.com;S3;Veste;1;1 234.56\n"
+    "P3;pas une date;c@example.com;S1;Robe;1;12,50\n"
+    "P4;07/03/2025;a@example.com;S2;\"Sac\nen cuir\";1;30\n"
+)
+
+
+def _run(path: str, workers: int) -> tuple:
+    """(blocs d'entités chargés dans l'ordre, lignes rejetées)"""
+    loaded = []
+    rejected = run_pipeline(path, loaded.append, chunk_size=2, workers=workers, queue_size=2,
+                            default_marketplace="pipeline-test")
+    return loaded, rejected
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Les workers produisent les mêmes entités, dans le même ordre, que le traitement séquentiel"""
+    path = tmp_path / "export.csv"
+    path.write_text(EXPORT, encoding="utf-8")
+
+    serial, serial_rejected = _run(str(path), workers=1)
+    parallel, parallel_rejected = _run(str(path), workers=2)
+
+    assert serial_rejected == parallel_rejected == 1
+    assert [chunk["orders"]["platform_order_id"].tolist() for chunk in serial] == [["P1"], ["P2"], ["P4"]]
+    assert len(parallel) == len(serial)
+    for serial_chunk, parallel_chunk in zip(serial, parallel):
+        assert serial_chunk.keys() == parallel_chunk.keys()
+        for entity in serial_chunk:
+            pd.testing.assert_frame_equal(parallel_chunk[entity], serial_chunk[entity])
@@ -0,0 +1,89 @@
+"""
+Tests de la lecture en flux des exports (CSV, JSON Lines, tableau JSON)
+"""
+import json
+
+import pandas as pd
+import pytest
+
+import readers
+from readers import iter_chunks, iter_complete_orders, iter_raw_chunks, parse_raw_chunk
+
+# Champ entre guillemets sur plusieurs lignes, guillemets doublés et séparateur dans un champ
+CSV_EXPORT = (
+    'order_id;product_name;price\n'
+    'A1;"Robe ""été""\nlongue; fleurie";12,50\n'
+    'A2;Sac;8\n'
+    'A3;"Veste\n\ncourte";30\n'
+)
+
+
+def _write(tmp_path, name: str, content: str) -> str:
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def _raw_frames(path: str, chunk_size: int) -> list:
+    return [parse_raw_chunk(raw) for raw in iter_raw_chunks(path, chunk_size)]
+
+
+def test_csv_multiline_quoted_fields(tmp_path):
+    """Un champ entre guillemets garde ses retours à la ligne et ne coupe jamais un bloc"""
+    path = _write(tmp_path, "export.csv", CSV_EXPORT)
+
+    frames = _raw_frames(path, chunk_size=1)
+
+    assert [frame["order_id"].tolist() for frame in frames] == [["A1"], ["A2"], ["A3"]]
+    assert frames[0]["product_name"].iloc[0] == 'Robe "été"\nlongue; fleurie'
+    assert frames[2]["product_name"].iloc[0] == "Veste\n\ncourte"
+    # Même contenu que la lecture pandas du fichier entier
+    direct = pd.read_csv(path, sep=";", dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(pd.concat(iter_chunks(path, chunk_size=2), ignore_index=True), direct)
+
+
+def test_json_array_with_brackets_in_strings(tmp_path, monkeypatch):
+    """Les ] et } contenus dans des chaînes ne terminent ni un objet ni le tableau"""
+    records = [
+        {"order_id": "J1", "product_name": "Lot ] de {2} \"sacs\"", "price": "5"},
+        {"order_id": "J2", "product_name": "}]", "price": "7,5"},
+        {"order_id": "J3", "product_name": "Robe", "price": None},
+    ]
+    path = _write(tmp_path, "export.json", " [\n" + ",\n".join(json.dumps(record) for record in records) + "\n] \n")
+    # Lectures de quelques octets: les coupures tombent au milieu des chaînes
+    monkeypatch.setattr(readers, "JSON_READ_SIZE", 5)
+
+    assert list(readers._iter_json_array(path)) == records
+    frames = _raw_frames(path, chunk_size=2)
+    assert [frame["product_name"].tolist() for frame in frames] == [["Lot ] de {2} \"sacs\"", "}]"], ["Robe"]]
+    assert frames[1]["price"].iloc[0] == ""
+
+
+def test_json_array_truncated(tmp_path):
+    """Un tableau JSON tronqué est signalé au lieu d'être importé à moitié"""
+    path = _write(tmp_path, "export.json", '[{"order_id": "J1"}, {"order_id": "J')
+
+    with pytest.raises(ValueError):
+        list(readers._iter_json_array(path))
+
+
+def test_jsonl_raw_chunks(tmp_path):
+    """Les JSON Lines sont découpés par enregistrement, valeurs nulles vides"""
+    path = _write(tmp_path, "export.jsonl", '{"order_id": "L1", "price": 3}\n{"order_id": "L2", "price": null}\n')
+
+    frames = _raw_frames(path, chunk_size=1)
+
+    assert [frame[["order_id", "price"]].values.tolist() for frame in frames] == [[["L1", "3"]], [["L2", ""]]]
+
+
+def test_complete_orders_across_chunk_boundary():
+    """Les lignes d'une commande coupée entre deux blocs sont regroupées dans le même bloc"""
+    chunks = [
+        pd.DataFrame({"platform_order_id": ["O1", "O2", "O2"], "line": [1, 2, 3]}),
+        pd.DataFrame({"platform_order_id": ["O2", "O2"], "line": [4, 5]}),
+        pd.DataFrame({"platform_order_id": ["O2", "O3"], "line": [6, 7]}),
+    ]
+
+    blocks = [block["line"].tolist() for block in iter_complete_orders(iter(chunks), key="platform_order_id")]
+
+    assert blocks == [[1], [2, 3, 4, 5, 6], [7]]
@@ -0,0 +1,98 @@
+"""
+Tests de la normalisation des exports: montants, dates, statuts, rejets et entités
+"""
+import pandas as pd
+
+from transform import build_entities, normalize_columns, normalize_status, parse_amounts, parse_dates, prepare_lines
+
+
+def _export(**columns) -> pd.DataFrame:
+    """Bloc d'export aux colonnes texte, une valeur par ligne"""
+    return pd.DataFrame(columns, dtype=str)
+
+
+def test_parse_amounts():
+    """Virgule ou point décimal, séparateurs de milliers et devises"""
+    values = pd.Series(["12,50 €", "1 234.56", "1.234,56", "1,234.56", "$9.99", "-3", "", "n/a"])
+
+    parsed = parse_amounts(values).tolist()
+
+    assert parsed[:6] == [12.5, 1234.56, 1234.56, 1234.56, 9.99, -3.0]
+    assert all(pd.isna(value) for value in parsed[6:])
+
+
+def test_parse_dates_day_first():
+    """Dates JJ/MM/AAAA lues jour en premier, ISO avec fuseau ramenées en UTC naïf"""
+    values = pd.Series(["05/03/2025", "25/12/2024 14:30", "2025-03-05T10:00:00+02:00", "pas une date"])
+
+    parsed = parse_dates(values)
+
+    assert parsed.iloc[0] == pd.Timestamp("2025-03-05")
+    assert parsed.iloc[1] == pd.Timestamp("2024-12-25 14:30")
+    assert parsed.iloc[2] == pd.Timestamp("2025-03-05 08:00")
+    assert pd.isna(parsed.iloc[3])
+
+
+def test_normalize_status():
+    """Statuts des marketplaces ramenés à ceux de Order, vide = completed"""
+    values = pd.Series(["Canceled", "Remboursée", "delivered", "", "pending"])
+
+    assert normalize_status(values).tolist() == ["cancelled", "refunded", "completed", "completed", "pending"]
+
+
+def test_prepare_lines_rejects_invalid_rows():
+    """Date, prix, produit, commande ou client manquants: la ligne est rejetée et comptée"""
+    chunk = normalize_columns(_export(
+        order_id=["R1", "R2", "R3", "", "R5", "R6"],
+        date=["01/02/2025", "pas une date", "01/02/2025", "01/02/2025", "01/02/2025", "01/02/2025"],
+        price=["10", "10", "", "10", "10", "10"],
+        product_name=["Robe", "Robe", "Robe", "Robe", "Robe", ""],
+        customer_id=["c1", "c1", "c1", "c1", "", "c1"],
+    ))
+
+    lines, rejected = prepare_lines(chunk, default_marketplace="vinted")
+
+    assert lines["platform_order_id"].tolist() == ["R1"]
+    assert rejected == 5
+    assert lines["customer_email"].iloc[0] == "c1@customers.invalid"
+    # Prix HT déduit du TTC avec la TVA par défaut
+    assert round(lines["unit_price_ht"].iloc[0], 2) == 8.33
+
+
+def test_build_entities():
+    """Une commande de deux lignes: totaux, statut et entités dédoublonnées"""
+    chunk = normalize_columns(_export(
+        order_id=["B1", "B1"],
+        date=["2025-02-01", "2025-02-01"],
+        status=["Annulée", "Annulée"],
+        email=["Client@Example.com", "Client@Example.com"],
+        sku=["S1", "S2"],
+        product_name=["Robe", "Sac"],
+        quantity=["2", "1"],
+        price=["12,00", "6"],
+        discount=["1", "1"],
+    ))
+    lines, _ = prepare_lines(chunk, default_marketplace="vinted")
+
+    entities = build_entities(lines)
+
+    assert entities["customers"]["email"].tolist() == ["client@example.com"]
+    assert entities["products"]["sku"].tolist() == ["S1", "S2"]
+    assert entities["items"]["total_price_ttc"].tolist() == [24.0, 6.0]
+    order = entities["orders"].iloc[0]
+    assert (order["platform_order_id"], order["status"], bool(order["is_cancelled"])) == ("B1", "cancelled", True)
+    assert (order["subtotal_ht"], order["total_ht"], order["total_ttc"]) == (25.0, 24.0, 29.0)
+
+
+def test_order_hash_covers_header_and_lines():
+    """Empreinte de commande stable à l'identique, modifiée par tout champ de l'en-tête ou des lignes"""
+    base = {"order_id": "H1", "date": "2025-02-01", "email": "h@example.com", "sku": "S1",
+            "product_name": "Robe", "quantity": "1", "price": "10"}
+
+    def order_hash(**changes):
+        lines, _ = prepare_lines(normalize_columns(_export(**{k: [v] for k, v in {**base, **changes}.items()})), "vinted")
+        return build_entities(lines)["orders"]["import_hash"].iloc[0]
+
+    assert order_hash() == order_hash()
+    for changes in ({"date": "2025-02-02"}, {"quantity": "2"}, {"price": "11"}, {"product_name": "Sac"}, {"status": "refunded"}):
+        assert order_hash(**changes) != order_hash(), changes
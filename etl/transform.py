@@ -0,0 +1,265 @@
+"""
+Normalisation des exports: une ligne d'export = une ligne de commande
+
+Les colonnes sont renommées vers un format canonique (voir COLUMN_ALIASES),
+puis typées de façon vectorisée (montants, dates, pays) et découpées en
+clients, produits, commandes et lignes de commande.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_CATEGORY
+
+# Colonnes canoniques -> noms rencontrés dans les exports des marketplaces
+COLUMN_ALIASES = {
+    "platform_order_id": ["order_id", "platform_order_id", "id_commande"],
+    "order_number": ["order_number", "order_reference", "reference", "numero_commande"],
+    "order_date": ["order_date", "date", "created_at", "date_commande", "purchase_date"],
+    "status": ["status", "order_status", "statut"],
+    "marketplace": ["marketplace", "platform", "channel", "plateforme"],
+    "country_code": ["country_code", "country", "shipping_country", "pays"],
+    "discount_amount": ["discount_amount", "discount", "remise"],
+    "platform_customer_id": ["customer_id", "platform_customer_id", "buyer_id", "id_client"],
+    "customer_email": ["customer_email", "email", "buyer_email"],
+    "customer_first_name": ["customer_first_name", "first_name", "prenom"],
+    "customer_last_name": ["customer_last_name", "last_name", "nom"],
+    "platform_product_id": ["product_id", "platform_product_id", "listing_id", "item_id"],
+    "sku": ["sku", "product_sku", "reference_produit"],
+    "product_name": ["product_name", "item_name", "title", "titre"],
+    "category": ["category", "categorie"],
+    "subcategory": ["subcategory", "sous_categorie"],
+    "quantity": ["quantity", "qty", "quantite"],
+    "unit_price_ht": ["unit_price_ht", "price_ht", "prix_ht"],
+    "unit_price_ttc": ["unit_price_ttc", "price_ttc", "unit_price", "price", "prix_ttc"],
+    "purchase_price": ["purchase_price", "cost_price", "prix_achat"],
+    "tax_rate": ["tax_rate", "vat_rate", "taux_tva"],
+}
+
+# TVA appliquée si l'export ne donne ni prix HT ni taux (en %)
+DEFAULT_TAX_RATE = 20.0
+
+STATUS_ALIASES = {
+    "canceled": "cancelled",
+    "annulee": "cancelled",
+    "annulée": "cancelled",
+    "refund": "refunded",
+    "remboursee": "refunded",
+    "remboursée": "refunded",
+    "return": "returned",
+    "retournee": "returned",
+    "retournée": "returned",
+    "shipped": "completed",
+    "delivered": "completed",
+    "livree": "completed",
+    "livrée": "completed",
+}
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Renomme les colonnes vers le format canonique et ajoute les colonnes absentes"""
+    lowered = {column: column.strip().lower().replace(" ", "_") for column in df.columns}
+    df = df.rename(columns=lowered)
+
+    renames = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in df.columns and canonical not in renames.values():
+                renames[alias] = canonical
+                break
+    df = df.rename(columns=renames)
+
+    for canonical in COLUMN_ALIASES:
+        if canonical not in df.columns:
+            df[canonical] = ""
+    df = df[list(COLUMN_ALIASES)].fillna("").astype(str)
+    for column in df.columns:
+        df[column] = df[column].str.strip()
+
+    # Identifiant de commande: l'un ou l'autre suffit
+    df["platform_order_id"] = df["platform_order_id"].where(df["platform_order_id"] != "", df["order_number"])
+    df["order_number"] = df["order_number"].where(df["order_number"] != "", df["platform_order_id"])
+    return df
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """
+    Convertit des montants texte ("12,50 €", "1 234.56", "$9.99") en float
+
+    Le dernier séparateur ("," ou ".") est le séparateur décimal, l'autre
+    est un séparateur de milliers. Les montants illisibles deviennent NaN.
+    """
+    cleaned = values.astype(str).str.replace(r"[^\d,.\-]", "", regex=True)
+    decimal_comma = cleaned.str.rfind(",") > cleaned.str.rfind(".")
+    cleaned = pd.Series(
+        np.where(
+            decimal_comma,
+            cleaned.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+            cleaned.str.replace(",", "", regex=False)
+        ),
+        index=values.index
+    )
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Convertit des dates texte (ISO, JJ/MM/AAAA...) en datetime UTC naïf"""
+    iso = values.str.match(r"^\d{4}-")
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+    if iso.any():
+        parsed[iso] = pd.to_datetime(values[iso], errors="coerce", utc=True, format="ISO8601")
+    if (~iso).any():
+        parsed[~iso] = pd.to_datetime(values[~iso], errors="coerce", utc=True, dayfirst=True, format="mixed")
+    return parsed.dt.tz_localize(None)
+
+
+def normalize_country(values: pd.Series) -> pd.Series:
+    """Met les codes pays en majuscules (None si absent)"""
+    upper = values.str.upper().str.slice(0, 10)
+    return upper.where(upper != "", None)
+
+
+def normalize_status(values: pd.Series) -> pd.Series:
+    """Ramène les statuts des marketplaces aux statuts de Order"""
+    lowered = values.str.lower()
+    lowered = lowered.replace(STATUS_ALIASES)
+    return lowered.where(lowered != "", "completed")
+
+
+def prepare_lines(df: pd.DataFrame, default_marketplace: Optional[str] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Type et valide un bloc de lignes normalisées
+
+    Args:
+        df: Bloc issu de normalize_columns()
+        default_marketplace: Marketplace utilisée quand l'export n'en indique pas
+
+    Returns:
+        (lignes valides typées, nombre de lignes rejetées)
+    """
+    lines = df.copy()
+    if default_marketplace:
+        lines["marketplace"] = lines["marketplace"].where(lines["marketplace"] != "", default_marketplace)
+
+    lines["order_date"] = parse_dates(lines["order_date"])
+    lines["country_code"] = normalize_country(lines["country_code"])
+    lines["status"] = normalize_status(lines["status"])
+    lines["quantity"] = pd.to_numeric(lines["quantity"], errors="coerce").fillna(1).astype("int64")
+    for column in ("unit_price_ht", "unit_price_ttc", "purchase_price", "discount_amount", "tax_rate"):
+        lines[column] = parse_amounts(lines[column])
+
+    # Prix HT manquant: déduit du TTC et du taux de TVA
+    tax_rate = lines["tax_rate"].fillna(DEFAULT_TAX_RATE)
+    lines["unit_price_ht"] = lines["unit_price_ht"].fillna(lines["unit_price_ttc"] / (1 + tax_rate / 100))
+    lines["discount_amount"] = lines["discount_amount"].fillna(0.0)
+
+    # Client sans email (marketplaces qui le masquent): adresse technique stable
+    missing_email = lines["customer_email"] == ""
+    lines.loc[missing_email, "customer_email"] = lines.loc[missing_email, "platform_customer_id"] + "@customers.invalid"
+    lines["customer_email"] = lines["customer_email"].str.lower()
+
+    lines["sku"] = lines["sku"].where(lines["sku"] != "", lines["platform_product_id"])
+    lines["category"] = lines["category"].where(lines["category"] != "", DEFAULT_CATEGORY)
+
+    valid = (
+        lines["order_date"].notna()
+        & lines["unit_price_ttc"].notna()
+        & (lines["product_name"] != "")
+        & (lines["platform_order_id"] != "")
+        & (lines["marketplace"] != "")
+        & (lines["customer_email"] != "@customers.invalid")
+        & (lines["quantity"] > 0)
+    )
+    return lines[valid].reset_index(drop=True), int((~valid).sum())
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Empreinte 64 bits de chaque ligne (toutes colonnes), vectorisée
+
+    Deux lignes aux valeurs identiques ont la même empreinte d'un import à
+    l'autre: c'est ce qui permet d'ignorer les enregistrements inchangés.
+    """
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def to_signed(hashes: pd.Series) -> pd.Series:
+    """Convertit des empreintes uint64 en int64 (colonnes BIGINT)"""
+    return pd.Series(hashes.to_numpy(dtype="uint64").view("int64"), index=hashes.index)
+
+
+def build_entities(lines: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Découpe des lignes typées en entités à charger
+
+    Returns:
+        Dict avec les clés "customers", "products", "orders", "items"
+    """
+    customers = lines.drop_duplicates("customer_email", keep="last")
+    # Un identifiant plateforme ne peut appartenir qu'à un client
+    customers = customers[
+        (customers["platform_customer_id"] == "")
+        | ~customers.duplicated("platform_customer_id", keep="last")
+    ][[
+        "customer_email", "platform_customer_id", "customer_first_name", "customer_last_name"
+    ]].rename(columns={
+        "customer_email": "email",
+        "customer_first_name": "first_name",
+        "customer_last_name": "last_name",
+    })
+    customers["import_hash"] = to_signed(row_hashes(customers))
+
+    products = lines[lines["sku"] != ""].drop_duplicates("sku", keep="last")
+    products = products[
+        (products["platform_product_id"] == "")
+        | ~products.duplicated("platform_product_id", keep="last")
+    ][[
+        "sku", "platform_product_id", "product_name", "category", "subcategory",
+        "purchase_price", "unit_price_ht", "unit_price_ttc"
+    ]].rename(columns={
+        "product_name": "name",
+        "unit_price_ht": "selling_price_ht",
+        "unit_price_ttc": "selling_price_ttc",
+    })
+    products["import_hash"] = to_signed(row_hashes(products))
+
+    items = lines[[
+        "platform_order_id", "sku", "product_name", "quantity",
+        "unit_price_ht", "unit_price_ttc", "purchase_price"
+    ]].copy()
+    items["total_price_ht"] = (items["unit_price_ht"] * items["quantity"]).round(2)
+    items["total_price_ttc"] = (items["unit_price_ttc"] * items["quantity"]).round(2)
+    items["unit_price_ht"] = items["unit_price_ht"].round(2)
+    items = items.rename(columns={"purchase_price": "cost_price"})
+
+    # Totaux de commande calculés à partir des lignes
+    grouped = items.groupby("platform_order_id", sort=False)
+    totals = pd.DataFrame({
+        "subtotal_ht": grouped["total_price_ht"].sum(),
+        "lines_ttc": grouped["total_price_ttc"].sum(),
+    })
+    orders = lines.drop_duplicates("platform_order_id", keep="first").set_index("platform_order_id")[[
+        "order_number", "order_date", "status", "marketplace", "country_code", "discount_amount",
+        "customer_email", "platform_customer_id"
+    ]].join(totals)
+    orders["tax_amount"] = (orders["lines_ttc"] - orders["subtotal_ht"]).round(2)
+    orders["total_ht"] = (orders["subtotal_ht"] - orders["discount_amount"]).round(2)
+    orders["total_ttc"] = (orders["total_ht"] + orders["tax_amount"]).round(2)
+    orders["is_cancelled"] = orders["status"] == "cancelled"
+    orders["is_refunded"] = orders["status"] == "refunded"
+    orders["has_returns"] = orders["status"] == "returned"
+    orders = orders.drop(columns=["lines_ttc"])
+
+    # Empreinte de commande = en-tête + somme (modulo 2^64) des empreintes de ses lignes
+    items_hash = row_hashes(items).groupby(items["platform_order_id"].values, sort=False).sum()
+    orders_hash = row_hashes(orders) + items_hash.reindex(orders.index).to_numpy(dtype="uint64")
+    orders["import_hash"] = to_signed(orders_hash).to_numpy()
+    orders = orders.reset_index()
+
+    return {
+        "customers": customers.reset_index(drop=True),
+        "products": products.reset_index(drop=True),
+        "orders": orders,
+        "items": items.reset_index(drop=True),
+    }